@@ -0,0 +1,36 @@
+"""add continuation record to generations
+
+Revision ID: add_generation_continuation
+Revises: b2fe3780f8c0
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "add_generation_continuation"
+down_revision: Union[str, Sequence[str], None] = "b2fe3780f8c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Schema name for all Boards tables
+SCHEMA = "boards"
+
+
+def upgrade() -> None:
+    """Add the continuation record kept while a provider job runs without a worker."""
+    op.add_column(
+        "generations",
+        sa.Column("continuation", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    """Drop the continuation record."""
+    op.drop_column("generations", "continuation", schema=SCHEMA)
@@ -0,0 +1,36 @@
+"""index generations by external job id
+
+Revision ID: index_external_job_id
+Revises: add_generation_continuation
+Create Date: 2026-10-17 00:00:01.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "index_external_job_id"
+down_revision: Union[str, Sequence[str], None] = "add_generation_continuation"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Schema name for all Boards tables
+SCHEMA = "boards"
+
+
+def upgrade() -> None:
+    """Index external_job_id for provider callbacks that identify jobs by it."""
+    op.create_index(
+        "idx_generations_external_job_id",
+        "generations",
+        ["external_job_id"],
+        unique=False,
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    """Drop the external_job_id index."""
+    op.drop_index("idx_generations_external_job_id", table_name="generations", schema=SCHEMA)
@@ -0,0 +1,38 @@
+"""index suspended generations
+
+Revision ID: index_suspended_generations
+Revises: index_external_job_id
+Create Date: 2026-10-17 00:00:02.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "index_suspended_generations"
+down_revision: Union[str, Sequence[str], None] = "index_external_job_id"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Schema name for all Boards tables
+SCHEMA = "boards"
+
+
+def upgrade() -> None:
+    """Partial index over suspended generations, scanned by the external job poller."""
+    op.create_index(
+        "idx_generations_suspended",
+        "generations",
+        ["id"],
+        unique=False,
+        schema=SCHEMA,
+        postgresql_where=sa.text("continuation IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the suspended generations index."""
+    op.drop_index("idx_generations_suspended", table_name="generations", schema=SCHEMA)
@@ -0,0 +1,48 @@
+"""add pipeline record to generations
+
+Revision ID: add_generation_pipeline
+Revises: index_suspended_generations
+Create Date: 2026-10-17 00:00:03.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "add_generation_pipeline"
+down_revision: Union[str, Sequence[str], None] = "index_suspended_generations"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Schema name for all Boards tables
+SCHEMA = "boards"
+
+
+def upgrade() -> None:
+    """Add the pipeline record of generations submitted as steps of a pipeline.
+
+    The GIN index finds the steps waiting on a generation when it finishes.
+    """
+    op.add_column(
+        "generations",
+        sa.Column("pipeline", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema=SCHEMA,
+    )
+    op.create_index(
+        "idx_generations_pipeline_waiting_on",
+        "generations",
+        [sa.text("(pipeline -> 'waiting_on')")],
+        unique=False,
+        schema=SCHEMA,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Drop the pipeline record."""
+    op.drop_index("idx_generations_pipeline_waiting_on", table_name="generations", schema=SCHEMA)
+    op.drop_column("generations", "pipeline", schema=SCHEMA)
@@ -0,0 +1,39 @@
+"""add progress sequence to generations
+
+Revision ID: add_generation_progress_sequence
+Revises: add_generation_pipeline
+Create Date: 2026-10-17 00:00:04.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_generation_progress_sequence"
+down_revision: Union[str, Sequence[str], None] = "add_generation_pipeline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Schema name for all Boards tables
+SCHEMA = "boards"
+
+
+def upgrade() -> None:
+    """Record which progress update a generation row was last written from.
+
+    The SSE stream uses it as the id of its snapshot event, so it can tell which
+    live updates the snapshot already contains.
+    """
+    op.add_column(
+        "generations",
+        sa.Column("progress_sequence", sa.BigInteger(), nullable=True),
+        schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    """Drop the progress sequence."""
+    op.drop_column("generations", "progress_sequence", schema=SCHEMA)
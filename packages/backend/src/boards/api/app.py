@@ -89,6 +89,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Boards API...")
+    from ..progress.hub import close_progress_hub
+
+    await close_progress_hub()
 
 
 def create_app() -> FastAPI:
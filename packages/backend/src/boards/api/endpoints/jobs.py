@@ -5,13 +5,20 @@ from __future__ import annotations
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...config import settings
 from ...database.connection import get_db_session
+from ...generators.registry import registry as generator_registry
+from ...graphql.access_control import (
+    BoardNotFoundError,
+    BoardPermissionError,
+    check_can_create_generations,
+)
 from ...jobs import repository as jobs_repo
 from ...logging import get_logger
-from ...workers.actors import process_generation
+from ...workers.actors import GenerationJob, enqueue_generation, enqueue_generations
 from ..auth import AuthenticatedUser, get_current_user
 
 logger = get_logger(__name__)
@@ -33,6 +40,21 @@ class SubmitGenerationResponse(BaseModel):
     generation_id: UUID
 
 
+class BatchGenerationItem(BaseModel):
+    board_id: UUID
+    generator_name: str
+    artifact_type: str
+    input_params: dict
+
+
+class SubmitGenerationBatchRequest(BaseModel):
+    generations: list[BatchGenerationItem] = Field(min_length=1)
+
+
+class SubmitGenerationBatchResponse(BaseModel):
+    generation_ids: list[UUID]
+
+
 @router.post("/generations", response_model=SubmitGenerationResponse)
 async def submit_generation(
     body: SubmitGenerationRequest,
@@ -65,8 +87,8 @@ async def submit_generation(
         logger.info(f"Created generation job {gen.id} for user {current_user.user_id}")
 
         # Enqueue job for processing
-        process_generation.send(str(gen.id))
-        logger.info(f"Enqueued generation job {gen.id}")
+        message = await enqueue_generation(str(gen.id), body.generator_name, current_user.tenant_id)
+        logger.info(f"Enqueued generation job {gen.id} on {message.queue_name}")
 
         return SubmitGenerationResponse(generation_id=gen.id)
 
@@ -74,3 +96,64 @@ async def submit_generation(
         logger.error(f"Failed to submit generation: {e}")
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to submit generation: {str(e)}") from e
+
+
+@router.post("/generations/batch", response_model=SubmitGenerationBatchResponse)
+async def submit_generation_batch(
+    body: SubmitGenerationBatchRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> SubmitGenerationBatchResponse:
+    """Submit many generation jobs at once.
+
+    Checks each board once, creates all generations with one INSERT and
+    enqueues them with one Redis round trip. Nothing is created if any item
+    is invalid. Generation IDs are returned in the order submitted.
+    """
+    items = body.generations
+    if len(items) > settings.generation_batch_max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.generation_batch_max_size} generations per request",
+        )
+    unknown = sorted({item.generator_name for item in items} - set(generator_registry.list_names()))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown generator: {', '.join(unknown)}")
+
+    try:
+        await check_can_create_generations(
+            db, {item.board_id for item in items}, current_user.user_id
+        )
+    except BoardNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except BoardPermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e)) from e
+
+    try:
+        gens = await jobs_repo.create_generations(
+            db,
+            tenant_id=current_user.tenant_id,
+            user_id=current_user.user_id,
+            generations=[item.model_dump() for item in items],
+        )
+        jobs = [GenerationJob(str(gen.id), gen.generator_name, gen.tenant_id) for gen in gens]
+        generation_ids = [gen.id for gen in gens]
+
+        # Commit so the jobs are persisted before they are enqueued
+        await db.commit()
+        messages = await enqueue_generations(jobs)
+        logger.info(
+            "Enqueued generation batch",
+            count=len(messages),
+            user_id=str(current_user.user_id),
+            queue_names=sorted({message.queue_name for message in messages}),
+        )
+
+        return SubmitGenerationBatchResponse(generation_ids=generation_ids)
+
+    except Exception as e:
+        logger.error("Failed to submit generation batch", error=str(e))
+        await db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Failed to submit generation batch: {str(e)}"
+        ) from e
@@ -8,13 +8,17 @@ import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...config import Settings
-from ...database.connection import get_db_session
+from ...database.connection import get_async_session, get_db_session
+from ...dbmodels import Generations
 from ...jobs import repository as jobs_repo
 from ...logging import get_logger
-from ...redis_pool import get_redis_client
+from ...progress.hub import get_progress_hub
+from ...progress.log import ProgressLog
+from ...progress.models import ArtifactInfo, ProgressPhase, ProgressUpdate
 from ..auth import AuthenticatedUser, get_current_user
 
 logger = get_logger(__name__)
@@ -22,8 +26,58 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 _settings = Settings()
-# Use the shared Redis connection pool
-_redis = get_redis_client()
+
+_SNAPSHOT_PHASES: dict[str, ProgressPhase] = {
+    "pending": "queued",
+    "completed": "finalizing",
+    "failed": "finalizing",
+    "cancelled": "finalizing",
+}
+
+
+def _parse_message(data: str) -> ProgressUpdate | None:
+    try:
+        return ProgressUpdate.model_validate_json(data)
+    except ValidationError:
+        return None
+
+
+def _message_event_id(data: str) -> int | None:
+    """SSE event id for a progress message: the update's sequence number."""
+    update = _parse_message(data)
+    return update.sequence if update is not None else None
+
+
+def _parse_last_event_id(value: str | None) -> int | None:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _snapshot_update(generation: Generations) -> ProgressUpdate:
+    """Build a progress event from the generation's persisted state."""
+    artifacts = []
+    if generation.status == "completed" and generation.storage_url:
+        artifacts = [ArtifactInfo(url=generation.storage_url, type=generation.artifact_type)]
+    return ProgressUpdate(
+        job_id=str(generation.id),
+        status=generation.status,
+        progress=float(generation.progress or 0) / 100,
+        phase=_SNAPSHOT_PHASES.get(generation.status, "processing"),
+        message=generation.error_message,
+        artifacts=artifacts,
+        timestamp=generation.updated_at,
+        sequence=generation.progress_sequence,
+    )
+
+
+def _format_event(data: str, event_id: int | None = None) -> str:
+    if event_id is None:
+        return f"data: {data}\n\n"
+    return f"id: {event_id}\ndata: {data}\n\n"
 
 
 @router.get("/generations/{generation_id}/progress")
@@ -35,6 +89,15 @@ async def generation_progress_stream(
 ):
     """Server-sent events for job progress, backed by Redis pub/sub.
 
+    Messages are received through the process-wide progress hub, so connected
+    clients do not hold Redis connections of their own. The first event is the
+    generation's current state from the database; every event carries the sequence
+    number of its update as id, and a reconnecting client that sends
+    ``Last-Event-ID`` only receives newer states. The stream ends after a
+    terminal snapshot.
+    With the Redis Streams progress log enabled, the retained updates are replayed
+    instead of the snapshot, so late subscribers see every event they missed.
+
     Requires authentication. Users can only monitor progress for their own generations
     or generations within their tenant (depending on access control policy).
     """
@@ -80,50 +143,77 @@ async def generation_progress_stream(
         )
         raise HTTPException(status_code=404, detail="Generation not found") from e
 
-    channel = f"job:{generation_id}:progress"
+    last_event_id = _parse_last_event_id(request.headers.get("last-event-id"))
 
     async def event_stream():
-        pubsub = _redis.pubsub()
-        await pubsub.subscribe(channel)
-        logger.info(
-            "SSE: Subscribed to Redis channel",
-            generation_id=generation_id,
-            channel=channel,
-        )
-        try:
-            while True:
-                if await request.is_disconnected():
-                    logger.info(
-                        "Client disconnected from progress stream",
-                        generation_id=generation_id,
-                    )
-                    break
-                msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                if msg:
-                    logger.info(
-                        "SSE: pubsub message received",
-                        message=msg,
-                        msg_type=msg.get("type"),
-                    )
-                if msg and msg.get("type") == "message":
-                    data = msg["data"]
-                    logger.info(
+        # Subscribe before reading the log or snapshot so nothing published in between is lost
+        async with get_progress_hub().subscribe(generation_id) as subscription:
+            logger.info("SSE: Subscribed to progress hub", generation_id=generation_id)
+            try:
+                # Live messages at or before this point are already known to the client
+                floor = last_event_id if last_event_id is not None else 0
+                replay: list[tuple[str, str]] = []
+                if _settings.progress_stream_enabled:
+                    replay = await ProgressLog(_settings).read(generation_id)
+                terminal = False
+                for _, data in replay:
+                    update = _parse_message(data)
+                    event_id = update.sequence if update is not None else None
+                    terminal = update is not None and update.status in jobs_repo.TERMINAL_STATUSES
+                    # Resend a terminal update the client has seen, as with the snapshot,
+                    # so a client reconnecting after the job ended learns it is over
+                    if event_id is not None and event_id <= floor and not terminal:
+                        continue
+                    yield _format_event(data, event_id)
+                    floor = max(floor, event_id or 0)
+                if terminal:
+                    return
+
+                if not replay:
+                    async with get_async_session() as session:
+                        snapshot = _snapshot_update(
+                            await jobs_repo.get_generation(session, generation_id)
+                        )
+                    # The database holds every update up to this one
+                    snapshot_id = snapshot.sequence or 0
+                    terminal = snapshot.status in jobs_repo.TERMINAL_STATUSES
+                    # Terminal states are written outside the publisher and carry no
+                    # newer sequence, so the client may not have seen them yet
+                    if last_event_id is None or snapshot_id > floor or terminal:
+                        yield _format_event(snapshot.model_dump_json(), snapshot_id)
+                        floor = max(floor, snapshot_id)
+                    if terminal:
+                        return
+
+                while True:
+                    if await request.is_disconnected():
+                        logger.info(
+                            "Client disconnected from progress stream",
+                            generation_id=generation_id,
+                        )
+                        break
+                    try:
+                        data = await asyncio.wait_for(
+                            subscription.get(), timeout=_settings.sse_keepalive_interval
+                        )
+                    except TimeoutError:
+                        logger.debug("SSE: sending keep-alive", generation_id=generation_id)
+                        yield ": keep-alive\n\n"
+                        continue
+
+                    event_id = _message_event_id(data)
+                    if event_id is not None and event_id <= floor:
+                        continue
+                    logger.debug(
                         "SSE: sending progress data to client",
                         generation_id=generation_id,
-                        data_preview=(data[:100] if isinstance(data, str) else str(data)[:100]),
+                        data_preview=data[:100],
                     )
-                    yield f"data: {data}\n\n"
-                else:
-                    # Send keep-alive every 15 seconds to prevent timeout
-                    await asyncio.sleep(15)
-                    logger.debug("SSE: sending keep-alive", generation_id=generation_id)
-                    yield ": keep-alive\n\n"
-        finally:
-            logger.info(
-                "SSE: Cleaning up stream",
-                generation_id=generation_id,
-            )
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+                    yield _format_event(data, event_id)
+            finally:
+                logger.info(
+                    "SSE: Cleaning up stream",
+                    generation_id=generation_id,
+                )
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -2,12 +2,134 @@
 Webhook endpoints for external service integrations
 """
 
-from fastapi import APIRouter
+from __future__ import annotations
+
+import json
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...config import Settings
+from ...database.connection import get_db_session
+from ...jobs import repository as jobs_repo
+from ...jobs.webhooks import (
+    WebhookProvider,
+    WebhookVerificationError,
+    get_fal_webhook_verifier,
+    verify_kie_token,
+    verify_replicate_signature,
+)
+from ...logging import get_logger
+from ...workers.actors import resume_generation
+
+logger = get_logger(__name__)
 
 router = APIRouter()
+_settings = Settings()
+
+
+class WebhookResponse(BaseModel):
+    status: Literal["accepted", "ignored", "already_finalized"]
 
 
 @router.get("/status")
 async def webhook_status():
     """Webhook status endpoint."""
     return {"status": "Webhook endpoint ready"}
+
+
+@router.post("/replicate", response_model=WebhookResponse)
+async def replicate_webhook(
+    request: Request, db: AsyncSession = Depends(get_db_session)
+) -> WebhookResponse:
+    """Completion callback for Replicate predictions."""
+    secret = _settings.replicate_webhook_secret
+    if not secret:
+        raise HTTPException(status_code=404, detail="Replicate webhooks are not configured")
+    body = await request.body()
+    try:
+        verify_replicate_signature(
+            request.headers, body, secret, tolerance=_settings.webhook_timestamp_tolerance
+        )
+    except WebhookVerificationError as e:
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+    payload = _parse_payload(body)
+    return await _accept_completion(db, "replicate", payload.get("id"))
+
+
+@router.post("/fal", response_model=WebhookResponse)
+async def fal_webhook(
+    request: Request, db: AsyncSession = Depends(get_db_session)
+) -> WebhookResponse:
+    """Completion callback for fal.ai queue requests."""
+    body = await request.body()
+    try:
+        await get_fal_webhook_verifier().verify(request.headers, body)
+    except WebhookVerificationError as e:
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+    payload = _parse_payload(body)
+    return await _accept_completion(db, "fal", payload.get("request_id"))
+
+
+@router.post("/kie", response_model=WebhookResponse)
+async def kie_webhook(
+    request: Request, db: AsyncSession = Depends(get_db_session)
+) -> WebhookResponse:
+    """Completion callback for Kie.ai tasks."""
+    secret = _settings.webhook_secret
+    if not secret:
+        raise HTTPException(status_code=404, detail="Kie.ai webhooks are not configured")
+    try:
+        verify_kie_token(request.query_params.get("token"), secret)
+    except WebhookVerificationError as e:
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+    payload = _parse_payload(await request.body())
+    data = payload.get("data")
+    task_id = data.get("taskId") if isinstance(data, dict) else None
+    return await _accept_completion(db, "kie", task_id)
+
+
+def _parse_payload(body: bytes) -> dict[str, Any]:
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload") from e
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    return payload
+
+
+async def _accept_completion(
+    db: AsyncSession, provider: WebhookProvider, external_job_id: Any
+) -> WebhookResponse:
+    """Hand a provider job that reported completion to a resume task.
+
+    Providers may deliver a callback more than once. Repeated callbacks for a
+    job that is finished are acknowledged without work, and resume_generation
+    claims the job before finalizing, so duplicates in flight are dropped too.
+    """
+    if not isinstance(external_job_id, str) or not external_job_id:
+        raise HTTPException(status_code=400, detail="Callback does not identify a job")
+
+    generation = await jobs_repo.get_generation_by_external_job_id(db, external_job_id)
+    if generation is None:
+        logger.warning(
+            "Webhook for unknown provider job", provider=provider, external_job_id=external_job_id
+        )
+        return WebhookResponse(status="ignored")
+    if generation.status in jobs_repo.TERMINAL_STATUSES:
+        return WebhookResponse(status="already_finalized")
+
+    resume_generation.send(str(generation.id))
+    logger.info(
+        "Webhook accepted, resuming generation",
+        provider=provider,
+        external_job_id=external_job_id,
+        generation_id=str(generation.id),
+    )
+    return WebhookResponse(status="accepted")
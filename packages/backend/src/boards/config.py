@@ -24,6 +24,8 @@ class Settings(BaseSettings):
 
     # Redis (for job queue)
     redis_url: str = "redis://localhost:6380"
+    # Connections in each process's shared Redis pool; callers wait for a free one
+    redis_max_connections: int = 50
 
     # Storage
     storage_config_path: str | None = None
@@ -47,9 +49,20 @@ class Settings(BaseSettings):
     api_reload: bool = False
     cors_origins: list[str] = ["http://localhost:3033"]
 
+    # Provider completion callbacks. When webhook_base_url (the public URL of this API)
+    # is set, resumable generators ask providers to call back instead of being polled
+    webhook_base_url: str | None = None
+    webhook_secret: str | None = None  # Derives the token in Kie.ai callback URLs
+    replicate_webhook_secret: str | None = None  # "whsec_..." signing secret from Replicate
+    fal_webhook_jwks_url: str = "https://rest.alpha.fal.ai/.well-known/jwks.json"
+    webhook_timestamp_tolerance: int = 300  # Seconds a signed callback stays valid
+
     # Generators Configuration
     generators_config_path: str | None = None
     generator_api_keys: dict[str, str] = {}
+    # Seconds to reuse fal.ai upload URLs of already staged inputs (0 disables).
+    # Must stay below fal's retention of uploaded files.
+    fal_upload_cache_ttl: int = 6 * 60 * 60
 
     # Environment
     environment: str = "development"  # 'development', 'staging', 'production'
@@ -81,7 +94,63 @@ class Settings(BaseSettings):
 
     # Job Queue Settings
     job_queue_name: str = "boards-jobs"
+    # Run each generation on the queue of its generator's duration class,
+    # <job_queue_name>-<class>, so long video jobs cannot hold up quick image jobs
+    job_queue_routing_enabled: bool = True
+    # Fair scheduling across tenants: generations wait in per-tenant queues and are moved
+    # to the job queues in weighted round-robin order, keeping at most
+    # fair_queue_max_backlog messages waiting in each job queue. Weights are by tenant
+    # ID (JSON in BOARDS_FAIR_QUEUE_TENANT_WEIGHTS) and must be positive; other tenants
+    # weigh 1
+    fair_queue_enabled: bool = False
+    fair_queue_max_backlog: int = 20
+    fair_queue_tenant_weights: dict[str, float] = {}
     job_timeout: int = 3600  # 1 hour default timeout
+    generation_batch_max_size: int = 1000  # Most generations submitted in one request
+    # Continuation mode: resumable generators submit their provider job and release
+    # the worker; a later message checks the provider and finalizes the job
+    job_continuation_enabled: bool = False
+    job_continuation_claim_timeout: int = 600  # Seconds before a stalled resume is retried
+    # A single poller checks all suspended jobs that are due. Each job is first checked
+    # after poll_interval seconds, then the delay grows by poll_backoff per check up to
+    # poll_max_interval, with +/- poll_jitter (a fraction) so checks do not bunch up
+    job_continuation_poll_interval: float = 5.0
+    job_continuation_poll_max_interval: float = 60.0
+    job_continuation_poll_backoff: float = 1.5
+    job_continuation_poll_jitter: float = 0.2
+    job_poller_tick_interval: float = 2.0  # Seconds between poller runs
+    job_poller_batch_size: int = 200  # Most jobs checked per run
+    # Provider rate limits are set under rate_limits in the generators config. A job waits
+    # up to provider_slot_wait_timeout seconds for a slot before it is requeued. Running
+    # jobs renew their slot's lease; slots of crashed workers free up after the lease TTL
+    provider_slot_wait_timeout: float = 120.0
+    provider_slot_lease_ttl: float = 60.0
+
+    # Worker scratch space for downloaded inputs (one directory per job)
+    scratch_dir: str | None = None  # Defaults to <system temp>/boards-scratch
+    scratch_quota_bytes: int = 10 * 1024 * 1024 * 1024  # 10GB per worker process
+    scratch_quota_wait_timeout: float = 300.0  # Seconds a job waits for space to start
+    # Worker cache of downloaded input artifacts, shared by all worker processes on a host
+    artifact_cache_enabled: bool = True
+    artifact_cache_dir: str | None = None  # Defaults to <system temp>/boards-artifact-cache
+    artifact_cache_max_bytes: int = 5 * 1024 * 1024 * 1024  # 5GB, least recently used evicted
+    # Image inputs of generators with an input_profile are downsized and re-encoded in a
+    # process pool before they are uploaded to the provider
+    input_preparation_enabled: bool = True
+    input_preparation_workers: int = 2
+    # Outputs of a multi-output job (num_images > 1) downloaded and stored at once
+    output_store_concurrency: int = 4
+    # Non-terminal progress writes are coalesced and flushed in one batch per interval
+    # (0 writes every update synchronously)
+    progress_flush_interval_ms: int = 250
+    # Optional durable progress log on Redis Streams, used to replay missed events
+    progress_stream_enabled: bool = False
+    progress_stream_maxlen: int = 500  # Approximate cap on entries kept per job
+    # Seconds to keep a job's log and update counter after its last update
+    progress_stream_ttl: int = 86400
+    # Messages buffered per SSE client before the oldest are dropped
+    sse_client_queue_size: int = 100
+    sse_keepalive_interval: float = 15.0  # Seconds of silence before a keep-alive comment
 
     # File Upload Settings
     max_upload_size: int = 100 * 1024 * 1024  # 100MB
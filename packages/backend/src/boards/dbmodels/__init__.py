@@ -11,6 +11,7 @@ from typing import Any
 from uuid import UUID
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -336,7 +337,13 @@ class Generations(Base):
         ),
         PrimaryKeyConstraint("id", name="generations_pkey"),
         Index("idx_generations_board", "board_id"),
+        Index("idx_generations_external_job_id", "external_job_id"),
         Index("idx_generations_status", "status"),
+        Index(
+            "idx_generations_suspended",
+            "id",
+            postgresql_where=text("continuation IS NOT NULL"),
+        ),
         Index("idx_generations_tenant", "tenant_id"),
         Index("idx_generations_user", "user_id"),
         Index(
@@ -344,6 +351,11 @@ class Generations(Base):
             "input_artifacts",
             postgresql_using="gin",
         ),
+        Index(
+            "idx_generations_pipeline_waiting_on",
+            text("(pipeline -> 'waiting_on')"),
+            postgresql_using="gin",
+        ),
     )
 
     id: Mapped[UUID] = mapped_column(Uuid, server_default=text("uuid_generate_v4()"))
@@ -366,7 +378,14 @@ class Generations(Base):
         JSONB, server_default=text("'[]'::jsonb")
     )
     external_job_id: Mapped[str | None] = mapped_column(String(255))
+    # Set while the job is suspended waiting on its provider job (continuation mode)
+    continuation: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
+    # Set on the steps of a pipeline: pipeline_id, step and the generations it still
+    # waits on (see jobs/pipelines.py)
+    pipeline: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
     progress: Mapped[Decimal] = mapped_column(Numeric(5, 2), server_default=text("0.0"))
+    # Sequence number of the progress update the row was last written from
+    progress_sequence: Mapped[int | None] = mapped_column(BigInteger)
     error_message: Mapped[str | None] = mapped_column(Text)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(True))
@@ -6,6 +6,7 @@ that produce various types of artifacts (images, videos, audio, text, etc.).
 
 Key components:
 - BaseGenerator: Abstract base class for all generators
+- ResumableGenerator: Base for generators whose provider job can outlive the worker call
 - Artifact types: Pydantic models for different content types
 - Registry: System for discovering and managing generators
 - Resolution utilities: For converting artifacts to files for provider SDKs
@@ -29,7 +30,15 @@ from .artifacts import (
     TextArtifact,
     VideoArtifact,
 )
-from .base import BaseGenerator
+from .base import (
+    AudioOutput,
+    BaseGenerator,
+    ExternalJobStatus,
+    ImageOutput,
+    InputProfile,
+    ResumableGenerator,
+    VideoOutput,
+)
 from .registry import GeneratorRegistry, registry
 from .resolution import (
     resolve_artifact,
@@ -41,6 +50,9 @@ from .resolution import (
 __all__ = [
     # Core classes
     "BaseGenerator",
+    "ResumableGenerator",
+    "ExternalJobStatus",
+    "InputProfile",
     "GeneratorRegistry",
     "registry",
     # Artifact types
@@ -49,6 +61,10 @@ __all__ = [
     "ImageArtifact",
     "TextArtifact",
     "LoRArtifact",
+    # Provider outputs to store
+    "ImageOutput",
+    "VideoOutput",
+    "AudioOutput",
     # Utilities
     "resolve_artifact",
     "store_image_result",
@@ -13,6 +13,7 @@ from typing import Any, TypeVar, get_args, get_origin
 from uuid import UUID
 
 from pydantic import BaseModel
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..dbmodels import Generations
@@ -125,7 +126,7 @@ def _generation_to_artifact[
         AudioArtifact,
         TextArtifact,
     )
-](generation: Generations, artifact_class: type[T]) -> T:
+](generation: Generations | Row[Any], artifact_class: type[T]) -> T:
     """Convert a Generations database record to an artifact object.
 
     Args:
@@ -196,7 +197,39 @@ def _generation_to_artifact[
         raise ValueError(f"Unsupported artifact class: {artifact_class}")
 
 
-async def resolve_generation_ids_to_artifacts[
+# Columns needed to validate a generation and build an artifact from it
+_RESOLUTION_COLUMNS = (
+    Generations.tenant_id,
+    Generations.status,
+    Generations.artifact_type,
+    Generations.storage_url,
+    Generations.output_metadata,
+)
+
+
+def _parse_generation_id(gen_id: str | UUID) -> UUID | None:
+    if isinstance(gen_id, UUID):
+        return gen_id
+    try:
+        return UUID(str(gen_id))
+    except ValueError:
+        return None
+
+
+async def _fetch_generations(
+    session: AsyncSession, generation_ids: list[str | UUID]
+) -> dict[UUID, Row[Any]]:
+    """Load everything needed to resolve the given generations in one query.
+
+    Malformed IDs are left out and reported as not found when validated.
+    """
+    parsed_ids = [
+        parsed for parsed in map(_parse_generation_id, generation_ids) if parsed is not None
+    ]
+    return await jobs_repo.get_generations_by_ids(session, parsed_ids, *_RESOLUTION_COLUMNS)
+
+
+def _build_artifacts[
     T: (
         ImageArtifact,
         VideoArtifact,
@@ -206,26 +239,10 @@ async def resolve_generation_ids_to_artifacts[
 ](
     generation_ids: list[str | UUID],
     artifact_class: type[T],
-    session: AsyncSession,
+    generations: dict[UUID, Row[Any]],
     tenant_id: UUID,
 ) -> list[T]:
-    """Convert a list of generation IDs to typed artifact objects.
-
-    This function:
-    1. Queries the database for each generation ID
-    2. Validates the generation is completed
-    3. Validates the artifact type matches
-    4. Validates the user has access (tenant_id matches)
-    5. Converts to the appropriate artifact object
-
-    Args:
-        generation_ids: List of generation IDs (as strings or UUIDs)
-        artifact_class: Target artifact class (ImageArtifact, VideoArtifact, etc.)
-        session: Database session for queries
-        tenant_id: Tenant ID for access validation
-
-    Returns:
-        List of artifact objects
+    """Validate prefetched generations and convert them to artifact objects.
 
     Raises:
         ValueError: If any generation is not found, not completed, wrong type, or access denied
@@ -234,11 +251,10 @@ async def resolve_generation_ids_to_artifacts[
     artifacts: list[T] = []
 
     for gen_id in generation_ids:
-        # Query generation from database
-        try:
-            generation = await jobs_repo.get_generation(session, gen_id)
-        except Exception as e:
-            raise ValueError(f"Generation {gen_id} not found") from e
+        parsed_id = _parse_generation_id(gen_id)
+        generation = generations.get(parsed_id) if parsed_id is not None else None
+        if generation is None:
+            raise ValueError(f"Generation {gen_id} not found")
 
         # Validate tenant access
         if generation.tenant_id != tenant_id:
@@ -265,6 +281,44 @@ async def resolve_generation_ids_to_artifacts[
     return artifacts
 
 
+async def resolve_generation_ids_to_artifacts[
+    T: (
+        ImageArtifact,
+        VideoArtifact,
+        AudioArtifact,
+        TextArtifact,
+    )
+](
+    generation_ids: list[str | UUID],
+    artifact_class: type[T],
+    session: AsyncSession,
+    tenant_id: UUID,
+) -> list[T]:
+    """Convert a list of generation IDs to typed artifact objects.
+
+    This function:
+    1. Queries the database for all generation IDs at once
+    2. Validates the generation is completed
+    3. Validates the artifact type matches
+    4. Validates the user has access (tenant_id matches)
+    5. Converts to the appropriate artifact object
+
+    Args:
+        generation_ids: List of generation IDs (as strings or UUIDs)
+        artifact_class: Target artifact class (ImageArtifact, VideoArtifact, etc.)
+        session: Database session for queries
+        tenant_id: Tenant ID for access validation
+
+    Returns:
+        List of artifact objects
+
+    Raises:
+        ValueError: If any generation is not found, not completed, wrong type, or access denied
+    """
+    generations = await _fetch_generations(session, generation_ids)
+    return _build_artifacts(generation_ids, artifact_class, generations, tenant_id)
+
+
 async def resolve_input_artifacts(
     input_params: dict[str, Any],
     schema: type[BaseModel],
@@ -325,6 +379,8 @@ async def resolve_input_artifacts(
     resolved_params = dict(input_params)
     lineage_metadata: list[dict[str, Any]] = []
 
+    # First pass: collect the generation IDs of every unresolved artifact field
+    pending_fields: list[tuple[str, type[Any], bool, list[str | UUID]]] = []
     for field_name, (artifact_class, expects_list) in artifact_field_map.items():
         field_value = resolved_params.get(field_name)
 
@@ -357,11 +413,21 @@ async def resolve_input_artifacts(
                 f"or list of generation IDs, got: {type(field_value)}"
             )
 
+        pending_fields.append((field_name, artifact_class, expects_list, generation_ids))
+
+    if not pending_fields:
+        return resolved_params, lineage_metadata
+
+    # Fetch the generations of all fields with a single query
+    generations = await _fetch_generations(
+        session, [gen_id for *_, generation_ids in pending_fields for gen_id in generation_ids]
+    )
+
+    # Second pass: validate and convert each field from the prefetched rows
+    for field_name, artifact_class, expects_list, generation_ids in pending_fields:
         # Resolve to artifacts
         try:
-            artifacts = await resolve_generation_ids_to_artifacts(
-                generation_ids, artifact_class, session, tenant_id
-            )
+            artifacts = _build_artifacts(generation_ids, artifact_class, generations, tenant_id)
         except ValueError as e:
             raise ValueError(f"Failed to resolve field '{field_name}': {e}") from e
 
@@ -2,8 +2,11 @@
 Base generator classes and interfaces for the Boards generators system.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Protocol, runtime_checkable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal, Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
@@ -23,6 +26,57 @@ class GeneratorResult(BaseModel):
     outputs: list[DigitalArtifact]
 
 
+class ImageOutput(BaseModel):
+    """An image returned by a provider, to be stored with ``context.store_many``."""
+
+    storage_url: str
+    format: str
+    width: int | None = None
+    height: int | None = None
+
+
+class VideoOutput(BaseModel):
+    """A video returned by a provider, to be stored with ``context.store_many``."""
+
+    storage_url: str
+    format: str
+    width: int | None = None
+    height: int | None = None
+    duration: float | None = None
+    fps: float | None = None
+
+
+class AudioOutput(BaseModel):
+    """An audio file returned by a provider, to be stored with ``context.store_many``."""
+
+    storage_url: str
+    format: str
+    duration: float | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+
+
+ResultOutput = ImageOutput | VideoOutput | AudioOutput
+
+
+@dataclass(frozen=True)
+class InputProfile:
+    """How image inputs are prepared before a generator sends them to its provider.
+
+    Larger images are scaled down to fit ``max_dimension`` and re-encoded in the
+    first of ``formats`` that can hold them (see workers/input_preparation.py).
+    """
+
+    max_dimension: int
+    formats: tuple[str, ...] = ("webp", "jpeg", "png")  # Accepted formats, preferred first
+    quality: Literal["high", "balanced", "small"] = "high"
+
+    @property
+    def key(self) -> str:
+        """Identifies the prepared variant of an input in caches."""
+        return f"{self.max_dimension}-{'+'.join(self.formats)}-{self.quality}"
+
+
 class BaseGenerator(ABC):
     """
     Abstract base class for all generators in the Boards system.
@@ -35,6 +89,15 @@ class BaseGenerator(ABC):
     name: str
     artifact_type: str  # 'image', 'video', 'audio', 'text', 'lora'
     description: str
+    # Provider account whose rate limits the generator's jobs count against
+    # (e.g. 'fal'); see rate_limit.py
+    provider: str | None = None
+    # Duration class picking the queue the generator's jobs run on; defaults to
+    # artifact_type (see workers/queues.py)
+    queue_class: str | None = None
+    # Image inputs are downsized and re-encoded to this profile before they are
+    # handed to the generator; None passes them through unchanged
+    input_profile: InputProfile | None = None
 
     @abstractmethod
     def get_input_schema(self) -> type[BaseModel]:
@@ -74,10 +137,125 @@ class BaseGenerator(ABC):
         """
         pass
 
+    async def resume(
+        self, external_id: str, inputs: BaseModel, context: "GeneratorExecutionContext"
+    ) -> GeneratorResult | None:
+        """
+        Reattach to a provider job that an earlier attempt of this generation submitted.
+
+        Called instead of generate() when a retried generation already has an
+        external job ID, so that the retry stores the outputs of the job that
+        was already paid for. The default cannot reattach and returns None, in
+        which case generate() submits a new job.
+
+        Args:
+            external_id: Job ID the earlier attempt passed to set_external_job_id()
+            inputs: Validated input data matching the input schema
+
+        Returns:
+            GeneratorResult | None: The stored outputs, or None to run generate()
+        """
+        return None
+
+    async def cancel(self, external_id: str) -> None:
+        """
+        Cancel a provider job of a generation that was cancelled.
+
+        Called after the worker stopped the generation, so the provider stops
+        working (and billing) too. The default does nothing, for providers
+        without a cancel API.
+
+        Args:
+            external_id: Job ID passed to set_external_job_id()
+        """
+        return None
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}(name='{self.name}', type='{self.artifact_type}')>"
 
 
+class ExternalJobStatus(BaseModel):
+    """State of a job running at an external provider."""
+
+    state: Literal["pending", "completed", "failed"]
+    progress: float | None = None  # 0.0-1.0 when the provider reports it
+    error: str | None = None
+
+
+class ResumableGenerator(BaseGenerator):
+    """
+    Generator whose provider job can be finished by a later worker call.
+
+    In continuation mode the worker calls submit() and returns once the job is
+    queued at the provider. Later messages call check_status() and, when the
+    provider job is done, finalize() to store its outputs. generate() still runs
+    the whole job in a single call when continuation mode is off.
+    """
+
+    @abstractmethod
+    async def submit(self, inputs: BaseModel, context: "GeneratorExecutionContext") -> str:
+        """
+        Start the provider job without waiting for it.
+
+        Args:
+            inputs: Validated input data matching the input schema
+
+        Returns:
+            str: The provider's job ID
+        """
+        pass
+
+    @abstractmethod
+    async def check_status(self, external_id: str) -> ExternalJobStatus:
+        """
+        Fetch the current state of a provider job.
+
+        Args:
+            external_id: Job ID returned by submit()
+
+        Returns:
+            ExternalJobStatus: Whether the job is still running, done or failed
+        """
+        pass
+
+    async def check_statuses(
+        self, external_ids: Sequence[str]
+    ) -> list[ExternalJobStatus | BaseException]:
+        """
+        Fetch the current state of many provider jobs at once.
+
+        The poller calls this with every due job of this generator. The default
+        runs check_status() concurrently; override it to share connections or
+        use a provider's batch endpoint.
+
+        Args:
+            external_ids: Job IDs returned by submit()
+
+        Returns:
+            The status of each job, in order, or the exception raised checking it
+        """
+        return await asyncio.gather(
+            *(self.check_status(external_id) for external_id in external_ids),
+            return_exceptions=True,
+        )
+
+    @abstractmethod
+    async def finalize(
+        self, external_id: str, inputs: BaseModel, context: "GeneratorExecutionContext"
+    ) -> GeneratorResult:
+        """
+        Fetch the results of a completed provider job and store them.
+
+        Args:
+            external_id: Job ID returned by submit()
+            inputs: The same validated inputs the job was submitted with
+
+        Returns:
+            GeneratorResult: The stored output artifacts
+        """
+        pass
+
+
 @runtime_checkable
 class GeneratorExecutionContext(Protocol):
     """Typed protocol for the execution context passed to generators.
@@ -86,6 +264,11 @@ class GeneratorExecutionContext(Protocol):
     with storage, database, and progress tracking systems.
     """
 
+    generation_id: str
+    tenant_id: str
+    # Profile resolve_artifact() prepares image inputs with, if any
+    input_profile: InputProfile | None = None
+
     async def resolve_artifact(self, artifact: DigitalArtifact) -> str:
         """Resolve an artifact to a local file path for use with provider SDKs."""
         ...
@@ -135,6 +318,20 @@ class GeneratorExecutionContext(Protocol):
         """Store a text result to permanent storage."""
         ...
 
+    async def store_many(self, outputs: Sequence[ResultOutput]) -> list[DigitalArtifact]:
+        """Store all outputs of a job at once; output ``i`` gets ``output_index=i``.
+
+        Returns the stored artifacts in the order of ``outputs``.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    _store_output(self, output, output_index)
+                    for output_index, output in enumerate(outputs)
+                )
+            )
+        )
+
     async def publish_progress(self, update: ProgressUpdate) -> None:
         """Publish a progress update for this generation."""
         ...
@@ -142,3 +339,14 @@ class GeneratorExecutionContext(Protocol):
     async def set_external_job_id(self, external_id: str) -> None:
         """Set the external job ID from the provider (e.g., Replicate prediction ID)."""
         ...
+
+
+async def _store_output(
+    context: GeneratorExecutionContext, output: ResultOutput, output_index: int
+) -> DigitalArtifact:
+    fields = output.model_dump()
+    if isinstance(output, ImageOutput):
+        return await context.store_image_result(**fields, output_index=output_index)
+    if isinstance(output, VideoOutput):
+        return await context.store_video_result(**fields, output_index=output_index)
+    return await context.store_audio_result(**fields, output_index=output_index)
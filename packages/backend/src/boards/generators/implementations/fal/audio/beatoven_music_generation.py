@@ -59,6 +59,7 @@ class FalBeatovenMusicGenerationGenerator(BaseGenerator):
     """Beatoven music generation using fal.ai."""
 
     name = "beatoven-music-generation"
+    provider = "fal"
     artifact_type = "audio"
     description = "Fal: Beatoven - generate royalty-free instrumental music from text prompts"
 
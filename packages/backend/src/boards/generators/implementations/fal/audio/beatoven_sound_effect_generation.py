@@ -57,6 +57,7 @@ class FalBeatovenSoundEffectGenerationGenerator(BaseGenerator):
     """Generator for creating professional-grade sound effects."""
 
     name = "fal-beatoven-sound-effect-generation"
+    provider = "fal"
     description = (
         "Fal: Beatoven Sound Effects - create professional-grade sound effects "
         "for films, games, and digital content"
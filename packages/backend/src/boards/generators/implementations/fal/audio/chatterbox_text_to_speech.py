@@ -68,6 +68,7 @@ class FalChatterboxTextToSpeechGenerator(BaseGenerator):
     """
 
     name = "fal-chatterbox-text-to-speech"
+    provider = "fal"
     artifact_type = "audio"
     description = (
         "Fal: Chatterbox TTS - Expressive text-to-speech with emotive tags and voice cloning"
@@ -83,6 +83,7 @@ class FalChatterboxTtsTurboGenerator(BaseGenerator):
     """Chatterbox TTS Turbo text-to-speech generator using fal.ai."""
 
     name = "fal-chatterbox-tts-turbo"
+    provider = "fal"
     artifact_type = "audio"
     description = (
         "Fal: Chatterbox TTS Turbo - "
@@ -82,6 +82,7 @@ class FalElevenlabsSoundEffectsV2Generator(BaseGenerator):
     """ElevenLabs Sound Effects V2 text-to-audio generator using fal.ai."""
 
     name = "fal-elevenlabs-sound-effects-v2"
+    provider = "fal"
     artifact_type = "audio"
     description = (
         "Fal: ElevenLabs Sound Effects V2 - "
@@ -82,6 +82,7 @@ class FalElevenlabsTtsElevenV3Generator(BaseGenerator):
     """ElevenLabs Text-to-Speech Eleven-V3 generator using fal.ai."""
 
     name = "fal-elevenlabs-tts-eleven-v3"
+    provider = "fal"
     artifact_type = "audio"
     description = (
         "Fal: ElevenLabs TTS Eleven-V3 - "
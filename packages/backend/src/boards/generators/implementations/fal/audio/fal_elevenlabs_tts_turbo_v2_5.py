@@ -87,6 +87,7 @@ class FalElevenlabsTtsTurboV25Generator(BaseGenerator):
     """Generator for high-speed text-to-speech using ElevenLabs TTS Turbo v2.5."""
 
     name = "fal-elevenlabs-tts-turbo-v2-5"
+    provider = "fal"
     description = (
         "Fal: ElevenLabs TTS Turbo v2.5 - "
         "High-speed text-to-speech with customizable voices and prosody"
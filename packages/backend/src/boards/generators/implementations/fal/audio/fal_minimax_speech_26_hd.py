@@ -142,6 +142,7 @@ class FalMinimaxSpeech26HdGenerator(BaseGenerator):
     """Generator for text-to-speech using Minimax Speech 2.6-HD."""
 
     name = "fal-minimax-speech-26-hd"
+    provider = "fal"
     description = (
         "High-quality text-to-speech generation with extensive voice customization options"
     )
@@ -59,6 +59,7 @@ class FalMinimaxMusicV2Generator(BaseGenerator):
     """minimax-music/v2 music generator using fal.ai."""
 
     name = "fal-minimax-music-v2"
+    provider = "fal"
     artifact_type = "audio"
     description = "Fal: MiniMax Music 2.0 - generate music from text prompts and lyrics"
 
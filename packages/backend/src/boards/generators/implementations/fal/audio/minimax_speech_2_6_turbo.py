@@ -103,6 +103,7 @@ class FalMinimaxSpeech26TurboGenerator(BaseGenerator):
     """MiniMax Speech 2.6 Turbo text-to-speech generator using fal.ai."""
 
     name = "fal-minimax-speech-2-6-turbo"
+    provider = "fal"
     artifact_type = "audio"
     description = (
         "Fal: MiniMax Speech 2.6 Turbo - "
@@ -22,6 +22,7 @@ from .ideogram_v2 import FalIdeogramV2Generator
 from .imagen4_preview import FalImagen4PreviewGenerator
 from .imagen4_preview_fast import FalImagen4PreviewFastGenerator
 from .kolors_virtual_try_on import FalKolorsVirtualTryOnGenerator
+from .kolors_virtual_try_on_batch import FalKolorsVirtualTryOnBatchGenerator
 from .nano_banana import FalNanoBananaGenerator
 from .nano_banana_edit import FalNanoBananaEditGenerator
 from .nano_banana_pro import FalNanoBananaProGenerator
@@ -55,6 +56,7 @@ __all__ = [
     "FalImagen4PreviewGenerator",
     "FalImagen4PreviewFastGenerator",
     "FalKolorsVirtualTryOnGenerator",
+    "FalKolorsVirtualTryOnBatchGenerator",
     "FalNanoBananaGenerator",
     "FalNanoBananaEditGenerator",
     "FalNanoBananaProGenerator",
@@ -30,6 +30,7 @@ class FalBriaBackgroundRemoveGenerator(BaseGenerator):
     """Bria RMBG 2.0 background removal generator using fal.ai."""
 
     name = "fal-bria-background-remove"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Bria RMBG 2.0 - Seamless background removal from images"
 
@@ -15,7 +15,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, ImageOutput
 
 # Valid image size presets
 ImageSizePreset = Literal[
@@ -78,6 +78,7 @@ class FalBytedanceSeedreamV45EditGenerator(BaseGenerator):
     """ByteDance Seedream v4.5 Edit image editing generator using fal.ai."""
 
     name = "fal-bytedance-seedream-v45-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: ByteDance Seedream v4.5 Edit - Unified image generation and editing"
 
@@ -176,8 +177,8 @@ class FalBytedanceSeedreamV45EditGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url = image_data.get("url")
             # Extract dimensions if available, otherwise use sensible defaults
@@ -196,16 +197,11 @@ class FalBytedanceSeedreamV45EditGenerator(BaseGenerator):
             else:
                 format_type = "png"
 
-            # Store with appropriate output_index
-            artifact = await context.store_image_result(
-                storage_url=image_url,
-                format=format_type,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(storage_url=image_url, format=format_type, width=width, height=height)
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: BytedanceSeedreamV45EditInput) -> float:
@@ -75,6 +75,7 @@ class FalClarityUpscalerGenerator(BaseGenerator):
     """Clarity upscaler generator using fal.ai."""
 
     name = "fal-clarity-upscaler"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Clarity upscaler - High fidelity image upscaling (1-4x)"
 
@@ -38,6 +38,7 @@ class FalCrystalUpscalerGenerator(BaseGenerator):
     """Crystal Upscaler generator using fal.ai."""
 
     name = "fal-crystal-upscaler"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Crystal Upscaler - Advanced image enhancement for facial details"
 
@@ -100,6 +100,7 @@ class FalIdeogramCharacterGenerator(BaseGenerator):
     """Generator for consistent character appearance generation."""
 
     name = "fal-ideogram-character"
+    provider = "fal"
     description = (
         "Generate consistent character appearances across multiple images. Maintains facial "
         "features, proportions, and distinctive traits for cohesive storytelling and branding."
@@ -12,7 +12,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, ImageOutput
 
 
 class Flux2EditImageSize(BaseModel):
@@ -94,6 +94,7 @@ class FalFlux2EditGenerator(BaseGenerator):
     """FLUX.2 [dev] Edit image-to-image generator using fal.ai."""
 
     name = "fal-flux-2-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: FLUX.2 [dev] Edit - Precise image editing with natural language"
 
@@ -197,8 +198,8 @@ class FalFlux2EditGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url_result = image_data.get("url")
             width = image_data.get("width", 1024)
@@ -207,16 +208,16 @@ class FalFlux2EditGenerator(BaseGenerator):
             if not image_url_result:
                 raise ValueError(f"Image {idx} missing URL in fal.ai response")
 
-            # Store with appropriate output_index
-            artifact = await context.store_image_result(
-                storage_url=image_url_result,
-                format=inputs.output_format,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(
+                    storage_url=image_url_result,
+                    format=inputs.output_format,
+                    width=width,
+                    height=height,
+                )
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: Flux2EditInput) -> float:
@@ -16,7 +16,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, ImageOutput
 
 # Image size presets supported by the API
 ImageSizePreset = Literal[
@@ -88,6 +88,7 @@ class FalFlux2ProEditGenerator(BaseGenerator):
     """
 
     name = "fal-flux-2-pro-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: FLUX 2 Pro Edit - Production-grade multi-reference image editing"
 
@@ -187,8 +188,8 @@ class FalFlux2ProEditGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url = image_data.get("url")
             # Extract dimensions if available, otherwise use sensible defaults
@@ -198,16 +199,13 @@ class FalFlux2ProEditGenerator(BaseGenerator):
             if not image_url:
                 raise ValueError(f"Image {idx} missing URL in fal.ai response")
 
-            # Store with appropriate output_index
-            artifact = await context.store_image_result(
-                storage_url=image_url,
-                format=inputs.output_format,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(
+                    storage_url=image_url, format=inputs.output_format, width=width, height=height
+                )
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: Flux2ProEditInput) -> float:
@@ -11,7 +11,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class FluxProKontextInput(BaseModel):
@@ -85,10 +85,12 @@ class FalFluxProKontextGenerator(BaseGenerator):
     """FLUX.1 [pro] Kontext image-to-image generator using fal.ai."""
 
     name = "fal-flux-pro-kontext"
+    provider = "fal"
     artifact_type = "image"
     description = (
         "Fal: FLUX.1 [pro] Kontext - Image-to-image editing with text and reference images"
     )
+    input_profile = InputProfile(max_dimension=1536)
 
     def get_input_schema(self) -> type[FluxProKontextInput]:
         return FluxProKontextInput
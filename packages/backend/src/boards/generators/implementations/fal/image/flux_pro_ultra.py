@@ -73,6 +73,7 @@ class FalFluxProUltraGenerator(BaseGenerator):
     """FLUX1.1 [pro] ultra image generator using fal.ai."""
 
     name = "fal-flux-pro-ultra"
+    provider = "fal"
     artifact_type = "image"
     description = (
         "Fal: FLUX1.1 [pro] ultra - high-quality text-to-image generation with advanced controls"
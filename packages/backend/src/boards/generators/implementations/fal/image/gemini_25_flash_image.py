@@ -63,6 +63,7 @@ class FalGemini25FlashImageGenerator(BaseGenerator):
     """Google Gemini 2.5 Flash Image generator using fal.ai."""
 
     name = "fal-gemini-25-flash-image"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Gemini 2.5 Flash Image - Google's state-of-the-art text-to-image generation"
 
@@ -15,7 +15,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class Gemini25FlashImageEditInput(BaseModel):
@@ -77,8 +77,10 @@ class FalGemini25FlashImageEditGenerator(BaseGenerator):
     """Google Gemini 2.5 Flash Image edit generator using fal.ai."""
 
     name = "fal-gemini-25-flash-image-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Gemini 2.5 Flash Image Edit - AI-powered image editing with Gemini"
+    input_profile = InputProfile(max_dimension=1024)
 
     def get_input_schema(self) -> type[Gemini25FlashImageEditInput]:
         return Gemini25FlashImageEditInput
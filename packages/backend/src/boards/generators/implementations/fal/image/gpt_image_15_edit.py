@@ -12,7 +12,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class GptImage15EditInput(BaseModel):
@@ -67,7 +67,9 @@ class FalGptImage15EditGenerator(BaseGenerator):
     """Generator for OpenAI's GPT-Image-1.5 image editing via fal.ai."""
 
     name = "fal-gpt-image-15-edit"
+    provider = "fal"
     description = "Fal: GPT-Image-1.5 Edit - OpenAI's latest image editing model"
+    input_profile = InputProfile(max_dimension=1536)
     artifact_type = "image"
 
     def get_input_schema(self) -> type[GptImage15EditInput]:
@@ -55,6 +55,7 @@ class FalGptImage15Generator(BaseGenerator):
     """GPT Image 1.5 text-to-image generator using fal.ai."""
 
     name = "fal-gpt-image-1-5"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: GPT Image 1.5 - High-fidelity image generation with strong prompt adherence"
 
@@ -12,7 +12,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class GptImage1EditImageInput(BaseModel):
@@ -55,7 +55,9 @@ class FalGptImage1EditImageGenerator(BaseGenerator):
     """Generator for OpenAI's GPT-Image-1 image editing via fal.ai."""
 
     name = "fal-gpt-image-1-edit-image"
+    provider = "fal"
     description = "Fal: GPT-Image-1 Edit - OpenAI's image editing model"
+    input_profile = InputProfile(max_dimension=1536)
     artifact_type = "image"
 
     def get_input_schema(self) -> type[GptImage1EditImageInput]:
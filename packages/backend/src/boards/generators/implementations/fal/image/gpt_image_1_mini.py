@@ -51,6 +51,7 @@ class FalGptImage1MiniGenerator(BaseGenerator):
     """GPT Image 1 Mini text-to-image generator using fal.ai."""
 
     name = "fal-gpt-image-1-mini"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: GPT Image 1 Mini - Efficient text-to-image generation with GPT-5"
 
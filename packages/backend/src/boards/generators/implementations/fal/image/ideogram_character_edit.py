@@ -142,6 +142,7 @@ class FalIdeogramCharacterEditGenerator(BaseGenerator):
     """Generator for Ideogram V3 Character Edit - modify consistent characters."""
 
     name = "fal-ideogram-character-edit"
+    provider = "fal"
     artifact_type = "image"
     description = (
         "Fal: Ideogram V3 Character Edit - "
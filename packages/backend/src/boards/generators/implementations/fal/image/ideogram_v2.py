@@ -63,6 +63,7 @@ class FalIdeogramV2Generator(BaseGenerator):
     """Generator for high-quality images with exceptional typography using Ideogram V2."""
 
     name = "fal-ideogram-v2"
+    provider = "fal"
     artifact_type = "image"
     description = (
         "Fal: Ideogram V2 - high-quality images, posters, and logos with exceptional typography"
@@ -45,6 +45,7 @@ class FalImagen4PreviewGenerator(BaseGenerator):
     """Imagen 4 Preview image generator using fal.ai."""
 
     name = "fal-imagen4-preview"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Imagen 4 - Google's highest quality text-to-image generation model"
 
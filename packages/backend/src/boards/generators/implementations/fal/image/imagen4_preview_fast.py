@@ -47,6 +47,7 @@ class FalImagen4PreviewFastGenerator(BaseGenerator):
     """Google Imagen 4 fast image generator using fal.ai."""
 
     name = "fal-imagen4-preview-fast"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Google Imagen 4 - highest quality text-to-image generation"
 
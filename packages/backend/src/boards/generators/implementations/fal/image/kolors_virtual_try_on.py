@@ -13,7 +13,7 @@ import os
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class KolorsVirtualTryOnInput(BaseModel):
@@ -39,8 +39,11 @@ class FalKolorsVirtualTryOnGenerator(BaseGenerator):
     """Generator for Kolors Virtual Try-On using fal.ai."""
 
     name = "fal-kolors-virtual-try-on"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Kolors Virtual Try-On - High quality virtual clothing try-on"
+    # Kolors accepts JPEG and PNG inputs only
+    input_profile = InputProfile(max_dimension=1024, formats=("jpeg", "png"))
 
     def get_input_schema(self) -> type[KolorsVirtualTryOnInput]:
         """Return the input schema for this generator."""
@@ -67,11 +70,10 @@ class FalKolorsVirtualTryOnGenerator(BaseGenerator):
         # Fal API requires publicly accessible URLs
         from ..utils import upload_artifacts_to_fal
 
-        human_image_urls = await upload_artifacts_to_fal([inputs.human_image_url], context)
-        garment_image_urls = await upload_artifacts_to_fal([inputs.garment_image_url], context)
-
-        human_image_url = human_image_urls[0]
-        garment_image_url = garment_image_urls[0]
+        # Both images are uploaded in parallel
+        human_image_url, garment_image_url = await upload_artifacts_to_fal(
+            [inputs.human_image_url, inputs.garment_image_url], context
+        )
 
         # Prepare arguments for fal.ai API
         arguments = {
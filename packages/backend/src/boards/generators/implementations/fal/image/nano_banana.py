@@ -9,7 +9,7 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, ImageOutput
 
 
 class NanoBananaInput(BaseModel):
@@ -67,6 +67,7 @@ class FalNanoBananaGenerator(BaseGenerator):
     """nano-banana image generator using fal.ai."""
 
     name = "fal-nano-banana"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: nano-banana - fast text-to-image generation with batch support"
 
@@ -153,8 +154,8 @@ class FalNanoBananaGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url = image_data.get("url")
             width = image_data.get("width")
@@ -163,16 +164,13 @@ class FalNanoBananaGenerator(BaseGenerator):
             if not image_url:
                 raise ValueError(f"Image {idx} missing URL in fal.ai response")
 
-            # Store with appropriate output_index
-            artifact = await context.store_image_result(
-                storage_url=image_url,
-                format=inputs.output_format,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(
+                    storage_url=image_url, format=inputs.output_format, width=width, height=height
+                )
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: NanoBananaInput) -> float:
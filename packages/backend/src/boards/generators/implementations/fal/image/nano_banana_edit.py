@@ -11,7 +11,13 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import (
+    BaseGenerator,
+    GeneratorExecutionContext,
+    GeneratorResult,
+    ImageOutput,
+    InputProfile,
+)
 
 
 class NanoBananaEditInput(BaseModel):
@@ -78,8 +84,10 @@ class FalNanoBananaEditGenerator(BaseGenerator):
     """nano-banana image editing generator using fal.ai."""
 
     name = "fal-nano-banana-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: nano-banana edit - AI-powered image editing with Gemini"
+    input_profile = InputProfile(max_dimension=1024)
 
     def get_input_schema(self) -> type[NanoBananaEditInput]:
         return NanoBananaEditInput
@@ -175,8 +183,8 @@ class FalNanoBananaEditGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url = image_data.get("url")
             # Extract dimensions if available, otherwise use sensible defaults
@@ -186,19 +194,16 @@ class FalNanoBananaEditGenerator(BaseGenerator):
             if not image_url:
                 raise ValueError(f"Image {idx} missing URL in fal.ai response")
 
-            # Store with appropriate output_index
             # Note: The Gemini description from the API response (result.get("description"))
             # is not currently stored with the artifact. Consider extending ImageArtifact
             # to support metadata in the future.
-            artifact = await context.store_image_result(
-                storage_url=image_url,
-                format=inputs.output_format,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(
+                    storage_url=image_url, format=inputs.output_format, width=width, height=height
+                )
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: NanoBananaEditInput) -> float:
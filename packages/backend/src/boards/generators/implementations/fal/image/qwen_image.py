@@ -115,6 +115,7 @@ class FalQwenImageGenerator(BaseGenerator):
     """
 
     name = "fal-qwen-image"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Qwen-Image - advanced text-to-image with exceptional text rendering"
 
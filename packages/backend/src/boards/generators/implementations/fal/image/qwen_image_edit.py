@@ -12,7 +12,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from ....artifacts import ImageArtifact
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, InputProfile
 
 
 class ImageSize(BaseModel):
@@ -100,8 +100,10 @@ class FalQwenImageEditGenerator(BaseGenerator):
     """Qwen image editing generator using fal.ai."""
 
     name = "fal-qwen-image-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Qwen Image Edit - AI-powered image editing with text editing capabilities"
+    input_profile = InputProfile(max_dimension=1536)
 
     def get_input_schema(self) -> type[QwenImageEditInput]:
         return QwenImageEditInput
@@ -54,6 +54,7 @@ class FalReveEditGenerator(BaseGenerator):
     """Reve image editing generator using fal.ai."""
 
     name = "fal-reve-edit"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: Reve edit - AI-powered image editing and transformation"
 
@@ -44,6 +44,7 @@ class FalReveTextToImageGenerator(BaseGenerator):
     """Reve text-to-image generator using fal.ai."""
 
     name = "fal-reve-text-to-image"
+    provider = "fal"
     artifact_type = "image"
     description = (
         "Fal: Reve - detailed text-to-image with strong aesthetic quality "
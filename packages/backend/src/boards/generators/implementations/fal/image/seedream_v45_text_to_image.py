@@ -10,7 +10,7 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
-from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult
+from ....base import BaseGenerator, GeneratorExecutionContext, GeneratorResult, ImageOutput
 
 
 class SeedreamV45TextToImageInput(BaseModel):
@@ -57,6 +57,7 @@ class FalSeedreamV45TextToImageGenerator(BaseGenerator):
     """Generator for high-quality images using ByteDance's Seedream 4.5 model."""
 
     name = "fal-seedream-v45-text-to-image"
+    provider = "fal"
     artifact_type = "image"
     description = "Fal: ByteDance Seedream 4.5 - high-quality text-to-image generation"
 
@@ -143,8 +144,8 @@ class FalSeedreamV45TextToImageGenerator(BaseGenerator):
         if not images:
             raise ValueError("No images returned from fal.ai API")
 
-        # Store each image using output_index
-        artifacts = []
+        # Store all images at once, image i as output_index i
+        outputs = []
         for idx, image_data in enumerate(images):
             image_url = image_data.get("url")
 
@@ -159,16 +160,11 @@ class FalSeedreamV45TextToImageGenerator(BaseGenerator):
             content_type = image_data.get("content_type", "image/png")
             format = content_type.split("/")[-1] if "/" in content_type else "png"
 
-            # Store with appropriate output_index
-            artifact = await context.store_image_result(
-                storage_url=image_url,
-                format=format,
-                width=width,
-                height=height,
-                output_index=idx,
+            outputs.append(
+                ImageOutput(storage_url=image_url, format=format, width=width, height=height)
             )
-            artifacts.append(artifact)
 
+        artifacts = await context.store_many(outputs)
         return GeneratorResult(outputs=artifacts)
 
     async def estimate_cost(self, inputs: SeedreamV45TextToImageInput) -> float:
@@ -5,9 +5,90 @@ Provides helper functions for common operations across Fal generators.
 """
 
 import asyncio
+import hashlib
 
+import redis.asyncio as redis
+
+from ....config import Settings
+from ....logging import get_logger
+from ....redis_pool import get_redis_client
 from ...artifacts import AudioArtifact, DigitalArtifact, ImageArtifact, VideoArtifact
-from ...base import GeneratorExecutionContext
+from ...base import GeneratorExecutionContext, InputProfile
+
+logger = get_logger(__name__)
+
+
+class FalUploadCache:
+    """Redis cache from staged artifacts to their fal CDN URLs, shared by all workers.
+
+    Generation outputs are immutable, so an artifact identified by its
+    generation_id and storage URL always uploads the same bytes. Entries expire
+    before fal drops the uploaded file. Images prepared to a generator's input
+    profile are cached per profile, since a different file was uploaded.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl: int) -> None:
+        self._redis = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def key(artifact: DigitalArtifact, profile: InputProfile | None = None) -> str:
+        url_hash = hashlib.sha256(artifact.storage_url.encode()).hexdigest()[:16]
+        key = f"fal:upload:{artifact.generation_id}:{url_hash}"
+        if profile is not None and isinstance(artifact, ImageArtifact):
+            key = f"{key}:{profile.key}"
+        return key
+
+    async def get_many(
+        self, artifacts: list[DigitalArtifact], profile: InputProfile | None = None
+    ) -> list[str | None]:
+        """Look up cached URLs for all artifacts in one round trip.
+
+        With a ``profile``, an image is also found under the URL of its original:
+        reusing a file that is already on fal beats uploading a smaller one.
+        """
+        keys = [self.key(artifact, profile) for artifact in artifacts]
+        originals = [self.key(artifact) for artifact in artifacts]
+        try:
+            if keys == originals:
+                return await self._redis.mget(keys)
+            urls = await self._redis.mget(keys + originals)
+            return [
+                url or original
+                for url, original in zip(urls[: len(keys)], urls[len(keys) :], strict=True)
+            ]
+        except Exception as e:
+            # The cache is an optimization; fall back to uploading
+            logger.warning("Fal upload cache lookup failed", error=str(e))
+            return [None] * len(artifacts)
+
+    async def set_many(
+        self, entries: list[tuple[DigitalArtifact, str]], profile: InputProfile | None = None
+    ) -> None:
+        if not entries:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for artifact, url in entries:
+                pipe.set(self.key(artifact, profile), url, ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Fal upload cache update failed", error=str(e))
+
+
+_upload_cache: FalUploadCache | None = None
+_upload_cache_configured = False
+
+
+def get_fal_upload_cache() -> FalUploadCache | None:
+    """Get the shared fal upload cache, or None if it is disabled."""
+    global _upload_cache, _upload_cache_configured
+    if not _upload_cache_configured:
+        ttl = Settings().fal_upload_cache_ttl
+        if ttl > 0:
+            _upload_cache = FalUploadCache(get_redis_client(), ttl)
+        _upload_cache_configured = True
+    return _upload_cache
 
 
 async def upload_artifacts_to_fal[T: DigitalArtifact](
@@ -24,6 +105,9 @@ async def upload_artifacts_to_fal[T: DigitalArtifact](
     2. Upload to Fal's public temporary storage
     3. Get back publicly accessible URLs
 
+    URLs of artifacts uploaded recently (by any worker) are taken from the fal
+    upload cache, which skips both the download and the upload.
+
     Args:
         artifacts: List of artifacts (image, video, or audio) to upload
         context: Generator execution context for artifact resolution
@@ -55,7 +139,24 @@ async def upload_artifacts_to_fal[T: DigitalArtifact](
 
         return url
 
-    # Upload all artifacts in parallel for performance
-    urls = await asyncio.gather(*[upload_single_artifact(artifact) for artifact in artifacts])
+    artifact_list: list[DigitalArtifact] = list(artifacts)
+    cache = get_fal_upload_cache()
+    urls: list[str | None] = [None] * len(artifact_list)
+    if cache is not None and artifact_list:
+        urls = await cache.get_many(artifact_list, context.input_profile)
+
+    # Upload all uncached artifacts in parallel for performance
+    missing = [index for index, url in enumerate(urls) if url is None]
+    uploaded = await asyncio.gather(
+        *[upload_single_artifact(artifact_list[index]) for index in missing]
+    )
+    for index, url in zip(missing, uploaded, strict=True):
+        urls[index] = url
+
+    if cache is not None:
+        await cache.set_many(
+            [(artifact_list[index], url) for index, url in zip(missing, uploaded, strict=True)],
+            context.input_profile,
+        )
 
-    return list(urls)
+    return [url for url in urls if url is not None]
@@ -52,6 +52,7 @@ class FalBytedanceSeedanceV1ProTextToVideoGenerator(BaseGenerator):
     """Generator for text-to-video using Bytedance Seedance 1.0 Pro."""
 
     name = "fal-bytedance-seedance-v1-pro-text-to-video"
+    provider = "fal"
     description = "Fal: Bytedance Seedance 1.0 Pro - high quality text-to-video generation"
     artifact_type = "video"
 
@@ -36,6 +36,7 @@ class FalCreatifyLipsyncGenerator(BaseGenerator):
     """Generator for realistic lip-synchronization videos."""
 
     name = "fal-creatify-lipsync"
+    provider = "fal"
     description = "Fal: Creatify Lipsync - Realistic lipsync video optimized for speed and quality"
     artifact_type = "video"
 
@@ -62,6 +62,7 @@ class FalBytedanceSeedanceV1ProImageToVideoGenerator(BaseGenerator):
     """Generator for converting images to videos using ByteDance SeedDance v1 Pro."""
 
     name = "fal-bytedance-seedance-v1-pro-image-to-video"
+    provider = "fal"
     description = "Fal: SeedDance v1 Pro - High quality image-to-video generation by ByteDance"
     artifact_type = "video"
 
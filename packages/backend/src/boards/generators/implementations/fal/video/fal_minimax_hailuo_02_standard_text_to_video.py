@@ -38,6 +38,7 @@ class FalMinimaxHailuo02StandardTextToVideoGenerator(BaseGenerator):
     """Generator for text-to-video using MiniMax Hailuo 02 Standard model."""
 
     name = "fal-minimax-hailuo-02-standard-text-to-video"
+    provider = "fal"
     description = "Fal: MiniMax Hailuo 02 [Standard] - Advanced 768p text-to-video generation"
     artifact_type = "video"
 
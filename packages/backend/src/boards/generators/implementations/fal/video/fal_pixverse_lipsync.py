@@ -56,6 +56,7 @@ class FalPixverseLipsyncGenerator(BaseGenerator):
     """Generator for PixVerse lip-sync animation."""
 
     name = "fal-pixverse-lipsync"
+    provider = "fal"
     description = "Fal: PixVerse Lipsync - Realistic lip-sync animation with audio or TTS"
     artifact_type = "video"
 
@@ -46,6 +46,7 @@ class FalSora2TextToVideoGenerator(BaseGenerator):
     """Generator for text-to-video using Sora 2."""
 
     name = "fal-sora-2-text-to-video"
+    provider = "fal"
     description = (
         "Fal: Sora 2 - OpenAI's state-of-the-art text-to-video with richly detailed, dynamic clips"
     )
@@ -56,6 +56,7 @@ class FalInfinitalkGenerator(BaseGenerator):
     """Generator for talking avatar videos from image and audio."""
 
     name = "fal-infinitalk"
+    provider = "fal"
     description = "Fal: infinitalk - Generate talking avatar video from image and audio"
     artifact_type = "video"
 
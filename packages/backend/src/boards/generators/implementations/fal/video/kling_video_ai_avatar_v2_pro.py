@@ -36,6 +36,7 @@ class FalKlingVideoAiAvatarV2ProGenerator(BaseGenerator):
     """Generator for AI avatar talking videos using Kling Video AI Avatar v2 Pro."""
 
     name = "fal-kling-video-ai-avatar-v2-pro"
+    provider = "fal"
     description = (
         "Fal: Kling Video AI Avatar v2 Pro - "
         "Transform portraits into talking avatar videos with audio-driven facial animation"
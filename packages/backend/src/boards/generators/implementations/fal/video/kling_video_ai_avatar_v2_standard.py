@@ -35,6 +35,7 @@ class FalKlingVideoAiAvatarV2StandardGenerator(BaseGenerator):
     """Generator for AI-powered avatar video synthesis."""
 
     name = "fal-kling-video-ai-avatar-v2-standard"
+    provider = "fal"
     description = "Fal: Kling Video AI Avatar v2 Standard - Avatar video from image and audio"
     artifact_type = "video"
 
@@ -52,6 +52,7 @@ class FalKlingVideoV25TurboProImageToVideoGenerator(BaseGenerator):
     """Generator for image-to-video using Kling v2.5 Turbo Pro."""
 
     name = "fal-kling-video-v2-5-turbo-pro-image-to-video"
+    provider = "fal"
     description = (
         "Fal: Kling v2.5 Turbo Pro - top-tier image-to-video generation with cinematic visuals"
     )
@@ -48,6 +48,7 @@ class FalKlingVideoV25TurboProTextToVideoGenerator(BaseGenerator):
     """Generator for text-to-video using Kling v2.5 Turbo Pro."""
 
     name = "fal-kling-video-v2-5-turbo-pro-text-to-video"
+    provider = "fal"
     description = (
         "Fal: Kling v2.5 Turbo Pro - top-tier text-to-video generation with cinematic visuals"
     )
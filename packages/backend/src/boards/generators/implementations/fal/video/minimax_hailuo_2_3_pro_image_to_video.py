@@ -39,6 +39,7 @@ class FalMinimaxHailuo23ProImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from images using MiniMax Hailuo 2.3 Pro."""
 
     name = "fal-minimax-hailuo-2-3-pro-image-to-video"
+    provider = "fal"
     description = "Fal: MiniMax Hailuo 2.3 Pro - Image-to-video with 1080p resolution"
     artifact_type = "video"
 
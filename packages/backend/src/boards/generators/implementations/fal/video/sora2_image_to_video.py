@@ -48,6 +48,7 @@ class FalSora2ImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from images using OpenAI's Sora 2."""
 
     name = "fal-sora2-image-to-video"
+    provider = "fal"
     description = "Fal: Sora 2 - Generate videos from images with audio"
     artifact_type = "video"
 
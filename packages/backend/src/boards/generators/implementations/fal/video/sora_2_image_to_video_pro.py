@@ -49,6 +49,7 @@ class FalSora2ImageToVideoProGenerator(BaseGenerator):
     """Generator for creating videos from images using OpenAI Sora 2 Pro."""
 
     name = "fal-sora-2-image-to-video-pro"
+    provider = "fal"
     description = "Fal: Sora 2 Pro - Create dynamic videos with audio from images and text prompts"
     artifact_type = "video"
 
@@ -41,6 +41,7 @@ class FalSyncLipsyncV2Generator(BaseGenerator):
     """Generator for realistic lip-synchronization animations."""
 
     name = "fal-sync-lipsync-v2"
+    provider = "fal"
     description = "Fal: sync-lipsync v2 - Realistic lip-sync animation with audio"
     artifact_type = "video"
 
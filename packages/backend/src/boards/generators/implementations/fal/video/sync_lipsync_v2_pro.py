@@ -36,6 +36,7 @@ class FalSyncLipsyncV2ProGenerator(BaseGenerator):
     """Generator for high-quality realistic lip-synchronization animations."""
 
     name = "fal-sync-lipsync-v2-pro"
+    provider = "fal"
     description = "Fal: sync-lipsync v2 pro - High-quality lipsync preserving facial features"
     artifact_type = "video"
 
@@ -37,6 +37,7 @@ class FalVeedFabric10Generator(BaseGenerator):
     """Generator for turning images into talking videos using VEED Fabric 1.0."""
 
     name = "veed-fabric-1.0"
+    provider = "fal"
     description = "VEED: Fabric 1.0 - Turn any image into a talking video"
     artifact_type = "video"
 
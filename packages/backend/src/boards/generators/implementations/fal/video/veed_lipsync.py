@@ -32,6 +32,7 @@ class FalVeedLipsyncGenerator(BaseGenerator):
     """Generator for realistic lip-synchronization using VEED's model."""
 
     name = "veed-lipsync"
+    provider = "fal"
     description = "VEED: Lipsync - Generate realistic lipsync from any audio"
     artifact_type = "video"
 
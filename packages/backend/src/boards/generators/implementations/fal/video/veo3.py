@@ -58,6 +58,7 @@ class FalVeo3Generator(BaseGenerator):
     """Generator for text-to-video using Google Veo 3."""
 
     name = "fal-veo3"
+    provider = "fal"
     description = "Fal: Veo 3 - Google's most advanced AI video generation model"
     artifact_type = "video"
 
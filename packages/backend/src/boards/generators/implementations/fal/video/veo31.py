@@ -58,6 +58,7 @@ class FalVeo31Generator(BaseGenerator):
     """Generator for text-to-video using Google Veo 3.1."""
 
     name = "fal-veo31"
+    provider = "fal"
     description = "Fal: Veo 3.1 - Google's most advanced AI video generation model with audio"
     artifact_type = "video"
 
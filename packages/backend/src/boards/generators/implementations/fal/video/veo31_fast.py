@@ -58,6 +58,7 @@ class FalVeo31FastGenerator(BaseGenerator):
     """Generator for text-to-video using Google Veo 3.1 Fast."""
 
     name = "fal-veo31-fast"
+    provider = "fal"
     description = "Fal: Veo 3.1 Fast - Google's fast AI video generation model"
     artifact_type = "video"
 
@@ -52,6 +52,7 @@ class FalVeo31FastImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from static images using Google Veo 3.1 Fast."""
 
     name = "fal-veo31-fast-image-to-video"
+    provider = "fal"
     description = "Fal: Veo 3.1 Fast - Convert images to videos with text-guided animation"
     artifact_type = "video"
 
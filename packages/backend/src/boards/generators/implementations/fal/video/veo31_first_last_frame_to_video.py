@@ -51,6 +51,7 @@ class FalVeo31FirstLastFrameToVideoGenerator(BaseGenerator):
     """Generator for creating videos from first and last frame images using Google Veo 3.1."""
 
     name = "fal-veo31-first-last-frame-to-video"
+    provider = "fal"
     description = "Fal: Veo 3.1 - Generate videos by interpolating between first and last frames"
     artifact_type = "video"
 
@@ -50,6 +50,7 @@ class FalVeo31ImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from static images using Google Veo 3.1."""
 
     name = "fal-veo31-image-to-video"
+    provider = "fal"
     description = "Fal: Veo 3.1 - Convert images to videos with text-guided animation"
     artifact_type = "video"
 
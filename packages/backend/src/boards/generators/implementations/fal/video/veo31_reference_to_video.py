@@ -46,6 +46,7 @@ class FalVeo31ReferenceToVideoGenerator(BaseGenerator):
     """Generator for creating videos from reference images using Google Veo 3.1."""
 
     name = "fal-veo31-reference-to-video"
+    provider = "fal"
     description = "Fal: Veo 3.1 - Generate videos from reference images with consistent subjects"
     artifact_type = "video"
 
@@ -72,6 +72,7 @@ class FalWan25PreviewImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from static images using WAN 2.5 Preview."""
 
     name = "fal-wan-25-preview-image-to-video"
+    provider = "fal"
     description = "Fal: WAN 2.5 Preview - Generate videos from images with motion guidance"
     artifact_type = "video"
 
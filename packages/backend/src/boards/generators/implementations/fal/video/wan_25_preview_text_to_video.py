@@ -69,6 +69,7 @@ class FalWan25PreviewTextToVideoGenerator(BaseGenerator):
     """Generator for text-to-video using Wan 2.5 Preview."""
 
     name = "fal-wan-25-preview-text-to-video"
+    provider = "fal"
     description = (
         "Fal: Wan 2.5 Preview - Text-to-video generation supporting "
         "Chinese/English prompts up to 800 characters"
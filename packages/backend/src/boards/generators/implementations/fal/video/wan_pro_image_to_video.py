@@ -40,6 +40,7 @@ class FalWanProImageToVideoGenerator(BaseGenerator):
     """Generator for creating videos from static images using WAN-Pro 2.1."""
 
     name = "fal-wan-pro-image-to-video"
+    provider = "fal"
     description = "Fal: WAN-Pro 2.1 - Generate high-quality 1080p videos from static images"
     artifact_type = "video"
 
@@ -2,6 +2,8 @@
 
 Provides common functionality shared across all Kie.ai generator implementations,
 including API key validation, HTTP client setup, response validation, and polling logic.
+Kie.ai generators are resumable: a task can be submitted by one worker call and
+its results stored by a later one (see ResumableGenerator).
 
 Kie.ai supports two API patterns:
 - Market API: Unified endpoint for 30+ models using /api/v1/jobs endpoints
@@ -11,15 +13,23 @@ Kie.ai supports two API patterns:
 import asyncio
 import os
 from abc import abstractmethod
+from collections.abc import Sequence
 from typing import Any, ClassVar, Literal
 
 import httpx
+from pydantic import BaseModel
 
+from ....jobs.webhooks import webhook_url
 from ....progress.models import ProgressUpdate
-from ...base import BaseGenerator, GeneratorExecutionContext
+from ...base import (
+    ExternalJobStatus,
+    GeneratorExecutionContext,
+    GeneratorResult,
+    ResumableGenerator,
+)
 
 
-class KieBaseGenerator(BaseGenerator):
+class KieBaseGenerator(ResumableGenerator):
     """Base class for all Kie.ai generators with common functionality.
 
     Provides shared methods for API key management, HTTP requests,
@@ -28,11 +38,20 @@ class KieBaseGenerator(BaseGenerator):
     Subclasses must define:
     - api_pattern: Either "market" or "dedicated"
     - model_id: Model identifier (for market) or endpoint path (for dedicated)
+    - submit(): Submit the task and return its task ID
+    - _store_outputs(): Store the results of a completed task
     """
 
+    provider = "kie"
+
     # Subclasses must define these
     api_pattern: ClassVar[Literal["market", "dedicated"]]
     model_id: str
+    # Default polling budget when a task is awaited in-process
+    max_polls: ClassVar[int]
+    poll_interval: ClassVar[int] = 10
+    # Connections used to check many tasks at once (see check_statuses)
+    status_check_concurrency: ClassVar[int] = 10
 
     def _get_api_key(self) -> str:
         """Get and validate KIE_API_KEY from environment.
@@ -63,6 +82,12 @@ class KieBaseGenerator(BaseGenerator):
             error_msg = response.get("msg", "Unknown error")
             raise ValueError(f"Kie.ai API error: {error_msg}")
 
+    def _add_callback_url(self, body: dict[str, Any]) -> None:
+        """Ask Kie.ai to call back on completion when webhooks are configured."""
+        callback_url = webhook_url("kie")
+        if callback_url:
+            body["callBackUrl"] = callback_url
+
     async def _make_request(
         self,
         url: str,
@@ -70,6 +95,7 @@ class KieBaseGenerator(BaseGenerator):
         api_key: str,
         json: dict[str, Any] | None = None,
         timeout: float = 30.0,
+        client: httpx.AsyncClient | None = None,
     ) -> dict[str, Any]:
         """Make HTTP request to Kie.ai API with standard error handling.
 
@@ -79,6 +105,7 @@ class KieBaseGenerator(BaseGenerator):
             api_key: API key for authorization
             json: Request body for POST requests
             timeout: Request timeout in seconds
+            client: Client to send the request with (default: a new client)
 
         Returns:
             The validated JSON response
@@ -86,84 +113,162 @@ class KieBaseGenerator(BaseGenerator):
         Raises:
             ValueError: If the request fails or returns an error response
         """
-        async with httpx.AsyncClient() as client:
-            if method == "POST":
-                response = await client.post(
-                    url,
-                    json=json,
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=timeout,
-                )
-            else:
-                response = await client.get(
-                    url,
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=timeout,
-                )
+        if client is None:
+            async with httpx.AsyncClient() as own_client:
+                return await self._make_request(url, method, api_key, json, timeout, own_client)
+
+        if method == "POST":
+            response = await client.post(
+                url,
+                json=json,
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=timeout,
+            )
+        else:
+            response = await client.get(
+                url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=timeout,
+            )
+
+        if response.status_code != 200:
+            raise ValueError(f"Kie.ai API request failed: {response.status_code} {response.text}")
+
+        result = response.json()
+        self._validate_response(result)
+        return result
 
-            if response.status_code != 200:
-                raise ValueError(
-                    f"Kie.ai API request failed: {response.status_code} {response.text}"
-                )
+    @abstractmethod
+    def _get_status_url(self, task_id: str) -> str:
+        """Get the status check URL for a task.
 
-            result = response.json()
-            self._validate_response(result)
-            return result
+        Args:
+            task_id: The task ID to check status for
 
-    @abstractmethod
-    async def _poll_for_completion(
-        self,
-        task_id: str,
-        api_key: str,
-        context: GeneratorExecutionContext,
-    ) -> dict[str, Any]:
-        """Poll for task completion.
+        Returns:
+            Full URL for status checking
+        """
+        pass
 
-        Subclasses implement this based on their API pattern (Market vs Dedicated).
+    @abstractmethod
+    def _job_status(self, task_data: dict[str, Any]) -> ExternalJobStatus:
+        """Interpret the "data" field of a status response.
 
         Args:
-            task_id: The task ID to poll
-            api_key: API key for authorization
-            context: Generator execution context for progress updates
+            task_data: The task data returned by the status endpoint
 
         Returns:
-            The completed task data containing results
+            The task state
 
         Raises:
-            ValueError: If polling fails or task fails
+            ValueError: If the response contains an unknown state
         """
         pass
 
+    @abstractmethod
+    async def _store_outputs(
+        self,
+        task_data: dict[str, Any],
+        inputs: BaseModel,
+        context: GeneratorExecutionContext,
+    ) -> GeneratorResult:
+        """Store the outputs of a completed task.
 
-class KieMarketAPIGenerator(KieBaseGenerator):
-    """Base class for Kie.ai Market API generators.
+        Args:
+            task_data: The completed task data from the status endpoint
+            inputs: The inputs the task was submitted with
+            context: Generator execution context for storing results
 
-    Market API is used for 30+ models through a unified endpoint.
-    - Submit: POST /api/v1/jobs/createTask with model parameter
-    - Status: GET /api/v1/jobs/recordInfo?taskId={id}
-    - Status field: "state" with values: "waiting", "pending", "processing", "success", "failed"
-    """
+        Returns:
+            The stored artifacts
+        """
+        pass
 
-    api_pattern: ClassVar[Literal["market"]] = "market"
+    async def generate(
+        self, inputs: BaseModel, context: GeneratorExecutionContext
+    ) -> GeneratorResult:
+        """Submit the task, wait for it in-process and store its outputs."""
+        api_key = self._get_api_key()
+        task_id = await self.submit(inputs, context)
+
+        # Store external job ID
+        await context.set_external_job_id(task_id)
+
+        task_data = await self._poll_for_completion(task_id, api_key, context)
+        return await self._store_outputs(task_data, inputs, context)
+
+    async def resume(
+        self, external_id: str, inputs: BaseModel, context: GeneratorExecutionContext
+    ) -> GeneratorResult | None:
+        """Wait for a task submitted by an earlier attempt and store its outputs.
+
+        Returns None when the task failed, so that a new one is submitted.
+        """
+        api_key = self._get_api_key()
+        task_data = await self._fetch_task_data(external_id, api_key)
+        if self._job_status(task_data).state == "failed":
+            return None
+        task_data = await self._poll_for_completion(external_id, api_key, context)
+        return await self._store_outputs(task_data, inputs, context)
+
+    async def check_status(self, external_id: str) -> ExternalJobStatus:
+        """Check the task state with a single status request."""
+        task_data = await self._fetch_task_data(external_id, self._get_api_key())
+        return self._job_status(task_data)
+
+    async def check_statuses(
+        self, external_ids: Sequence[str]
+    ) -> list[ExternalJobStatus | BaseException]:
+        """Check many tasks concurrently over one pool of keep-alive connections."""
+        api_key = self._get_api_key()
+        limits = httpx.Limits(max_connections=self.status_check_concurrency)
+        async with httpx.AsyncClient(limits=limits) as client:
+
+            async def check(task_id: str) -> ExternalJobStatus:
+                return self._job_status(await self._fetch_task_data(task_id, api_key, client))
+
+            return await asyncio.gather(
+                *(check(task_id) for task_id in external_ids), return_exceptions=True
+            )
+
+    async def finalize(
+        self, external_id: str, inputs: BaseModel, context: GeneratorExecutionContext
+    ) -> GeneratorResult:
+        """Store the outputs of a task that has already completed."""
+        task_data = await self._fetch_task_data(external_id, self._get_api_key())
+        status = self._job_status(task_data)
+        if status.state == "failed":
+            raise ValueError(f"Generation failed: {status.error}")
+        if status.state != "completed":
+            raise ValueError(f"Kie.ai task {external_id} has not completed yet")
+        return await self._store_outputs(task_data, inputs, context)
+
+    async def _fetch_task_data(
+        self, task_id: str, api_key: str, client: httpx.AsyncClient | None = None
+    ) -> dict[str, Any]:
+        result = await self._make_request(
+            self._get_status_url(task_id), "GET", api_key, client=client
+        )
+        return result.get("data") or {}
 
     async def _poll_for_completion(
         self,
         task_id: str,
         api_key: str,
         context: GeneratorExecutionContext,
-        max_polls: int = 120,
-        poll_interval: int = 10,
+        max_polls: int | None = None,
+        poll_interval: int | None = None,
     ) -> dict[str, Any]:
-        """Poll Market API for task completion using state field.
+        """Poll for task completion.
 
         Args:
             task_id: The task ID to poll
             api_key: API key for authorization
             context: Generator execution context for progress updates
-            max_polls: Maximum number of polling attempts (default: 120 = 20 minutes)
+            max_polls: Maximum number of polling attempts (default: the class's max_polls)
             poll_interval: Seconds between polls (default: 10)
 
         Returns:
@@ -172,7 +277,9 @@ class KieMarketAPIGenerator(KieBaseGenerator):
         Raises:
             ValueError: If task fails or times out
         """
-        status_url = f"https://api.kie.ai/api/v1/jobs/recordInfo?taskId={task_id}"
+        max_polls = max_polls or self.max_polls
+        poll_interval = poll_interval or self.poll_interval
+        status_url = self._get_status_url(task_id)
 
         async with httpx.AsyncClient() as client:
             for poll_count in range(max_polls):
@@ -195,17 +302,12 @@ class KieMarketAPIGenerator(KieBaseGenerator):
                 self._validate_response(status_result)
 
                 task_data = status_result.get("data", {})
-                state = task_data.get("state")
+                status = self._job_status(task_data)
 
-                if state == "success":
+                if status.state == "completed":
                     return task_data
-                elif state == "failed":
-                    error_msg = task_data.get("failMsg", "Unknown error")
-                    raise ValueError(f"Generation failed: {error_msg}")
-                elif state not in ["waiting", "pending", "processing", None]:
-                    raise ValueError(
-                        f"Unknown state '{state}' from Kie.ai API. Full response: {status_result}"
-                    )
+                elif status.state == "failed":
+                    raise ValueError(f"Generation failed: {status.error}")
 
                 # Publish progress
                 progress = min(90, (poll_count / max_polls) * 100)
@@ -222,95 +324,52 @@ class KieMarketAPIGenerator(KieBaseGenerator):
                 raise ValueError(f"Generation timed out after {timeout_minutes} minutes")
 
 
-class KieDedicatedAPIGenerator(KieBaseGenerator):
-    """Base class for Kie.ai Dedicated API generators.
+class KieMarketAPIGenerator(KieBaseGenerator):
+    """Base class for Kie.ai Market API generators.
 
-    Dedicated APIs have model-specific endpoints with custom paths.
-    - Submit: POST /api/v1/{model}/generate (no model parameter in body)
-    - Status: GET /api/v1/{model}/record-info?taskId={id}
-    - Status field: "successFlag" with values: 0 (processing), 1 (success), 2/3 (failed)
+    Market API is used for 30+ models through a unified endpoint.
+    - Submit: POST /api/v1/jobs/createTask with model parameter
+    - Status: GET /api/v1/jobs/recordInfo?taskId={id}
+    - Status field: "state" with values: "waiting", "pending", "processing", "success", "failed"
     """
 
-    api_pattern: ClassVar[Literal["dedicated"]] = "dedicated"
+    api_pattern: ClassVar[Literal["market"]] = "market"
+    max_polls: ClassVar[int] = 120  # 20 minutes
 
-    @abstractmethod
     def _get_status_url(self, task_id: str) -> str:
-        """Get the status check URL for this specific dedicated API.
+        return f"https://api.kie.ai/api/v1/jobs/recordInfo?taskId={task_id}"
 
-        Each dedicated API has its own status endpoint path.
+    def _job_status(self, task_data: dict[str, Any]) -> ExternalJobStatus:
+        state = task_data.get("state")
+        if state == "success":
+            return ExternalJobStatus(state="completed")
+        elif state == "failed":
+            return ExternalJobStatus(
+                state="failed", error=task_data.get("failMsg", "Unknown error")
+            )
+        elif state not in ["waiting", "pending", "processing", None]:
+            raise ValueError(f"Unknown state '{state}' from Kie.ai API. Task data: {task_data}")
+        return ExternalJobStatus(state="pending")
 
-        Args:
-            task_id: The task ID to check status for
 
-        Returns:
-            Full URL for status checking
-        """
-        pass
-
-    async def _poll_for_completion(
-        self,
-        task_id: str,
-        api_key: str,
-        context: GeneratorExecutionContext,
-        max_polls: int = 180,
-        poll_interval: int = 10,
-    ) -> dict[str, Any]:
-        """Poll Dedicated API for task completion using successFlag field.
-
-        Args:
-            task_id: The task ID to poll
-            api_key: API key for authorization
-            context: Generator execution context for progress updates
-            max_polls: Maximum number of polling attempts (default: 180 = 30 minutes)
-            poll_interval: Seconds between polls (default: 10)
-
-        Returns:
-            The completed task data from the "data" field
-
-        Raises:
-            ValueError: If task fails or times out
-        """
-        status_url = self._get_status_url(task_id)
-
-        async with httpx.AsyncClient() as client:
-            for poll_count in range(max_polls):
-                # Don't sleep on first poll - check status immediately
-                if poll_count > 0:
-                    await asyncio.sleep(poll_interval)
-
-                status_response = await client.get(
-                    status_url,
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=30.0,
-                )
-
-                if status_response.status_code != 200:
-                    raise ValueError(
-                        f"Status check failed: {status_response.status_code} {status_response.text}"
-                    )
-
-                status_result = status_response.json()
-                self._validate_response(status_result)
-
-                task_data = status_result.get("data", {})
-                success_flag = task_data.get("successFlag")
+class KieDedicatedAPIGenerator(KieBaseGenerator):
+    """Base class for Kie.ai Dedicated API generators.
 
-                if success_flag == 1:
-                    return task_data
-                elif success_flag in [2, 3]:
-                    error_msg = task_data.get("errorMsg", "Unknown error")
-                    raise ValueError(f"Generation failed: {error_msg}")
+    Dedicated APIs have model-specific endpoints with custom paths.
+    - Submit: POST /api/v1/{model}/generate (no model parameter in body)
+    - Status: GET /api/v1/{model}/record-info?taskId={id}
+    - Status field: "successFlag" with values: 0 (processing), 1 (success), 2/3 (failed)
+    """
 
-                # Publish progress
-                progress = min(90, (poll_count / max_polls) * 100)
-                await context.publish_progress(
-                    ProgressUpdate(
-                        job_id=task_id,
-                        status="processing",
-                        progress=progress,
-                        phase="processing",
-                    )
-                )
-            else:
-                timeout_minutes = (max_polls * poll_interval) / 60
-                raise ValueError(f"Generation timed out after {timeout_minutes} minutes")
+    api_pattern: ClassVar[Literal["dedicated"]] = "dedicated"
+    max_polls: ClassVar[int] = 180  # 30 minutes
+
+    def _job_status(self, task_data: dict[str, Any]) -> ExternalJobStatus:
+        success_flag = task_data.get("successFlag")
+        if success_flag == 1:
+            return ExternalJobStatus(state="completed")
+        elif success_flag in [2, 3]:
+            return ExternalJobStatus(
+                state="failed", error=task_data.get("errorMsg", "Unknown error")
+            )
+        return ExternalJobStatus(state="pending")
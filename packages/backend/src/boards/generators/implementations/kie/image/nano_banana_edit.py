@@ -8,7 +8,7 @@ Based on Kie.ai's google/nano-banana-edit model.
 See: https://docs.kie.ai/market/google/nano-banana-edit
 """
 
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -68,10 +68,8 @@ class KieNanoBananaEditGenerator(KieMarketAPIGenerator):
     def get_input_schema(self) -> type[NanoBananaEditInput]:
         return NanoBananaEditInput
 
-    async def generate(
-        self, inputs: NanoBananaEditInput, context: GeneratorExecutionContext
-    ) -> GeneratorResult:
-        """Edit images using Kie.ai google/nano-banana-edit model."""
+    async def submit(self, inputs: NanoBananaEditInput, context: GeneratorExecutionContext) -> str:
+        """Submit a Kie.ai google/nano-banana-edit task."""
         # Get API key using base class method
         api_key = self._get_api_key()
 
@@ -95,6 +93,8 @@ class KieNanoBananaEditGenerator(KieMarketAPIGenerator):
             },
         }
 
+        self._add_callback_url(body)
+
         # Submit task using base class method
         submit_url = "https://api.kie.ai/api/v1/jobs/createTask"
         result = await self._make_request(submit_url, "POST", api_key, json=body)
@@ -106,12 +106,15 @@ class KieNanoBananaEditGenerator(KieMarketAPIGenerator):
         if not task_id:
             raise ValueError(f"No taskId returned from Kie.ai API. Response: {result}")
 
-        # Store external job ID
-        await context.set_external_job_id(task_id)
-
-        # Poll for completion using base class method
-        task_data = await self._poll_for_completion(task_id, api_key, context)
+        return task_id
 
+    async def _store_outputs(
+        self,
+        task_data: dict[str, Any],
+        inputs: NanoBananaEditInput,
+        context: GeneratorExecutionContext,
+    ) -> GeneratorResult:
+        """Store the images of a completed edit task."""
         # Extract outputs from resultJson
         result_json = task_data.get("resultJson")
         if result_json:
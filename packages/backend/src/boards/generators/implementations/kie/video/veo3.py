@@ -62,10 +62,8 @@ class KieVeo3Generator(KieDedicatedAPIGenerator):
         """Get the Veo3-specific status check URL."""
         return f"https://api.kie.ai/api/v1/veo/record-info?taskId={task_id}"
 
-    async def generate(
-        self, inputs: KieVeo3Input, context: GeneratorExecutionContext
-    ) -> GeneratorResult:
-        """Generate video using Kie.ai Veo 3.1 model."""
+    async def submit(self, inputs: KieVeo3Input, context: GeneratorExecutionContext) -> str:
+        """Submit a Kie.ai Veo 3.1 video task."""
         # Get API key using base class method
         api_key = self._get_api_key()
 
@@ -83,6 +81,8 @@ class KieVeo3Generator(KieDedicatedAPIGenerator):
             image_urls = await upload_artifacts_to_kie(inputs.image_sources, context)
             body["imageUrls"] = image_urls
 
+        self._add_callback_url(body)
+
         # Submit task to Dedicated API endpoint using base class method
         submit_url = "https://api.kie.ai/api/v1/veo/generate"
         result = await self._make_request(submit_url, "POST", api_key, json=body)
@@ -97,11 +97,16 @@ class KieVeo3Generator(KieDedicatedAPIGenerator):
         if not task_id:
             raise ValueError(f"No taskId returned from Kie.ai API. Response: {result}")
 
-        # Store external job ID
-        await context.set_external_job_id(task_id)
+        return task_id
 
-        # Poll for completion using base class method
-        result_data = await self._poll_for_completion(task_id, api_key, context)
+    async def _store_outputs(
+        self,
+        task_data: dict[str, Any],
+        inputs: KieVeo3Input,
+        context: GeneratorExecutionContext,
+    ) -> GeneratorResult:
+        """Store the videos of a completed Veo 3.1 task."""
+        result_data = task_data
 
         # Extract video URLs from response.resultUrls field
         # Dedicated API nests the results inside a 'response' object
@@ -22,6 +22,7 @@ class OpenAIWhisperGenerator(BaseGenerator):
     """Whisper speech-to-text transcription using OpenAI API."""
 
     name = "openai-whisper"
+    provider = "openai"
     artifact_type = "text"
     description = "OpenAI: Whisper - speech-to-text transcription"
 
@@ -28,6 +28,7 @@ class OpenAIDallE3Generator(BaseGenerator):
     """DALL-E 3 image generator using OpenAI API."""
 
     name = "openai-dall-e-3"
+    provider = "openai"
     artifact_type = "image"
     description = "OpenAI: DALL-E 3 - advanced text-to-image generation"
 
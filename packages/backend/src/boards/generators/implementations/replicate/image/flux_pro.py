@@ -31,6 +31,7 @@ class ReplicateFluxProGenerator(BaseGenerator):
     """FLUX.1.1 Pro image generator using Replicate."""
 
     name = "replicate-flux-pro"
+    provider = "replicate"
     artifact_type = "image"
     description = "Replicate: FLUX.1.1 [pro] by Black Forest Labs - high-quality image generation"
 
@@ -23,6 +23,7 @@ class ReplicateLipsyncGenerator(BaseGenerator):
     """Lipsync generator that syncs lips in video to audio."""
 
     name = "replicate-lipsync"
+    provider = "replicate"
     artifact_type = "video"
     description = "Replicate: Sync lips in video to match audio track"
 
@@ -10,7 +10,7 @@ Strict mode is enabled by default and will fail startup on errors.
 from __future__ import annotations
 
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from importlib import import_module
 from importlib import metadata as importlib_metadata
 from pathlib import Path
@@ -22,6 +22,7 @@ from boards.config import settings
 from boards.logging import get_logger
 
 from .base import BaseGenerator
+from .rate_limit import ProviderLimit, configure_provider_limits
 from .registry import registry
 
 logger = get_logger(__name__)
@@ -37,6 +38,7 @@ class LoaderConfig:
     strict_mode: bool = True
     allow_unlisted: bool = False
     declarations: list[dict[str, Any]] | None = None
+    rate_limits: dict[str, ProviderLimit] = field(default_factory=dict)
 
 
 def _load_file_config(path: str) -> LoaderConfig | None:
@@ -50,10 +52,23 @@ def _load_file_config(path: str) -> LoaderConfig | None:
     allow_unlisted = bool(data.get("allow_unlisted", False))
     declarations = list(data.get("generators", []) or [])
 
+    rate_limits: dict[str, ProviderLimit] = {}
+    for provider, options in (data.get("rate_limits") or {}).items():
+        try:
+            if not isinstance(options, dict):
+                raise ValueError(f"expected a mapping, got {type(options).__name__}")
+            rate_limits[provider] = ProviderLimit.from_config(options)
+        except ValueError as e:
+            msg = f"Invalid rate limit for provider '{provider}': {e}"
+            if strict_mode:
+                raise ValueError(msg) from e
+            logger.error(msg)
+
     return LoaderConfig(
         strict_mode=strict_mode,
         allow_unlisted=allow_unlisted,
         declarations=declarations,
+        rate_limits=rate_limits,
     )
 
 
@@ -115,13 +130,24 @@ def _validate_artifact_type(instance: BaseGenerator) -> None:
         raise ValueError(f"Invalid artifact_type: {artifact_type}")
 
 
-def _register_instance(instance: BaseGenerator, name_override: str | None) -> None:
+def _register_instance(
+    instance: BaseGenerator,
+    name_override: str | None,
+    provider_override: str | None = None,
+    queue_class_override: str | None = None,
+) -> None:
     if name_override:
         # Override instance name if provided
         try:
             instance.name = name_override
         except Exception as e:
             raise ValueError(f"Failed to set generator name override: {e}") from e
+    if provider_override:
+        # Count the generator against another provider's rate limits
+        instance.provider = provider_override
+    if queue_class_override:
+        # Run the generator's jobs on another duration class's queue
+        instance.queue_class = queue_class_override
 
     _validate_artifact_type(instance)
     registry.register(instance)
@@ -173,6 +199,8 @@ def load_generators_from_config(config_path: str | None = None) -> None:
         logger.info("No generators configuration found; skipping generator loading")
         return
 
+    configure_provider_limits(cfg.rate_limits)
+
     strict_mode = cfg.strict_mode
     allow_unlisted = cfg.allow_unlisted
 
@@ -191,6 +219,8 @@ def load_generators_from_config(config_path: str | None = None) -> None:
             continue
 
         name_override = decl.get("name")
+        provider_override = decl.get("provider")
+        queue_class_override = decl.get("queue_class")
 
         try:
             if "import" in decl:
@@ -204,7 +234,7 @@ def load_generators_from_config(config_path: str | None = None) -> None:
                 options = decl.get("options", {}) or {}
                 cls = _resolve_class(qualified)
                 instance = cls(**options) if options else cls()
-                _register_instance(instance, name_override)
+                _register_instance(instance, name_override, provider_override, queue_class_override)
                 requested_names.add(instance.name)
                 logger.debug(
                     "Registered generator via class",
@@ -216,7 +246,7 @@ def load_generators_from_config(config_path: str | None = None) -> None:
                 options = decl.get("options", {}) or {}
                 cls = _resolve_entrypoint(ep_name)
                 instance = cls(**options) if options else cls()
-                _register_instance(instance, name_override)
+                _register_instance(instance, name_override, provider_override, queue_class_override)
                 requested_names.add(instance.name)
                 logger.debug(
                     "Registered generator via entrypoint",
@@ -250,4 +280,5 @@ def load_generators_from_config(config_path: str | None = None) -> None:
         names=registry.list_names(),
         strict_mode=strict_mode,
         allow_unlisted=allow_unlisted,
+        rate_limited_providers=sorted(cfg.rate_limits),
     )
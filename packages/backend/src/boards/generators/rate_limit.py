@@ -0,0 +1,257 @@
+"""Provider rate limits shared by all workers.
+
+Providers limit each account's request rate and the number of jobs it has
+running. Limits are configured per provider in the generators YAML:
+
+    rate_limits:
+      fal:
+        requests_per_second: 10   # Sustained submit rate
+        burst: 20                 # Submits allowed at once after a quiet period
+        concurrency: 40           # Jobs running at the provider at once
+      replicate:
+        requests_per_second: 5
+        per_tenant: true          # Limit each tenant separately
+
+Before submitting a job a worker takes a token from the provider's bucket and
+a lease on one of its concurrency slots. Both live in Redis and are updated by
+one script, so workers never exceed the limits together. A lease is held
+until the provider job finishes and expires if its worker dies without
+releasing it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from ..logging import get_logger
+from ..redis_pool import get_redis_client
+
+logger = get_logger(__name__)
+
+# KEYS: token bucket hash, lease sorted set (lease ID -> expiry in ms)
+# ARGV: lease ID, tokens per second (0 = no rate limit), bucket size,
+#       concurrency (0 = no limit), lease TTL in ms
+# Returns 0 when acquired, -1 when all slots are leased, or else the
+# milliseconds until a token is available.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+local lease_id = ARGV[1]
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local concurrency = tonumber(ARGV[4])
+local ttl = tonumber(ARGV[5])
+
+if concurrency > 0 then
+  redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+  if not redis.call('ZSCORE', KEYS[2], lease_id)
+      and redis.call('ZCARD', KEYS[2]) >= concurrency then
+    return -1
+  end
+end
+
+if rate > 0 then
+  local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or burst
+  local ts = tonumber(state[2]) or now
+  tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+  if tokens < 1 then
+    return math.ceil((1 - tokens) * 1000 / rate)
+  end
+  redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+  redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+end
+
+if concurrency > 0 then
+  redis.call('ZADD', KEYS[2], now + ttl, lease_id)
+end
+return 0
+"""
+
+# KEYS: lease sorted set. ARGV: lease ID, lease TTL in ms
+_RENEW_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[2]), ARGV[1])
+"""
+
+
+class ProviderBusyError(RuntimeError):
+    """Raised when a provider slot did not free up within the wait timeout."""
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """Limits of one provider account. None leaves that dimension unlimited."""
+
+    requests_per_second: float | None = None
+    burst: int | None = None  # Defaults to one second worth of requests
+    concurrency: int | None = None
+    per_tenant: bool = False
+
+    @classmethod
+    def from_config(cls, data: Mapping[str, Any]) -> ProviderLimit:
+        unknown = set(data) - {"requests_per_second", "burst", "concurrency", "per_tenant"}
+        if unknown:
+            raise ValueError(f"Unknown rate limit options: {sorted(unknown)}")
+        limit = cls(
+            requests_per_second=data.get("requests_per_second"),
+            burst=data.get("burst"),
+            concurrency=data.get("concurrency"),
+            per_tenant=bool(data.get("per_tenant", False)),
+        )
+        for field in ("requests_per_second", "burst", "concurrency"):
+            value = getattr(limit, field)
+            if value is not None and (not isinstance(value, int | float) or value <= 0):
+                raise ValueError(f"Rate limit {field} must be a positive number, got {value!r}")
+        return limit
+
+    @property
+    def bucket_size(self) -> int:
+        if self.burst is not None:
+            return self.burst
+        return max(1, math.ceil(self.requests_per_second or 0))
+
+
+@dataclass(frozen=True)
+class RateLimitScope:
+    """The limit that applies to a job and the Redis key it is counted under."""
+
+    key: str
+    limit: ProviderLimit
+
+
+class ProviderLimiter:
+    """Distributed token bucket and concurrency leases per provider (and tenant).
+
+    Args:
+        redis_client: Redis shared by all workers
+        limits: Limits by provider name; providers without one are not limited
+        retry_interval: Seconds between attempts while all slots are leased
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        limits: Mapping[str, ProviderLimit] | None = None,
+        *,
+        retry_interval: float = 0.25,
+    ) -> None:
+        self._redis = redis_client
+        self.limits: dict[str, ProviderLimit] = dict(limits or {})
+        self.retry_interval = retry_interval
+
+    def scope(
+        self, provider: str | None, tenant_id: str | UUID | None = None
+    ) -> RateLimitScope | None:
+        """The limit a job of ``provider`` for ``tenant_id`` counts against, if any."""
+        limit = self.limits.get(provider) if provider else None
+        if limit is None:
+            return None
+        key = f"ratelimit:{provider}"
+        if limit.per_tenant and tenant_id is not None:
+            key = f"{key}:{tenant_id}"
+        return RateLimitScope(key, limit)
+
+    async def acquire(
+        self, scope: RateLimitScope, lease_id: str, *, ttl: float, timeout: float
+    ) -> None:
+        """Take a token and lease a slot for ``ttl`` seconds, waiting up to ``timeout``.
+
+        Raises:
+            ProviderBusyError: If no slot was available in time
+        """
+        limit = scope.limit
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                result = await self._redis.eval(
+                    _ACQUIRE_SCRIPT,
+                    2,
+                    f"{scope.key}:tokens",
+                    f"{scope.key}:leases",
+                    lease_id,
+                    limit.requests_per_second or 0,
+                    limit.bucket_size,
+                    limit.concurrency or 0,
+                    int(ttl * 1000),
+                )
+            except Exception as e:
+                # Limits protect the provider account; never fail a job because Redis is down
+                logger.warning(
+                    "Rate limiter unavailable, not limiting", key=scope.key, error=str(e)
+                )
+                return
+            if result == 0:
+                return
+
+            wait = self.retry_interval if result < 0 else result / 1000
+            # Jitter keeps waiting workers from retrying in lockstep
+            wait *= random.uniform(1.0, 1.5)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ProviderBusyError(f"No {scope.key} slot available within {timeout}s")
+            await asyncio.sleep(min(wait, remaining))
+
+    async def renew(self, scope_key: str, lease_id: str, *, ttl: float) -> None:
+        await self._redis.eval(_RENEW_SCRIPT, 1, f"{scope_key}:leases", lease_id, int(ttl * 1000))
+
+    async def release(self, scope_key: str, lease_id: str) -> None:
+        """Free the lease's slot. Releasing a lease that is gone is a no-op."""
+        try:
+            await self._redis.zrem(f"{scope_key}:leases", lease_id)
+        except Exception as e:
+            logger.warning("Failed to release provider slot", key=scope_key, error=str(e))
+
+    @asynccontextmanager
+    async def hold(
+        self, scope: RateLimitScope, lease_id: str, *, ttl: float, timeout: float
+    ) -> AsyncIterator[None]:
+        """Hold a slot while the block runs, renewing its lease so it outlives ``ttl``."""
+        await self.acquire(scope, lease_id, ttl=ttl, timeout=timeout)
+        renewer = asyncio.create_task(self._keep_renewing(scope.key, lease_id, ttl))
+        try:
+            yield
+        finally:
+            renewer.cancel()
+            with suppress(asyncio.CancelledError):
+                await renewer
+            await self.release(scope.key, lease_id)
+
+    async def _keep_renewing(self, scope_key: str, lease_id: str, ttl: float) -> None:
+        while True:
+            await asyncio.sleep(ttl / 3)
+            try:
+                await self.renew(scope_key, lease_id, ttl=ttl)
+            except Exception as e:
+                logger.warning("Failed to renew provider slot", key=scope_key, error=str(e))
+
+
+_limits: dict[str, ProviderLimit] = {}
+_limiter: ProviderLimiter | None = None
+
+
+def configure_provider_limits(limits: Mapping[str, ProviderLimit]) -> None:
+    """Set the provider limits (called by the generators loader)."""
+    global _limiter
+    _limits.clear()
+    _limits.update(limits)
+    _limiter = None
+
+
+def get_provider_limiter() -> ProviderLimiter:
+    """Get the process-wide limiter for the configured provider limits."""
+    global _limiter
+    if _limiter is None:
+        _limiter = ProviderLimiter(get_redis_client(), _limits)
+    return _limiter
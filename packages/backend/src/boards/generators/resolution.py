@@ -6,6 +6,8 @@ import base64
 import os
 import tempfile
 import uuid
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 import aiofiles
@@ -21,6 +23,9 @@ from .artifacts import (
     VideoArtifact,
 )
 
+if TYPE_CHECKING:
+    from ..workers.workspace import JobWorkspace
+
 logger = get_logger(__name__)
 
 
@@ -75,6 +80,7 @@ def _rewrite_storage_url(storage_url: str) -> str:
 
 async def resolve_artifact(
     artifact: AudioArtifact | VideoArtifact | ImageArtifact | LoRArtifact,
+    workspace: "JobWorkspace | None" = None,
 ) -> str:
     """
     Resolve an artifact to a local file path that can be used by provider SDKs.
@@ -84,6 +90,8 @@ async def resolve_artifact(
 
     Args:
         artifact: Artifact instance to resolve
+        workspace: Job scratch workspace to download into (cleaned up with the job);
+            without one the file goes to the system temp directory
 
     Returns:
         str: Local file path to the artifact content
@@ -105,7 +113,7 @@ async def resolve_artifact(
     # Check if it's a valid URL with a scheme (http, https, s3, etc.)
     if parsed.scheme in ("http", "https", "s3", "gs"):
         # It's a remote URL, download it
-        return await download_artifact_to_temp(artifact)
+        return await download_artifact_to_temp(artifact, workspace=workspace)
 
     # If no scheme, it might be a local file path
     # Only allow this if the file actually exists (for backward compatibility)
@@ -117,30 +125,43 @@ async def resolve_artifact(
         return artifact.storage_url
 
     # Download the file to a temporary location
-    return await download_artifact_to_temp(artifact)
+    return await download_artifact_to_temp(artifact, workspace=workspace)
 
 
 async def download_artifact_to_temp(
     artifact: AudioArtifact | VideoArtifact | ImageArtifact | LoRArtifact,
+    workspace: "JobWorkspace | None" = None,
 ) -> str:
     """
     Download an artifact from its storage URL to a temporary file.
 
     Args:
         artifact: Artifact to download
+        workspace: Job scratch workspace to download into. Downloads wait while
+            the worker's scratch quota is used up, and the bytes are counted
+            against it. Without a workspace a file in the system temp directory
+            is created, which the caller must delete.
 
     Returns:
         str: Path to the temporary file containing the artifact content
 
     Raises:
         httpx.HTTPError: If downloading fails
+        ScratchQuotaExceeded: If scratch space does not free up in time
     """
     # Determine file extension based on artifact type and format
     extension = _get_file_extension(artifact)
 
-    # Create temporary file with appropriate extension (use random prefix for security)
-    random_id = uuid.uuid4().hex[:8]
-    temp_fd, temp_path = tempfile.mkstemp(suffix=extension, prefix=f"boards_artifact_{random_id}_")
+    if workspace is not None:
+        await workspace.wait_for_capacity()
+        temp_path = str(workspace.new_file(suffix=extension, prefix="boards_artifact_"))
+        temp_fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    else:
+        # Create temporary file with appropriate extension (use random prefix for security)
+        random_id = uuid.uuid4().hex[:8]
+        temp_fd, temp_path = tempfile.mkstemp(
+            suffix=extension, prefix=f"boards_artifact_{random_id}_"
+        )
 
     # Set restrictive file permissions (owner read/write only: 0o600)
     os.chmod(temp_path, 0o600)
@@ -168,6 +189,8 @@ async def download_artifact_to_temp(
                     async for chunk in response.aiter_bytes(chunk_size=8192):
                         await temp_file.write(chunk)
                         total_bytes += len(chunk)
+                        if workspace is not None:
+                            workspace.add_bytes(len(chunk))
 
                 # Validate that we downloaded something
                 if total_bytes == 0:
@@ -273,8 +296,8 @@ async def download_from_url(url: str) -> bytes:
 
     Supports both HTTP(S) URLs and data URLs (data:mime/type;base64,...)
 
-    Note: For very large files, consider using streaming downloads directly to storage
-    instead of loading into memory.
+    Note: This loads the whole file into memory. Use stream_from_url() to pipe
+    large outputs directly into storage instead.
 
     Args:
         url: URL to download from (HTTP(S) or data URL)
@@ -316,6 +339,66 @@ async def download_from_url(url: str) -> bytes:
             return b"".join(chunks)
 
 
+async def stream_from_url(url: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """
+    Stream content from a URL (typically a provider's temporary URL) chunk by chunk.
+
+    This is the streaming counterpart of download_from_url(): the HTTP response is
+    consumed lazily as the caller iterates, so generated outputs can be piped
+    straight into StorageManager.store_artifact() without holding the whole file
+    in memory.
+
+    Supports both HTTP(S) URLs and data URLs (data:mime/type;base64,...). Data URLs
+    are already in memory, so they are decoded and yielded as a single chunk.
+
+    Args:
+        url: URL to stream from (HTTP(S) or data URL)
+        chunk_size: Size of the chunks read from the HTTP response
+
+    Yields:
+        bytes: Chunks of the downloaded content
+
+    Raises:
+        httpx.HTTPError: If download fails
+        ValueError: If downloaded content is empty or data URL is malformed
+    """
+    logger.debug("Streaming content from URL", url=url[:50])
+
+    if url.startswith("data:"):
+        yield _decode_data_url(url)
+        return
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+
+            total_bytes = 0
+            async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                total_bytes += len(chunk)
+                yield chunk
+
+            if total_bytes == 0:
+                raise ValueError(f"Downloaded file from {url} is empty")
+
+            logger.info(
+                "Successfully streamed content",
+                url=url,
+                size_bytes=total_bytes,
+            )
+
+
+def _result_content(url: str) -> bytes | AsyncIterator[bytes]:
+    """
+    Get provider output content in the form best suited for storage.
+
+    Data URLs are already in memory, so they are decoded eagerly (which also keeps
+    upload retries and size-based routing available). Remote URLs are streamed.
+    """
+    if url.startswith("data:"):
+        return _decode_data_url(url)
+    return stream_from_url(url)
+
+
 def _get_content_type_from_format(artifact_type: str, format: str) -> str:
     """
     Get MIME content type from artifact type and format.
@@ -391,16 +474,13 @@ async def store_image_result(
         format=format,
     )
 
-    # Download content from provider URL
-    content = await download_from_url(storage_url)
-
     # Determine content type
     content_type = _get_content_type_from_format("image", format)
 
-    # Upload to storage system
+    # Stream content from the provider URL straight into storage
     artifact_ref = await storage_manager.store_artifact(
         artifact_id=generation_id,
-        content=content,
+        content=_result_content(storage_url),
         artifact_type="image",
         content_type=content_type,
         tenant_id=tenant_id,
@@ -411,6 +491,7 @@ async def store_image_result(
         "Image stored successfully",
         generation_id=generation_id,
         storage_key=artifact_ref.storage_key,
+        size_bytes=artifact_ref.size,
         storage_url=artifact_ref.storage_url[:50],
     )
 
@@ -465,16 +546,13 @@ async def store_video_result(
         format=format,
     )
 
-    # Download content from provider URL
-    content = await download_from_url(storage_url)
-
     # Determine content type
     content_type = _get_content_type_from_format("video", format)
 
-    # Upload to storage system
+    # Stream content from the provider URL straight into storage
     artifact_ref = await storage_manager.store_artifact(
         artifact_id=generation_id,
-        content=content,
+        content=_result_content(storage_url),
         artifact_type="video",
         content_type=content_type,
         tenant_id=tenant_id,
@@ -485,6 +563,7 @@ async def store_video_result(
         "Video stored successfully",
         generation_id=generation_id,
         storage_key=artifact_ref.storage_key,
+        size_bytes=artifact_ref.size,
         storage_url=artifact_ref.storage_url[:50],
     )
 
@@ -539,16 +618,13 @@ async def store_audio_result(
         format=format,
     )
 
-    # Download content from provider URL
-    content = await download_from_url(storage_url)
-
     # Determine content type
     content_type = _get_content_type_from_format("audio", format)
 
-    # Upload to storage system
+    # Stream content from the provider URL straight into storage
     artifact_ref = await storage_manager.store_artifact(
         artifact_id=generation_id,
-        content=content,
+        content=_result_content(storage_url),
         artifact_type="audio",
         content_type=content_type,
         tenant_id=tenant_id,
@@ -559,6 +635,7 @@ async def store_audio_result(
         "Audio stored successfully",
         generation_id=generation_id,
         storage_key=artifact_ref.storage_key,
+        size_bytes=artifact_ref.size,
         storage_url=artifact_ref.storage_url[:50],
     )
 
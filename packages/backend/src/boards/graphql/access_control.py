@@ -2,17 +2,22 @@
 Shared access control logic for GraphQL resolvers
 """
 
+from collections.abc import Iterable
 from enum import Enum
 from typing import TYPE_CHECKING
+from uuid import UUID
 
 import strawberry
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from ..auth.middleware import get_auth_context_optional
+from ..dbmodels import Boards
 from ..logging import get_logger
 
 if TYPE_CHECKING:
     from ..auth.context import AuthContext
-    from ..dbmodels import Boards
 
 logger = get_logger(__name__)
 
@@ -111,6 +116,47 @@ def is_board_owner_or_member(board: "Boards", auth_context: "AuthContext | None"
     return any(member.user_id == auth_context.user_id for member in board.board_members)
 
 
+class BoardNotFoundError(RuntimeError):
+    """A board to create generations on does not exist."""
+
+
+class BoardPermissionError(RuntimeError):
+    """The user may not create generations on a board."""
+
+
+def can_create_generations(board: "Boards", user_id: UUID) -> bool:
+    """Check if the user is the board's owner or one of its editors."""
+    if board.owner_id == user_id:
+        return True
+    return any(
+        member.user_id == user_id and member.role in {"editor", "admin"}
+        for member in board.board_members
+    )
+
+
+async def check_can_create_generations(
+    session: AsyncSession, board_ids: Iterable[UUID], user_id: UUID
+) -> None:
+    """
+    Check with one query that the user can create generations on all the boards.
+
+    Raises:
+        BoardNotFoundError: If a board does not exist
+        BoardPermissionError: If the user is not owner or editor of a board
+    """
+    board_ids = set(board_ids)
+    board_stmt = (
+        select(Boards).where(Boards.id.in_(board_ids)).options(selectinload(Boards.board_members))
+    )
+    boards = (await session.execute(board_stmt)).scalars().all()
+    if len(boards) != len(board_ids):
+        raise BoardNotFoundError("Board not found")
+    if not all(can_create_generations(board, user_id) for board in boards):
+        raise BoardPermissionError(
+            "Permission denied: only board owner or editor can create generations"
+        )
+
+
 def ensure_preloaded(obj, attr_name: str, error_msg: str | None = None) -> None:
     """
     Ensure that a relationship attribute has been preloaded.
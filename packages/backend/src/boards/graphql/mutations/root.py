@@ -57,6 +57,27 @@ class CreateGenerationInput:
     input_params: strawberry.scalars.JSON  # type: ignore[reportInvalidTypeForm]
 
 
+@strawberry.input
+class PipelineStepInput:
+    """One step of a generation pipeline.
+
+    An artifact field of input_params can take ``{"$step": "<step id>"}`` to use
+    the output of another step of the pipeline.
+    """
+
+    id: str
+    generator_name: str
+    input_params: strawberry.scalars.JSON  # type: ignore[reportInvalidTypeForm]
+
+
+@strawberry.input
+class CreatePipelineInput:
+    """Input for creating a pipeline of generations on a board."""
+
+    board_id: UUID
+    steps: list[PipelineStepInput]
+
+
 @strawberry.input
 class CreateTagInput:
     """Input for creating a new tag."""
@@ -139,6 +160,24 @@ class Mutation:
 
         return await create_generation(info, input)
 
+    @strawberry.mutation(name="createGenerations")
+    async def create_generations(
+        self, info: strawberry.Info, inputs: list[CreateGenerationInput]
+    ) -> list[Generation]:
+        """Create many generations at once (start a batch of jobs)."""
+        from ..resolvers.generation import create_generations
+
+        return await create_generations(info, inputs)
+
+    @strawberry.mutation(name="createPipeline")
+    async def create_pipeline(
+        self, info: strawberry.Info, input: CreatePipelineInput
+    ) -> list[Generation]:
+        """Create the generations of a pipeline; each step starts when its inputs are ready."""
+        from ..resolvers.generation import create_pipeline
+
+        return await create_pipeline(info, input)
+
     @strawberry.mutation(name="cancelGeneration")
     async def cancel_generation(self, info: strawberry.Info, id: UUID) -> Generation:
         """Cancel a pending or processing generation."""
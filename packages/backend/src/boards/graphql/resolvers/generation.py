@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import strawberry
 from sqlalchemy import or_, select
 from sqlalchemy.orm import selectinload
 
+from ...config import settings
 from ...database.connection import get_async_session
 from ...dbmodels import BoardMembers, Boards, Generations
 from ...generators.registry import registry as generator_registry
 from ...jobs import repository as jobs_repo
+from ...jobs.cancellation import request_cancellation
+from ...jobs.pipelines import PipelineStep, plan_pipeline
 from ...logging import get_logger
-from ...workers.actors import process_generation
-from ..access_control import can_access_board, get_auth_context_from_info
+from ...redis_pool import get_redis_client
+from ...workers.actors import (
+    GenerationJob,
+    cancel_external_job,
+    enqueue_generation,
+    enqueue_generations,
+)
+from ..access_control import (
+    can_access_board,
+    check_can_create_generations,
+    get_auth_context_from_info,
+)
 
 if TYPE_CHECKING:
-    from ..mutations.root import CreateGenerationInput
+    from ..mutations.root import CreateGenerationInput, CreatePipelineInput
     from ..types.board import Board
     from ..types.generation import ArtifactType, Generation, GenerationStatus
     from ..types.user import User
@@ -65,31 +78,7 @@ async def resolve_generation_by_id(info: strawberry.Info, id: UUID) -> Generatio
             )
             return None
 
-        # Convert to GraphQL type
-        from ..types.generation import ArtifactType, GenerationStatus
-        from ..types.generation import Generation as GenerationType
-
-        return GenerationType(
-            id=gen.id,
-            tenant_id=gen.tenant_id,
-            board_id=gen.board_id,
-            user_id=gen.user_id,
-            generator_name=gen.generator_name,
-            artifact_type=ArtifactType(gen.artifact_type),
-            storage_url=gen.storage_url,
-            thumbnail_url=gen.thumbnail_url,
-            additional_files=gen.additional_files or [],
-            input_params=gen.input_params or {},
-            output_metadata=gen.output_metadata or {},
-            external_job_id=gen.external_job_id,
-            status=GenerationStatus(gen.status),
-            progress=float(gen.progress or 0.0),
-            error_message=gen.error_message,
-            started_at=gen.started_at,
-            completed_at=gen.completed_at,
-            created_at=gen.created_at,
-            updated_at=gen.updated_at,
-        )
+        return _to_generation_type(gen)
 
 
 async def resolve_recent_generations(
@@ -291,28 +280,7 @@ async def create_generation(info: strawberry.Info, input: CreateGenerationInput)
 
     async with get_async_session() as session:
         # Check board access - require editor or owner role
-        board_stmt = (
-            select(Boards)
-            .where(Boards.id == input.board_id)
-            .options(selectinload(Boards.board_members))
-        )
-        board_result = await session.execute(board_stmt)
-        board = board_result.scalar_one_or_none()
-
-        if not board:
-            raise RuntimeError("Board not found")
-
-        # Check if user is owner or editor
-        is_owner = board.owner_id == auth_context.user_id
-        is_editor = any(
-            member.user_id == auth_context.user_id and member.role in {"editor", "admin"}
-            for member in board.board_members
-        )
-
-        if not is_owner and not is_editor:
-            raise RuntimeError(
-                "Permission denied: only board owner or editor can create generations"
-            )
+        await check_can_create_generations(session, {input.board_id}, auth_context.user_id)
 
         # Validate generator exists
         generator = generator_registry.get(input.generator_name)
@@ -344,7 +312,7 @@ async def create_generation(info: strawberry.Info, input: CreateGenerationInput)
         )
 
         # Enqueue job for processing
-        message = process_generation.send(str(gen.id))
+        message = await enqueue_generation(str(gen.id), input.generator_name, gen.tenant_id)
         logger.info(
             "Generation job enqueued",
             generation_id=str(gen.id),
@@ -352,32 +320,162 @@ async def create_generation(info: strawberry.Info, input: CreateGenerationInput)
             queue_name=message.queue_name,
         )
 
-        # Convert to GraphQL type
-        from ..types.generation import ArtifactType, GenerationStatus
-        from ..types.generation import Generation as GenerationType
+        return _to_generation_type(gen)
 
-        return GenerationType(
-            id=gen.id,
-            tenant_id=gen.tenant_id,
-            board_id=gen.board_id,
-            user_id=gen.user_id,
-            generator_name=gen.generator_name,
-            artifact_type=ArtifactType(gen.artifact_type),
-            storage_url=gen.storage_url,
-            thumbnail_url=gen.thumbnail_url,
-            additional_files=gen.additional_files or [],
-            input_params=gen.input_params or {},
-            output_metadata=gen.output_metadata or {},
-            external_job_id=gen.external_job_id,
-            status=GenerationStatus(gen.status),
-            progress=float(gen.progress or 0.0),
-            error_message=gen.error_message,
-            started_at=gen.started_at,
-            completed_at=gen.completed_at,
-            created_at=gen.created_at,
-            updated_at=gen.updated_at,
+
+async def create_generations(
+    info: strawberry.Info, inputs: list[CreateGenerationInput]
+) -> list[Generation]:
+    """
+    Create many generations at once (a prompt grid, one outfit on many models).
+
+    Each board's permissions are checked once, all generations are inserted
+    with one statement and their jobs are enqueued with one Redis round trip.
+    Requires editor or owner role on every target board. Nothing is created if
+    any input is invalid.
+    """
+    auth_context = await get_auth_context_from_info(info)
+    if not auth_context or not auth_context.is_authenticated or not auth_context.user_id:
+        raise RuntimeError("Authentication required to create generations")
+    if not inputs:
+        return []
+    if len(inputs) > settings.generation_batch_max_size:
+        raise RuntimeError(
+            f"Too many generations: {len(inputs)} (at most "
+            f"{settings.generation_batch_max_size} per request)"
         )
 
+    unknown = sorted(
+        {input.generator_name for input in inputs if input.generator_name not in generator_registry}
+    )
+    if unknown:
+        raise RuntimeError(f"Unknown generator: {', '.join(unknown)}")
+
+    async with get_async_session() as session:
+        board_ids = {input.board_id for input in inputs}
+        await check_can_create_generations(session, board_ids, auth_context.user_id)
+
+        gens = await jobs_repo.create_generations(
+            session,
+            tenant_id=auth_context.tenant_id,
+            user_id=auth_context.user_id,
+            generations=[
+                {
+                    "board_id": input.board_id,
+                    "generator_name": input.generator_name,
+                    "artifact_type": input.artifact_type.value,
+                    "input_params": input.input_params,
+                }
+                for input in inputs
+            ],
+        )
+        # Read the rows before commit expires them
+        jobs = [GenerationJob(str(gen.id), gen.generator_name, gen.tenant_id) for gen in gens]
+        created = [_to_generation_type(gen) for gen in gens]
+        await session.commit()
+
+    messages = await enqueue_generations(jobs)
+    logger.info(
+        "Generations created and enqueued",
+        count=len(created),
+        board_ids=sorted(str(board_id) for board_id in board_ids),
+        user_id=str(auth_context.user_id),
+        queue_names=sorted({message.queue_name for message in messages}),
+    )
+    return created
+
+
+async def create_pipeline(info: strawberry.Info, input: CreatePipelineInput) -> list[Generation]:
+    """
+    Create the generations of a pipeline (see jobs/pipelines.py).
+
+    All steps are inserted with one statement. Steps without upstream steps are
+    enqueued now; workers enqueue each other step once its upstream steps have
+    completed. Requires editor or owner role on the board.
+    """
+    auth_context = await get_auth_context_from_info(info)
+    if not auth_context or not auth_context.is_authenticated or not auth_context.user_id:
+        raise RuntimeError("Authentication required to create a pipeline")
+    if len(input.steps) > settings.generation_batch_max_size:
+        raise RuntimeError(
+            f"Too many pipeline steps: {len(input.steps)} (at most "
+            f"{settings.generation_batch_max_size} per request)"
+        )
+
+    try:
+        planned = plan_pipeline(
+            [PipelineStep(step.id, step.generator_name, step.input_params) for step in input.steps],
+            generator_registry.get,
+        )
+    except ValueError as e:
+        raise RuntimeError(str(e)) from e
+    pipeline_id = str(uuid4())
+
+    async with get_async_session() as session:
+        await check_can_create_generations(session, {input.board_id}, auth_context.user_id)
+
+        gens = await jobs_repo.create_generations(
+            session,
+            tenant_id=auth_context.tenant_id,
+            user_id=auth_context.user_id,
+            generations=[
+                {
+                    "id": step.generation_id,
+                    "board_id": input.board_id,
+                    "generator_name": step.generator_name,
+                    "artifact_type": step.artifact_type,
+                    "input_params": step.input_params,
+                    "pipeline": step.pipeline_record(pipeline_id),
+                }
+                for step in planned
+            ],
+        )
+        created = [_to_generation_type(gen) for gen in gens]
+        await session.commit()
+
+    roots = [
+        GenerationJob(str(step.generation_id), step.generator_name, auth_context.tenant_id)
+        for step in planned
+        if not step.waiting_on
+    ]
+    await enqueue_generations(roots)
+    logger.info(
+        "Pipeline created",
+        pipeline_id=pipeline_id,
+        board_id=str(input.board_id),
+        step_count=len(created),
+        started_count=len(roots),
+        user_id=str(auth_context.user_id),
+    )
+    return created
+
+
+def _to_generation_type(gen: Generations) -> Generation:
+    from ..types.generation import ArtifactType, GenerationStatus
+    from ..types.generation import Generation as GenerationType
+
+    return GenerationType(
+        id=gen.id,
+        tenant_id=gen.tenant_id,
+        board_id=gen.board_id,
+        user_id=gen.user_id,
+        generator_name=gen.generator_name,
+        artifact_type=ArtifactType(gen.artifact_type),
+        storage_url=gen.storage_url,
+        thumbnail_url=gen.thumbnail_url,
+        additional_files=gen.additional_files or [],
+        input_params=gen.input_params or {},
+        output_metadata=gen.output_metadata or {},
+        external_job_id=gen.external_job_id,
+        status=GenerationStatus(gen.status),
+        progress=float(gen.progress or 0.0),
+        error_message=gen.error_message,
+        started_at=gen.started_at,
+        completed_at=gen.completed_at,
+        created_at=gen.created_at,
+        updated_at=gen.updated_at,
+    )
+
 
 async def cancel_generation(info: strawberry.Info, id: UUID) -> Generation:
     """
@@ -431,6 +529,11 @@ async def cancel_generation(info: strawberry.Info, id: UUID) -> Generation:
                 "Only pending or processing generations can be cancelled."
             )
 
+        # Suspended generations wait on their provider without a worker. The
+        # cancelled status clears the continuation, so read its provider slot first
+        suspended = gen.continuation is not None
+        rate_limit_scope = (gen.continuation or {}).get("rate_limit_scope")
+
         # Update status to cancelled
         await jobs_repo.update_progress(
             session,
@@ -439,42 +542,34 @@ async def cancel_generation(info: strawberry.Info, id: UUID) -> Generation:
             progress=float(gen.progress or 0.0),
             error_message="Cancelled by user",
         )
+        # Steps of a pipeline take the steps downstream of them along
+        if gen.pipeline is not None:
+            await jobs_repo.fail_pipeline_dependents(
+                session,
+                id,
+                status="cancelled",
+                error_message=f"Upstream pipeline step {id} was cancelled",
+            )
         await session.commit()
 
         # Refresh to get updated data
         await session.refresh(gen)
 
+        # Stop the worker running the job, and the provider job it submitted
+        try:
+            await request_cancellation(get_redis_client(), str(id), ttl=settings.job_timeout)
+        except Exception as e:
+            logger.warning("Failed to signal cancellation", generation_id=str(id), error=str(e))
+        if suspended:
+            cancel_external_job.send(str(id), rate_limit_scope)
+
         logger.info(
             "Generation cancelled",
             generation_id=str(id),
             user_id=str(auth_context.user_id),
         )
 
-        # Convert to GraphQL type
-        from ..types.generation import ArtifactType, GenerationStatus
-        from ..types.generation import Generation as GenerationType
-
-        return GenerationType(
-            id=gen.id,
-            tenant_id=gen.tenant_id,
-            board_id=gen.board_id,
-            user_id=gen.user_id,
-            generator_name=gen.generator_name,
-            artifact_type=ArtifactType(gen.artifact_type),
-            storage_url=gen.storage_url,
-            thumbnail_url=gen.thumbnail_url,
-            additional_files=gen.additional_files or [],
-            input_params=gen.input_params or {},
-            output_metadata=gen.output_metadata or {},
-            external_job_id=gen.external_job_id,
-            status=GenerationStatus(gen.status),
-            progress=float(gen.progress or 0.0),
-            error_message=gen.error_message,
-            started_at=gen.started_at,
-            completed_at=gen.completed_at,
-            created_at=gen.created_at,
-            updated_at=gen.updated_at,
-        )
+        return _to_generation_type(gen)
 
 
 async def delete_generation(info: strawberry.Info, id: UUID) -> bool:
@@ -625,8 +720,14 @@ async def regenerate(info: strawberry.Info, id: UUID) -> Generation:
         )
 
         # Enqueue job for processing
-        process_generation.send(str(new_gen.id))
-        logger.info("Regeneration job enqueued", generation_id=str(new_gen.id))
+        message = await enqueue_generation(
+            str(new_gen.id), original.generator_name, new_gen.tenant_id
+        )
+        logger.info(
+            "Regeneration job enqueued",
+            generation_id=str(new_gen.id),
+            queue_name=message.queue_name,
+        )
 
         # Convert to GraphQL type
         from ..types.generation import ArtifactType, GenerationStatus
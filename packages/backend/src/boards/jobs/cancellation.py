@@ -0,0 +1,151 @@
+"""Cancellation channel between the API and the workers running a job.
+
+Cancelling a generation sets a short-lived Redis key and publishes on the
+job's cancel channel. Each worker process keeps one pattern subscription to
+all cancel channels and cancels the asyncio task running the job as soon as
+the message arrives. The key covers jobs a worker only picks up after the
+message was published.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import redis.asyncio as redis
+
+from ..config import Settings
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+CANCEL_CHANNEL_PATTERN = "job:*:cancel"
+
+
+def cancel_channel(job_id: str) -> str:
+    return f"job:{job_id}:cancel"
+
+
+def cancelled_key(job_id: str) -> str:
+    return f"job:{job_id}:cancelled"
+
+
+async def request_cancellation(redis_client: redis.Redis, job_id: str, ttl: int) -> None:
+    """Tell the worker running a job, or the one that will pick it up, to stop."""
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.set(cancelled_key(job_id), "1", ex=ttl)
+    pipe.publish(cancel_channel(job_id), "cancel")
+    await pipe.execute()
+
+
+class WatchedJob:
+    """Async context manager that cancels a job's task when the job is cancelled."""
+
+    def __init__(self, watcher: CancellationWatcher, job_id: str, task: asyncio.Task) -> None:
+        self.watcher = watcher
+        self.job_id = job_id
+        self.task = task
+        # Set when the task was cancelled because the job was, as opposed to
+        # e.g. the worker shutting down
+        self.requested = False
+
+    def cancel(self) -> None:
+        self.requested = True
+        self.task.cancel()
+
+    async def __aenter__(self) -> WatchedJob:
+        self.watcher._add(self)
+        try:
+            if await self.watcher._redis.exists(cancelled_key(self.job_id)):
+                self.cancel()
+        except Exception as e:
+            # Cancellation is best effort; never fail the job because Redis is unavailable
+            logger.warning("Failed to check job cancellation", job_id=self.job_id, error=str(e))
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.watcher._remove(self)
+
+
+class CancellationWatcher:
+    """Single pattern subscription that cancels the tasks of cancelled jobs."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        self.settings = settings or Settings()
+        # Dedicated client so the listener never borrows from the shared pool
+        self._redis = redis_client or redis.Redis.from_url(
+            self.settings.redis_url, decode_responses=True
+        )
+        self._watched: dict[str, set[WatchedJob]] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    def watch(self, job_id: str, task: asyncio.Task) -> WatchedJob:
+        """Cancel ``task`` if the job is cancelled while the returned context is entered."""
+        return WatchedJob(self, job_id, task)
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel every watched task of the job."""
+        watched = self._watched.get(job_id)
+        if not watched:
+            return
+        logger.info("Cancelling job", job_id=job_id)
+        for job in watched:
+            job.cancel()
+
+    def _add(self, job: WatchedJob) -> None:
+        self._ensure_listening()
+        self._watched.setdefault(job.job_id, set()).add(job)
+
+    def _remove(self, job: WatchedJob) -> None:
+        watched = self._watched.get(job.job_id)
+        if watched is not None:
+            watched.discard(job)
+            if not watched:
+                del self._watched[job.job_id]
+
+    async def close(self) -> None:
+        """Stop the listener and release the Redis connection."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.close()
+
+    def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._listener
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(CANCEL_CHANNEL_PATTERN)
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.cancel(message["channel"].split(":")[1])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Cancellation watcher connection lost, reconnecting", error=str(e))
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.close()
+
+
+_watcher: CancellationWatcher | None = None
+
+
+def get_cancellation_watcher() -> CancellationWatcher:
+    """Get the process-wide cancellation watcher."""
+    global _watcher
+    if _watcher is None:
+        _watcher = CancellationWatcher()
+    return _watcher
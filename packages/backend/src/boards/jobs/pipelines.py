@@ -0,0 +1,173 @@
+"""Server-side generation pipelines.
+
+A pipeline is a DAG of generator steps submitted in one request, e.g. generate
+a person, try a garment on them, upscale the result and animate it. An
+artifact field of a step refers to the output of an earlier step with
+``{"$step": "<step id>"}`` in place of a generation ID:
+
+    [
+        {"id": "person", "generator_name": "fal-flux-2", "input_params": {"prompt": "..."}},
+        {
+            "id": "try-on",
+            "generator_name": "fal-kolors-virtual-try-on",
+            "input_params": {
+                "human_image_url": {"$step": "person"},
+                "garment_image_url": "<generation ID>",
+            },
+        },
+    ]
+
+All steps are created up front with their generation IDs, so references are
+replaced by the upstream generation's ID and each step's input lineage is
+recorded by the usual artifact resolution. A step's pipeline record lists the
+generations it still waits on. Steps without upstream steps are enqueued at
+once; each other step is enqueued by the worker that completes its last
+upstream step (see workers/actors.py). When a step fails or is cancelled,
+everything downstream of it is failed or cancelled too.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID, uuid4
+
+from ..generators.artifact_resolution import _get_artifact_type_name, extract_artifact_fields
+from ..generators.base import BaseGenerator
+
+STEP_REFERENCE_KEY = "$step"
+
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """One generator run of a pipeline, as submitted."""
+
+    id: str
+    generator_name: str
+    input_params: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class PlannedStep:
+    """A step with its generation ID and references replaced by upstream generation IDs."""
+
+    step_id: str
+    generation_id: UUID
+    generator_name: str
+    artifact_type: str
+    input_params: dict[str, Any]
+    waiting_on: list[str]  # Generation IDs of the upstream steps
+
+    def pipeline_record(self, pipeline_id: str) -> dict[str, Any]:
+        return {"pipeline_id": pipeline_id, "step": self.step_id, "waiting_on": self.waiting_on}
+
+
+def _step_reference(value: Any) -> str | None:
+    if isinstance(value, Mapping) and set(value) == {STEP_REFERENCE_KEY}:
+        return str(value[STEP_REFERENCE_KEY])
+    return None
+
+
+def plan_pipeline(
+    steps: Sequence[PipelineStep],
+    get_generator: Callable[[str], BaseGenerator | None],
+) -> list[PlannedStep]:
+    """Validate a pipeline and assign its steps' generation IDs.
+
+    Args:
+        steps: The pipeline's steps, in any order
+        get_generator: Looks up a generator by name (e.g. ``registry.get``)
+
+    Returns:
+        The planned steps, upstream steps before the steps that use them
+
+    Raises:
+        ValueError: If a step ID repeats, a generator is unknown, input_params
+            is not an object, a reference
+            names an unknown step, is not in an artifact field or has the wrong
+            artifact type, or the steps form a cycle
+    """
+    if not steps:
+        raise ValueError("A pipeline needs at least one step")
+    by_id: dict[str, PipelineStep] = {}
+    generators: dict[str, BaseGenerator] = {}
+    for step in steps:
+        if step.id in by_id:
+            raise ValueError(f"Duplicate pipeline step: {step.id}")
+        if not isinstance(step.input_params, Mapping):
+            raise ValueError(f"Step {step.id}: input_params must be an object")
+        generator = get_generator(step.generator_name)
+        if generator is None:
+            raise ValueError(f"Unknown generator: {step.generator_name}")
+        by_id[step.id] = step
+        generators[step.id] = generator
+
+    # Upstream step IDs of each step, checked against the artifact fields they fill
+    upstream: dict[str, list[str]] = {}
+    for step in steps:
+        artifact_fields = extract_artifact_fields(generators[step.id].get_input_schema())
+        parents: list[str] = []
+        for field_name, value in step.input_params.items():
+            values = value if isinstance(value, list) else [value]
+            references = [ref for ref in map(_step_reference, values) if ref is not None]
+            if not references:
+                continue
+            if field_name not in artifact_fields:
+                raise ValueError(
+                    f"Step {step.id}: {field_name} is not an artifact field and cannot "
+                    "refer to another step"
+                )
+            expected_type = _get_artifact_type_name(artifact_fields[field_name][0])
+            for reference in references:
+                if reference not in by_id:
+                    raise ValueError(f"Step {step.id} refers to unknown step {reference}")
+                produced_type = generators[reference].artifact_type
+                if produced_type != expected_type:
+                    raise ValueError(
+                        f"Step {step.id}: {field_name} needs a {expected_type}, but step "
+                        f"{reference} produces a {produced_type}"
+                    )
+                if reference not in parents:
+                    parents.append(reference)
+        upstream[step.id] = parents
+
+    order = _topological_order([step.id for step in steps], upstream)
+    generation_ids = {step_id: uuid4() for step_id in order}
+
+    def resolve(value: Any) -> Any:
+        reference = _step_reference(value)
+        if reference is not None:
+            return str(generation_ids[reference])
+        if isinstance(value, list):
+            return [resolve(item) for item in value]
+        return value
+
+    return [
+        PlannedStep(
+            step_id=step_id,
+            generation_id=generation_ids[step_id],
+            generator_name=by_id[step_id].generator_name,
+            artifact_type=generators[step_id].artifact_type,
+            input_params={
+                field_name: resolve(value)
+                for field_name, value in by_id[step_id].input_params.items()
+            },
+            waiting_on=[str(generation_ids[parent]) for parent in upstream[step_id]],
+        )
+        for step_id in order
+    ]
+
+
+def _topological_order(step_ids: list[str], upstream: Mapping[str, list[str]]) -> list[str]:
+    order: list[str] = []
+    done: set[str] = set()
+    remaining = list(step_ids)
+    while remaining:
+        ready = [step_id for step_id in remaining if all(p in done for p in upstream[step_id])]
+        if not ready:
+            raise ValueError(f"Pipeline steps form a cycle: {', '.join(sorted(remaining))}")
+        order.extend(ready)
+        done.update(ready)
+        remaining = [step_id for step_id in remaining if step_id not in done]
+    return order
@@ -2,16 +2,39 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import (
+    BigInteger,
+    Numeric,
+    Row,
+    String,
+    Text,
+    Uuid,
+    and_,
+    cast,
+    column,
+    func,
+    insert,
+    literal_column,
+    null,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, array
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from ..dbmodels import Generations
 
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
 
 async def get_generation(session: AsyncSession, generation_id: str | UUID) -> Generations:
     stmt = select(Generations).where(Generations.id == str(generation_id))
@@ -20,6 +43,97 @@ async def get_generation(session: AsyncSession, generation_id: str | UUID) -> Ge
     return row
 
 
+# What a worker needs to run a generation; the rest of the row is never read
+_JOB_COLUMNS = (
+    Generations.id,
+    Generations.tenant_id,
+    Generations.board_id,
+    Generations.user_id,
+    Generations.generator_name,
+    Generations.artifact_type,
+    Generations.input_params,
+    Generations.external_job_id,
+    Generations.pipeline,
+    Generations.status,
+)
+
+# Statuses a worker may (re)start a generation from
+RUNNABLE_STATUSES = ("pending", "processing")
+
+
+async def load_job(session: AsyncSession, generation_id: str | UUID) -> Row[Any]:
+    """Load the columns a worker needs to run a generation.
+
+    Raises:
+        NoResultFound: If the generation does not exist
+    """
+    stmt = select(*_JOB_COLUMNS).where(Generations.id == str(generation_id))
+    res = await session.execute(stmt)
+    return res.one()
+
+
+async def start_job(
+    session: AsyncSession,
+    generation_id: str | UUID,
+    *,
+    input_artifacts: list[dict[str, Any]] | None = None,
+) -> bool:
+    """Mark a generation as processing, recording its input lineage in the same UPDATE.
+
+    A generation that was cancelled or has finished keeps its status.
+
+    Returns:
+        Whether the generation is now processing
+    """
+    now = datetime.now(UTC)
+    stmt = (
+        update(Generations)
+        .where(Generations.id == str(generation_id))
+        .where(Generations.status.in_(RUNNABLE_STATUSES))
+        .values(
+            status="processing",
+            progress=0.0,
+            error_message=None,
+            started_at=now,
+            completed_at=None,
+            updated_at=now,
+        )
+    )
+    if input_artifacts:
+        stmt = stmt.values(input_artifacts=input_artifacts)
+    res = await session.execute(stmt.returning(Generations.id))
+    return res.scalar_one_or_none() is not None
+
+
+async def get_generations_by_ids(
+    session: AsyncSession,
+    generation_ids: Sequence[UUID],
+    *columns: InstrumentedAttribute[Any],
+) -> dict[UUID, Row[Any]]:
+    """Fetch the given columns of many generations in a single query, keyed by id.
+
+    IDs that do not exist are simply missing from the result.
+    """
+    if not generation_ids:
+        return {}
+    stmt = select(Generations.id, *columns).where(Generations.id.in_(set(generation_ids)))
+    res = await session.execute(stmt)
+    return {row.id: row for row in res}
+
+
+async def get_generation_by_external_job_id(
+    session: AsyncSession, external_job_id: str
+) -> Row[Any] | None:
+    """Find the ``id`` and ``status`` of the generation running a provider job."""
+    stmt = (
+        select(Generations.id, Generations.status)
+        .where(Generations.external_job_id == external_job_id)
+        .limit(1)
+    )
+    res = await session.execute(stmt)
+    return res.first()
+
+
 async def update_progress(
     session: AsyncSession,
     generation_id: str | UUID,
@@ -27,18 +141,63 @@ async def update_progress(
     status: str,
     progress: float,
     error_message: str | None = None,
+    sequence: int | None = None,
 ) -> None:
     now = datetime.now(UTC)
     stmt = (
         update(Generations)
         .where(Generations.id == str(generation_id))
+        # A cancelled job stays cancelled, whatever its worker still reports
+        .where(Generations.status != "cancelled")
         .values(
             status=status,
             progress=progress,
+            progress_sequence=(sequence if sequence is not None else Generations.progress_sequence),
             error_message=error_message,
             updated_at=now,
             started_at=now if status == "processing" else Generations.started_at,
-            completed_at=(now if status in {"completed", "failed", "cancelled"} else None),
+            completed_at=(now if status in TERMINAL_STATUSES else None),
+            continuation=null() if status in TERMINAL_STATUSES else Generations.continuation,
+        )
+    )
+    await session.execute(stmt)
+
+
+async def update_progress_batch(
+    session: AsyncSession,
+    updates: Sequence[tuple[str | UUID, str, float, int]],
+) -> None:
+    """Apply coalesced non-terminal progress updates in a single UPDATE.
+
+    Each entry is ``(generation_id, status, progress, sequence)``. Rows that already
+    reached a terminal status are left untouched, so a late flush can never
+    overwrite a completed, failed or cancelled job.
+    """
+    if not updates:
+        return
+
+    now = datetime.now(UTC)
+    rows = values(
+        column("id", Uuid),
+        column("status", String),
+        column("progress", Numeric(5, 2)),
+        column("sequence", BigInteger),
+        name="progress_updates",
+    ).data(
+        [
+            (UUID(str(gen_id)), status, progress, sequence)
+            for gen_id, status, progress, sequence in updates
+        ]
+    )
+    stmt = (
+        update(Generations)
+        .where(Generations.id == rows.c.id)
+        .where(Generations.status.not_in(TERMINAL_STATUSES))
+        .values(
+            status=rows.c.status,
+            progress=rows.c.progress,
+            progress_sequence=rows.c.sequence,
+            updated_at=now,
         )
     )
     await session.execute(stmt)
@@ -68,6 +227,46 @@ async def create_generation(
     return gen
 
 
+async def create_generations(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    user_id: UUID,
+    generations: Sequence[Mapping[str, Any]],
+) -> list[Generations]:
+    """Create many pending generations with one multi-row INSERT ... RETURNING.
+
+    Args:
+        session: Database session
+        tenant_id: Tenant ID of all the generations
+        user_id: User submitting the generations
+        generations: board_id, generator_name, artifact_type and input_params of
+            each; optionally a preassigned id and a pipeline record
+
+    Returns:
+        The created generations, in the order given
+    """
+    if not generations:
+        return []
+    rows = [
+        {
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "board_id": generation["board_id"],
+            "generator_name": generation["generator_name"],
+            "artifact_type": generation["artifact_type"],
+            "input_params": generation["input_params"],
+            "status": "pending",
+            "progress": Decimal(0.0),
+            **{key: generation[key] for key in ("id", "pipeline") if key in generation},
+        }
+        for generation in generations
+    ]
+    stmt = insert(Generations).returning(Generations, sort_by_parameter_order=True)
+    res = await session.scalars(stmt, rows)
+    return list(res)
+
+
 async def set_external_job_id(
     session: AsyncSession, generation_id: str | UUID, external_job_id: str
 ) -> None:
@@ -91,12 +290,51 @@ async def finalize_success(
     stmt = (
         update(Generations)
         .where(Generations.id == str(generation_id))
+        .where(Generations.status != "cancelled")
         .values(
             status="completed",
             progress=100.0,
             storage_url=storage_url,
             thumbnail_url=thumbnail_url,
             output_metadata=output_metadata or {},
+            continuation=null(),
+            updated_at=now,
+            completed_at=now,
+        )
+    )
+    await session.execute(stmt)
+
+
+async def finalize_success_batch(
+    session: AsyncSession,
+    results: Sequence[tuple[str | UUID, str | None, dict[str, Any]]],
+) -> None:
+    """Complete many generations in a single UPDATE.
+
+    Each entry is ``(generation_id, storage_url, output_metadata)``, e.g. the
+    outputs of one multi-output job. Cancelled generations stay cancelled.
+    """
+    if not results:
+        return
+
+    now = datetime.now(UTC)
+    rows = values(
+        column("id", Uuid),
+        column("storage_url", String),
+        column("output_metadata", JSONB),
+        name="finalized",
+    ).data([(UUID(str(gen_id)), url, metadata) for gen_id, url, metadata in results])
+    stmt = (
+        update(Generations)
+        .where(Generations.id == rows.c.id)
+        .where(Generations.status != "cancelled")
+        .values(
+            status="completed",
+            progress=100.0,
+            storage_url=rows.c.storage_url,
+            thumbnail_url=None,
+            output_metadata=rows.c.output_metadata,
+            continuation=null(),
             updated_at=now,
             completed_at=now,
         )
@@ -104,6 +342,216 @@ async def finalize_success(
     await session.execute(stmt)
 
 
+# Generations a pipeline step still waits on; written like the expression of
+# idx_generations_pipeline_waiting_on so that queries can use the index
+_WAITING_ON = Generations.pipeline.op("->", return_type=JSONB)(literal_column("'waiting_on'"))
+
+
+async def release_pipeline_dependents(
+    session: AsyncSession, generation_id: str | UUID
+) -> list[Row[Any]]:
+    """Drop a completed generation from the wait lists of its pipeline's downstream steps.
+
+    Returns:
+        id, tenant_id, generator_name, status and the remaining ``waiting_on``
+        of each downstream step; those waiting on nothing else are ready to run
+    """
+    gen_id = str(generation_id)
+    stmt = (
+        update(Generations)
+        .where(_WAITING_ON.has_key(gen_id))
+        .values(
+            pipeline=func.jsonb_set(
+                Generations.pipeline,
+                literal_column("'{waiting_on}'::text[]"),
+                _WAITING_ON.op("-")(cast(gen_id, Text)),
+            ),
+            updated_at=datetime.now(UTC),
+        )
+        .returning(
+            Generations.id,
+            Generations.tenant_id,
+            Generations.generator_name,
+            Generations.status,
+            _WAITING_ON.label("waiting_on"),
+        )
+    )
+    res = await session.execute(stmt)
+    return list(res)
+
+
+async def fail_pipeline_dependents(
+    session: AsyncSession,
+    generation_id: str | UUID,
+    *,
+    status: str,
+    error_message: str,
+) -> list[UUID]:
+    """Fail (or cancel) the pending pipeline steps downstream of a generation.
+
+    Steps are updated a level at a time, one UPDATE per level.
+
+    Returns:
+        IDs of the steps that changed
+    """
+    stopped: list[UUID] = []
+    upstream = [str(generation_id)]
+    while upstream:
+        now = datetime.now(UTC)
+        stmt = (
+            update(Generations)
+            .where(_WAITING_ON.has_any(array(upstream)))
+            .where(Generations.status == "pending")
+            .values(status=status, error_message=error_message, updated_at=now, completed_at=now)
+            .returning(Generations.id)
+        )
+        res = await session.execute(stmt)
+        changed = list(res.scalars())
+        stopped.extend(changed)
+        upstream = [str(step_id) for step_id in changed]
+    return stopped
+
+
+async def suspend_generation(
+    session: AsyncSession,
+    generation_id: str | UUID,
+    *,
+    external_job_id: str,
+    next_check_at: datetime,
+    rate_limit_scope: str | None = None,
+) -> None:
+    """Record that the job now waits on its provider job without holding a worker.
+
+    ``rate_limit_scope`` names the provider slot the job holds until it finishes.
+    """
+    now = datetime.now(UTC)
+    continuation: dict[str, Any] = {
+        "suspended_at": now.isoformat(),
+        "checks": 0,
+        "next_check_at": next_check_at.isoformat(),
+    }
+    if rate_limit_scope is not None:
+        continuation["rate_limit_scope"] = rate_limit_scope
+    stmt = (
+        update(Generations)
+        .where(Generations.id == str(generation_id))
+        .values(
+            external_job_id=external_job_id,
+            continuation=continuation,
+            updated_at=now,
+        )
+    )
+    await session.execute(stmt)
+
+
+def _claimable(now: datetime, claim_timeout: int) -> Any:
+    # Suspended, unfinished jobs that nobody holds, or whose claim went stale
+    claimed_at = Generations.continuation["claimed_at"].astext
+    stale_before = (now - timedelta(seconds=claim_timeout)).isoformat()
+    return and_(
+        Generations.continuation.is_not(None),
+        Generations.status.not_in(TERMINAL_STATUSES),
+        or_(claimed_at.is_(None), claimed_at < stale_before),
+    )
+
+
+def _claimed(now: datetime) -> Any:
+    return Generations.continuation.op("||")(func.jsonb_build_object("claimed_at", now.isoformat()))
+
+
+async def claim_continuation(
+    session: AsyncSession, generation_id: str | UUID, *, claim_timeout: int
+) -> Row[Any] | None:
+    """Claim a suspended job so that only one worker resumes it at a time.
+
+    A claim older than ``claim_timeout`` seconds belongs to a worker that died
+    and is taken over. Returns the job's ``continuation``, ``external_job_id``
+    and ``generator_name``, or None if the job is not suspended or another
+    worker holds the claim.
+    """
+    now = datetime.now(UTC)
+    stmt = (
+        update(Generations)
+        .where(Generations.id == str(generation_id))
+        .where(_claimable(now, claim_timeout))
+        .values(continuation=_claimed(now))
+        .returning(
+            Generations.continuation, Generations.external_job_id, Generations.generator_name
+        )
+    )
+    res = await session.execute(stmt)
+    return res.one_or_none()
+
+
+async def claim_due_continuations(
+    session: AsyncSession, *, claim_timeout: int, limit: int
+) -> Sequence[Row[Any]]:
+    """Claim up to ``limit`` suspended jobs whose next provider check is due.
+
+    One UPDATE claims the whole batch; rows locked by a concurrent poller are
+    skipped. Returns ``id``, ``continuation``, ``external_job_id`` and
+    ``generator_name`` of each claimed job.
+    """
+    now = datetime.now(UTC)
+    next_check_at = Generations.continuation["next_check_at"].astext
+    due = (
+        select(Generations.id)
+        .where(_claimable(now, claim_timeout))
+        .where(or_(next_check_at.is_(None), next_check_at <= now.isoformat()))
+        .order_by(next_check_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Generations)
+        .where(Generations.id.in_(due.scalar_subquery()))
+        .values(continuation=_claimed(now))
+        .returning(
+            Generations.id,
+            Generations.continuation,
+            Generations.external_job_id,
+            Generations.generator_name,
+        )
+    )
+    res = await session.execute(stmt)
+    return res.all()
+
+
+async def release_continuation(
+    session: AsyncSession, generation_id: str | UUID, continuation: dict[str, Any]
+) -> None:
+    """Give up a claim on a job that is still waiting on its provider."""
+    await release_continuations(session, {str(generation_id): continuation})
+
+
+async def release_continuations(
+    session: AsyncSession, continuations: Mapping[str, dict[str, Any]]
+) -> None:
+    """Give up the claims on many jobs in a single UPDATE, storing their new state."""
+    if not continuations:
+        return
+    rows = values(
+        column("id", Uuid),
+        column("continuation", JSONB),
+        name="released",
+    ).data(
+        [
+            (
+                UUID(gen_id),
+                {key: value for key, value in record.items() if key != "claimed_at"},
+            )
+            for gen_id, record in continuations.items()
+        ]
+    )
+    stmt = (
+        update(Generations)
+        .where(Generations.id == rows.c.id)
+        .where(Generations.continuation.is_not(None))
+        .values(continuation=rows.c.continuation)
+    )
+    await session.execute(stmt)
+
+
 async def create_batch_generation(
     session: AsyncSession,
     *,
@@ -151,3 +599,66 @@ async def create_batch_generation(
     session.add(gen)
     await session.flush()
     return str(gen.id)
+
+
+async def stop_generations(
+    session: AsyncSession,
+    generation_ids: Sequence[str | UUID],
+    *,
+    status: str,
+    error_message: str,
+) -> None:
+    """Fail (or cancel) several unfinished generations with one UPDATE.
+
+    Generations that already finished keep their status.
+    """
+    if not generation_ids:
+        return
+    now = datetime.now(UTC)
+    stmt = (
+        update(Generations)
+        .where(Generations.id.in_([str(gen_id) for gen_id in generation_ids]))
+        .where(Generations.status.not_in(TERMINAL_STATUSES))
+        .values(status=status, error_message=error_message, updated_at=now, completed_at=now)
+    )
+    await session.execute(stmt)
+
+
+async def create_batch_generations(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    board_id: UUID,
+    user_id: UUID,
+    generator_name: str,
+    artifact_type: str,
+    input_params: dict,
+    batch_id: str,
+    batch_indexes: Sequence[int],
+) -> list[str]:
+    """Create the batch generation records of several outputs with one INSERT.
+
+    Same as create_batch_generation() for each of ``batch_indexes``.
+
+    Returns:
+        IDs of the created generation records, in the order of ``batch_indexes``
+    """
+    if not batch_indexes:
+        return []
+    rows = [
+        {
+            "tenant_id": tenant_id,
+            "board_id": board_id,
+            "user_id": user_id,
+            "generator_name": generator_name,
+            "artifact_type": artifact_type,
+            "input_params": input_params,
+            "status": "processing",
+            "progress": Decimal(0.0),
+            "output_metadata": {"batch_id": batch_id, "batch_index": batch_index},
+        }
+        for batch_index in batch_indexes
+    ]
+    stmt = insert(Generations).returning(Generations.id, sort_by_parameter_order=True)
+    res = await session.scalars(stmt, rows)
+    return [str(gen_id) for gen_id in res]
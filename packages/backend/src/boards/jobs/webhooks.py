@@ -0,0 +1,159 @@
+"""Verification of provider completion callbacks (webhooks).
+
+Each provider authenticates its callbacks differently:
+
+- Replicate follows the Standard Webhooks scheme: an HMAC-SHA256 over
+  ``{webhook-id}.{webhook-timestamp}.{body}`` keyed with the account's
+  signing secret.
+- fal.ai signs the request id, user id, timestamp and the SHA-256 of the body
+  with ED25519 keys it publishes as a JWKS.
+- Kie.ai does not sign callbacks, so the callback URL we register carries a
+  token derived from ``webhook_secret``.
+
+A verified callback only makes a worker look at the provider job again.
+Results are always fetched from the provider, never taken from the callback.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import time
+from collections.abc import Mapping
+from typing import Literal
+
+import httpx
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from ..config import Settings, settings
+
+WebhookProvider = Literal["replicate", "fal", "kie"]
+
+
+class WebhookVerificationError(Exception):
+    """Raised when a callback's signature, token or timestamp is not valid."""
+
+
+def webhook_url(provider: WebhookProvider, config: Settings | None = None) -> str | None:
+    """Callback URL to register with a provider, or None if webhooks are not configured."""
+    config = config or settings
+    if not config.webhook_base_url:
+        return None
+    url = f"{config.webhook_base_url.rstrip('/')}/api/webhooks/{provider}"
+    if provider == "kie":
+        if not config.webhook_secret:
+            return None
+        url += f"?token={kie_callback_token(config.webhook_secret)}"
+    return url
+
+
+def kie_callback_token(secret: str) -> str:
+    return hmac.new(secret.encode(), b"kie", hashlib.sha256).hexdigest()
+
+
+def verify_kie_token(token: str | None, secret: str) -> None:
+    if not token or not hmac.compare_digest(token, kie_callback_token(secret)):
+        raise WebhookVerificationError("Invalid callback token")
+
+
+def verify_replicate_signature(
+    headers: Mapping[str, str], body: bytes, secret: str, tolerance: int = 300
+) -> None:
+    """Verify a Replicate callback signed with the account's webhook secret."""
+    webhook_id = headers.get("webhook-id")
+    timestamp = headers.get("webhook-timestamp")
+    signatures = headers.get("webhook-signature")
+    if not webhook_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing webhook signature headers")
+    _check_timestamp(timestamp, tolerance)
+
+    key = base64.b64decode(secret.removeprefix("whsec_"))
+    signed_content = f"{webhook_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed_content, hashlib.sha256).digest()).decode()
+    # The header may list several space separated "version,signature" pairs
+    for signature in signatures.split():
+        version, _, value = signature.partition(",")
+        if version == "v1" and hmac.compare_digest(value, expected):
+            return
+    raise WebhookVerificationError("Invalid webhook signature")
+
+
+class FalWebhookVerifier:
+    """Verifies fal.ai callbacks against fal's published ED25519 keys."""
+
+    def __init__(self, jwks_url: str, tolerance: int = 300, jwks_ttl: float = 24 * 3600) -> None:
+        self.jwks_url = jwks_url
+        self.tolerance = tolerance
+        self.jwks_ttl = jwks_ttl
+        self._keys: list[Ed25519PublicKey] = []
+        self._fetched_at = 0.0
+
+    async def verify(self, headers: Mapping[str, str], body: bytes) -> None:
+        request_id = headers.get("x-fal-webhook-request-id")
+        user_id = headers.get("x-fal-webhook-user-id")
+        timestamp = headers.get("x-fal-webhook-timestamp")
+        signature = headers.get("x-fal-webhook-signature")
+        if not request_id or not user_id or not timestamp or not signature:
+            raise WebhookVerificationError("Missing webhook signature headers")
+        _check_timestamp(timestamp, self.tolerance)
+
+        message = "\n".join(
+            [request_id, user_id, timestamp, hashlib.sha256(body).hexdigest()]
+        ).encode()
+        try:
+            signature_bytes = bytes.fromhex(signature)
+        except ValueError as e:
+            raise WebhookVerificationError("Invalid webhook signature") from e
+
+        for key in await self._public_keys():
+            try:
+                key.verify(signature_bytes, message)
+                return
+            except InvalidSignature:
+                continue
+        raise WebhookVerificationError("Invalid webhook signature")
+
+    async def _public_keys(self) -> list[Ed25519PublicKey]:
+        if not self._keys or time.monotonic() - self._fetched_at > self.jwks_ttl:
+            jwks = await self._fetch_jwks()
+            self._keys = [
+                Ed25519PublicKey.from_public_bytes(_b64url_decode(jwk["x"]))
+                for jwk in jwks.get("keys", [])
+                if jwk.get("crv") == "Ed25519"
+            ]
+            self._fetched_at = time.monotonic()
+        return self._keys
+
+    async def _fetch_jwks(self) -> dict:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(self.jwks_url, timeout=10.0)
+            response.raise_for_status()
+            return response.json()
+
+
+def _check_timestamp(timestamp: str, tolerance: int) -> None:
+    try:
+        sent_at = int(timestamp)
+    except ValueError as e:
+        raise WebhookVerificationError("Invalid webhook timestamp") from e
+    if abs(time.time() - sent_at) > tolerance:
+        raise WebhookVerificationError("Webhook timestamp is too old or too new")
+
+
+def _b64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+_fal_webhook_verifier: FalWebhookVerifier | None = None
+
+
+def get_fal_webhook_verifier() -> FalWebhookVerifier:
+    """Get the fal.ai verifier shared by all requests, caching fal's keys."""
+    global _fal_webhook_verifier
+    if _fal_webhook_verifier is None:
+        _fal_webhook_verifier = FalWebhookVerifier(
+            settings.fal_webhook_jwks_url, tolerance=settings.webhook_timestamp_tolerance
+        )
+    return _fal_webhook_verifier
@@ -0,0 +1,153 @@
+"""Per-process fan-out of Redis progress messages to SSE clients.
+
+A single Redis connection pattern-subscribes to every job progress channel and
+dispatches messages to bounded in-memory queues, one per connected client. The
+number of Redis connections therefore stays constant no matter how many
+clients are streaming.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import redis.asyncio as redis
+
+from ..config import Settings
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+PROGRESS_CHANNEL_PATTERN = "job:*:progress"
+
+
+def progress_channel(job_id: str) -> str:
+    return f"job:{job_id}:progress"
+
+
+class ProgressSubscription:
+    """Bounded queue of progress messages for one client.
+
+    When the client falls behind and the queue is full, the oldest message is
+    dropped so a slow consumer never blocks delivery to the others. Progress
+    updates carry absolute state, so the latest messages are the ones to keep.
+    """
+
+    def __init__(self, job_id: str, maxsize: int) -> None:
+        self.job_id = job_id
+        self.dropped = 0
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, data: str) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(data)
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class ProgressHub:
+    """Single pattern subscription shared by all progress streams in the process."""
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        self.settings = settings or Settings()
+        # Dedicated client so the listener never borrows from the shared pool
+        self._redis = redis_client or redis.Redis.from_url(
+            self.settings.redis_url, decode_responses=True
+        )
+        self._subscribers: dict[str, set[ProgressSubscription]] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[ProgressSubscription]:
+        """Register a client for a job's progress messages for the duration of the block."""
+        self._ensure_listening()
+        subscription = ProgressSubscription(job_id, self.settings.sse_client_queue_size)
+        channel = progress_channel(job_id)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+            if subscription.dropped:
+                logger.warning(
+                    "SSE client fell behind, progress messages dropped",
+                    job_id=job_id,
+                    dropped=subscription.dropped,
+                )
+
+    def dispatch(self, channel: str, data: str) -> None:
+        """Deliver a message to every client subscribed to the channel."""
+        for subscription in self._subscribers.get(channel, ()):
+            subscription.put(data)
+
+    async def close(self) -> None:
+        """Stop the listener and release the Redis connection."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._redis.close()
+
+    def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._listener
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(PROGRESS_CHANNEL_PATTERN)
+                logger.info("Progress hub subscribed", pattern=PROGRESS_CHANNEL_PATTERN)
+                async for message in pubsub.listen():
+                    if message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Progress hub connection lost, reconnecting", error=str(e))
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.close()
+
+
+_hub: ProgressHub | None = None
+
+
+def get_progress_hub() -> ProgressHub:
+    """Get the process-wide progress hub."""
+    global _hub
+    if _hub is None:
+        _hub = ProgressHub()
+    return _hub
+
+
+async def close_progress_hub() -> None:
+    """Close the progress hub. Call during application shutdown."""
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
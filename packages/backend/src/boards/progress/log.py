@@ -0,0 +1,53 @@
+"""Durable per-job progress log backed by Redis Streams.
+
+When enabled, every progress update is appended to a capped stream
+(``job:{id}:events``). Consumers that connect late can replay the stream from
+any offset instead of querying the database.
+"""
+
+from __future__ import annotations
+
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from ..config import Settings
+from ..redis_pool import get_redis_client
+
+
+def progress_stream_key(job_id: str) -> str:
+    return f"job:{job_id}:events"
+
+
+class ProgressLog:
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        self.settings = settings or Settings()
+        self._redis = redis_client or get_redis_client()
+
+    def append(self, pipe: Pipeline, job_id: str, data: str) -> None:
+        """Queue the commands that record an update on a pipeline.
+
+        The stream entry is written by the same pipeline as the pub/sub
+        message, so the two never disagree.
+        """
+        stream_key = progress_stream_key(job_id)
+        pipe.xadd(
+            stream_key,
+            {"data": data},
+            maxlen=self.settings.progress_stream_maxlen,
+            approximate=True,
+        )
+        pipe.expire(stream_key, self.settings.progress_stream_ttl)
+
+    async def read(
+        self, job_id: str, after: str = "0-0", count: int | None = None
+    ) -> list[tuple[str, str]]:
+        """Return ``(entry_id, data)`` pairs logged after the given stream offset."""
+        response = await self._redis.xread({progress_stream_key(job_id): after}, count=count)
+        if not response:
+            return []
+        _, entries = response[0]
+        return [(entry_id, fields["data"]) for entry_id, fields in entries]
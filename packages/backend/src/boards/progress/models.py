@@ -5,7 +5,9 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+ProgressPhase = Literal["queued", "initializing", "processing", "finalizing"]
 
 
 class ArtifactInfo(BaseModel):
@@ -18,8 +20,11 @@ class ProgressUpdate(BaseModel):
     job_id: str
     status: str  # Use string to avoid tight coupling to GraphQL enums
     progress: float
-    phase: Literal["queued", "initializing", "processing", "finalizing"]
+    phase: ProgressPhase
     message: str | None = None
     estimated_completion: datetime | None = None
     artifacts: list[ArtifactInfo] = []
-    timestamp: datetime = datetime.now(UTC)
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    # Position in the job's stream of updates, assigned by the publisher; it only
+    # ever grows, so it orders updates from any worker (see progress/publisher.py)
+    sequence: int | None = None
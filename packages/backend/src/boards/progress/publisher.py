@@ -2,26 +2,142 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import weakref
+
 from ..config import Settings
 from ..database.connection import get_async_session
 from ..jobs import repository as jobs_repo
 from ..logging import get_logger
 from ..redis_pool import get_redis_client
+from .log import ProgressLog
 from .models import ProgressUpdate
 
 logger = get_logger(__name__)
 
+# Increments the job's update counter and keeps it alive as long as its updates
+_NEXT_SEQUENCE_SCRIPT = """
+local sequence = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return sequence
+"""
+
+
+def progress_sequence_key(job_id: str) -> str:
+    return f"job:{job_id}:sequence"
+
+
+def _db_progress(update: ProgressUpdate) -> float:
+    """Convert a 0-1 progress fraction to the percentage stored in the DB."""
+    return update.progress * 100 if update.progress <= 1.0 else update.progress
+
+
+class ProgressWriteBuffer:
+    """Write-behind buffer that coalesces progress writes per job.
+
+    Only the latest pending update for each job is kept. Pending updates are
+    written in one batched UPDATE at most ``flush_interval`` seconds after the
+    first one arrives, so frequent progress ticks from many jobs cost a single
+    statement instead of one round trip each.
+    """
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self._pending: dict[str, tuple[str, float, int]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def add(self, job_id: str, status: str, progress: float, sequence: int) -> None:
+        """Queue a progress write, replacing any pending write for the job."""
+        self._pending[job_id] = (status, progress, sequence)
+        task = self._flush_task
+        if task is None or task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    def discard(self, job_id: str) -> None:
+        """Drop any pending write for the job (e.g. before a terminal write)."""
+        self._pending.pop(job_id, None)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs with a write waiting to be flushed."""
+        return len(self._pending)
+
+    async def flush(self) -> None:
+        """Write all pending updates now."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            async with get_async_session() as session:
+                await jobs_repo.update_progress_batch(
+                    session,
+                    [(job_id, *write) for job_id, write in batch.items()],
+                )
+            logger.debug("Flushed coalesced progress updates", count=len(batch))
+        except Exception as e:
+            # Progress is advisory: the next update or the terminal write supersedes it
+            logger.warning(
+                "Failed to flush coalesced progress updates", count=len(batch), error=str(e)
+            )
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+
+_write_buffers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ProgressWriteBuffer] = (
+    weakref.WeakKeyDictionary()
+)
+_write_buffers_lock = threading.Lock()
+
+
+def get_progress_write_buffer(settings: Settings) -> ProgressWriteBuffer:
+    """Get the progress write buffer of the running event loop.
+
+    Every worker thread runs its own event loop, and a buffer schedules and
+    flushes its writes on a single loop, so each loop gets a buffer of its own.
+    """
+    loop = asyncio.get_running_loop()
+    flush_interval = settings.progress_flush_interval_ms / 1000
+    with _write_buffers_lock:
+        buffer = _write_buffers.get(loop)
+        if buffer is None or buffer.flush_interval != flush_interval:
+            buffer = ProgressWriteBuffer(flush_interval)
+            _write_buffers[loop] = buffer
+    return buffer
+
 
 class ProgressPublisher:
     def __init__(self, settings: Settings | None = None) -> None:
         self.settings = settings or Settings()
         # Use the shared Redis connection pool
         self._redis = get_redis_client()
+        # Last status written to the DB per job, until it ends; status changes are
+        # never deferred
+        self._persisted_status: dict[str, str] = {}
+        self._log: ProgressLog | None = None
+        if self.settings.progress_stream_enabled:
+            self._log = ProgressLog(self.settings, self._redis)
+
+    @property
+    def _buffer(self) -> ProgressWriteBuffer | None:
+        """Write buffer of the running event loop, or None if writes are not coalesced."""
+        if self.settings.progress_flush_interval_ms <= 0:
+            return None
+        return get_progress_write_buffer(self.settings)
 
     async def publish_progress(self, job_id: str, update: ProgressUpdate) -> None:
-        """Publish progress update to Redis and persist to database."""
+        """Publish progress update to Redis and persist to database.
+
+        Status changes and terminal states are written to the database before
+        publishing. Further progress ticks in the same status are handed to the
+        shared write buffer and persisted in the next batched flush.
+        """
         channel = f"job:{job_id}:progress"
-        await self._persist_update(job_id, update)
+        sequence = await self._next_sequence(job_id)
+        update = update.model_copy(update={"sequence": sequence})
+        await self._persist_update(job_id, update, sequence)
         json_data = update.model_dump_json()
         logger.info(
             "Publishing progress update to Redis",
@@ -31,7 +147,7 @@ class ProgressPublisher:
             progress=update.progress,
             data_length=len(json_data),
         )
-        await self._redis.publish(channel, json_data)
+        await self._publish(job_id, channel, json_data)
         logger.debug("Progress update published successfully", job_id=job_id)
 
     async def publish_only(self, job_id: str, update: ProgressUpdate) -> None:
@@ -41,6 +157,12 @@ class ProgressPublisher:
         e.g., after calling finalize_success in the repository.
         """
         channel = f"job:{job_id}:progress"
+        update = update.model_copy(update={"sequence": await self._next_sequence(job_id)})
+        if update.status in jobs_repo.TERMINAL_STATUSES:
+            self._persisted_status.pop(job_id, None)
+            buffer = self._buffer
+            if buffer is not None:
+                buffer.discard(job_id)
         json_data = update.model_dump_json()
         logger.info(
             "Publishing progress update to Redis (no DB persist)",
@@ -50,15 +172,61 @@ class ProgressPublisher:
             progress=update.progress,
             data_length=len(json_data),
         )
-        await self._redis.publish(channel, json_data)
+        await self._publish(job_id, channel, json_data)
         logger.debug("Progress update published successfully", job_id=job_id)
 
-    async def _persist_update(self, job_id: str, update: ProgressUpdate) -> None:
+    def mark_persisted(self, job_id: str, status: str) -> None:
+        """Record that the caller wrote the job's status to the database itself.
+
+        Further progress ticks in that status then go to the write buffer.
+        """
+        self._persisted_status[job_id] = status
+
+    async def _next_sequence(self, job_id: str) -> int:
+        """Number the job's next update.
+
+        The counter lives in Redis, so updates of a job are numbered in order
+        even when a retry or a resumed job runs on another worker.
+        """
+        return int(
+            await self._redis.eval(
+                _NEXT_SEQUENCE_SCRIPT,
+                1,
+                progress_sequence_key(job_id),
+                self.settings.progress_stream_ttl,
+            )
+        )
+
+    async def _publish(self, job_id: str, channel: str, json_data: str) -> None:
+        if self._log is None:
+            await self._redis.publish(channel, json_data)
+            return
+        # Log append and pub/sub message go out in one round trip
+        pipe = self._redis.pipeline(transaction=True)
+        self._log.append(pipe, job_id, json_data)
+        pipe.publish(channel, json_data)
+        await pipe.execute()
+
+    async def _persist_update(self, job_id: str, update: ProgressUpdate, sequence: int) -> None:
+        terminal = update.status in jobs_repo.TERMINAL_STATUSES
+        buffer = self._buffer
+        if buffer is not None:
+            if not terminal and self._persisted_status.get(job_id) == update.status:
+                buffer.add(job_id, update.status, _db_progress(update), sequence)
+                return
+            # A synchronous write supersedes anything still waiting in the buffer
+            buffer.discard(job_id)
+
         async with get_async_session() as session:
             await jobs_repo.update_progress(
                 session,
                 generation_id=job_id,
                 status=update.status,
-                progress=(update.progress * 100 if update.progress <= 1.0 else update.progress),
+                progress=_db_progress(update),
                 error_message=update.message if update.status == "failed" else None,
+                sequence=sequence,
             )
+        if terminal:
+            self._persisted_status.pop(job_id, None)
+        else:
+            self._persisted_status[job_id] = update.status
@@ -33,11 +33,14 @@ class RedisPoolManager:
             settings = Settings()
 
             # Create connection pool with sensible defaults
-            # These can be tuned based on your application's needs
-            self._pool = redis.ConnectionPool.from_url(
+            # These can be tuned based on your application's needs.
+            # A blocking pool makes bursts of concurrent jobs wait for a connection
+            # instead of failing once max_connections are in use.
+            self._pool = redis.BlockingConnectionPool.from_url(
                 settings.redis_url,
                 decode_responses=True,
-                max_connections=50,  # Maximum number of connections
+                max_connections=settings.redis_max_connections,
+                timeout=10,  # Seconds to wait for a free connection
                 socket_connect_timeout=5,  # Connection timeout in seconds
                 socket_timeout=5,  # Socket timeout in seconds
                 retry_on_timeout=True,  # Retry on timeout
@@ -48,8 +51,9 @@ class RedisPoolManager:
             self._client = redis.Redis(connection_pool=self._pool)
 
             logger.info(
-                "Redis connection pool initialized with max_connections=50, "
-                "health_check_interval=30s"
+                "Redis connection pool initialized",
+                max_connections=settings.redis_max_connections,
+                health_check_interval=30,
             )
 
     @property
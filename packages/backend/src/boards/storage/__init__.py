@@ -14,7 +14,9 @@ Main components:
 
 from .base import (
     ArtifactReference,
+    ResumableUploadError,
     SecurityException,
+    SizeLimitedStream,
     StorageConfig,
     StorageException,
     StorageManager,
@@ -41,6 +43,8 @@ __all__ = [
     "StorageException",
     "SecurityException",
     "ValidationException",
+    "ResumableUploadError",
+    "SizeLimitedStream",
     # Factory functions
     "create_storage_provider",
     "create_storage_manager",
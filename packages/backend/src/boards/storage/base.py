@@ -79,6 +79,40 @@ class ValidationException(StorageException):
     pass
 
 
+class ResumableUploadError(StorageException):
+    """Upload failed part-way, but the provider kept enough state to resume it.
+
+    Raising this from StorageProvider.upload() tells StorageManager that calling
+    upload() again with the same key continues where the previous attempt stopped,
+    even when the content is a stream that cannot be replayed.
+    """
+
+    pass
+
+
+class SizeLimitedStream:
+    """Async iterator that counts streamed bytes and enforces a size limit.
+
+    Wraps upload content that arrives as an async iterator so the size limit
+    is applied while bytes are flowing, without buffering the whole file.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], max_size: int):
+        self._source = source.__aiter__()
+        self.max_size = max_size
+        self.size = 0
+
+    def __aiter__(self) -> "SizeLimitedStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunk = await self._source.__anext__()
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise ValidationException(f"File size exceeds limit {self.max_size}")
+        return chunk
+
+
 class StorageProvider(ABC):
     """Abstract base class for all storage providers."""
 
@@ -141,6 +175,13 @@ class StorageProvider(ABC):
         """Get file metadata (size, modified date, etc.)."""
         pass
 
+    async def abort_upload(self, key: str) -> None:
+        """Discard a partial upload left behind by a ResumableUploadError.
+
+        Providers that never raise ResumableUploadError don't need to override this.
+        """
+        return None
+
 
 class StorageManager:
     """Central storage coordinator handling provider selection and routing."""
@@ -201,9 +242,15 @@ class StorageManager:
             # Validate content type
             self._validate_content_type(content_type)
 
-            # Validate content size if it's bytes
+            # Validate content size up front for bytes, or as chunks arrive for streams
+            stream: SizeLimitedStream | None = None
             if isinstance(content, bytes):
                 self._validate_file_size(len(content))
+                size = len(content)
+            else:
+                stream = SizeLimitedStream(content, self.config.max_file_size)
+                content = stream
+                size = 0
 
             # Generate and validate storage key
             key = self._generate_storage_key(artifact_id, artifact_type, tenant_id, board_id)
@@ -227,9 +274,20 @@ class StorageManager:
             }
 
             # Store the content with retry logic
-            storage_url = await self._upload_with_retry(
-                provider, validated_key, content, content_type, metadata
-            )
+            try:
+                storage_url = await self._upload_with_retry(
+                    provider, validated_key, content, content_type, metadata
+                )
+            except Exception as e:
+                # Providers wrap errors raised by the stream; surface the size violation
+                if stream is not None and stream.size > stream.max_size:
+                    raise ValidationException(
+                        f"File size exceeds limit {self.config.max_file_size}"
+                    ) from e
+                raise
+
+            if stream is not None:
+                size = stream.size
 
             logger.info(f"Successfully stored artifact {artifact_id} at {validated_key}")
 
@@ -239,7 +297,7 @@ class StorageManager:
                 storage_provider=provider_name,
                 storage_url=storage_url,
                 content_type=content_type,
-                size=len(content) if isinstance(content, bytes) else 0,
+                size=size,
                 created_at=datetime.now(UTC),
             )
 
@@ -259,16 +317,31 @@ class StorageManager:
         metadata: dict[str, Any],
         max_retries: int = 3,
     ) -> str:
-        """Upload with exponential backoff retry logic."""
+        """Upload with exponential backoff retry logic.
+
+        Streamed content can only be consumed once, so it is only retried when the
+        provider raises ResumableUploadError and can pick up where it stopped.
+        """
 
         if max_retries <= 0:
             max_retries = 1
+        replayable = isinstance(content, bytes)
 
         for attempt in range(max_retries):
             try:
                 return await provider.upload(key, content, content_type, metadata)
-            except Exception as e:
+            except ResumableUploadError as e:
                 if attempt == max_retries - 1:
+                    await provider.abort_upload(key)
+                    raise
+
+                wait_time = 2**attempt  # Exponential backoff
+                logger.warning(
+                    f"Upload attempt {attempt + 1} failed: {e}. Resuming in {wait_time}s"
+                )
+                await asyncio.sleep(wait_time)
+            except Exception as e:
+                if attempt == max_retries - 1 or not replayable:
                     raise
 
                 wait_time = 2**attempt  # Exponential backoff
@@ -158,6 +158,8 @@ def _create_s3_provider(config: dict[str, Any]) -> StorageProvider:
     endpoint_url = config.get("endpoint_url")
     cloudfront_domain = config.get("cloudfront_domain")
     upload_config = config.get("upload_config", {})
+    multipart_part_size = config.get("multipart_part_size", 8 * 1024 * 1024)
+    multipart_concurrency = config.get("multipart_concurrency", 4)
 
     return S3StorageProvider(
         bucket=bucket,
@@ -168,6 +170,8 @@ def _create_s3_provider(config: dict[str, Any]) -> StorageProvider:
         endpoint_url=endpoint_url,
         cloudfront_domain=cloudfront_domain,
         upload_config=upload_config,
+        multipart_part_size=multipart_part_size,
+        multipart_concurrency=multipart_concurrency,
     )
 
 
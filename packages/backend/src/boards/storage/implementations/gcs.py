@@ -2,11 +2,14 @@
 
 import json
 import os
+import tempfile
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import aiofiles
+
 if TYPE_CHECKING:
     from google.cloud import storage
 
@@ -150,26 +153,23 @@ class GCSStorageProvider(StorageProvider):
 
             # Handle streaming content for large files
             if isinstance(content, bytes):
-                file_content = content
+                # Upload using thread pool to avoid blocking
+                await self._run_sync(blob.upload_from_string, content, content_type=content_type)
             else:
-                # Collect streaming content into memory for upload
-                # For very large files, consider using resumable uploads
-                chunks = []
-                total_size = 0
-                async for chunk in content:
-                    chunks.append(chunk)
-                    total_size += len(chunk)
-                    # For files larger than 100MB, we could implement resumable upload
-                    if total_size > 100 * 1024 * 1024:
-                        logger.warning(
-                            f"Large file upload ({total_size} bytes) - "
-                            f"consider implementing resumable upload for key: {key}"
-                        )
-
-                file_content = b"".join(chunks)
-
-            # Upload using thread pool to avoid blocking
-            await self._run_sync(blob.upload_from_string, file_content, content_type=content_type)
+                # Spool the stream to a temp file so memory use stays flat; the GCS client
+                # switches to a resumable upload for large files automatically
+                with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+                    tmp_file_path = tmp_file.name
+                try:
+                    async with aiofiles.open(tmp_file_path, "wb") as f:
+                        async for chunk in content:
+                            await f.write(chunk)
+
+                    await self._run_sync(
+                        blob.upload_from_filename, tmp_file_path, content_type=content_type
+                    )
+                finally:
+                    os.unlink(tmp_file_path)
 
             # Return the CDN URL if configured, otherwise public GCS URL
             if self.cdn_domain:
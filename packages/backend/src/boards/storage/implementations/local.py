@@ -54,11 +54,16 @@ class LocalStorageProvider(StorageProvider):
                 async with aiofiles.open(file_path, "wb") as f:
                     await f.write(content)
             else:  # isinstance(content, AsyncIterable):
-                async with aiofiles.open(file_path, "wb") as f:
-                    async for chunk in content:
-                        # Just write the chunk directly - aiofiles accepts bytes-like objects
-                        # It will raise an error if chunk is not bytes-like
-                        await f.write(chunk)
+                try:
+                    async with aiofiles.open(file_path, "wb") as f:
+                        async for chunk in content:
+                            # Just write the chunk directly - aiofiles accepts bytes-like objects
+                            # It will raise an error if chunk is not bytes-like
+                            await f.write(chunk)
+                except Exception:
+                    # Don't leave a truncated file behind if the stream fails midway
+                    file_path.unlink(missing_ok=True)
+                    raise
 
             # Store metadata atomically
             if metadata:
@@ -1,6 +1,8 @@
 """AWS S3 storage provider with IAM auth and CloudFront CDN support."""
 
+import asyncio
 from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
@@ -23,10 +25,35 @@ except ImportError:
     _s3_available = False
 
 from ...logging import get_logger
-from ..base import StorageException, StorageProvider
+from ..base import ResumableUploadError, StorageException, StorageProvider
 
 logger = get_logger(__name__)
 
+# S3 rejects multipart parts smaller than 5MB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class _MultipartUpload:
+    """State of an in-progress multipart upload, kept so a failed upload can resume."""
+
+    upload_id: str
+    source: AsyncIterator[bytes]
+    buffer: bytearray = field(default_factory=bytearray)
+    next_part_number: int = 1
+    source_exhausted: bool = False
+    # Parts read from the source but not yet acknowledged by S3
+    pending_parts: dict[int, bytes] = field(default_factory=dict)
+    # Part number -> ETag for parts S3 has accepted
+    completed_parts: dict[int, str] = field(default_factory=dict)
+
+
+async def _iter_bytes(content: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield an in-memory payload in chunks so it can share the multipart path."""
+    view = memoryview(content)
+    for offset in range(0, len(content), chunk_size):
+        yield bytes(view[offset : offset + chunk_size])
+
 
 class S3StorageProvider(StorageProvider):
     """AWS S3 storage with IAM auth, CloudFront CDN, and proper async patterns."""
@@ -41,9 +68,15 @@ class S3StorageProvider(StorageProvider):
         endpoint_url: str | None = None,
         cloudfront_domain: str | None = None,
         upload_config: dict[str, Any] | None = None,
+        multipart_part_size: int = 8 * 1024 * 1024,
+        multipart_concurrency: int = 4,
     ):
         if not _s3_available:
             raise ImportError("boto3 and aioboto3 are required for S3StorageProvider")
+        if multipart_part_size < MIN_PART_SIZE:
+            raise ValueError(f"multipart_part_size must be at least {MIN_PART_SIZE} bytes")
+        if multipart_concurrency < 1:
+            raise ValueError("multipart_concurrency must be at least 1")
 
         self.bucket = bucket
         self.region = region
@@ -53,6 +86,11 @@ class S3StorageProvider(StorageProvider):
         self.endpoint_url = endpoint_url
         self.cloudfront_domain = cloudfront_domain
 
+        # Content larger than one part is uploaded with multipart upload, sending up to
+        # multipart_concurrency parts at once (so at most that many parts are buffered)
+        self.multipart_part_size = multipart_part_size
+        self.multipart_concurrency = multipart_concurrency
+
         # Default upload configuration
         self.upload_config = {
             "ServerSideEncryption": "AES256",
@@ -68,6 +106,7 @@ class S3StorageProvider(StorageProvider):
         )
 
         self._session: Any | None = None
+        self._multipart_uploads: dict[str, _MultipartUpload] = {}
 
     def _get_session(self) -> Any:
         """Get or create the aioboto3 session."""
@@ -87,7 +126,14 @@ class S3StorageProvider(StorageProvider):
         content_type: str,
         metadata: dict[str, Any] | None = None,
     ) -> str:
-        """Upload content to S3."""
+        """Upload content to S3.
+
+        Content up to one part in size is sent with a single put_object call. Larger
+        content (including streams) goes through multipart upload, so a stream is
+        never buffered in full. If a part fails, the upload state is kept and
+        ResumableUploadError is raised; calling upload() again with the same key
+        resumes from the parts S3 has not acknowledged yet.
+        """
         try:
             session = self._get_session()
 
@@ -108,44 +154,170 @@ class S3StorageProvider(StorageProvider):
                     s3_metadata[clean_key] = str(v)
                 upload_params["Metadata"] = s3_metadata
 
-            # Handle streaming content for large files
-            if isinstance(content, bytes):
-                upload_params["Body"] = content
-            else:
-                # Collect streaming content into memory for upload
-                # For very large files, consider using S3 multipart upload
-                chunks = []
-                total_size = 0
-                async for chunk in content:
-                    chunks.append(chunk)
-                    total_size += len(chunk)
-                    # For files larger than 100MB, we could implement multipart upload
-                    if total_size > 100 * 1024 * 1024:
-                        logger.warning(
-                            f"Large file upload ({total_size} bytes) - "
-                            f"consider implementing multipart upload for key: {key}"
-                        )
-
-                upload_params["Body"] = b"".join(chunks)
-
-            # Upload using aioboto3
             async with session.client(
                 "s3", config=self.config, endpoint_url=self.endpoint_url
             ) as s3:
-                await s3.put_object(**upload_params)
+                state = self._multipart_uploads.get(key)
+                if state is None:
+                    if isinstance(content, bytes) and len(content) <= self.multipart_part_size:
+                        await s3.put_object(Body=content, **upload_params)
+                        return self._get_object_url(key)
+
+                    source = (
+                        _iter_bytes(content, self.multipart_part_size)
+                        if isinstance(content, bytes)
+                        else content.__aiter__()
+                    )
+                    buffer = bytearray()
+                    first_part = await self._read_part(source, buffer)
+                    if len(buffer) == 0 and len(first_part) < self.multipart_part_size:
+                        # Small stream: not worth a multipart upload
+                        await s3.put_object(Body=first_part, **upload_params)
+                        return self._get_object_url(key)
+
+                    response = await s3.create_multipart_upload(**upload_params)
+                    state = _MultipartUpload(
+                        upload_id=response["UploadId"],
+                        source=source,
+                        buffer=buffer,
+                        next_part_number=2,
+                        pending_parts={1: first_part},
+                    )
+                    self._multipart_uploads[key] = state
+                    logger.debug(f"Started multipart upload {state.upload_id} for key: {key}")
+                else:
+                    logger.info(
+                        f"Resuming multipart upload {state.upload_id} for key: {key} "
+                        f"({len(state.completed_parts)} parts already uploaded)"
+                    )
+
+                await self._upload_parts(s3, key, state)
+
+                await s3.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=state.upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {"PartNumber": number, "ETag": etag}
+                            for number, etag in sorted(state.completed_parts.items())
+                        ]
+                    },
+                )
+                del self._multipart_uploads[key]
+                logger.info(
+                    f"Completed multipart upload of {len(state.completed_parts)} parts "
+                    f"for key: {key}"
+                )
 
-            # Return the CloudFront URL if configured, otherwise S3 URL
-            if self.cloudfront_domain:
-                return f"https://{self.cloudfront_domain}/{key}"
-            else:
-                return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+            return self._get_object_url(key)
 
         except Exception as e:
             if isinstance(e, StorageException):
                 raise
+            if key in self._multipart_uploads:
+                # Parts already in S3 are kept; the next upload() call resumes them
+                raise ResumableUploadError(f"S3 multipart upload interrupted: {e}") from e
             logger.error(f"Unexpected error uploading {key} to S3: {e}")
             raise StorageException(f"S3 upload failed: {e}") from e
 
+    async def _read_part(self, source: AsyncIterator[bytes], buffer: bytearray) -> bytes:
+        """Read up to one part from the source, carrying any excess over in buffer."""
+        while len(buffer) < self.multipart_part_size:
+            try:
+                chunk = await source.__anext__()
+            except StopAsyncIteration:
+                break
+            buffer.extend(chunk)
+
+        part = bytes(buffer[: self.multipart_part_size])
+        del buffer[: self.multipart_part_size]
+        return part
+
+    async def _upload_parts(self, s3: Any, key: str, state: _MultipartUpload) -> None:
+        """Upload pending parts and the rest of the source with bounded concurrency."""
+        slots = asyncio.Semaphore(self.multipart_concurrency)
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def upload_part(part_number: int, data: bytes) -> None:
+            try:
+                response = await s3.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=state.upload_id,
+                    PartNumber=part_number,
+                    Body=data,
+                )
+                state.completed_parts[part_number] = response["ETag"]
+                del state.pending_parts[part_number]
+            finally:
+                slots.release()
+
+        def failed() -> bool:
+            return any(task.done() and task.exception() is not None for task in tasks)
+
+        try:
+            # Retry parts left over from an interrupted attempt first
+            for part_number, data in sorted(state.pending_parts.items()):
+                await slots.acquire()
+                tasks.add(asyncio.create_task(upload_part(part_number, data)))
+
+            while not state.source_exhausted and not failed():
+                try:
+                    data = await self._read_part(state.source, state.buffer)
+                except Exception as e:
+                    # The source itself failed (download error, size limit, ...);
+                    # there is nothing to resume, so discard the upload
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    await self.abort_upload(key)
+                    raise StorageException(
+                        f"S3 multipart upload aborted for key {key}: source stream failed"
+                    ) from e
+
+                if not data:
+                    state.source_exhausted = True
+                    break
+                if len(data) < self.multipart_part_size:
+                    state.source_exhausted = True
+
+                part_number = state.next_part_number
+                state.next_part_number += 1
+                state.pending_parts[part_number] = data
+
+                await slots.acquire()
+                tasks.add(asyncio.create_task(upload_part(part_number, data)))
+        finally:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def abort_upload(self, key: str) -> None:
+        """Abort an interrupted multipart upload so S3 frees the stored parts."""
+        state = self._multipart_uploads.pop(key, None)
+        if state is None:
+            return
+
+        try:
+            session = self._get_session()
+            async with session.client(
+                "s3", config=self.config, endpoint_url=self.endpoint_url
+            ) as s3:
+                await s3.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=state.upload_id
+                )
+            logger.info(f"Aborted multipart upload {state.upload_id} for key: {key}")
+        except Exception as e:
+            logger.warning(f"Failed to abort multipart upload {state.upload_id} for {key}: {e}")
+
+    def _get_object_url(self, key: str) -> str:
+        """Return the CloudFront URL if configured, otherwise the S3 URL."""
+        if self.cloudfront_domain:
+            return f"https://{self.cloudfront_domain}/{key}"
+        else:
+            return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
     async def download(self, key: str) -> bytes:
         """Download file content from S3."""
         try:
@@ -59,33 +59,35 @@ class SupabaseStorageProvider(StorageProvider):
 
             # Handle streaming content for large files
             if isinstance(content, bytes):
-                file_content = content
+                response = await client.storage.from_(self.bucket).upload(
+                    path=key,
+                    file=content,
+                    file_options={
+                        "content-type": content_type,
+                        "upsert": "false",  # Prevent accidental overwrites
+                    },
+                )
             else:
-                # Stream to temp file to avoid memory issues
+                # Stream to temp file to avoid memory issues, then let the client
+                # upload from the file path instead of reading it back into memory
                 with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
                     tmp_file_path = tmp_file.name
 
-                # Use async file operations for streaming content
-                async with aiofiles.open(tmp_file_path, "wb") as f:
-                    async for chunk in content:
-                        await f.write(chunk)
-
-                # Read the temp file asynchronously and upload
-                async with aiofiles.open(tmp_file_path, "rb") as f:
-                    file_content = await f.read()
-
-                # Clean up temp file
-                os.unlink(tmp_file_path)
-
-            # Use async Supabase client methods
-            response = await client.storage.from_(self.bucket).upload(
-                path=key,
-                file=file_content,
-                file_options={
-                    "content-type": content_type,
-                    "upsert": "false",  # Prevent accidental overwrites
-                },
-            )
+                try:
+                    async with aiofiles.open(tmp_file_path, "wb") as f:
+                        async for chunk in content:
+                            await f.write(chunk)
+
+                    response = await client.storage.from_(self.bucket).upload(
+                        path=key,
+                        file=tmp_file_path,
+                        file_options={
+                            "content-type": content_type,
+                            "upsert": "false",  # Prevent accidental overwrites
+                        },
+                    )
+                finally:
+                    os.unlink(tmp_file_path)
 
             # Return the full public URL, not just the path
             # This matches the behavior of LocalStorageProvider which returns a full URL
@@ -2,24 +2,48 @@
 
 from __future__ import annotations
 
+import asyncio
 import traceback
-from typing import Any
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID, uuid4
 
 import dramatiq
 from dramatiq import actor
 from dramatiq.brokers.redis import RedisBroker
 from dramatiq.middleware import AsyncIO
+from pydantic import BaseModel
 
 from ..config import Settings
 from ..database.connection import get_async_session
+from ..generators.base import (
+    BaseGenerator,
+    ExternalJobStatus,
+    GeneratorResult,
+    ResumableGenerator,
+)
+from ..generators.rate_limit import ProviderBusyError, RateLimitScope, get_provider_limiter
 from ..generators.registry import registry as generator_registry
 from ..jobs import repository as jobs_repo
+from ..jobs.cancellation import WatchedJob, get_cancellation_watcher
 from ..logging import get_logger
 from ..progress.models import ProgressUpdate
 from ..progress.publisher import ProgressPublisher
+from ..redis_pool import get_redis_client
 from ..storage.factory import create_storage_manager
 from .context import GeneratorExecutionContext
-from .middleware import GeneratorLoaderMiddleware
+from .fair_queue import TenantFairQueue
+from .middleware import (
+    FairQueueDispatchMiddleware,
+    GeneratorLoaderMiddleware,
+    PollerStartMiddleware,
+    ScratchSweepMiddleware,
+)
+from .poller import ExternalJobPoller, claim_poller_turn, next_check_at, poller_running
+from .queues import enqueue_many, queue_for_generator
 
 logger = get_logger(__name__)
 
@@ -36,239 +60,816 @@ broker.add_middleware(AsyncIO())
 # Middleware runs before_worker_boot hook once per worker process at startup
 broker.add_middleware(GeneratorLoaderMiddleware())
 
+# Remove scratch directories left behind by crashed workers
+broker.add_middleware(ScratchSweepMiddleware())
 
-@actor(queue_name="boards-jobs", max_retries=3, min_backoff=5000, max_backoff=30000)
-async def process_generation(generation_id: str) -> None:
-    """Entry actor: load job context and dispatch to the generator.
+# Make sure a worker polls the provider jobs of suspended generations
+broker.add_middleware(PollerStartMiddleware())
 
-    Retry policy:
-    - max_retries: 3 attempts
-    - min_backoff: 5 seconds
-    - max_backoff: 30 seconds
+# Pick up generations left waiting in tenant queues
+broker.add_middleware(FairQueueDispatchMiddleware())
 
-    Note: This is an async actor. Dramatiq manages the event loop lifecycle properly,
-    avoiding the event loop conflicts that would occur with asyncio.run().
 
-    Process a generation job with comprehensive error handling.
-    """
-    logger.info("Starting generation processing", generation_id=generation_id)
+class InvalidJobError(ValueError):
+    """A generation that cannot run however often it is retried."""
 
-    publisher = ProgressPublisher(settings)
 
-    try:
-        # Initialize processing
-        await publisher.publish_progress(
-            generation_id,
-            ProgressUpdate(
-                job_id=generation_id,
-                status="processing",
-                progress=0.0,
-                phase="initializing",
-            ),
-        )
+class _PreparedJob(NamedTuple):
+    generator: BaseGenerator
+    inputs: BaseModel
+    context: GeneratorExecutionContext
+    # Provider job submitted by an earlier attempt, if any
+    external_job_id: str | None = None
 
-        # Load generation from DB
-        async with get_async_session() as session:
-            gen = await jobs_repo.get_generation(session, generation_id)
-            # Access all attributes while session is active to avoid DetachedInstanceError
-            generator_name = gen.generator_name
-            input_params = gen.input_params
-            gen_id = gen.id
-            tenant_id = gen.tenant_id
-            board_id = gen.board_id
-            user_id = gen.user_id
-            artifact_type = gen.artifact_type
 
-        # Initialize storage manager
-        # This will use the default storage configuration from environment/config
-        storage_manager = create_storage_manager()
+async def _prepare_job(
+    generation_id: str, publisher: ProgressPublisher, *, record_lineage: bool = True
+) -> _PreparedJob | None:
+    """Load a generation, resolve and validate its inputs and build its context.
+
+    On a first run (``record_lineage``) the job is also marked processing, with
+    its input lineage, in the same transaction. Loading, resolving input
+    artifacts and the status update share one session.
+
+    Returns:
+        None if the generation was cancelled or has finished, and must not run
+    """
+    # Automatically resolve generation IDs to artifacts before validation
+    from ..generators.artifact_resolution import resolve_input_artifacts
+
+    async with get_async_session() as session:
+        job = await jobs_repo.load_job(session, generation_id)
+        if job.status not in jobs_repo.RUNNABLE_STATUSES:
+            logger.info(
+                "Generation not runnable, skipping", generation_id=generation_id, status=job.status
+            )
+            return None
+        generator_name = job.generator_name
 
         # Validate generator exists
         generator = generator_registry.get(generator_name)
         if generator is None:
             error_msg = "Unknown generator"
             logger.error(error_msg, generator_name=generator_name)
-            raise RuntimeError(f"Unknown generator: {generator_name}")
+            raise InvalidJobError(f"Unknown generator: {generator_name}")
 
         # Build and validate typed inputs
         # First resolve any artifact fields (generation IDs -> artifact objects)
         # This happens automatically via type introspection
-        lineage_metadata: list[dict[str, Any]] = []
         try:
             input_schema = generator.get_input_schema()
-
-            # Automatically resolve generation IDs to artifacts before validation
-            from ..generators.artifact_resolution import resolve_input_artifacts
-
-            async with get_async_session() as session:
-                resolved_params, lineage_metadata = await resolve_input_artifacts(
-                    input_params,
-                    input_schema,  # Schema is introspected to find artifact fields
-                    session,
-                    tenant_id,
-                )
-
-                # Store lineage metadata in the generation
-                if lineage_metadata:
-                    generation = await jobs_repo.get_generation(session, generation_id)
-                    generation.input_artifacts = lineage_metadata
-                    await session.commit()
-
+            resolved_params, lineage_metadata = await resolve_input_artifacts(
+                job.input_params,
+                input_schema,  # Schema is introspected to find artifact fields
+                session,
+                job.tenant_id,
+            )
             typed_inputs = input_schema.model_validate(resolved_params)
         except Exception as e:
             error_msg = "Invalid input parameters"
             logger.error(error_msg, generation_id=generation_id, error=str(e))
-            raise ValueError(f"Invalid input parameters: {e}") from e
-
-        # Build context and run generator
-        context = GeneratorExecutionContext(
-            gen_id,
-            publisher,
-            storage_manager,
-            tenant_id,
-            board_id,
-            user_id,
-            generator_name,
-            artifact_type,
-            input_params,
+            raise InvalidJobError(f"Invalid input parameters: {e}") from e
+
+        if record_lineage and not await jobs_repo.start_job(
+            session, generation_id, input_artifacts=lineage_metadata
+        ):
+            # Cancelled while its inputs were resolved
+            logger.info("Generation not runnable, skipping", generation_id=generation_id)
+            return None
+
+    if record_lineage:
+        publisher.mark_persisted(generation_id, "processing")
+
+    # Initialize storage manager
+    # This will use the default storage configuration from environment/config
+    storage_manager = create_storage_manager()
+
+    # Build context
+    context = GeneratorExecutionContext(
+        job.id,
+        publisher,
+        storage_manager,
+        job.tenant_id,
+        job.board_id,
+        job.user_id,
+        generator_name,
+        job.artifact_type,
+        job.input_params,
+        pipeline_id=job.pipeline["pipeline_id"] if job.pipeline else None,
+        input_profile=generator.input_profile,
+    )
+    return _PreparedJob(generator, typed_inputs, context, job.external_job_id)
+
+
+async def _finalize_job(
+    generation_id: str,
+    output: GeneratorResult,
+    context: GeneratorExecutionContext,
+    publisher: ProgressPublisher,
+) -> None:
+    """Record the generator's outputs on the generation and its batch siblings."""
+    # Find the artifact with matching generation_id (primary generation)
+    # Generators should return exactly one artifact with the matching generation_id
+    matching_artifacts = [art for art in output.outputs if art.generation_id == generation_id]
+
+    if len(matching_artifacts) == 0:
+        raise RuntimeError(
+            f"No artifact found with generation_id {generation_id} in generator output. "
+            f"Generator returned {len(output.outputs)} artifact(s) but none matched."
         )
 
-        await publisher.publish_progress(
-            generation_id,
-            ProgressUpdate(
-                job_id=generation_id,
-                status="processing",
-                progress=0.05,
-                phase="processing",
-                message="Starting generation",
-            ),
+    if len(matching_artifacts) > 1:
+        logger.warning(
+            "Generator returned multiple artifacts with same generation_id, using first one",
+            generation_id=generation_id,
+            artifact_count=len(matching_artifacts),
         )
 
-        # Execute generator
+    artifact = matching_artifacts[0]
+
+    # Extract storage URL and convert artifact to dict
+    storage_url = artifact.storage_url
+    output_metadata = artifact.model_dump()
+
+    # If this was a batch generation, add batch metadata to primary generation
+    if context._batch_id is not None:
+        output_metadata["batch_id"] = context._batch_id
+        output_metadata["batch_index"] = 0
+        output_metadata["batch_size"] = len(output.outputs)
         logger.info(
-            "Executing generator",
-            generator_name=generator_name,
+            "Primary generation is part of batch",
             generation_id=generation_id,
+            batch_id=context._batch_id,
+            batch_size=len(output.outputs),
         )
-        # TODO: Consider implementing credit refund logic on failure
-        # await refund_credits(gen.user_id, gen.estimated_cost)
-        output = await generator.generate(typed_inputs, context)
+
+    # Finalize DB with storage URL and output metadata
+    if context._batch_id is None:
+        async with get_async_session() as session:
+            await jobs_repo.finalize_success(
+                session,
+                generation_id,
+                storage_url=storage_url,
+                output_metadata=output_metadata,
+            )
+    else:
+        # The primary and all batch generations are completed by one statement
+        results = [(generation_id, storage_url, output_metadata)]
+        batch_indexes = {
+            batch_generation_id: batch_index
+            for batch_index, batch_generation_id in enumerate(context._batch_generations, 1)
+        }
+        for batch_artifact in output.outputs:
+            if batch_artifact.generation_id == generation_id:
+                continue
+            batch_metadata = batch_artifact.model_dump()
+            batch_metadata["batch_id"] = context._batch_id
+            # Keep the batch_index the batch generation was created with
+            if batch_artifact.generation_id in batch_indexes:
+                batch_metadata["batch_index"] = batch_indexes[batch_artifact.generation_id]
+            batch_metadata["batch_size"] = len(output.outputs)
+            results.append(
+                (batch_artifact.generation_id, batch_artifact.storage_url, batch_metadata)
+            )
+        async with get_async_session() as session:
+            await jobs_repo.finalize_success_batch(session, results)
         logger.info(
-            "Generator completed successfully",
-            generator_name=generator_name,
-            generation_id=generation_id,
-            artifact_count=len(output.outputs),
+            "Batch generations finalized",
+            batch_id=context._batch_id,
+            batch_count=len(results) - 1,
         )
 
-        # Find the artifact with matching generation_id (primary generation)
-        # Generators should return exactly one artifact with the matching generation_id
-        matching_artifacts = [art for art in output.outputs if art.generation_id == generation_id]
+    logger.info("Job finalized successfully", generation_id=generation_id)
 
-        if len(matching_artifacts) == 0:
-            raise RuntimeError(
-                f"No artifact found with generation_id {generation_id} in generator output. "
-                f"Generator returned {len(output.outputs)} artifact(s) but none matched."
-            )
+    if context.pipeline_id is not None:
+        await _advance_pipeline(generation_id)
 
-        if len(matching_artifacts) > 1:
-            logger.warning(
-                "Generator returned multiple artifacts with same generation_id, using first one",
-                generation_id=generation_id,
-                artifact_count=len(matching_artifacts),
-            )
+    # Publish completion (DB already updated by finalize_success)
+    await publisher.publish_only(
+        generation_id,
+        ProgressUpdate(
+            job_id=generation_id,
+            status="completed",
+            progress=1.0,
+            phase="finalizing",
+            message="Completed",
+        ),
+    )
 
-        artifact = matching_artifacts[0]
 
-        # Extract storage URL and convert artifact to dict
-        storage_url = artifact.storage_url
-        output_metadata = artifact.model_dump()
+async def _advance_pipeline(generation_id: str) -> None:
+    """Enqueue the downstream pipeline steps that waited only on this generation.
 
-        # If this was a batch generation, add batch metadata to primary generation
-        if context._batch_id is not None:
-            output_metadata["batch_id"] = context._batch_id
-            output_metadata["batch_index"] = 0
-            output_metadata["batch_size"] = len(output.outputs)
+    Best effort: the generation is already completed, so raising would only
+    get the job retried, and the retry skips completed generations.
+    """
+    try:
+        async with get_async_session() as session:
+            dependents = await jobs_repo.release_pipeline_dependents(session, generation_id)
+        ready = [
+            GenerationJob(str(step.id), step.generator_name, step.tenant_id)
+            for step in dependents
+            if not step.waiting_on and step.status == "pending"
+        ]
+        if ready:
+            await enqueue_generations(ready)
             logger.info(
-                "Primary generation is part of batch",
+                "Pipeline steps enqueued",
                 generation_id=generation_id,
-                batch_id=context._batch_id,
-                batch_size=len(output.outputs),
+                steps=[job.generation_id for job in ready],
             )
+    except Exception as e:
+        logger.warning("Failed to advance pipeline", generation_id=generation_id, error=str(e))
 
-        # Finalize DB with storage URL and output metadata
+
+async def _fail_pipeline(generation_id: str, publisher: ProgressPublisher) -> None:
+    """Fail everything downstream of a failed pipeline step.
+
+    Best effort: a step left waiting never runs, it just stays pending.
+    """
+    message = f"Upstream pipeline step {generation_id} failed"
+    try:
         async with get_async_session() as session:
-            await jobs_repo.finalize_success(
-                session,
-                generation_id,
-                storage_url=storage_url,
-                output_metadata=output_metadata,
+            failed = await jobs_repo.fail_pipeline_dependents(
+                session, generation_id, status="failed", error_message=message
             )
-
-        # Finalize all batch generation records (if any)
-        if context._batch_id is not None:
-            batch_artifacts = [art for art in output.outputs if art.generation_id != generation_id]
-            logger.info(
-                "Finalizing batch generation records",
-                batch_id=context._batch_id,
-                batch_count=len(batch_artifacts),
+        for step_id in map(str, failed):
+            await publisher.publish_only(
+                step_id,
+                ProgressUpdate(
+                    job_id=step_id,
+                    status="failed",
+                    progress=0.0,
+                    phase="finalizing",
+                    message=message,
+                ),
             )
-            for batch_artifact in batch_artifacts:
-                async with get_async_session() as session:
-                    batch_metadata = batch_artifact.model_dump()
-                    # Add batch metadata to each batch generation
-                    batch_metadata["batch_id"] = context._batch_id
-                    # batch_index was set during generation creation via create_batch_generation()
-                    batch_metadata["batch_size"] = len(output.outputs)
+    except Exception as e:
+        logger.warning("Failed to fail pipeline steps", generation_id=generation_id, error=str(e))
 
-                    await jobs_repo.finalize_success(
-                        session,
-                        batch_artifact.generation_id,
-                        storage_url=batch_artifact.storage_url,
-                        output_metadata=batch_metadata,
-                    )
-                    logger.info(
-                        "Batch generation finalized",
-                        batch_generation_id=batch_artifact.generation_id,
-                        batch_id=context._batch_id,
-                    )
 
-        logger.info("Job finalized successfully", generation_id=generation_id)
+async def _fail_job(generation_id: str, publisher: ProgressPublisher, error: Exception) -> None:
+    # Log the full traceback for debugging
+    logger.error(
+        "Job failed with error",
+        generation_id=generation_id,
+        error=str(error),
+        traceback=traceback.format_exc(),
+    )
+    await _mark_failed(generation_id, publisher, str(error))
 
-        # Publish completion (DB already updated by finalize_success)
-        await publisher.publish_only(
+
+async def _mark_failed(generation_id: str, publisher: ProgressPublisher, message: str) -> None:
+    # Publish failure status (this also persists to DB via ProgressPublisher)
+    try:
+        await publisher.publish_progress(
             generation_id,
             ProgressUpdate(
                 job_id=generation_id,
-                status="completed",
-                progress=1.0,
+                status="failed",
+                progress=0.0,
                 phase="finalizing",
-                message="Completed",
+                message=message,
             ),
         )
+    except Exception as pub_error:
+        logger.error("Failed to publish error status", error=str(pub_error))
+
+    await _fail_pipeline(generation_id, publisher)
+
+
+async def _stop_batch_outputs(
+    context: GeneratorExecutionContext | None, status: str, message: str
+) -> None:
+    """Stop the batch generations an attempt created for its extra outputs.
 
+    A retry creates batch generations of its own, so those of an attempt that
+    did not finish would otherwise stay processing.
+    """
+    if context is None or not context._batch_generations:
+        return
+    try:
+        async with get_async_session() as session:
+            await jobs_repo.stop_generations(
+                session, context._batch_generations, status=status, error_message=message
+            )
     except Exception as e:
-        # Log the full traceback for debugging
-        logger.error(
-            "Job failed with error",
-            generation_id=generation_id,
+        logger.warning(
+            "Failed to stop batch generations",
+            generation_id=context.generation_id,
+            batch_id=context._batch_id,
             error=str(e),
-            traceback=traceback.format_exc(),
         )
 
-        # Publish failure status (this also persists to DB via ProgressPublisher)
-        try:
-            await publisher.publish_progress(
+
+async def _ensure_poller() -> None:
+    """Start a poller chain unless one is running (e.g. after Redis lost it)."""
+    try:
+        if not await poller_running(get_redis_client()):
+            poll_external_jobs.send(str(uuid4()))
+    except Exception as e:
+        logger.warning("Failed to check the external job poller", error=str(e))
+
+
+def _watch_cancellation(generation_id: str) -> WatchedJob:
+    task = asyncio.current_task()
+    if task is None:
+        raise RuntimeError("Generations must run inside an asyncio task")
+    return get_cancellation_watcher().watch(generation_id, task)
+
+
+async def _cancel_job(generation_id: str, publisher: ProgressPublisher) -> None:
+    """Stop a cancelled job: cancel its provider job and skip finalization."""
+    # The job's task was cancelled to get here; let this cleanup await normally
+    task = asyncio.current_task()
+    if task is not None:
+        task.uncancel()
+    logger.info("Generation cancelled, stopped processing", generation_id=generation_id)
+
+    try:
+        async with get_async_session() as session:
+            gen = await jobs_repo.get_generation(session, generation_id)
+            external_job_id = gen.external_job_id
+            generator_name = gen.generator_name
+        generator = generator_registry.get(generator_name)
+        if external_job_id and generator is not None:
+            await generator.cancel(external_job_id)
+    except Exception as e:
+        logger.warning("Failed to cancel provider job", generation_id=generation_id, error=str(e))
+
+    # The API already marked the generation cancelled; tell progress streams
+    await publisher.publish_only(
+        generation_id,
+        ProgressUpdate(
+            job_id=generation_id,
+            status="cancelled",
+            progress=0.0,
+            phase="finalizing",
+            message="Cancelled by user",
+        ),
+    )
+
+
+def _provider_slot(
+    scope: RateLimitScope | None, generation_id: str
+) -> AbstractAsyncContextManager[None]:
+    """Hold a slot of the generator's provider while the job runs there."""
+    if scope is None:
+        return nullcontext()
+    return get_provider_limiter().hold(
+        scope,
+        generation_id,
+        ttl=settings.provider_slot_lease_ttl,
+        timeout=settings.provider_slot_wait_timeout,
+    )
+
+
+async def _submit(
+    generator: ResumableGenerator,
+    inputs: BaseModel,
+    context: GeneratorExecutionContext,
+    scope: RateLimitScope | None,
+) -> str:
+    """Submit a provider job, taking a provider slot that it holds until it finishes."""
+    if scope is None:
+        return await generator.submit(inputs, context)
+    limiter = get_provider_limiter()
+    generation_id = context.generation_id
+    # resume_generation releases the slot; the lease only runs out if that never happens
+    ttl = settings.job_timeout + settings.job_continuation_claim_timeout
+    await limiter.acquire(
+        scope, generation_id, ttl=ttl, timeout=settings.provider_slot_wait_timeout
+    )
+    try:
+        return await generator.submit(inputs, context)
+    except BaseException:
+        await limiter.release(scope.key, generation_id)
+        raise
+
+
+async def _release_provider_slot(continuation: dict[str, Any] | None, generation_id: str) -> None:
+    """Free the provider slot a suspended job held while its provider job ran."""
+    scope_key = (continuation or {}).get("rate_limit_scope")
+    if scope_key:
+        await get_provider_limiter().release(scope_key, generation_id)
+
+
+def _tenant_fair_queue() -> TenantFairQueue:
+    return TenantFairQueue(
+        get_redis_client(),
+        broker,
+        weights=settings.fair_queue_tenant_weights,
+        max_backlog=settings.fair_queue_max_backlog,
+    )
+
+
+def _generation_message(generation_id: str, generator_name: str | None) -> dramatiq.Message:
+    message = process_generation.message(generation_id)
+    queue_name = queue_for_generator(generator_name) if generator_name else None
+    if queue_name and queue_name != message.queue_name:
+        message = message.copy(queue_name=queue_name)
+    return message
+
+
+async def enqueue_generation(
+    generation_id: str, generator_name: str | None, tenant_id: str | UUID | None = None
+) -> dramatiq.Message:
+    """Send a generation to process_generation on its generator's queue (see queues.py).
+
+    With fair scheduling the message waits in its tenant's queue until the
+    dispatcher moves it to the job queue (see fair_queue.py).
+    """
+    message = _generation_message(generation_id, generator_name)
+    if not settings.fair_queue_enabled or tenant_id is None:
+        return broker.enqueue(message)
+
+    fair_queue = _tenant_fair_queue()
+    await fair_queue.push(str(tenant_id), message)
+    await fair_queue.dispatch()
+    return message
+
+
+class GenerationJob(NamedTuple):
+    """A generation to enqueue with enqueue_generations."""
+
+    generation_id: str
+    generator_name: str | None
+    tenant_id: str | UUID | None = None
+
+
+async def enqueue_generations(jobs: Sequence[GenerationJob]) -> list[dramatiq.Message]:
+    """Send many generations to process_generation like enqueue_generation does.
+
+    The messages are enqueued in one Redis round trip, or pushed to their
+    tenants' queues with one command per tenant and queue under fair scheduling.
+    """
+    messages = [_generation_message(job.generation_id, job.generator_name) for job in jobs]
+    if not settings.fair_queue_enabled:
+        return enqueue_many(broker, messages)
+
+    unscheduled: list[dramatiq.Message] = []
+    by_tenant: dict[str, list[dramatiq.Message]] = defaultdict(list)
+    for job, message in zip(jobs, messages, strict=True):
+        if job.tenant_id is None:
+            unscheduled.append(message)
+        else:
+            by_tenant[str(job.tenant_id)].append(message)
+    enqueue_many(broker, unscheduled)
+    fair_queue = _tenant_fair_queue()
+    for tenant_id, tenant_messages in by_tenant.items():
+        await fair_queue.push(tenant_id, *tenant_messages)
+    await fair_queue.dispatch()
+    return messages
+
+
+async def _dispatch_fair_queue() -> None:
+    """Refill the job queues from the tenant queues after a job leaves them."""
+    if not settings.fair_queue_enabled:
+        return
+    try:
+        await _tenant_fair_queue().dispatch()
+    except Exception as e:
+        logger.warning("Failed to dispatch tenant queues", error=str(e))
+
+
+def _resume_finished(generation_id: str, completed: bool) -> None:
+    resume_generation.send(generation_id, completed)
+
+
+@actor(
+    queue_name=settings.job_queue_name,
+    max_retries=3,
+    min_backoff=5000,
+    max_backoff=30000,
+    on_retry_exhausted="fail_generation",
+)
+async def process_generation(generation_id: str) -> None:
+    """Entry actor: load job context and dispatch to the generator.
+
+    Retry policy:
+    - max_retries: 3 attempts
+    - min_backoff: 5 seconds
+    - max_backoff: 30 seconds
+    - The generation is marked failed by fail_generation once retries run out;
+      a retry reattaches to the provider job an earlier attempt submitted
+    - Invalid jobs fail at once
+
+    Note: This is an async actor. Dramatiq manages the event loop lifecycle properly,
+    avoiding the event loop conflicts that would occur with asyncio.run().
+
+    In continuation mode, resumable generators only submit their provider job
+    here; the job is suspended and resume_generation finishes it later.
+
+    Process a generation job with comprehensive error handling.
+    """
+    logger.info("Starting generation processing", generation_id=generation_id)
+
+    publisher = ProgressPublisher(settings)
+    context: GeneratorExecutionContext | None = None
+    watched = _watch_cancellation(generation_id)
+
+    try:
+        async with watched:
+            # Loads the job and marks it processing
+            prepared = await _prepare_job(generation_id, publisher)
+            if prepared is None:
+                return
+            generator, typed_inputs, context, external_job_id = prepared
+            generator_name = context.generator_name
+            await publisher.publish_only(
                 generation_id,
                 ProgressUpdate(
                     job_id=generation_id,
-                    status="failed",
+                    status="processing",
                     progress=0.0,
-                    phase="finalizing",
-                    message=str(e),
+                    phase="initializing",
                 ),
             )
-        except Exception as pub_error:
-            logger.error("Failed to publish error status", error=str(pub_error))
 
+            await publisher.publish_progress(
+                generation_id,
+                ProgressUpdate(
+                    job_id=generation_id,
+                    status="processing",
+                    progress=0.05,
+                    phase="processing",
+                    message="Starting generation",
+                ),
+            )
+
+            rate_limit_scope = get_provider_limiter().scope(generator.provider, context.tenant_id)
+
+            if settings.job_continuation_enabled and isinstance(generator, ResumableGenerator):
+                # Hand the provider job off and free this worker while the provider runs.
+                # A job submitted by an earlier attempt is waited on instead of resubmitted.
+                external_id = external_job_id
+                if external_id is None:
+                    external_id = await _submit(generator, typed_inputs, context, rate_limit_scope)
+                async with get_async_session() as session:
+                    await jobs_repo.suspend_generation(
+                        session,
+                        generation_id,
+                        external_job_id=external_id,
+                        next_check_at=next_check_at(0, settings),
+                        rate_limit_scope=rate_limit_scope.key if rate_limit_scope else None,
+                    )
+                await _ensure_poller()
+                logger.info(
+                    "Generation suspended until provider job completes",
+                    generator_name=generator_name,
+                    generation_id=generation_id,
+                    external_job_id=external_id,
+                )
+                return
+
+            output = None
+            async with _provider_slot(rate_limit_scope, generation_id):
+                if external_job_id is not None:
+                    # An earlier attempt already submitted a provider job; reattach to it
+                    # rather than paying for a new one
+                    logger.info(
+                        "Resuming provider job of an earlier attempt",
+                        generator_name=generator_name,
+                        generation_id=generation_id,
+                        external_job_id=external_job_id,
+                    )
+                    output = await generator.resume(external_job_id, typed_inputs, context)
+                    if output is None:
+                        logger.info(
+                            "Provider job cannot be resumed, submitting a new one",
+                            generation_id=generation_id,
+                            external_job_id=external_job_id,
+                        )
+
+                if output is None:
+                    # Execute generator
+                    logger.info(
+                        "Executing generator",
+                        generator_name=generator_name,
+                        generation_id=generation_id,
+                    )
+                    # TODO: Consider implementing credit refund logic on failure
+                    # await refund_credits(gen.user_id, gen.estimated_cost)
+                    output = await generator.generate(typed_inputs, context)
+            logger.info(
+                "Generator completed successfully",
+                generator_name=generator_name,
+                generation_id=generation_id,
+                artifact_count=len(output.outputs),
+            )
+
+            await _finalize_job(generation_id, output, context, publisher)
+
+    except asyncio.CancelledError:
+        if not watched.requested:
+            raise
+        await _cancel_job(generation_id, publisher)
+        await _stop_batch_outputs(context, "cancelled", "Cancelled by user")
+    except ProviderBusyError as e:
+        # The provider is at its limits; go to the back of the queue rather than fail
+        logger.info(
+            "Provider busy, requeueing generation", generation_id=generation_id, error=str(e)
+        )
+        await _stop_batch_outputs(context, "failed", f"Attempt requeued: {e}")
+        # The job goes to the back of its tenant's queue
+        await enqueue_generation(
+            generation_id,
+            context.generator_name if context else None,
+            context.tenant_id if context else None,
+        )
+    except InvalidJobError as e:
+        # Retrying cannot make the job valid
+        await _fail_job(generation_id, publisher, e)
+    except Exception as e:
+        logger.warning(
+            "Generation attempt failed, leaving it to Dramatiq to retry",
+            generation_id=generation_id,
+            error=str(e),
+            traceback=traceback.format_exc(),
+        )
+        await _stop_batch_outputs(context, "failed", str(e))
         # Re-raise for Dramatiq retry mechanism
-        # raise
+        raise
+    finally:
+        if context is not None:
+            context.cleanup()
+        await _dispatch_fair_queue()
+
+
+@actor(queue_name=settings.job_queue_name, max_retries=0)
+async def fail_generation(message_data: dict[str, Any], retry_info: dict[str, Any]) -> None:
+    """Mark a generation failed once process_generation has run out of retries.
+
+    Dramatiq sends this with the failed message (see on_retry_exhausted).
+    """
+    generation_id = message_data["args"][0]
+    trace = (message_data.get("options") or {}).get("traceback") or ""
+    lines = trace.strip().splitlines()
+    error = lines[-1] if lines else "Generation failed"
+    logger.error(
+        "Generation failed after retries",
+        generation_id=generation_id,
+        retries=retry_info.get("retries"),
+        error=error,
+        traceback=trace,
+    )
+    await _mark_failed(generation_id, ProgressPublisher(settings), error)
+
+
+@actor(queue_name=settings.job_queue_name, max_retries=0)
+async def resume_generation(generation_id: str, completed: bool = False) -> None:
+    """Continuation actor: check a suspended job's provider job and finalize it.
+
+    Sent by the poller and by provider webhooks. Each call holds a worker only
+    for one status request, or for storing the outputs once the provider is
+    done; a job that is still running is left to the poller. ``completed``
+    skips the status request when the poller has just seen the job complete.
+    The job is claimed first, so duplicate resume messages for the same job
+    are dropped.
+    """
+    async with get_async_session() as session:
+        claim = await jobs_repo.claim_continuation(
+            session, generation_id, claim_timeout=settings.job_continuation_claim_timeout
+        )
+    if claim is None:
+        logger.debug(
+            "Generation not suspended or already being resumed", generation_id=generation_id
+        )
+        return
+
+    publisher = ProgressPublisher(settings)
+    context: GeneratorExecutionContext | None = None
+    external_id = claim.external_job_id
+    watched = _watch_cancellation(generation_id)
+
+    try:
+        async with watched:
+            generator = generator_registry.get(claim.generator_name)
+            if not isinstance(generator, ResumableGenerator) or external_id is None:
+                raise RuntimeError(
+                    f"Generator {claim.generator_name} cannot resume suspended generations"
+                )
+
+            try:
+                if completed:
+                    status = ExternalJobStatus(state="completed")
+                else:
+                    status = await generator.check_status(external_id)
+            except Exception as e:
+                # A failed status request says nothing about the provider job; check again later
+                logger.warning(
+                    "Provider status check failed",
+                    generation_id=generation_id,
+                    external_job_id=external_id,
+                    error=str(e),
+                )
+                status = ExternalJobStatus(state="pending")
+
+            if status.state == "pending":
+                suspended_at = datetime.fromisoformat(claim.continuation["suspended_at"])
+                if datetime.now(UTC) - suspended_at > timedelta(seconds=settings.job_timeout):
+                    raise RuntimeError(
+                        f"Provider job {external_id} did not complete "
+                        f"within {settings.job_timeout}s"
+                    )
+                if status.progress is not None:
+                    await publisher.publish_progress(
+                        generation_id,
+                        ProgressUpdate(
+                            job_id=generation_id,
+                            status="processing",
+                            progress=status.progress,
+                            phase="processing",
+                        ),
+                    )
+                continuation = dict(claim.continuation)
+                continuation["checks"] = checks = continuation.get("checks", 0) + 1
+                continuation["next_check_at"] = next_check_at(checks, settings).isoformat()
+                async with get_async_session() as session:
+                    await jobs_repo.release_continuation(session, generation_id, continuation)
+                return
+
+            if status.state == "failed":
+                raise ValueError(f"Generation failed: {status.error}")
+
+            logger.info(
+                "Provider job completed, finalizing generation",
+                generation_id=generation_id,
+                external_job_id=external_id,
+            )
+            prepared = await _prepare_job(generation_id, publisher, record_lineage=False)
+            if prepared is None:
+                return
+            _, typed_inputs, context, _ = prepared
+            output = await generator.finalize(external_id, typed_inputs, context)
+            await _finalize_job(generation_id, output, context, publisher)
+            await _release_provider_slot(claim.continuation, generation_id)
+
+    except asyncio.CancelledError:
+        if not watched.requested:
+            raise
+        await _cancel_job(generation_id, publisher)
+        await _stop_batch_outputs(context, "cancelled", "Cancelled by user")
+        await _release_provider_slot(claim.continuation, generation_id)
+    except Exception as e:
+        await _fail_job(generation_id, publisher, e)
+        await _stop_batch_outputs(context, "failed", str(e))
+        await _release_provider_slot(claim.continuation, generation_id)
+    finally:
+        if context is not None:
+            context.cleanup()
+
+
+@actor(queue_name=settings.job_queue_name, max_retries=0)
+async def poll_external_jobs(chain_id: str) -> None:
+    """Timer actor: check the provider jobs of suspended generations that are due.
+
+    Runs every job_poller_tick_interval seconds by sending itself again. Only
+    the chain that owns the poller runs; other chains end here (see poller).
+    """
+    interval = settings.job_poller_tick_interval
+    if not await claim_poller_turn(get_redis_client(), chain_id, ttl=interval * 5):
+        logger.debug("Another poller chain is running, ending this one", chain_id=chain_id)
+        return
+
+    try:
+        poller = ExternalJobPoller(settings, ProgressPublisher(settings), _resume_finished)
+        await poller.run_once()
+    except Exception as e:
+        logger.error("External job poller run failed", error=str(e))
+    finally:
+        poll_external_jobs.send_with_options(args=(chain_id,), delay=int(interval * 1000))
+
+
+@actor(queue_name=settings.job_queue_name, max_retries=0)
+async def dispatch_tenant_queues() -> None:
+    """Move generations waiting in the tenant queues to the job queues (see fair_queue).
+
+    Jobs finishing dispatch the next ones themselves; workers send this when
+    they boot so generations submitted while no worker ran are not stranded.
+    """
+    await _dispatch_fair_queue()
+
+
+@actor(queue_name=settings.job_queue_name, max_retries=3, min_backoff=5000, max_backoff=30000)
+async def cancel_external_job(generation_id: str, rate_limit_scope: str | None = None) -> None:
+    """Cancel the provider job of a cancelled generation that no worker is running.
+
+    Suspended generations wait on their provider without a worker, so nothing
+    watches their cancellation; the API sends this message instead, with the
+    provider slot the job held, since cancelling cleared its continuation.
+    """
+    if rate_limit_scope:
+        await get_provider_limiter().release(rate_limit_scope, generation_id)
+    async with get_async_session() as session:
+        gen = await jobs_repo.get_generation(session, generation_id)
+        external_job_id = gen.external_job_id
+        generator_name = gen.generator_name
+    generator = generator_registry.get(generator_name)
+    if external_job_id and generator is not None:
+        await generator.cancel(external_job_id)
+        logger.info(
+            "Provider job cancelled",
+            generation_id=generation_id,
+            external_job_id=external_job_id,
+        )
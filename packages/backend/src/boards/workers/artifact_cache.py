@@ -0,0 +1,193 @@
+"""Content-addressed on-disk cache for resolved input artifacts.
+
+Generation outputs never change once stored, so an input artifact that a
+worker has already downloaded can be reused by later jobs. Files are stored
+once per content hash under ``blobs/`` and an index entry per
+(generation_id, storage_url) points at the blob; prepared variants of an input
+(see input_preparation.py) get an index entry per profile. A hit hard-links the
+blob into the job's workspace, which takes microseconds and leaves the job with
+a path that stays valid even if the blob is evicted meanwhile.
+
+All writes go through a temporary file and an atomic rename, so any number of
+threads and worker processes can share one cache directory. Total size is
+bounded by evicting the least recently used blobs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from ..config import Settings
+from ..generators.artifacts import AudioArtifact, ImageArtifact, LoRArtifact, VideoArtifact
+from ..logging import get_logger
+from .workspace import JobWorkspace
+
+logger = get_logger(__name__)
+
+FileArtifact = AudioArtifact | VideoArtifact | ImageArtifact | LoRArtifact
+
+
+def default_artifact_cache_root() -> Path:
+    return Path(tempfile.gettempdir()) / "boards-artifact-cache"
+
+
+class ArtifactCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, artifact: FileArtifact, workspace: JobWorkspace, variant: str = "") -> str | None:
+        """Link a cached copy of the artifact (or of its ``variant``) into the workspace.
+
+        Returns:
+            Path of the linked file, or None on a cache miss
+        """
+        index_path = self._index_path(artifact, variant)
+        try:
+            blob_name = index_path.read_text().strip()
+            blob_path = self._blob_dir(blob_name) / blob_name
+            # Mark as recently used for LRU eviction
+            os.utime(blob_path)
+            os.utime(index_path)
+            target = workspace.new_file(suffix=blob_path.suffix, prefix="boards_artifact_")
+            _link_or_copy(blob_path, target)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        logger.debug(
+            "Artifact cache hit",
+            generation_id=artifact.generation_id,
+            hits=self.hits,
+            misses=self.misses,
+        )
+        return str(target)
+
+    async def put(self, artifact: FileArtifact, path: str, variant: str = "") -> None:
+        """Add a downloaded artifact (or a prepared ``variant`` of it) to the cache."""
+        try:
+            await asyncio.to_thread(self._put, artifact, Path(path), variant)
+        except OSError as e:
+            # A cache write failure must never fail the job
+            logger.warning("Failed to cache artifact", path=path, error=str(e))
+
+    def _put(self, artifact: FileArtifact, path: Path, variant: str) -> None:
+        digest = _sha256_file(path)
+        blob_name = f"{digest}{path.suffix}"
+        blob_path = self._blob_dir(blob_name) / blob_name
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f".{blob_name}.{uuid.uuid4().hex}")
+            _link_or_copy(path, tmp_path)
+            # Cached inputs are shared between jobs, so they must not be modified
+            tmp_path.chmod(0o400)
+            os.replace(tmp_path, blob_path)
+        _atomic_write_text(self._index_path(artifact, variant), blob_name)
+        self._evict()
+
+    def _evict(self) -> None:
+        blobs_root = self.root / "blobs"
+        blobs: list[tuple[float, int, Path]] = []
+        total = 0
+        for shard in os.scandir(blobs_root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        blobs.sort()
+        evicted = 0
+        while blobs and total > self.max_bytes:
+            _, size, blob_path = blobs.pop(0)
+            blob_path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        self._count("evictions", evicted)
+
+        # Index entries not used since before the oldest surviving blob point at evicted blobs
+        if blobs:
+            oldest = blobs[0][0]
+            for entry in os.scandir(self.root / "index"):
+                try:
+                    if entry.stat().st_mtime < oldest:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+        logger.info("Evicted cached artifacts", evicted=evicted, total_bytes=total)
+
+    def _index_path(self, artifact: FileArtifact, variant: str = "") -> Path:
+        name = f"{artifact.generation_id}\0{artifact.storage_url}"
+        if variant:
+            name = f"{name}\0{variant}"
+        key = hashlib.sha256(name.encode())
+        return self.root / "index" / key.hexdigest()
+
+    def _blob_dir(self, blob_name: str) -> Path:
+        return self.root / "blobs" / blob_name[:2]
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        # Different filesystem or links not supported
+        shutil.copyfile(source, target)
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+_artifact_cache: ArtifactCache | None = None
+_artifact_cache_configured = False
+
+
+def get_artifact_cache(settings: Settings | None = None) -> ArtifactCache | None:
+    """Get the artifact cache shared by all jobs in this process, or None if disabled."""
+    global _artifact_cache, _artifact_cache_configured
+    if not _artifact_cache_configured:
+        settings = settings or Settings()
+        if settings.artifact_cache_enabled:
+            root = (
+                Path(settings.artifact_cache_dir)
+                if settings.artifact_cache_dir
+                else default_artifact_cache_root()
+            )
+            _artifact_cache = ArtifactCache(root, max_bytes=settings.artifact_cache_max_bytes)
+        _artifact_cache_configured = True
+    return _artifact_cache
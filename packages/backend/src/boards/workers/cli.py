@@ -29,10 +29,13 @@ def start_worker(
     threads: int,
     queue_list: list[str],
     log_level: str,
+    concurrency: int | None = None,
+    queue_concurrency: dict[str, int] | None = None,
 ) -> None:
     """Start the Dramatiq worker process."""
     # Configure logging
     configure_logging(debug=(log_level == "debug"))
+    original_argv = sys.argv
 
     try:
         # Import workers to register them (if they exist)
@@ -41,6 +44,19 @@ def start_worker(
         except ImportError:
             logger.warning("No worker actors found - continuing with empty worker")
 
+        if concurrency:
+            # Async mode: run jobs as tasks on this process's event loop
+            from boards.workers.actors import broker
+            from boards.workers.executor import run_async_worker
+
+            run_async_worker(
+                broker,
+                concurrency=concurrency,
+                queues=queue_list or None,
+                queue_concurrency=queue_concurrency,
+            )
+            return
+
         # Start the worker
         from dramatiq.cli import main as dramatiq_main
 
@@ -56,7 +72,6 @@ def start_worker(
             args.extend(["--queues", queue])
 
         # Override sys.argv for dramatiq CLI
-        original_argv = sys.argv
         sys.argv = args
 
         dramatiq_main()
@@ -71,6 +86,40 @@ def start_worker(
         sys.argv = original_argv
 
 
+def parse_queue_concurrency(value: str | None) -> dict[str, int]:
+    """Parse ``video=4,lora=1`` into concurrency limits by queue name.
+
+    Keys are queue names or duration classes (see boards.workers.queues).
+    """
+    from boards.workers.queues import resolve_queue_name
+
+    limits: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in (value or "").split(","))):
+        name, _, limit = item.partition("=")
+        if not name.strip() or not limit.strip().isdigit() or int(limit) < 1:
+            raise click.BadParameter(f"expected QUEUE=N with N >= 1, got {item!r}")
+        limits[resolve_queue_name(name.strip())] = int(limit)
+    return limits
+
+
+def parse_queues(value: str | None) -> list[str]:
+    """Parse ``video,lora`` into the queue names a worker consumes.
+
+    Items are queue names or duration classes. The control queue
+    (``job_queue_name``) is always included: continuations, polling,
+    cancellation and failure handling run there.
+    """
+    from boards.config import settings
+    from boards.workers.queues import resolve_queue_name
+
+    names = [
+        resolve_queue_name(name) for name in filter(None, map(str.strip, (value or "").split(",")))
+    ]
+    if names and settings.job_queue_name not in names:
+        names.append(settings.job_queue_name)
+    return names
+
+
 @click.command()
 @click.option(
     "--processes",
@@ -84,10 +133,30 @@ def start_worker(
     type=int,
     help="Number of worker threads per process (default: 1)",
 )
+@click.option(
+    "--concurrency",
+    default=None,
+    type=click.IntRange(min=1),
+    help=(
+        "Run up to this many jobs at once as async tasks on one event loop, "
+        "instead of one job per thread. Runs a single process."
+    ),
+)
 @click.option(
     "--queues",
-    default="boards-jobs",
-    help="Comma-separated list of queues to process (default: boards-jobs)",
+    default=None,
+    help=(
+        "Comma-separated queue names or duration classes to process (default: all "
+        "queues). The control queue is always processed."
+    ),
+)
+@click.option(
+    "--queue-concurrency",
+    default=None,
+    help=(
+        "Comma-separated QUEUE=N limits on the jobs of a queue run at once, e.g. "
+        "'video=4,lora=1'. QUEUE is a queue name or duration class. Requires --concurrency."
+    ),
 )
 @click.option(
     "--log-level",
@@ -99,7 +168,9 @@ def start_worker(
 def main(
     processes: int,
     threads: int,
-    queues: str,
+    concurrency: int | None,
+    queues: str | None,
+    queue_concurrency: str | None,
     log_level: str,
 ) -> None:
     """Start Boards background workers."""
@@ -107,17 +178,26 @@ def main(
     # Configure logging
     configure_logging(debug=(log_level == "debug"))
 
-    queue_list = [q.strip() for q in queues.split(",")]
+    if concurrency is not None and processes > 1:
+        raise click.UsageError("--concurrency runs a single process; omit --processes")
+
+    if queue_concurrency and concurrency is None:
+        raise click.UsageError("--queue-concurrency requires --concurrency")
+    queue_limits = parse_queue_concurrency(queue_concurrency)
+
+    queue_list = parse_queues(queues)
 
     logger.info(
         "Starting Boards workers",
         processes=processes,
         threads=threads,
-        queues=queue_list,
+        concurrency=concurrency,
+        queues=queue_list or "all",
+        queue_concurrency=queue_limits,
         log_level=log_level,
     )
 
-    start_worker(processes, threads, queue_list, log_level)
+    start_worker(processes, threads, queue_list, log_level, concurrency, queue_limits)
 
 
 # meaningless
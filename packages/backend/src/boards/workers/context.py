@@ -2,24 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+from urllib.parse import urlparse
 from uuid import UUID, uuid4
 
+from ..config import settings
 from ..database.connection import get_async_session
 from ..generators import resolution
 from ..generators.artifacts import (
     AudioArtifact,
+    DigitalArtifact,
     ImageArtifact,
     TextArtifact,
     VideoArtifact,
 )
+from ..generators.base import ImageOutput, InputProfile, ResultOutput, VideoOutput
 from ..jobs import repository as jobs_repo
 from ..logging import get_logger
 from ..progress.models import ProgressUpdate
 from ..progress.publisher import ProgressPublisher
 from ..storage.base import StorageManager
+from .artifact_cache import ArtifactCache, get_artifact_cache
+from .input_preparation import InputPreparer, get_input_preparer
+from .workspace import JobWorkspace, ScratchSpace, get_scratch_space
 
 logger = get_logger(__name__)
 
+# Host of the files fal.ai serves its outputs from
+FAL_CDN_HOST = "fal.media"
+
 
 class GeneratorExecutionContext:
     def __init__(
@@ -33,6 +46,11 @@ class GeneratorExecutionContext:
         generator_name: str,
         artifact_type: str,
         input_params: dict,
+        scratch_space: ScratchSpace | None = None,
+        artifact_cache: ArtifactCache | None = None,
+        pipeline_id: str | None = None,
+        input_profile: InputProfile | None = None,
+        input_preparer: InputPreparer | None = None,
     ) -> None:
         self.generation_id = str(generation_id)
         self.publisher = publisher
@@ -45,6 +63,16 @@ class GeneratorExecutionContext:
         self.input_params = input_params
         self._batch_id: str | None = None
         self._batch_generations: list[str] = []
+        # Set when the generation is a step of a pipeline (see jobs/pipelines.py)
+        self.pipeline_id = pipeline_id
+        # Scratch directory for downloaded inputs, removed by cleanup()
+        self.workspace: JobWorkspace = (scratch_space or get_scratch_space()).workspace(
+            self.generation_id
+        )
+        self.artifact_cache = artifact_cache or get_artifact_cache()
+        # Image inputs are prepared to the generator's profile unless preparation is off
+        self.input_preparer = input_preparer or get_input_preparer()
+        self.input_profile = input_profile if self.input_preparer is not None else None
         logger.info(
             "Created execution context",
             generation_id=str(generation_id),
@@ -53,16 +81,43 @@ class GeneratorExecutionContext:
         )
 
     async def resolve_artifact(self, artifact) -> str:
-        """Resolve an artifact to a file path."""
+        """Resolve an artifact to a file path.
+
+        Inputs already downloaded on this host are served from the artifact cache;
+        fresh downloads are added to it. Image inputs of generators with an input
+        profile are resolved to their prepared variant, which is cached as well.
+        """
         logger.debug("Resolving artifact", generation_id=self.generation_id)
+        profile = self.input_profile if isinstance(artifact, ImageArtifact) else None
         try:
-            result = await resolution.resolve_artifact(artifact)
+            result = None
+            if self.artifact_cache is not None:
+                if profile is not None:
+                    cached = self.artifact_cache.get(artifact, self.workspace, variant=profile.key)
+                    if cached is not None:
+                        return cached
+                # A cached original still has to be prepared to the profile
+                result = self.artifact_cache.get(artifact, self.workspace)
+            if result is None:
+                result = await resolution.resolve_artifact(artifact, workspace=self.workspace)
+                # Only downloads land in the workspace; local paths are used as-is
+                if self.artifact_cache is not None and Path(result).parent == self.workspace.path:
+                    await self.artifact_cache.put(artifact, result)
+            if profile is not None and self.input_preparer is not None:
+                result = await self.input_preparer.prepare(result, self.workspace, profile)
+                if self.artifact_cache is not None and Path(result).parent == self.workspace.path:
+                    await self.artifact_cache.put(artifact, result, variant=profile.key)
             logger.debug("Artifact resolved successfully", result=result)
             return result
         except Exception as e:
             logger.error("Failed to resolve artifact", error=str(e))
             raise
 
+    def cleanup(self) -> None:
+        """Delete the job's scratch files. Called once the job has finished."""
+        self.workspace.cleanup()
+        logger.debug("Cleaned up job workspace", generation_id=self.generation_id)
+
     async def store_image_result(
         self,
         storage_url: str,
@@ -102,6 +157,7 @@ class GeneratorExecutionContext:
                 width=width,
                 height=height,
             )
+            await self._share_provider_url(result, storage_url)
             logger.info(
                 "Image result stored",
                 generation_id=target_generation_id,
@@ -157,6 +213,7 @@ class GeneratorExecutionContext:
                 duration=duration,
                 fps=fps,
             )
+            await self._share_provider_url(result, storage_url)
             logger.info(
                 "Video result stored",
                 generation_id=target_generation_id,
@@ -209,6 +266,7 @@ class GeneratorExecutionContext:
                 sample_rate=sample_rate,
                 channels=channels,
             )
+            await self._share_provider_url(result, storage_url)
             logger.info(
                 "Audio result stored",
                 generation_id=target_generation_id,
@@ -262,6 +320,77 @@ class GeneratorExecutionContext:
             logger.error("Failed to store text result", error=str(e))
             raise
 
+    async def store_many(self, outputs: Sequence[ResultOutput]) -> list[DigitalArtifact]:
+        """Store all outputs of a multi-output job at once.
+
+        The batch generations of outputs 1+ are created with one INSERT, then the
+        outputs are downloaded and uploaded concurrently, at most
+        ``output_store_concurrency`` at a time.
+
+        Args:
+            outputs: Provider outputs; output ``i`` is stored with ``output_index=i``
+
+        Returns:
+            The stored artifacts, in the order of ``outputs``
+        """
+        generation_ids = await self._reserve_outputs(len(outputs))
+        semaphore = asyncio.Semaphore(max(1, settings.output_store_concurrency))
+
+        async def store(output: ResultOutput, generation_id: str) -> DigitalArtifact:
+            async with semaphore:
+                return await self._store_output(output, generation_id)
+
+        try:
+            artifacts = await asyncio.gather(
+                *(
+                    store(output, generation_id)
+                    for output, generation_id in zip(outputs, generation_ids, strict=True)
+                )
+            )
+        except Exception as e:
+            logger.error("Failed to store results", generation_id=self.generation_id, error=str(e))
+            raise
+        logger.info(
+            "Results stored",
+            generation_id=self.generation_id,
+            output_count=len(outputs),
+            batch_id=self._batch_id,
+        )
+        return list(artifacts)
+
+    async def _store_output(self, output: ResultOutput, generation_id: str) -> DigitalArtifact:
+        common = {
+            "storage_manager": self.storage_manager,
+            "generation_id": generation_id,
+            "tenant_id": self.tenant_id,
+            "board_id": self.board_id,
+            **output.model_dump(),
+        }
+        result: DigitalArtifact
+        if isinstance(output, ImageOutput):
+            result = await resolution.store_image_result(**common)
+        elif isinstance(output, VideoOutput):
+            result = await resolution.store_video_result(**common)
+        else:
+            result = await resolution.store_audio_result(**common)
+        await self._share_provider_url(result, output.storage_url)
+        return result
+
+    async def _share_provider_url(self, artifact: DigitalArtifact, provider_url: str) -> None:
+        """Let later fal jobs (e.g. downstream pipeline steps) use an output still on fal's CDN.
+
+        Such jobs find the URL in the fal upload cache instead of downloading the
+        stored artifact and uploading it to fal again.
+        """
+        host = urlparse(provider_url).hostname or ""
+        if host != FAL_CDN_HOST and not host.endswith(f".{FAL_CDN_HOST}"):
+            return
+        from ..generators.implementations.fal.utils import get_fal_upload_cache
+
+        cache = get_fal_upload_cache()
+        if cache is not None:
+            await cache.set_many([(artifact, provider_url)])
+
     async def publish_progress(self, update: ProgressUpdate) -> None:
         """Publish progress update for the generation."""
         logger.debug(
@@ -346,3 +475,34 @@ class GeneratorExecutionContext:
             batch_index=output_index,
         )
         return batch_gen_id
+
+    async def _reserve_outputs(self, count: int) -> list[str]:
+        """Generation IDs for outputs ``0..count-1``, creating missing batch records at once."""
+        if count <= 1:
+            return [self.generation_id][:count]
+        if self._batch_id is None:
+            self._batch_id = str(uuid4())
+
+        missing = range(len(self._batch_generations) + 1, count)
+        if missing:
+            async with get_async_session() as session:
+                created = await jobs_repo.create_batch_generations(
+                    session,
+                    tenant_id=UUID(self.tenant_id),
+                    board_id=UUID(self.board_id),
+                    user_id=UUID(self.user_id),
+                    generator_name=self.generator_name,
+                    artifact_type=self.artifact_type,
+                    input_params=self.input_params,
+                    batch_id=self._batch_id,
+                    batch_indexes=list(missing),
+                )
+                await session.commit()
+            self._batch_generations.extend(created)
+            logger.info(
+                "Created batch generation records",
+                primary_generation_id=self.generation_id,
+                batch_id=self._batch_id,
+                batch_count=len(created),
+            )
+        return [self.generation_id, *self._batch_generations[: count - 1]]
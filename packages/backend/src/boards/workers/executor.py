@@ -0,0 +1,264 @@
+"""Dramatiq worker that runs many async jobs at once on one event loop.
+
+Dramatiq's own worker processes each message on a worker thread, and a thread
+running an async actor blocks until the actor returns. Generations spend
+nearly all their time waiting on providers, so with one job per thread the
+thread count caps the jobs in flight. AsyncWorker keeps Dramatiq's consumers
+but starts every message as a task on the AsyncIO middleware's event loop, so
+one process runs up to ``concurrency`` jobs while they share its database
+pool and Redis client.
+
+The TimeLimit and ShutdownNotifications middleware act on the thread that
+runs a message, which here is the event loop's. AsyncWorker bypasses them and
+enforces time limits with asyncio timeouts instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import signal
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from queue import Empty
+from typing import Any
+
+from dramatiq import Actor, Broker, Worker
+from dramatiq.asyncio import get_event_loop_thread
+from dramatiq.broker import MessageProxy
+from dramatiq.errors import RateLimitExceeded, Retry
+from dramatiq.middleware import (
+    MiddlewareError,
+    ShutdownNotifications,
+    SkipMessage,
+    TimeLimit,
+    TimeLimitExceeded,
+)
+from dramatiq.worker import DELAY_QUEUE_PREFETCH, QUEUE_PREFETCH
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+# Middleware that interrupts the thread running a message
+_THREAD_BOUND_MIDDLEWARE = (TimeLimit, ShutdownNotifications)
+
+
+class AsyncWorker(Worker):
+    """Worker that runs up to ``concurrency`` messages as tasks on one event loop.
+
+    Requires the AsyncIO middleware. Synchronous actors run in the event
+    loop's default executor and are not time limited.
+
+    Args:
+        broker: The broker to consume from
+        concurrency: Most messages processed at once
+        queues: Queues to consume; all declared queues by default
+        queue_concurrency: Most messages of a queue processed at once, by queue name
+        worker_timeout: Milliseconds to wait for messages before checking for shutdown
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        *,
+        concurrency: int,
+        queues: Iterable[str] | None = None,
+        queue_concurrency: Mapping[str, int] | None = None,
+        worker_timeout: int = 1000,
+    ) -> None:
+        # The one worker thread only hands messages to the event loop
+        super().__init__(broker, queues=queues, worker_timeout=worker_timeout, worker_threads=1)
+        self.concurrency = concurrency
+        # Prefetch as Dramatiq would for a thread per concurrent message
+        self.queue_prefetch = QUEUE_PREFETCH or min(concurrency * 2, 65535)
+        self.delay_prefetch = DELAY_QUEUE_PREFETCH or min(concurrency * 1000, 65535)
+        self.queue_concurrency = dict(queue_concurrency or {})
+
+    def _add_consumer(self, queue_name: str, *, delay: bool = False) -> None:
+        limit = None if delay else self.queue_concurrency.get(queue_name)
+        if limit is None:
+            super()._add_consumer(queue_name, delay=delay)
+            return
+        # Messages count against the prefetch until they are acked, so a consumer
+        # prefetching `limit` messages never has more than `limit` of them in flight
+        queue_prefetch = self.queue_prefetch
+        self.queue_prefetch = min(limit, queue_prefetch)
+        try:
+            super()._add_consumer(queue_name, delay=delay)
+        finally:
+            self.queue_prefetch = queue_prefetch
+
+    def _add_worker(self) -> None:
+        event_loop_thread = get_event_loop_thread()
+        if event_loop_thread is None:
+            raise RuntimeError("AsyncWorker requires the AsyncIO middleware")
+        dispatcher = _LoopDispatcher(self, event_loop_thread.loop)
+        dispatcher.start()
+        self.workers.append(dispatcher)
+
+
+class _LoopDispatcher(threading.Thread):
+    """Moves messages from the work queue onto the event loop, a bounded number at a time."""
+
+    def __init__(self, worker: AsyncWorker, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(daemon=True, name="AsyncWorkerDispatcher")
+        self.worker = worker
+        self.broker = worker.broker
+        self.loop = loop
+        self.slots = threading.BoundedSemaphore(worker.concurrency)
+        self.running = False
+        self.paused = False
+        self.paused_event = threading.Event()
+        self.timeout = worker.worker_timeout / 1000
+        self.default_time_limit: int | None = next(
+            (m.time_limit for m in self.broker.middleware if isinstance(m, TimeLimit)), None
+        )
+
+    def run(self) -> None:
+        self.running = True
+        self.broker.emit_after("worker_thread_boot", self)
+        while self.running:
+            if self.paused:
+                self.paused_event.set()
+                time.sleep(self.timeout)
+                continue
+            if not self.slots.acquire(timeout=self.timeout):
+                continue
+            try:
+                _, message = self.worker.work_queue.get(timeout=self.timeout)
+            except Empty:
+                self.slots.release()
+                continue
+            asyncio.run_coroutine_threadsafe(self._process(message), self.loop)
+
+        # Let the messages in flight finish before the worker stops the event loop
+        for _ in range(self.worker.concurrency):
+            self.slots.acquire()
+        self.broker.emit_before("worker_thread_shutdown", self)
+
+    def pause(self) -> None:
+        self.paused = True
+        self.paused_event.clear()
+
+    def resume(self) -> None:
+        self.paused = False
+        self.paused_event.clear()
+
+    def stop(self) -> None:
+        self.running = False
+
+    async def _process(self, message: MessageProxy) -> None:
+        """Process one message like Dramatiq's worker threads do, then ack or nack it."""
+        try:
+            self._emit_before("process_message", message)
+            result = None
+            if not message.failed:
+                actor = self.broker.get_actor(message.actor_name)
+                result = await self._call(actor, message)
+            self._emit_after("process_message", message, result=result)
+        except SkipMessage as e:
+            if message.failed:
+                message.stuff_exception(e)
+            logger.warning("Message was skipped", message_id=message.message_id)
+            self._emit_after("skip_message", message)
+        except BaseException as e:
+            message.stuff_exception(e)
+            if not isinstance(e, Retry | RateLimitExceeded):
+                logger.error(
+                    "Failed to process message",
+                    message_id=message.message_id,
+                    actor_name=message.actor_name,
+                    error=repr(e),
+                    exc_info=True,
+                )
+            self._emit_after("process_message", message, exception=e)
+        finally:
+            try:
+                # Acks are blocking broker calls that retry while the connection is down
+                consumer = self.worker.consumers[message.queue_name]
+                await asyncio.to_thread(consumer.post_process_message, message)
+            finally:
+                self.worker.work_queue.task_done()
+                message.clear_exception()
+                self.slots.release()
+
+    async def _call(self, actor: Actor, message: MessageProxy) -> Any:
+        fn = getattr(actor.fn, "__wrapped__", actor.fn)
+        if not inspect.iscoroutinefunction(fn):
+            return await asyncio.to_thread(actor.fn, *message.args, **message.kwargs)
+
+        time_limit = (
+            message.options.get("time_limit")
+            or actor.options.get("time_limit")
+            or self.default_time_limit
+        )
+        deadline = asyncio.timeout(time_limit / 1000 if time_limit else None)
+        try:
+            async with deadline:
+                return await fn(*message.args, **message.kwargs)
+        except TimeoutError:
+            if deadline.expired():
+                raise TimeLimitExceeded(f"Time limit of {time_limit}ms exceeded") from None
+            raise
+
+    def _emit_before(self, signal_name: str, *args: Any, **kwargs: Any) -> None:
+        for middleware in self.broker.middleware:
+            if isinstance(middleware, _THREAD_BOUND_MIDDLEWARE):
+                continue
+            try:
+                getattr(middleware, "before_" + signal_name)(self.broker, *args, **kwargs)
+            except MiddlewareError:
+                raise
+            except Exception:
+                logger.critical(
+                    "Unexpected middleware failure",
+                    signal="before_" + signal_name,
+                    middleware=type(middleware).__name__,
+                    exc_info=True,
+                )
+
+    def _emit_after(self, signal_name: str, *args: Any, **kwargs: Any) -> None:
+        for middleware in reversed(self.broker.middleware):
+            if isinstance(middleware, _THREAD_BOUND_MIDDLEWARE):
+                continue
+            try:
+                getattr(middleware, "after_" + signal_name)(self.broker, *args, **kwargs)
+            except Exception:
+                logger.critical(
+                    "Unexpected middleware failure",
+                    signal="after_" + signal_name,
+                    middleware=type(middleware).__name__,
+                    exc_info=True,
+                )
+
+
+def run_async_worker(
+    broker: Broker,
+    *,
+    concurrency: int,
+    queues: Iterable[str] | None = None,
+    queue_concurrency: Mapping[str, int] | None = None,
+) -> None:
+    """Run an AsyncWorker in this process until it receives SIGINT or SIGTERM."""
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    broker.emit_after("process_boot")
+    worker = AsyncWorker(
+        broker, concurrency=concurrency, queues=queues, queue_concurrency=queue_concurrency
+    )
+    worker.start()
+    logger.info(
+        "Async worker started", concurrency=concurrency, queue_concurrency=queue_concurrency
+    )
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        logger.info("Async worker shutting down, waiting for jobs in flight")
+        worker.stop()
+        broker.emit_before("process_stop")
+        broker.close()
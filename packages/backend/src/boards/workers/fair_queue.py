@@ -0,0 +1,256 @@
+"""Weighted fair scheduling of generations across tenants.
+
+Dramatiq queues are FIFO, so a tenant that submits 500 generations at once
+makes everyone else wait behind all of them. With fair scheduling enabled a
+generation first waits in its tenant's sub-queue in Redis. A dispatcher moves
+generations into the job queue in deficit round-robin order, so each tenant
+with waiting work gets a share of the dispatches proportional to its weight,
+however much it submitted.
+
+The dispatcher keeps at most ``max_backlog`` messages waiting in each job
+queue. The order is therefore decided here rather than by Dramatiq, while
+workers still always have a message ready. It runs when a generation is
+submitted and whenever a worker finishes one. A Redis lock makes sure only
+one process dispatches at a time. Messages taken from the sub-queues wait in
+a dispatching list until they are enqueued; the next dispatch enqueues any
+that a failed or interrupted one left there, so a generation is never lost,
+though one may rarely be enqueued twice.
+
+Queue wait per tenant, from submission to dispatch, is recorded in the
+``boards.generation.queue_wait`` histogram and in the dispatch log line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Mapping
+from typing import cast
+from uuid import uuid4
+
+import redis.asyncio as redis
+from dramatiq import Broker, Message
+from opentelemetry import metrics
+
+from ..logging import get_logger
+from .queues import enqueue_many
+
+logger = get_logger(__name__)
+
+FAIR_QUEUE_PREFIX = "boards:fairqueue"
+
+_queue_wait = metrics.get_meter(__name__).create_histogram(
+    "boards.generation.queue_wait",
+    unit="s",
+    description="Time from submitting a generation until it is dispatched to a job queue",
+)
+
+
+class TenantFairQueue:
+    """Per-tenant sub-queues in front of the job queues, drained by weighted round-robin.
+
+    Args:
+        redis_client: Redis shared by the API and all workers
+        broker: Broker that dispatched messages are enqueued on
+        weights: Weight by tenant ID; tenants without one weigh 1. Weights must be
+            positive: a tenant with nothing to its credit would never be served
+        max_backlog: Most messages left waiting in a job queue
+        lock_timeout: Seconds to wait for another dispatcher to finish
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        broker: Broker,
+        *,
+        weights: Mapping[str, float] | None = None,
+        max_backlog: int = 20,
+        lock_timeout: float = 5.0,
+    ) -> None:
+        self._redis = redis_client
+        self._broker = broker
+        self.weights = dict(weights or {})
+        invalid = sorted(tenant for tenant, weight in self.weights.items() if not weight > 0)
+        if invalid:
+            raise ValueError(f"Fair queue weights must be positive; invalid for: {invalid}")
+        self.max_backlog = max_backlog
+        self.lock_timeout = lock_timeout
+        # Where the broker keeps a queue's waiting messages (see dramatiq's Redis broker)
+        self._broker_namespace = getattr(broker, "namespace", "dramatiq")
+
+    def weight(self, tenant_id: str) -> float:
+        return self.weights.get(tenant_id, 1.0)
+
+    async def push(self, tenant_id: str, *messages: Message) -> None:
+        """Add messages to the back of their tenant's sub-queues."""
+        by_queue: dict[str, list[bytes]] = {}
+        for message in messages:
+            by_queue.setdefault(message.queue_name, []).append(message.encode())
+        for queue_name, data in by_queue.items():
+            await self._redis.rpush(self._tenant_key(queue_name, tenant_id), *data)
+            # Membership is added after the messages so a dispatcher never drops a
+            # tenant that has just been given work (see _take)
+            await self._redis.sadd(self._tenants_key(queue_name), tenant_id)
+            await self._redis.sadd(f"{FAIR_QUEUE_PREFIX}:queues", queue_name)
+
+    async def dispatch(self) -> int:
+        """Move waiting messages to the job queues that have room; returns how many."""
+        token = await self._lock()
+        if token is None:
+            logger.warning("Another fair queue dispatcher did not finish in time")
+            return 0
+        try:
+            dispatched = 0
+            for queue_name in sorted(await self._members(f"{FAIR_QUEUE_PREFIX}:queues")):
+                dispatched += await self._dispatch_queue(queue_name)
+            return dispatched
+        finally:
+            await self._unlock(token)
+
+    async def _dispatch_queue(self, queue_name: str) -> int:
+        dispatching_key = self._dispatching_key(queue_name)
+        interrupted = await self._redis.lrange(dispatching_key, 0, -1)
+        if interrupted:
+            logger.warning(
+                "Finishing an interrupted fair queue dispatch",
+                queue_name=queue_name,
+                count=len(interrupted),
+            )
+            enqueue_many(self._broker, [_decode(data) for data in interrupted])
+            await self._redis.delete(dispatching_key)
+
+        backlog = await self._redis.llen(f"{self._broker_namespace}:{queue_name}")
+        room = self.max_backlog - backlog
+        if room > 0:
+            now = time.time()
+            taken = await self._take(queue_name, room)
+            messages = [_decode(data) for _, data in taken]
+            enqueue_many(self._broker, messages)
+            await self._redis.delete(dispatching_key)
+            self._record_dispatches(queue_name, taken, messages, now)
+        else:
+            taken = []
+
+        if not await self._redis.scard(self._tenants_key(queue_name)):
+            await self._redis.srem(f"{FAIR_QUEUE_PREFIX}:queues", queue_name)
+            # Re-check in case a push raced the removal
+            if await self._redis.scard(self._tenants_key(queue_name)):
+                await self._redis.sadd(f"{FAIR_QUEUE_PREFIX}:queues", queue_name)
+        return len(interrupted) + len(taken)
+
+    def _record_dispatches(
+        self,
+        queue_name: str,
+        taken: list[tuple[str, str | bytes]],
+        messages: list[Message],
+        now: float,
+    ) -> None:
+        for (tenant_id, _), message in zip(taken, messages, strict=True):
+            wait = max(0.0, now - message.message_timestamp / 1000)
+            _queue_wait.record(wait, {"tenant_id": tenant_id, "queue": queue_name})
+            logger.info(
+                "Generation dispatched",
+                generation_id=message.args[0] if message.args else None,
+                tenant_id=tenant_id,
+                queue_name=queue_name,
+                queue_wait_seconds=round(wait, 3),
+            )
+
+    async def _take(self, queue_name: str, limit: int) -> list[tuple[str, str | bytes]]:
+        """Move up to ``limit`` messages to the dispatching list by deficit round-robin.
+
+        Each turn credits the tenant its weight and pops one message per whole
+        credit. Credit left at the end of a turn carries to the tenant's next
+        turn, so fractional weights get their share over several rounds. A
+        tenant's credit is dropped when its sub-queue empties. The round order
+        and credits are only touched while holding the dispatch lock.
+        """
+        state_key = f"{FAIR_QUEUE_PREFIX}:{queue_name}:state"
+        raw_state = await self._redis.get(state_key)
+        state = json.loads(raw_state) if raw_state else {}
+        order: list[str] = state.get("order", [])
+        deficits: dict[str, float] = state.get("deficits", {})
+        turn: str | None = state.get("turn")
+
+        # Tenants that got work since the last dispatch join the end of the round
+        members = await self._members(self._tenants_key(queue_name))
+        order = [tenant for tenant in order if tenant in members]
+        order.extend(sorted(members - set(order)))
+
+        dispatching_key = self._dispatching_key(queue_name)
+        taken: list[tuple[str, str | bytes]] = []
+        while order and len(taken) < limit:
+            tenant_id = order[0]
+            if turn != tenant_id:
+                turn = tenant_id
+                deficits[tenant_id] = deficits.get(tenant_id, 0.0) + self.weight(tenant_id)
+
+            tenant_key = self._tenant_key(queue_name, tenant_id)
+            while deficits[tenant_id] >= 1 and len(taken) < limit:
+                data = cast(
+                    str | bytes | None,
+                    await self._redis.lmove(tenant_key, dispatching_key, "LEFT", "RIGHT"),
+                )
+                if data is None:
+                    break
+                taken.append((tenant_id, data))
+                deficits[tenant_id] -= 1
+
+            if await self._redis.llen(tenant_key) == 0:
+                # Re-check after leaving the round, in case a push raced the check
+                await self._redis.srem(self._tenants_key(queue_name), tenant_id)
+                if await self._redis.llen(tenant_key) == 0:
+                    order.pop(0)
+                    deficits.pop(tenant_id, None)
+                    turn = None
+                    continue
+                await self._redis.sadd(self._tenants_key(queue_name), tenant_id)
+            if deficits[tenant_id] >= 1:
+                # Out of room mid-turn; the tenant continues its turn next dispatch
+                break
+            order.append(order.pop(0))
+            turn = None
+
+        await self._redis.set(
+            state_key, json.dumps({"order": order, "deficits": deficits, "turn": turn})
+        )
+        return taken
+
+    async def _members(self, key: str) -> set[str]:
+        return {
+            member.decode() if isinstance(member, bytes) else member
+            for member in await self._redis.smembers(key)
+        }
+
+    async def _lock(self) -> str | None:
+        token = str(uuid4())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        lock_ms = int(self.lock_timeout * 1000)
+        while not await self._redis.set(f"{FAIR_QUEUE_PREFIX}:lock", token, nx=True, px=lock_ms):
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(0.01)
+        return token
+
+    async def _unlock(self, token: str) -> None:
+        holder = await self._redis.get(f"{FAIR_QUEUE_PREFIX}:lock")
+        if holder in (token, token.encode()):
+            await self._redis.delete(f"{FAIR_QUEUE_PREFIX}:lock")
+
+    @staticmethod
+    def _dispatching_key(queue_name: str) -> str:
+        return f"{FAIR_QUEUE_PREFIX}:{queue_name}:dispatching"
+
+    @staticmethod
+    def _tenants_key(queue_name: str) -> str:
+        return f"{FAIR_QUEUE_PREFIX}:{queue_name}:tenants"
+
+    @staticmethod
+    def _tenant_key(queue_name: str, tenant_id: str) -> str:
+        return f"{FAIR_QUEUE_PREFIX}:{queue_name}:tenant:{tenant_id}"
+
+
+def _decode(data: str | bytes) -> Message:
+    return Message.decode(data.encode() if isinstance(data, str) else data)
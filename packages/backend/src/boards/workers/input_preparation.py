@@ -0,0 +1,162 @@
+"""Downsizing and re-encoding of image inputs before they reach a provider.
+
+Most edit and try-on models work at around 1024px, yet inputs are stored as
+generated, often as 4K PNGs, and were uploaded to the provider as they are.
+Generators declare an InputProfile; resolve_artifact() then scales image inputs
+down to the profile's maximum dimension and re-encodes them in the first
+accepted format that can hold them. Decoding and encoding run in a process
+pool, so they neither block the event loop nor hold the GIL of worker threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from ..config import Settings
+from ..generators.base import InputProfile
+from ..logging import get_logger
+from .workspace import JobWorkspace
+
+logger = get_logger(__name__)
+
+# Encoder quality of each InputProfile.quality preset (JPEG and WebP)
+QUALITY_PRESETS = {"high": 90, "balanced": 82, "small": 72}
+
+_SUFFIXES = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+_ALPHA_FORMATS = {"png", "webp"}
+
+
+class InputPreparer:
+    """Prepares image inputs to a generator's InputProfile on an executor.
+
+    Args:
+        executor: Pool the Pillow work runs on (a process pool in workers)
+    """
+
+    def __init__(self, executor: Executor) -> None:
+        self._executor = executor
+
+    async def prepare(self, path: str, workspace: JobWorkspace, profile: InputProfile) -> str:
+        """Prepare the image at ``path`` for ``profile``.
+
+        Returns:
+            Path of the prepared image in the workspace, or ``path`` itself when
+            the image already fits the profile or cannot be prepared
+        """
+        target = workspace.new_file(prefix="boards_prepared_")
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._executor, prepare_image, path, str(target), profile
+            )
+        except Exception as e:
+            # The original is still a valid input, just a larger one
+            logger.warning("Failed to prepare input image", path=path, error=str(e))
+            return path
+        if result != path:
+            prepared_bytes = os.path.getsize(result)
+            workspace.add_bytes(prepared_bytes)
+            logger.debug(
+                "Prepared input image",
+                profile=profile.key,
+                original_bytes=os.path.getsize(path),
+                prepared_bytes=prepared_bytes,
+            )
+        return result
+
+
+def prepare_image(source: str, target: str, profile: InputProfile) -> str:
+    """Write ``source`` prepared for ``profile`` to ``target`` plus a format suffix.
+
+    Runs in the preparation pool.
+
+    Returns:
+        The path written, or ``source`` when preparing would not make it smaller
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        if getattr(image, "is_animated", False):
+            return source
+        source_format = _normalize_format(image.format)
+        fits = max(image.size) <= profile.max_dimension
+        accepted = source_format in profile.formats
+        # Re-encoding a lossy image that already fits only loses quality
+        if fits and accepted and source_format != "png":
+            return source
+
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        output_format = _output_format(profile.formats, has_alpha)
+        prepared = ImageOps.exif_transpose(image)
+        if not fits:
+            prepared.thumbnail(
+                (profile.max_dimension, profile.max_dimension), Image.Resampling.LANCZOS
+            )
+
+        if has_alpha and output_format in _ALPHA_FORMATS:
+            prepared = prepared.convert("RGBA")
+        elif has_alpha:
+            # JPEG has no alpha channel; flatten onto white like most viewers show it
+            rgba = prepared.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba)
+            prepared = background
+        elif prepared.mode not in ("RGB", "L"):
+            prepared = prepared.convert("RGB")
+
+        output = target + _SUFFIXES[output_format]
+        quality = QUALITY_PRESETS[profile.quality]
+        if output_format == "jpeg":
+            prepared.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+        elif output_format == "webp":
+            prepared.save(output, "WEBP", quality=quality, method=4)
+        else:
+            prepared.save(output, "PNG", optimize=True)
+
+    if fits and accepted and os.path.getsize(output) >= os.path.getsize(source):
+        os.unlink(output)
+        return source
+    return output
+
+
+def _normalize_format(pil_format: str | None) -> str | None:
+    if pil_format is None:
+        return None
+    name = pil_format.lower()
+    return "jpeg" if name in ("jpg", "mpo") else name
+
+
+def _output_format(formats: tuple[str, ...], has_alpha: bool) -> str:
+    known = [name for name in formats if name in _SUFFIXES]
+    if not known:
+        raise ValueError(f"No supported output format in {formats}")
+    if has_alpha:
+        for name in known:
+            if name in _ALPHA_FORMATS:
+                return name
+    return known[0]
+
+
+_input_preparer: InputPreparer | None = None
+_input_preparer_configured = False
+
+
+def get_input_preparer(settings: Settings | None = None) -> InputPreparer | None:
+    """Get the input preparer shared by all jobs in this process, or None if disabled."""
+    global _input_preparer, _input_preparer_configured
+    if not _input_preparer_configured:
+        settings = settings or Settings()
+        if settings.input_preparation_enabled:
+            # Spawned, since forking a process that runs worker threads is unsafe
+            executor = ProcessPoolExecutor(
+                max_workers=settings.input_preparation_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _input_preparer = InputPreparer(executor)
+        _input_preparer_configured = True
+    return _input_preparer
@@ -7,6 +7,7 @@ particularly for loading generators during worker startup.
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from dramatiq.middleware import Middleware
 
@@ -14,6 +15,8 @@ from ..config import initialize_generator_api_keys, settings
 from ..generators.loader import load_generators_from_config
 from ..generators.registry import registry as generator_registry
 from ..logging import configure_logging, get_logger
+from .queues import declare_generation_queues
+from .workspace import get_scratch_space
 
 if TYPE_CHECKING:
     from dramatiq import Broker, Worker
@@ -54,6 +57,8 @@ class GeneratorLoaderMiddleware(Middleware):
         logger.info("Generator API keys initialized in worker process")
 
         load_generators_from_config()
+        # Consume the queues of the loaded generators' duration classes
+        declare_generation_queues(broker)
 
         logger.info(
             "Generators loaded in worker process",
@@ -61,3 +66,54 @@ class GeneratorLoaderMiddleware(Middleware):
             generator_count=len(generator_registry.list_names()),
             generators=generator_registry.list_names(),
         )
+
+
+class ScratchSweepMiddleware(Middleware):
+    """Middleware that sweeps stale job scratch directories at worker startup.
+
+    Jobs delete their own scratch directory when they finish, but a worker
+    that crashes or is killed mid-job leaves its directories behind. Each
+    worker process removes directories whose owning process is gone before
+    it starts taking jobs.
+    """
+
+    def before_worker_boot(self, broker: Broker, worker: Worker) -> None:
+        try:
+            get_scratch_space(settings).sweep()
+        except Exception as e:
+            logger.warning("Failed to sweep scratch directories", error=str(e))
+
+
+class PollerStartMiddleware(Middleware):
+    """Middleware that starts the external job poller when a worker boots.
+
+    In continuation mode suspended generations are only finished if the
+    poll_external_jobs chain runs. Each booting worker starts a chain; all but
+    the chain that owns the poller end on their first run.
+    """
+
+    def after_worker_boot(self, broker: Broker, worker: Worker) -> None:
+        if not settings.job_continuation_enabled:
+            return
+        try:
+            broker.get_actor("poll_external_jobs").send(str(uuid4()))
+        except Exception as e:
+            logger.warning("Failed to start the external job poller", error=str(e))
+
+
+class FairQueueDispatchMiddleware(Middleware):
+    """Middleware that dispatches waiting generations when a worker boots.
+
+    With fair scheduling, generations wait in tenant queues until a submission
+    or a finishing job dispatches them. A booting worker dispatches once so
+    generations submitted while the job queues were full and no job was
+    running still get picked up.
+    """
+
+    def after_worker_boot(self, broker: Broker, worker: Worker) -> None:
+        if not settings.fair_queue_enabled:
+            return
+        try:
+            broker.get_actor("dispatch_tenant_queues").send()
+        except Exception as e:
+            logger.warning("Failed to dispatch tenant queues", error=str(e))
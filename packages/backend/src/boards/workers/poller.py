@@ -0,0 +1,184 @@
+"""Central poller for the provider jobs of suspended generations.
+
+In continuation mode a generation waits on its provider job without holding a
+worker. Rather than every job scheduling its own status checks, one poller run
+claims all jobs whose next check is due, checks them in one batch per
+generator and hands finished jobs to resume_generation. Jobs are checked soon
+after submission and then less and less often, with jitter so that jobs
+submitted together do not stay in lockstep.
+
+The poller runs as a chain of poll_external_jobs messages, each scheduling the
+next. A Redis key names the chain that owns the poller; chains that find
+another owner end, so duplicates started by restarting workers die out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy import Row
+
+from ..config import Settings
+from ..database.connection import get_async_session
+from ..generators.base import ExternalJobStatus, ResumableGenerator
+from ..generators.registry import registry as generator_registry
+from ..jobs import repository as jobs_repo
+from ..logging import get_logger
+from ..progress.models import ProgressUpdate
+from ..progress.publisher import ProgressPublisher
+
+logger = get_logger(__name__)
+
+POLLER_OWNER_KEY = "boards:poller:owner"
+
+
+def next_check_delay(checks: int, config: Settings) -> float:
+    """Seconds until a job that has been checked ``checks`` times is checked again."""
+    delay = min(
+        config.job_continuation_poll_interval * config.job_continuation_poll_backoff**checks,
+        config.job_continuation_poll_max_interval,
+    )
+    jitter = config.job_continuation_poll_jitter
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+def next_check_at(checks: int, config: Settings) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=next_check_delay(checks, config))
+
+
+async def claim_poller_turn(redis_client: redis.Redis, chain_id: str, ttl: float) -> bool:
+    """Whether the poller chain ``chain_id`` owns the poller and should run now.
+
+    A chain takes ownership when nobody holds it and keeps it by running
+    within ``ttl`` seconds of its previous run.
+    """
+    ttl_ms = int(ttl * 1000)
+    if await redis_client.set(POLLER_OWNER_KEY, chain_id, nx=True, px=ttl_ms):
+        return True
+    if await redis_client.get(POLLER_OWNER_KEY) == chain_id:
+        await redis_client.pexpire(POLLER_OWNER_KEY, ttl_ms)
+        return True
+    return False
+
+
+async def poller_running(redis_client: redis.Redis) -> bool:
+    return bool(await redis_client.exists(POLLER_OWNER_KEY))
+
+
+class ExternalJobPoller:
+    """Checks the provider jobs of all suspended generations that are due.
+
+    Args:
+        config: Settings with the poll schedule and batch size
+        publisher: Publishes progress reported by providers
+        resume: Sends a finished job to resume_generation; called with the
+            generation ID and whether its provider job is known to have completed
+    """
+
+    def __init__(
+        self,
+        config: Settings,
+        publisher: ProgressPublisher,
+        resume: Callable[[str, bool], None],
+    ) -> None:
+        self.config = config
+        self.publisher = publisher
+        self.resume = resume
+
+    async def run_once(self) -> int:
+        """Check one batch of due jobs. Returns the number of jobs checked."""
+        async with get_async_session() as session:
+            jobs = await jobs_repo.claim_due_continuations(
+                session,
+                claim_timeout=self.config.job_continuation_claim_timeout,
+                limit=self.config.job_poller_batch_size,
+            )
+        if not jobs:
+            return 0
+
+        by_generator: defaultdict[str, list[Row[Any]]] = defaultdict(list)
+        for job in jobs:
+            by_generator[job.generator_name].append(job)
+        checked = await asyncio.gather(
+            *(self._check(name, group) for name, group in by_generator.items())
+        )
+
+        released: dict[str, dict[str, Any]] = {}
+        progress: list[tuple[str, float]] = []
+        finished: list[tuple[str, bool]] = []
+        for job, status in (pair for group in checked for pair in group):
+            generation_id = str(job.id)
+            continuation = dict(job.continuation)
+            if status is not None and status.state == "pending" and not self._timed_out(job):
+                checks = continuation.get("checks", 0) + 1
+                continuation["checks"] = checks
+                continuation["next_check_at"] = next_check_at(checks, self.config).isoformat()
+                if status.progress is not None:
+                    progress.append((generation_id, status.progress))
+            else:
+                # resume_generation finishes the job. Should its message get lost,
+                # the poller looks at the job again once the claim would be stale.
+                retry_at = datetime.now(UTC) + timedelta(
+                    seconds=self.config.job_continuation_claim_timeout
+                )
+                continuation["next_check_at"] = retry_at.isoformat()
+                finished.append((generation_id, status is not None and status.state == "completed"))
+            released[generation_id] = continuation
+
+        async with get_async_session() as session:
+            await jobs_repo.release_continuations(session, released)
+
+        for generation_id, value in progress:
+            await self.publisher.publish_progress(
+                generation_id,
+                ProgressUpdate(
+                    job_id=generation_id,
+                    status="processing",
+                    progress=value,
+                    phase="processing",
+                ),
+            )
+        for generation_id, completed in finished:
+            self.resume(generation_id, completed)
+
+        logger.debug("Polled provider jobs", checked=len(jobs), finished=len(finished))
+        return len(jobs)
+
+    async def _check(
+        self, generator_name: str, jobs: Sequence[Row[Any]]
+    ) -> list[tuple[Row[Any], ExternalJobStatus | None]]:
+        """Check one generator's jobs. None marks jobs that resume_generation must fail."""
+        generator = generator_registry.get(generator_name)
+        if not isinstance(generator, ResumableGenerator):
+            return [(job, None) for job in jobs]
+        pollable = [job for job in jobs if job.external_job_id]
+        results: list[tuple[Row[Any], ExternalJobStatus | None]] = [
+            (job, None) for job in jobs if not job.external_job_id
+        ]
+
+        try:
+            statuses = await generator.check_statuses([job.external_job_id for job in pollable])
+        except Exception as e:
+            statuses = [e] * len(pollable)
+        for job, status in zip(pollable, statuses, strict=True):
+            if isinstance(status, BaseException):
+                # A failed status request says nothing about the provider job
+                logger.warning(
+                    "Provider status check failed",
+                    generation_id=str(job.id),
+                    external_job_id=job.external_job_id,
+                    error=str(status),
+                )
+                status = ExternalJobStatus(state="pending")
+            results.append((job, status))
+        return results
+
+    def _timed_out(self, job: Row[Any]) -> bool:
+        suspended_at = datetime.fromisoformat(job.continuation["suspended_at"])
+        return datetime.now(UTC) - suspended_at > timedelta(seconds=self.config.job_timeout)
@@ -0,0 +1,104 @@
+"""Queues that generation jobs run on.
+
+A generation is enqueued on the queue of its generator's duration class,
+``<job_queue_name>-<class>``, so a backlog of long jobs (a batch of video
+generations) does not delay the quick ones (image edits) queued behind it. A
+generator's class is its ``queue_class``, which a generators config
+declaration can also set, and otherwise its artifact type.
+
+Workers consume every queue unless started with ``--queues``, which always
+adds the control queue ``job_queue_name``. Async workers
+take ``--queue-concurrency`` to cap how many jobs of one class they run at
+once, keeping slots free for the other classes.
+
+Continuation, polling, cancellation and failure messages stay on
+``job_queue_name``; they only hold a worker briefly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from uuid import uuid4
+
+from dramatiq import Broker, Message
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.common import current_millis
+
+from ..config import settings
+from ..generators.base import BaseGenerator
+from ..generators.loader import VALID_ARTIFACT_TYPES
+from ..generators.registry import registry as generator_registry
+
+
+def generation_queue_name(queue_class: str) -> str:
+    """Name of the queue that jobs of ``queue_class`` run on."""
+    return f"{settings.job_queue_name}-{queue_class}"
+
+
+def queue_class_of(generator: BaseGenerator) -> str:
+    return generator.queue_class or generator.artifact_type
+
+
+def queue_for_generator(generator_name: str) -> str:
+    """Queue to enqueue a generation of ``generator_name`` on."""
+    if not settings.job_queue_routing_enabled:
+        return settings.job_queue_name
+    generator = generator_registry.get(generator_name)
+    if generator is None:
+        # The job fails when processed; the default queue is as good as any
+        return settings.job_queue_name
+    return generation_queue_name(queue_class_of(generator))
+
+
+def generation_queue_names() -> list[str]:
+    """Queues of every artifact type and of every registered generator's class."""
+    classes = set(VALID_ARTIFACT_TYPES)
+    classes.update(queue_class_of(generator) for generator in generator_registry.list_all())
+    return sorted(generation_queue_name(queue_class) for queue_class in classes)
+
+
+def declare_generation_queues(broker: Broker) -> None:
+    """Declare the generation queues so the broker's workers consume them."""
+    if not settings.job_queue_routing_enabled:
+        return
+    for queue_name in generation_queue_names():
+        broker.declare_queue(queue_name)
+
+
+def resolve_queue_name(name: str) -> str:
+    """Queue named by ``name``, which is a queue name or a duration class."""
+    if name == settings.job_queue_name or name.startswith(f"{settings.job_queue_name}-"):
+        return name
+    return generation_queue_name(name)
+
+
+def enqueue_many(broker: Broker, messages: Sequence[Message]) -> list[Message]:
+    """Enqueue many messages; on the Redis broker in one pipelined round trip."""
+    if not isinstance(broker, RedisBroker):
+        return [broker.enqueue(message) for message in messages]
+
+    # Mirrors RedisBroker.enqueue, queueing its dispatch script on a pipeline
+    dispatch = broker.scripts["dispatch"]
+    enqueued: list[Message] = []
+    with broker.client.pipeline(transaction=False) as pipe:
+        for message in messages:
+            message = message.copy(options={"redis_message_id": str(uuid4())})
+            broker.emit_before("enqueue", message, None)
+            args = [
+                "enqueue",
+                current_millis(),
+                message.queue_name,
+                broker.broker_id,
+                broker.heartbeat_timeout,
+                broker.dead_message_ttl,
+                0,  # Leave queue maintenance to regular enqueues
+                broker._max_unpack_size(),
+                message.options["redis_message_id"],
+                message.encode(),
+            ]
+            dispatch(keys=[broker.namespace], args=args, client=pipe)
+            enqueued.append(message)
+        pipe.execute()
+    for message in enqueued:
+        broker.emit_after("enqueue", message, None)
+    return enqueued
@@ -20,6 +20,7 @@ import click
 
 from boards import __version__
 from boards.logging import configure_logging, get_logger
+from boards.workers.cli import parse_queues
 from boards.workers.health import start_health_server_thread
 
 logger = get_logger(__name__)
@@ -38,10 +39,21 @@ logger = get_logger(__name__)
     type=int,
     help="Number of worker threads per process (default: 50)",
 )
+@click.option(
+    "--concurrency",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Run up to this many jobs at once on one event loop (see boards-worker)",
+)
 @click.option(
     "--queues",
-    default="boards-jobs",
-    help="Comma-separated list of queues to process (default: boards-jobs)",
+    default=None,
+    help="Comma-separated queues or duration classes to process (see boards-worker)",
+)
+@click.option(
+    "--queue-concurrency",
+    default=None,
+    help="Comma-separated QUEUE=N limits per queue, e.g. 'video=4' (see boards-worker)",
 )
 @click.option(
     "--log-level",
@@ -59,7 +71,9 @@ logger = get_logger(__name__)
 def main(
     processes: int,
     threads: int,
-    queues: str,
+    concurrency: int | None,
+    queues: str | None,
+    queue_concurrency: str | None,
     log_level: str,
     health_port: int | None,
 ) -> None:
@@ -71,13 +85,18 @@ def main(
     if health_port is None:
         health_port = int(os.environ.get("PORT", 8080))
 
-    queue_list = [q.strip() for q in queues.split(",")]
+    if queue_concurrency and concurrency is None:
+        raise click.UsageError("--queue-concurrency requires --concurrency")
+
+    queue_list = parse_queues(queues)
 
     logger.info(
         "Starting Boards worker with health server",
         processes=processes,
         threads=threads,
-        queues=queue_list,
+        concurrency=concurrency,
+        queues=queue_list or "all",
+        queue_concurrency=queue_concurrency,
         health_port=health_port,
         log_level=log_level,
     )
@@ -86,20 +105,34 @@ def main(
     start_health_server_thread(health_port)
     logger.info("Health check server running", port=health_port)
 
-    # Build dramatiq-gevent command
-    cmd = [
-        "dramatiq-gevent",
-        "boards.workers.actors:broker",
-        f"--processes={processes}",
-        f"--threads={threads}",
-    ]
-
-    for queue in queue_list:
-        cmd.extend(["--queues", queue])
-
-    logger.info("Starting dramatiq-gevent worker", cmd=" ".join(cmd))
-
-    # Run dramatiq-gevent (blocking)
+    if concurrency is not None:
+        # Async mode runs jobs as tasks on one event loop rather than on greenlets
+        cmd = [
+            sys.executable,
+            "-m",
+            "boards.workers.cli",
+            f"--concurrency={concurrency}",
+            f"--log-level={log_level}",
+        ]
+        if queue_list:
+            cmd.append(f"--queues={','.join(queue_list)}")
+        if queue_concurrency:
+            cmd.append(f"--queue-concurrency={queue_concurrency}")
+    else:
+        # Build dramatiq-gevent command
+        cmd = [
+            "dramatiq-gevent",
+            "boards.workers.actors:broker",
+            f"--processes={processes}",
+            f"--threads={threads}",
+        ]
+
+        for queue in queue_list:
+            cmd.extend(["--queues", queue])
+
+    logger.info("Starting worker", cmd=" ".join(cmd))
+
+    # Run the worker (blocking)
     try:
         result = subprocess.run(cmd)
         sys.exit(result.returncode)
@@ -0,0 +1,171 @@
+"""Per-job scratch workspaces for files downloaded while running generators.
+
+Each job gets its own directory under the worker's scratch root, removed when
+the job finishes whether it succeeded or not. Bytes written to all workspaces
+of a worker process count against a shared quota; when the quota is used up,
+jobs that hold no space yet wait before their first download until other jobs
+release theirs. A job that holds space is never made to wait, since it could
+only wait on itself or on jobs waiting on it; running jobs may therefore take
+the quota past its limit. Directories left behind by crashed workers are swept
+when a worker starts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from ..config import Settings
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+_JOB_DIR_PREFIX = "job-"
+
+
+class ScratchQuotaExceeded(RuntimeError):
+    """Raised when scratch space does not free up within the wait timeout."""
+
+
+def default_scratch_root() -> Path:
+    return Path(tempfile.gettempdir()) / "boards-scratch"
+
+
+class ScratchSpace:
+    """Scratch root and disk quota shared by all jobs in a worker process."""
+
+    def __init__(
+        self,
+        root: Path,
+        quota_bytes: int,
+        wait_timeout: float = 300.0,
+        poll_interval: float = 0.5,
+    ) -> None:
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.used_bytes = 0
+
+    def workspace(self, generation_id: str) -> JobWorkspace:
+        return JobWorkspace(self, generation_id)
+
+    async def wait_for_capacity(self, workspace: JobWorkspace | None = None) -> None:
+        """Block while the quota is used up, until other jobs release space.
+
+        Returns at once for a ``workspace`` that was already admitted.
+        """
+
+        def must_wait() -> bool:
+            if workspace is not None and workspace.admitted:
+                return False
+            return self.used_bytes >= self.quota_bytes
+
+        if not must_wait():
+            return
+        logger.warning(
+            "Scratch quota reached, waiting for space",
+            used_bytes=self.used_bytes,
+            quota_bytes=self.quota_bytes,
+        )
+        deadline = time.monotonic() + self.wait_timeout
+        while must_wait():
+            if time.monotonic() >= deadline:
+                raise ScratchQuotaExceeded(
+                    f"Scratch quota of {self.quota_bytes} bytes still in use "
+                    f"after {self.wait_timeout}s"
+                )
+            await asyncio.sleep(self.poll_interval)
+
+    def sweep(self) -> int:
+        """Remove job directories left behind by worker processes that are gone.
+
+        Returns:
+            Number of directories removed
+        """
+        if not self.root.is_dir():
+            return 0
+        removed = 0
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or not entry.name.startswith(_JOB_DIR_PREFIX):
+                continue
+            pid = _owner_pid(entry.name)
+            if pid is not None and pid != os.getpid() and _process_alive(pid):
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+        if removed:
+            logger.info("Swept stale scratch directories", root=str(self.root), removed=removed)
+        return removed
+
+
+class JobWorkspace:
+    """Scratch directory for a single job, created on first use."""
+
+    def __init__(self, space: ScratchSpace, generation_id: str) -> None:
+        self.space = space
+        self.path = space.root / f"{_JOB_DIR_PREFIX}{os.getpid()}-{generation_id}"
+        self.used_bytes = 0
+        # Set once the job got past the quota; it is not made to wait again
+        self.admitted = False
+
+    def new_file(self, suffix: str = "", prefix: str = "") -> Path:
+        """Return a fresh, not yet existing path inside the workspace."""
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return self.path / f"{prefix}{uuid.uuid4().hex[:8]}{suffix}"
+
+    async def wait_for_capacity(self) -> None:
+        """Wait for space before a download, unless the job was already admitted."""
+        await self.space.wait_for_capacity(self)
+        self.admitted = True
+
+    def add_bytes(self, count: int) -> None:
+        """Account for bytes written to the workspace."""
+        self.used_bytes += count
+        self.space.used_bytes += count
+
+    def cleanup(self) -> None:
+        """Delete the workspace directory and release its quota."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.space.used_bytes -= self.used_bytes
+        self.used_bytes = 0
+        self.admitted = False
+
+
+def _owner_pid(dir_name: str) -> int | None:
+    try:
+        return int(dir_name[len(_JOB_DIR_PREFIX) :].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_scratch_space: ScratchSpace | None = None
+
+
+def get_scratch_space(settings: Settings | None = None) -> ScratchSpace:
+    """Get the scratch space shared by all jobs in this worker process."""
+    global _scratch_space
+    if _scratch_space is None:
+        settings = settings or Settings()
+        root = Path(settings.scratch_dir) if settings.scratch_dir else default_scratch_root()
+        _scratch_space = ScratchSpace(
+            root,
+            quota_bytes=settings.scratch_quota_bytes,
+            wait_timeout=settings.scratch_quota_wait_timeout,
+        )
+    return _scratch_space
@@ -366,3 +366,11 @@ def image_resolving_context() -> ImageResolvingContext:
             result = await generator.generate(inputs, image_resolving_context)
     """
     return ImageResolvingContext()
+
+
+@pytest.fixture(autouse=True)
+def disable_fal_upload_cache(monkeypatch):
+    """Keep generator tests independent of any Redis that happens to be running."""
+    monkeypatch.setattr(
+        "boards.generators.implementations.fal.utils.get_fal_upload_cache", lambda: None
+    )
@@ -0,0 +1,133 @@
+"""Tests for the fal.ai upload URL cache used when staging input artifacts."""
+
+import sys
+from types import ModuleType
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.base import InputProfile
+from boards.generators.implementations.fal import utils as fal_utils
+from boards.generators.implementations.fal.utils import FalUploadCache, upload_artifacts_to_fal
+
+
+def _artifact(generation_id: str) -> ImageArtifact:
+    return ImageArtifact(
+        generation_id=generation_id,
+        storage_url=f"https://storage.example.com/{generation_id}.png",
+        width=512,
+        height=512,
+        format="png",
+    )
+
+
+@pytest.fixture
+def fal_client(monkeypatch):
+    mock_fal_client = ModuleType("fal_client")
+    mock_fal_client.upload_file_async = AsyncMock(  # type: ignore[attr-defined]
+        side_effect=lambda path: f"https://fal.media/{path.rsplit('/', 1)[-1]}"
+    )
+    monkeypatch.setitem(sys.modules, "fal_client", mock_fal_client)
+    return mock_fal_client
+
+
+@pytest.fixture
+def redis_client():
+    store: dict[str, str] = {}
+    ttls: dict[str, int | None] = {}
+    client = MagicMock()
+    client.mget = AsyncMock(side_effect=lambda keys: [store.get(key) for key in keys])
+
+    def pipeline(transaction=True):
+        pipe = MagicMock()
+
+        def set_value(key, value, ex=None):
+            store[key] = value
+            ttls[key] = ex
+
+        pipe.set.side_effect = set_value
+        pipe.execute = AsyncMock()
+        return pipe
+
+    client.pipeline.side_effect = pipeline
+    client.store = store
+    client.ttls = ttls
+    return client
+
+
+@pytest.fixture
+def context():
+    ctx = MagicMock()
+    ctx.input_profile = None
+    ctx.resolve_artifact = AsyncMock(
+        side_effect=lambda artifact: f"/scratch/{artifact.generation_id}.png"
+    )
+    return ctx
+
+
+class TestFalUploadCache:
+    @pytest.mark.asyncio
+    async def test_cached_artifacts_skip_download_and_upload(
+        self, monkeypatch, fal_client, redis_client, context
+    ):
+        cache = FalUploadCache(redis_client, ttl=3600)
+        monkeypatch.setattr(fal_utils, "get_fal_upload_cache", lambda: cache)
+        first, second = _artifact("gen-a"), _artifact("gen-b")
+
+        urls = await upload_artifacts_to_fal([first], context)
+        assert urls == ["https://fal.media/gen-a.png"]
+        assert redis_client.store[FalUploadCache.key(first)] == "https://fal.media/gen-a.png"
+
+        urls = await upload_artifacts_to_fal([first, second], context)
+
+        assert urls == ["https://fal.media/gen-a.png", "https://fal.media/gen-b.png"]
+        assert fal_client.upload_file_async.await_count == 2
+        resolved = [call.args[0].generation_id for call in context.resolve_artifact.await_args_list]
+        assert resolved == ["gen-a", "gen-b"]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_upload(
+        self, monkeypatch, fal_client, redis_client, context
+    ):
+        redis_client.mget = AsyncMock(side_effect=ConnectionError("redis down"))
+        redis_client.pipeline.side_effect = ConnectionError("redis down")
+        cache = FalUploadCache(redis_client, ttl=3600)
+        monkeypatch.setattr(fal_utils, "get_fal_upload_cache", lambda: cache)
+
+        urls = await upload_artifacts_to_fal([_artifact("gen-a")], context)
+
+        assert urls == ["https://fal.media/gen-a.png"]
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_with_ttl(self, redis_client):
+        cache = FalUploadCache(redis_client, ttl=1234)
+        artifact = _artifact("gen-a")
+
+        await cache.set_many([(artifact, "https://fal.media/x.png")])
+
+        assert redis_client.store == {FalUploadCache.key(artifact): "https://fal.media/x.png"}
+        assert redis_client.ttls == {FalUploadCache.key(artifact): 1234}
+
+    def test_key_changes_with_storage_url(self):
+        artifact = _artifact("gen-a")
+        moved = artifact.model_copy(update={"storage_url": "https://cdn.example.com/gen-a.png"})
+
+        assert FalUploadCache.key(artifact) != FalUploadCache.key(moved)
+        assert FalUploadCache.key(artifact).startswith("fal:upload:gen-a:")
+
+    @pytest.mark.asyncio
+    async def test_prepared_uploads_cached_per_profile(self, redis_client):
+        cache = FalUploadCache(redis_client, ttl=3600)
+        profile = InputProfile(max_dimension=1024)
+        prepared, original = _artifact("gen-a"), _artifact("gen-b")
+        await cache.set_many([(prepared, "https://fal.media/small.webp")], profile)
+        await cache.set_many([(original, "https://fal.media/gen-b.png")])
+
+        # A prepared upload is never handed to a generator that wants the original
+        assert await cache.get_many([prepared]) == [None]
+        # An original already on fal is reused instead of uploading a smaller copy
+        assert await cache.get_many([prepared, original], profile) == [
+            "https://fal.media/small.webp",
+            "https://fal.media/gen-b.png",
+        ]
@@ -0,0 +1,236 @@
+"""
+Tests for FalKolorsVirtualTryOnBatchGenerator.
+"""
+
+import asyncio
+import os
+import sys
+from types import ModuleType
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.base import GeneratorExecutionContext, GeneratorResult
+from boards.generators.implementations.fal.image.kolors_virtual_try_on_batch import (
+    FalKolorsVirtualTryOnBatchGenerator,
+    KolorsVirtualTryOnBatchInput,
+)
+from boards.generators.rate_limit import ProviderLimit, ProviderLimiter
+
+MODULE = "boards.generators.implementations.fal.image.kolors_virtual_try_on_batch"
+
+
+def _image(generation_id: str) -> ImageArtifact:
+    return ImageArtifact(
+        generation_id=generation_id,
+        storage_url=f"https://example.com/{generation_id}.png",
+        format="png",
+        width=512,
+        height=512,
+    )
+
+
+def _context(stored: list[dict]) -> GeneratorExecutionContext:
+    """A context that records the outputs stored through it."""
+
+    class DummyCtx(GeneratorExecutionContext):
+        generation_id = "test_gen"
+        provider_correlation_id = "corr"
+        tenant_id = "test_tenant"
+        board_id = "test_board"
+
+        async def resolve_artifact(self, artifact):
+            return f"/tmp/{artifact.generation_id}.png"
+
+        async def store_image_result(self, **kwargs):
+            stored.append(kwargs)
+            return ImageArtifact(
+                generation_id=f"gen-{kwargs['output_index']}",
+                storage_url=kwargs["storage_url"],
+                format=kwargs["format"],
+                width=kwargs["width"],
+                height=kwargs["height"],
+            )
+
+        async def store_video_result(self, *args, **kwargs):
+            raise NotImplementedError
+
+        async def store_audio_result(self, *args, **kwargs):
+            raise NotImplementedError
+
+        async def store_text_result(self, *args, **kwargs):
+            raise NotImplementedError
+
+        async def publish_progress(self, update):
+            return None
+
+        async def set_external_job_id(self, external_id: str) -> None:
+            return None
+
+    return DummyCtx()
+
+
+def _fal_client(get_result) -> ModuleType:
+    """A fal_client whose handlers answer ``get()`` with ``await get_result(arguments)``."""
+    handlers = []
+
+    def make_handler(arguments):
+        async def get():
+            return await get_result(arguments)
+
+        handler = MagicMock()
+        handler.get = get
+        handler.cancel = AsyncMock()
+        handlers.append(handler)
+        return handler
+
+    fal_client = ModuleType("fal_client")
+    fal_client.submit_async = AsyncMock(  # type: ignore[attr-defined]
+        side_effect=lambda endpoint, arguments: make_handler(arguments)
+    )
+    fal_client.upload_file_async = AsyncMock(  # type: ignore[attr-defined]
+        side_effect=lambda path: f"https://fal.media/files/{os.path.basename(path)}"
+    )
+    fal_client.handlers = handlers  # type: ignore[attr-defined]
+    return fal_client
+
+
+class TestKolorsVirtualTryOnBatchInput:
+    """Tests for KolorsVirtualTryOnBatchInput schema."""
+
+    def test_needs_at_least_one_garment(self):
+        with pytest.raises(ValidationError):
+            KolorsVirtualTryOnBatchInput(human_image_url=_image("human"), garment_image_urls=[])
+
+    def test_json_schema_lists_garments(self):
+        schema = KolorsVirtualTryOnBatchInput.model_json_schema()
+
+        assert schema["properties"]["garment_image_urls"]["type"] == "array"
+        assert schema["properties"]["garment_image_urls"]["maxItems"] == 50
+
+
+class TestFalKolorsVirtualTryOnBatchGenerator:
+    """Tests for FalKolorsVirtualTryOnBatchGenerator."""
+
+    def setup_method(self):
+        self.generator = FalKolorsVirtualTryOnBatchGenerator()
+
+    def test_generator_metadata(self):
+        assert self.generator.name == "fal-kolors-virtual-try-on-batch"
+        assert self.generator.artifact_type == "image"
+        assert self.generator.get_input_schema() == KolorsVirtualTryOnBatchInput
+
+    @pytest.mark.asyncio
+    async def test_generate_stages_once_and_submits_together(self):
+        """Each distinct image is uploaded once; all try-ons run at the same time."""
+        garments = [_image("shirt"), _image("dress"), _image("shirt")]
+        input_data = KolorsVirtualTryOnBatchInput(
+            human_image_url=_image("human"), garment_image_urls=garments
+        )
+        running = 0
+        max_running = 0
+
+        async def get(arguments):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            garment = arguments["garment_image_url"].rsplit("/", 1)[-1]
+            return {"image": {"url": f"https://fal.media/files/on-{garment}", "width": 768}}
+
+        mock_fal_client = _fal_client(get)
+        stored: list[dict] = []
+
+        with (
+            patch.dict(os.environ, {"FAL_KEY": "fake-key"}),
+            patch.dict(sys.modules, {"fal_client": mock_fal_client}),
+        ):
+            result = await self.generator.generate(input_data, _context(stored))
+
+        assert isinstance(result, GeneratorResult)
+        # The human and the two distinct garments are uploaded once each
+        assert mock_fal_client.upload_file_async.call_count == 3
+        assert max_running == 3
+        submitted = mock_fal_client.submit_async.call_args_list
+        assert [call.kwargs["arguments"] for call in submitted] == [
+            {
+                "human_image_url": "https://fal.media/files/human.png",
+                "garment_image_url": f"https://fal.media/files/{garment}.png",
+            }
+            for garment in ("shirt", "dress", "shirt")
+        ]
+        # One output per garment, in garment order
+        assert [kwargs["output_index"] for kwargs in stored] == [0, 1, 2]
+        assert [artifact.storage_url for artifact in result.outputs] == [
+            "https://fal.media/files/on-shirt.png",
+            "https://fal.media/files/on-dress.png",
+            "https://fal.media/files/on-shirt.png",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_try_ons_bounded_by_provider_concurrency(self):
+        garments = [_image(f"garment-{n}") for n in range(5)]
+        input_data = KolorsVirtualTryOnBatchInput(
+            human_image_url=_image("human"), garment_image_urls=garments
+        )
+        running = 0
+        max_running = 0
+
+        async def get(arguments):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"image": {"url": "https://fal.media/files/out.png"}}
+
+        limiter = ProviderLimiter(MagicMock(), {"fal": ProviderLimit(concurrency=2)})
+        with (
+            patch.dict(os.environ, {"FAL_KEY": "fake-key"}),
+            patch.dict(sys.modules, {"fal_client": _fal_client(get)}),
+            patch(f"{MODULE}.get_provider_limiter", return_value=limiter),
+        ):
+            result = await self.generator.generate(input_data, _context([]))
+
+        assert len(result.outputs) == 5
+        assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_try_on_cancels_the_others(self):
+        input_data = KolorsVirtualTryOnBatchInput(
+            human_image_url=_image("human"),
+            garment_image_urls=[_image("shirt"), _image("broken"), _image("dress")],
+        )
+
+        async def get(arguments):
+            if "broken" in arguments["garment_image_url"]:
+                return {"image": None}
+            await asyncio.sleep(3600)
+
+        fal_client = _fal_client(get)
+        stored: list[dict] = []
+        with (
+            patch.dict(os.environ, {"FAL_KEY": "fake-key"}),
+            patch.dict(sys.modules, {"fal_client": fal_client}),
+        ):
+            with pytest.raises(ValueError, match="No image returned from fal.ai API for garment 1"):
+                await asyncio.wait_for(self.generator.generate(input_data, _context(stored)), 1)
+
+        # The two try-ons still running are cancelled at fal, nothing is stored
+        shirt, broken, dress = fal_client.handlers  # type: ignore[attr-defined]
+        shirt.cancel.assert_awaited_once()
+        dress.cancel.assert_awaited_once()
+        broken.cancel.assert_not_awaited()
+        assert stored == []
+
+    @pytest.mark.asyncio
+    async def test_estimate_cost_per_garment(self):
+        input_data = KolorsVirtualTryOnBatchInput(
+            human_image_url=_image("human"),
+            garment_image_urls=[_image("shirt"), _image("dress")],
+        )
+
+        assert await self.generator.estimate_cost(input_data) == pytest.approx(0.10)
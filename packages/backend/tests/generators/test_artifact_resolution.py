@@ -0,0 +1,170 @@
+"""Tests for resolving generation IDs in generator inputs to artifacts."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from boards.generators.artifact_resolution import resolve_input_artifacts
+from boards.generators.artifacts import ImageArtifact, VideoArtifact
+
+TENANT_ID = uuid4()
+
+
+class MultiInput(BaseModel):
+    prompt: str
+    image_sources: list[ImageArtifact]
+    first_frame: ImageArtifact
+    video_source: VideoArtifact
+
+
+def _row(artifact_type: str = "image", **overrides) -> SimpleNamespace:
+    values = {
+        "id": uuid4(),
+        "tenant_id": TENANT_ID,
+        "status": "completed",
+        "artifact_type": artifact_type,
+        "storage_url": f"https://example.com/{artifact_type}",
+        "output_metadata": {"width": 512, "height": 512},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _session(rows: list[SimpleNamespace]) -> MagicMock:
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=rows)
+    return session
+
+
+def _params(images, first_frame, video) -> dict:
+    return {
+        "prompt": "a cat",
+        "image_sources": [str(row.id) for row in images],
+        "first_frame": str(first_frame.id),
+        "video_source": str(video.id),
+    }
+
+
+class TestResolveInputArtifacts:
+    @pytest.mark.asyncio
+    async def test_all_fields_resolved_with_one_query(self):
+        images = [_row() for _ in range(3)]
+        first_frame = _row()
+        video = _row("video")
+        session = _session([*images, first_frame, video])
+
+        resolved, lineage = await resolve_input_artifacts(
+            _params(images, first_frame, video), MultiInput, session, TENANT_ID
+        )
+
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "boards.generations.id IN" in sql
+        assert "input_params" not in sql
+        assert [a.generation_id for a in resolved["image_sources"]] == [
+            str(row.id) for row in images
+        ]
+        assert isinstance(resolved["first_frame"], ImageArtifact)
+        assert isinstance(resolved["video_source"], VideoArtifact)
+        assert [entry["role"] for entry in lineage] == [
+            "image_sources",
+            "image_sources",
+            "image_sources",
+            "first_frame",
+            "video_source",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_generation_reported_per_field(self):
+        images = [_row()]
+        first_frame = _row()
+        video = _row("video")
+        session = _session([*images, video])
+
+        with pytest.raises(ValueError) as exc_info:
+            await resolve_input_artifacts(
+                _params(images, first_frame, video), MultiInput, session, TENANT_ID
+            )
+
+        assert str(exc_info.value) == (
+            f"Failed to resolve field 'first_frame': Generation {first_frame.id} not found"
+        )
+
+    @pytest.mark.asyncio
+    async def test_malformed_id_reported_as_not_found(self):
+        images = [_row()]
+        video = _row("video")
+        session = _session([*images, video])
+        params = _params(images, _row(), video)
+        params["first_frame"] = "not-a-uuid"
+
+        with pytest.raises(ValueError, match="Generation not-a-uuid not found"):
+            await resolve_input_artifacts(params, MultiInput, session, TENANT_ID)
+
+    @pytest.mark.asyncio
+    async def test_tenant_status_and_type_checks(self):
+        images = [_row(tenant_id=UUID(int=1))]
+        first_frame = _row(status="processing")
+        video = _row("image")
+        params = _params(images, first_frame, video)
+
+        with pytest.raises(ValueError, match="tenant mismatch"):
+            await resolve_input_artifacts(
+                params, MultiInput, _session([*images, first_frame, video]), TENANT_ID
+            )
+
+        images = [_row()]
+        params = _params(images, first_frame, video)
+        with pytest.raises(ValueError, match=r"is not completed \(status: processing\)"):
+            await resolve_input_artifacts(
+                params, MultiInput, _session([*images, first_frame, video]), TENANT_ID
+            )
+
+        first_frame = _row()
+        params = _params(images, first_frame, video)
+        with pytest.raises(ValueError, match="expected video, got image"):
+            await resolve_input_artifacts(
+                params, MultiInput, _session([*images, first_frame, video]), TENANT_ID
+            )
+
+    @pytest.mark.asyncio
+    async def test_already_resolved_fields_skip_query(self):
+        artifact = ImageArtifact(
+            generation_id="g",
+            storage_url="https://example.com/a.png",
+            format="png",
+            width=512,
+            height=512,
+        )
+        video = VideoArtifact(
+            generation_id="v",
+            storage_url="https://example.com/a.mp4",
+            format="mp4",
+            width=512,
+            height=512,
+            duration=None,
+            fps=None,
+        )
+        session = _session([])
+
+        resolved, lineage = await resolve_input_artifacts(
+            {
+                "prompt": "x",
+                "image_sources": [artifact],
+                "first_frame": artifact,
+                "video_source": video,
+            },
+            MultiInput,
+            session,
+            TENANT_ID,
+        )
+
+        session.execute.assert_not_awaited()
+        assert lineage == []
+        assert resolved["first_frame"] is artifact
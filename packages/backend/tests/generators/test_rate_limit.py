@@ -0,0 +1,126 @@
+"""Tests for the provider rate limiter shared by workers."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from boards.generators.rate_limit import (
+    ProviderBusyError,
+    ProviderLimit,
+    ProviderLimiter,
+)
+
+
+class ScriptedRedis:
+    """Answers the acquire script with queued results (0 acquired, -1 full, >0 ms to wait)."""
+
+    def __init__(self, *results: int) -> None:
+        self.results = list(results)
+        self.evals: list[tuple] = []
+        self.released: list[tuple[str, str]] = []
+
+    async def eval(self, script, numkeys, *args):
+        self.evals.append(args)
+        result = self.results.pop(0) if self.results else 0
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def zrem(self, key, member):
+        self.released.append((key, member))
+
+
+def _limiter(redis_client, **limits: ProviderLimit) -> ProviderLimiter:
+    return ProviderLimiter(redis_client, limits, retry_interval=0.001)  # type: ignore[arg-type]
+
+
+class TestProviderLimit:
+    def test_from_config(self):
+        limit = ProviderLimit.from_config({"requests_per_second": 2.5, "concurrency": 10})
+
+        assert limit.requests_per_second == 2.5
+        assert limit.concurrency == 10
+        # Without a burst, one second worth of requests may go at once
+        assert limit.bucket_size == 3
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"requests_per_second": 0}, {"concurrency": "ten"}, {"rps": 5}],
+    )
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            ProviderLimit.from_config(options)
+
+
+class TestProviderLimiter:
+    def test_scope_per_provider_and_tenant(self):
+        limiter = _limiter(
+            ScriptedRedis(),
+            fal=ProviderLimit(concurrency=5),
+            replicate=ProviderLimit(requests_per_second=1, per_tenant=True),
+        )
+
+        fal_scope = limiter.scope("fal", "tenant-1")
+        replicate_scope = limiter.scope("replicate", "tenant-1")
+        assert fal_scope is not None and fal_scope.key == "ratelimit:fal"
+        assert replicate_scope is not None and replicate_scope.key == "ratelimit:replicate:tenant-1"
+        assert limiter.scope("openai", "tenant-1") is None
+        assert limiter.scope(None) is None
+
+    @pytest.mark.asyncio
+    async def test_waits_for_slots_and_tokens(self):
+        redis_client = ScriptedRedis(-1, 5, 0)
+        limiter = _limiter(redis_client, fal=ProviderLimit(requests_per_second=2, concurrency=1))
+        scope = limiter.scope("fal")
+        assert scope is not None
+
+        await limiter.acquire(scope, "gen-1", ttl=60, timeout=5)
+
+        assert len(redis_client.evals) == 3
+        keys_and_args = redis_client.evals[0]
+        assert keys_and_args == (
+            "ratelimit:fal:tokens",
+            "ratelimit:fal:leases",
+            "gen-1",
+            2,
+            2,
+            1,
+            60000,
+        )
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_timeout(self):
+        redis_client = ScriptedRedis(*[-1] * 1000)
+        limiter = _limiter(redis_client, fal=ProviderLimit(concurrency=1))
+        scope = limiter.scope("fal")
+        assert scope is not None
+
+        with pytest.raises(ProviderBusyError):
+            await limiter.acquire(scope, "gen-1", ttl=60, timeout=0.02)
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_does_not_block_jobs(self):
+        redis_client = ScriptedRedis(ConnectionError("redis down"))  # type: ignore[arg-type]
+        limiter = _limiter(redis_client, fal=ProviderLimit(concurrency=1))
+        scope = limiter.scope("fal")
+        assert scope is not None
+
+        await limiter.acquire(scope, "gen-1", ttl=60, timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_hold_renews_and_releases_the_lease(self):
+        redis_client = ScriptedRedis()
+        limiter = _limiter(redis_client, fal=ProviderLimit(concurrency=1))
+        scope = limiter.scope("fal")
+        assert scope is not None
+
+        with pytest.raises(RuntimeError):
+            async with limiter.hold(scope, "gen-1", ttl=0.03, timeout=5):
+                await asyncio.sleep(0.05)
+                raise RuntimeError("provider error")
+
+        # Acquired once, then renewed every ttl / 3 while the job ran
+        assert len(redis_client.evals) > 1
+        assert redis_client.released == [("ratelimit:fal:leases", "gen-1")]
@@ -64,7 +64,7 @@ class TestResolveArtifact:
             result = await resolve_artifact(artifact)
 
             assert result == "/tmp/downloaded_audio.mp3"
-            mock_download.assert_called_once_with(artifact)
+            mock_download.assert_called_once_with(artifact, workspace=None)
 
     @pytest.mark.asyncio
     async def test_resolve_text_artifact_fails(self):
@@ -191,7 +191,7 @@ class TestFileExtensionDetection:
             await resolve_artifact(artifact)
 
             # Check that the artifact was passed correctly
-            mock_download.assert_called_once_with(artifact)
+            mock_download.assert_called_once_with(artifact, workspace=None)
 
     @pytest.mark.asyncio
     async def test_extension_without_dot(self):
@@ -209,7 +209,7 @@ class TestFileExtensionDetection:
 
             await resolve_artifact(artifact)
 
-            mock_download.assert_called_once_with(artifact)
+            mock_download.assert_called_once_with(artifact, workspace=None)
 
 
 class TestStoreResults:
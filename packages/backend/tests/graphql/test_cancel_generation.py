@@ -0,0 +1,108 @@
+"""
+Unit tests for the cancelGeneration mutation
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from boards.auth.context import AuthContext
+from boards.graphql.resolvers.generation import cancel_generation
+from boards.workers import actors
+
+RESOLVER = "boards.graphql.resolvers.generation"
+
+
+@pytest.fixture
+def auth_context():
+    return AuthContext(
+        user_id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        principal={"provider": "none", "subject": "test-user"},
+        token="test-token",
+    )
+
+
+@pytest.fixture
+def suspended(auth_context):
+    """A generation suspended on its provider job, holding a provider slot."""
+    now = datetime.now(UTC)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        tenant_id=auth_context.tenant_id,
+        board_id=uuid.uuid4(),
+        user_id=auth_context.user_id,
+        generator_name="kie-veo3",
+        artifact_type="video",
+        storage_url=None,
+        thumbnail_url=None,
+        additional_files=None,
+        input_params={},
+        output_metadata=None,
+        external_job_id="provider-job-1",
+        status="processing",
+        progress=Decimal("40.00"),
+        error_message=None,
+        started_at=now,
+        completed_at=None,
+        created_at=now,
+        updated_at=now,
+        pipeline=None,
+        continuation={"suspended_at": now.isoformat(), "rate_limit_scope": "provider:kie"},
+    )
+
+
+class TestCancelSuspendedGeneration:
+    @pytest.mark.asyncio
+    async def test_provider_slot_released_after_continuation_cleared(self, auth_context, suspended):
+        board = SimpleNamespace(
+            id=suspended.board_id, owner_id=auth_context.user_id, board_members=[]
+        )
+        session = AsyncMock()
+        gen_result, board_result = MagicMock(), MagicMock()
+        gen_result.scalar_one_or_none.return_value = suspended
+        board_result.scalar_one_or_none.return_value = board
+        session.execute.side_effect = [gen_result, board_result]
+
+        async def update_progress(session, generation_id, *, status, **kwargs):
+            # Terminal statuses clear the continuation, as the repository does
+            suspended.status = status
+            suspended.continuation = None
+
+        with (
+            patch(f"{RESOLVER}.get_auth_context_from_info", AsyncMock(return_value=auth_context)),
+            patch(f"{RESOLVER}.get_async_session") as get_session,
+            patch(f"{RESOLVER}.jobs_repo.update_progress", update_progress),
+            patch(f"{RESOLVER}.get_redis_client"),
+            patch(f"{RESOLVER}.request_cancellation", AsyncMock()),
+            patch(f"{RESOLVER}.cancel_external_job") as cancel_message,
+        ):
+            get_session.return_value.__aenter__.return_value = session
+            result = await cancel_generation(MagicMock(), suspended.id)
+
+        assert result.status.value == "cancelled"
+        cancel_message.send.assert_called_once()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield MagicMock()
+
+        limiter = MagicMock()
+        limiter.release = AsyncMock()
+        generator = MagicMock()
+        generator.cancel = AsyncMock()
+        with (
+            patch.object(actors, "get_async_session", fake_session),
+            patch.object(actors.jobs_repo, "get_generation", AsyncMock(return_value=suspended)),
+            patch.object(actors, "get_provider_limiter", lambda: limiter),
+            patch.object(actors.generator_registry, "get", lambda name: generator),
+        ):
+            await actors.cancel_external_job.fn.__wrapped__(*cancel_message.send.call_args.args)
+
+        limiter.release.assert_awaited_once_with("provider:kie", str(suspended.id))
+        generator.cancel.assert_awaited_once_with("provider-job-1")
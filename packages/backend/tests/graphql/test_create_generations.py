@@ -0,0 +1,149 @@
+"""
+Unit tests for the createGenerations batch mutation
+"""
+
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from boards.auth.context import AuthContext
+from boards.graphql.mutations.root import CreateGenerationInput
+from boards.graphql.resolvers.generation import create_generations
+from boards.graphql.types.generation import ArtifactType
+
+RESOLVER = "boards.graphql.resolvers.generation"
+
+
+@pytest.fixture
+def auth_context():
+    return AuthContext(
+        user_id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        principal={"provider": "none", "subject": "test-user"},
+        token="test-token",
+    )
+
+
+def _board(owner_id, members=()):
+    return SimpleNamespace(id=uuid.uuid4(), owner_id=owner_id, board_members=list(members))
+
+
+def _inputs(board, count):
+    return [
+        CreateGenerationInput(
+            board_id=board.id,
+            generator_name="flux-2",
+            artifact_type=ArtifactType.IMAGE,
+            input_params={"prompt": f"prompt {n}"},
+        )
+        for n in range(count)
+    ]
+
+
+def _created(session, *, tenant_id, user_id, generations):
+    now = datetime.now(UTC)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            user_id=user_id,
+            storage_url=None,
+            thumbnail_url=None,
+            additional_files=None,
+            output_metadata=None,
+            external_job_id=None,
+            status="pending",
+            progress=Decimal(0),
+            error_message=None,
+            started_at=None,
+            completed_at=None,
+            created_at=now,
+            updated_at=now,
+            **generation,
+        )
+        for generation in generations
+    ]
+
+
+@pytest.fixture
+def batch(auth_context):
+    """Patch the resolver's collaborators; ``boards`` is what the board query returns."""
+    session = AsyncMock()
+    boards: list = []
+    result = MagicMock()
+    result.scalars.return_value.all.side_effect = lambda: boards
+    session.execute.return_value = result
+
+    with (
+        patch(f"{RESOLVER}.get_auth_context_from_info", AsyncMock(return_value=auth_context)),
+        patch(f"{RESOLVER}.get_async_session") as get_session,
+        patch(f"{RESOLVER}.generator_registry", {"flux-2"}),
+        patch(
+            f"{RESOLVER}.jobs_repo.create_generations", AsyncMock(side_effect=_created)
+        ) as create,
+        patch(f"{RESOLVER}.enqueue_generations", AsyncMock(return_value=[])) as enqueue,
+    ):
+        get_session.return_value.__aenter__.return_value = session
+        yield SimpleNamespace(
+            session=session, boards=boards, create=create, enqueue=enqueue, info=MagicMock()
+        )
+
+
+class TestCreateGenerations:
+    @pytest.mark.asyncio
+    async def test_creates_and_enqueues_all_in_one_go(self, batch, auth_context):
+        own_board = _board(auth_context.user_id)
+        shared_board = _board(
+            uuid.uuid4(), [SimpleNamespace(user_id=auth_context.user_id, role="editor")]
+        )
+        batch.boards.extend([own_board, shared_board])
+        inputs = _inputs(own_board, 3) + _inputs(shared_board, 2)
+
+        result = await create_generations(batch.info, inputs)
+
+        assert [gen.input_params for gen in result] == [i.input_params for i in inputs]
+        assert all(gen.tenant_id == auth_context.tenant_id for gen in result)
+        # One board query, one insert, one commit and one enqueue for the whole batch
+        batch.session.execute.assert_awaited_once()
+        batch.create.assert_awaited_once()
+        batch.session.commit.assert_awaited_once()
+        [jobs] = batch.enqueue.await_args.args
+        assert [job.generation_id for job in jobs] == [str(gen.id) for gen in result]
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_created_without_access_to_every_board(self, batch, auth_context):
+        own_board = _board(auth_context.user_id)
+        viewed_board = _board(
+            uuid.uuid4(), [SimpleNamespace(user_id=auth_context.user_id, role="viewer")]
+        )
+        batch.boards.extend([own_board, viewed_board])
+
+        with pytest.raises(RuntimeError, match="Permission denied"):
+            await create_generations(batch.info, _inputs(own_board, 2) + _inputs(viewed_board, 1))
+
+        batch.create.assert_not_awaited()
+        batch.enqueue.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_generators_and_boards(self, batch, auth_context):
+        board = _board(auth_context.user_id)
+        unknown = _inputs(board, 1)
+        unknown[0].generator_name = "no-such-generator"
+
+        with pytest.raises(RuntimeError, match="Unknown generator: no-such-generator"):
+            await create_generations(batch.info, _inputs(board, 1) + unknown)
+        with pytest.raises(RuntimeError, match="Board not found"):
+            await create_generations(batch.info, _inputs(board, 1))
+
+        batch.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batches(self, batch, auth_context, monkeypatch):
+        monkeypatch.setattr(f"{RESOLVER}.settings.generation_batch_max_size", 2)
+
+        with pytest.raises(RuntimeError, match="Too many generations"):
+            await create_generations(batch.info, _inputs(_board(auth_context.user_id), 3))
@@ -257,6 +257,68 @@ class TestStorageManager:
         # Provider should not be called
         mock_provider.upload.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_store_artifact_streaming_reports_size(self, manager: StorageManager):
+        received: list[bytes] = []
+
+        async def consume(key, content, content_type, metadata):
+            async for chunk in content:
+                received.append(chunk)
+            return "http://example.com/file.jpg"
+
+        provider = AsyncMock()
+        provider.upload.side_effect = consume
+        manager.register_provider("local", provider)
+
+        async def chunks():
+            yield b"a" * 100
+            yield b"b" * 50
+
+        ref = await manager.store_artifact(
+            artifact_id="test123",
+            content=chunks(),
+            artifact_type="image",
+            content_type="image/jpeg",
+        )
+
+        assert ref.size == 150
+        assert b"".join(received) == b"a" * 100 + b"b" * 50
+        # Streams can't be replayed, so there is exactly one attempt
+        provider.upload.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_store_artifact_streaming_enforces_max_size(self, manager: StorageManager):
+        consumed = 0
+
+        async def consume(key, content, content_type, metadata):
+            nonlocal consumed
+            try:
+                async for chunk in content:
+                    consumed += len(chunk)
+            except Exception as e:
+                # Providers wrap stream errors in their own exception type
+                raise StorageException(f"upload failed: {e}") from e
+            return "http://example.com/file.jpg"
+
+        provider = AsyncMock()
+        provider.upload.side_effect = consume
+        manager.register_provider("local", provider)
+
+        async def chunks():
+            # 1MB limit from the fixture; stop reading as soon as it is exceeded
+            for _ in range(10):
+                yield b"x" * (512 * 1024)
+
+        with pytest.raises(ValidationException, match="exceeds limit"):
+            await manager.store_artifact(
+                artifact_id="test123",
+                content=chunks(),
+                artifact_type="image",
+                content_type="image/jpeg",
+            )
+
+        assert consumed == 1024 * 1024
+
     @pytest.mark.asyncio
     async def test_store_artifact_provider_not_found(self, manager: StorageManager):
         # No providers registered - should fail
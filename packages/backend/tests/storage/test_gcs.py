@@ -156,15 +156,25 @@ class TestGCSStorageProvider:
             mock_client.bucket.return_value = mock_bucket
             mock_bucket.blob.return_value = mock_blob
 
-            with patch.object(gcs_provider, "_run_sync") as mock_run_sync:
+            uploaded: dict[str, bytes] = {}
+
+            async def capture_upload(func, path, content_type):
+                with open(path, "rb") as f:
+                    uploaded["content"] = f.read()
+                uploaded["path"] = path
+
+            with patch.object(
+                gcs_provider, "_run_sync", side_effect=capture_upload
+            ) as mock_run_sync:
                 await gcs_provider.upload(test_key, content_generator(), test_content_type)
 
-                # Verify content was collected and uploaded
-                mock_run_sync.assert_called_once_with(
-                    mock_blob.upload_from_string,
-                    b"chunk1chunk2chunk3",
-                    content_type=test_content_type,  # noqa: E501
-                )
+                # Verify content was spooled to a temp file and uploaded from disk
+                mock_run_sync.assert_called_once()
+                assert mock_run_sync.call_args[0][0] == mock_blob.upload_from_filename
+                assert mock_run_sync.call_args[1] == {"content_type": test_content_type}
+                assert uploaded["content"] == b"chunk1chunk2chunk3"
+                # Temp file is removed after upload
+                assert not os.path.exists(uploaded["path"])
 
     @pytest.mark.asyncio
     async def test_download_success(self, gcs_provider):
@@ -0,0 +1,287 @@
+"""Tests for S3 multipart uploads against a local moto S3 server."""
+
+import asyncio
+import socket
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from boards.storage.base import (
+    ResumableUploadError,
+    StorageConfig,
+    StorageException,
+    StorageManager,
+    ValidationException,
+)
+from boards.storage.implementations.s3 import MIN_PART_SIZE, S3StorageProvider
+
+# Skip tests if S3 dependencies or the moto server are not available
+pytest.importorskip("boto3", reason="boto3 not available")
+pytest.importorskip("aioboto3", reason="aioboto3 not available")
+moto_server = pytest.importorskip("moto.server", reason="moto[server] not available")
+
+import boto3  # noqa: E402
+from aiobotocore.client import AioBaseClient  # noqa: E402
+
+PART_SIZE = MIN_PART_SIZE
+BUCKET = "test-bucket"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def s3_endpoint():
+    """Run a moto S3 server for the duration of the module."""
+    port = _free_port()
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    endpoint = f"http://127.0.0.1:{port}"
+    yield endpoint
+    server.stop()
+
+
+@pytest.fixture
+def s3_client(s3_endpoint):
+    client = boto3.client(
+        "s3",
+        endpoint_url=s3_endpoint,
+        region_name="us-east-1",
+        aws_access_key_id="test-key",
+        aws_secret_access_key="test-secret",
+    )
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+    for obj in client.list_objects_v2(Bucket=BUCKET).get("Contents", []):
+        client.delete_object(Bucket=BUCKET, Key=obj["Key"])
+    for upload in client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []):
+        client.abort_multipart_upload(Bucket=BUCKET, Key=upload["Key"], UploadId=upload["UploadId"])
+    client.delete_bucket(Bucket=BUCKET)
+
+
+@pytest.fixture
+def s3_provider(s3_endpoint, s3_client):
+    return S3StorageProvider(
+        bucket=BUCKET,
+        region="us-east-1",
+        aws_access_key_id="test-key",
+        aws_secret_access_key="test-secret",
+        endpoint_url=s3_endpoint,
+        upload_config={},
+        multipart_part_size=PART_SIZE,
+        multipart_concurrency=2,
+    )
+
+
+@pytest.fixture
+def manager(s3_provider):
+    manager = StorageManager(
+        StorageConfig(
+            default_provider="s3",
+            providers={"s3": {"type": "s3"}},
+            routing_rules=[],
+            max_file_size=64 * 1024 * 1024,
+        )
+    )
+    manager.register_provider("s3", s3_provider)
+    return manager
+
+
+def _payload(size: int) -> bytes:
+    return (bytes(range(251)) * (size // 251 + 1))[:size]
+
+
+async def _chunks(content: bytes, chunk_size: int = 1024 * 1024):
+    for offset in range(0, len(content), chunk_size):
+        yield content[offset : offset + chunk_size]
+
+
+@pytest.fixture
+def api_calls():
+    """Record S3 API calls made through aiobotocore."""
+    calls: list[tuple[str, dict]] = []
+    original = AioBaseClient._make_api_call
+
+    async def recording(self, operation_name, api_params):
+        calls.append((operation_name, api_params))
+        return await original(self, operation_name, api_params)
+
+    with patch.object(AioBaseClient, "_make_api_call", recording):
+        yield calls
+
+
+def _part_numbers(calls: list[tuple[str, dict]]) -> list[int]:
+    return [params["PartNumber"] for name, params in calls if name == "UploadPart"]
+
+
+class TestS3MultipartUpload:
+    @pytest.mark.asyncio
+    async def test_stream_uploaded_in_parts(self, s3_provider, s3_client, api_calls):
+        content = _payload(2 * PART_SIZE + 123)
+
+        url = await s3_provider.upload("test/video.mp4", _chunks(content), "video/mp4")
+
+        assert url.endswith("/test/video.mp4")
+        assert sorted(_part_numbers(api_calls)) == [1, 2, 3]
+        assert "PutObject" not in [name for name, _ in api_calls]
+
+        stored = s3_client.get_object(Bucket=BUCKET, Key="test/video.mp4")
+        assert stored["Body"].read() == content
+        assert stored["ContentType"] == "video/mp4"
+
+    @pytest.mark.asyncio
+    async def test_large_bytes_uploaded_in_parts(self, s3_provider, s3_client, api_calls):
+        content = _payload(PART_SIZE + 1)
+
+        await s3_provider.upload("test/large.bin", content, "application/octet-stream")
+
+        assert sorted(_part_numbers(api_calls)) == [1, 2]
+        stored = s3_client.get_object(Bucket=BUCKET, Key="test/large.bin")
+        assert stored["Body"].read() == content
+
+    @pytest.mark.asyncio
+    async def test_small_stream_uses_put_object(self, s3_provider, s3_client, api_calls):
+        content = b"small content"
+
+        await s3_provider.upload("test/small.txt", _chunks(content), "text/plain")
+
+        assert [name for name, _ in api_calls] == ["PutObject"]
+        stored = s3_client.get_object(Bucket=BUCKET, Key="test/small.txt")
+        assert stored["Body"].read() == content
+
+    @pytest.mark.asyncio
+    async def test_failed_part_resumes_through_manager(self, manager, s3_client, api_calls):
+        content = _payload(3 * PART_SIZE)
+        original = AioBaseClient._make_api_call
+        failures = {"count": 0}
+
+        async def flaky(self, operation_name, api_params):
+            if operation_name == "UploadPart" and api_params["PartNumber"] == 2:
+                if failures["count"] == 0:
+                    failures["count"] += 1
+                    raise ConnectionError("connection reset")
+            return await original(self, operation_name, api_params)
+
+        with (
+            patch.object(AioBaseClient, "_make_api_call", flaky),
+            patch("boards.storage.base.asyncio.sleep", new=AsyncMock()),
+        ):
+            ref = await manager.store_artifact(
+                artifact_id="gen1",
+                content=_chunks(content),
+                artifact_type="video",
+                content_type="video/mp4",
+                tenant_id="tenant1",
+                board_id="board1",
+            )
+
+        assert failures["count"] == 1
+        assert ref.size == len(content)
+        stored = s3_client.get_object(Bucket=BUCKET, Key=ref.storage_key)
+        assert stored["Body"].read() == content
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+    @pytest.mark.asyncio
+    async def test_resume_only_resends_unacknowledged_parts(self, s3_provider, s3_client):
+        content = _payload(3 * PART_SIZE)
+        original = AioBaseClient._make_api_call
+        sent: list[int] = []
+        failures = {"count": 0}
+
+        async def flaky(self, operation_name, api_params):
+            if operation_name == "UploadPart":
+                sent.append(api_params["PartNumber"])
+                if api_params["PartNumber"] == 3 and failures["count"] == 0:
+                    failures["count"] += 1
+                    raise ConnectionError("connection reset")
+            return await original(self, operation_name, api_params)
+
+        source = _chunks(content)
+        with patch.object(AioBaseClient, "_make_api_call", flaky):
+            with pytest.raises(ResumableUploadError):
+                await s3_provider.upload("test/resume.mp4", source, "video/mp4")
+            await s3_provider.upload("test/resume.mp4", source, "video/mp4")
+
+        assert sorted(sent) == [1, 2, 3, 3]
+        stored = s3_client.get_object(Bucket=BUCKET, Key="test/resume.mp4")
+        assert stored["Body"].read() == content
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_abort_upload(self, manager, s3_client):
+        original = AioBaseClient._make_api_call
+
+        async def failing(self, operation_name, api_params):
+            if operation_name == "UploadPart" and api_params["PartNumber"] == 2:
+                raise ConnectionError("connection reset")
+            return await original(self, operation_name, api_params)
+
+        with (
+            patch.object(AioBaseClient, "_make_api_call", failing),
+            patch("boards.storage.base.asyncio.sleep", new=AsyncMock()),
+        ):
+            with pytest.raises(StorageException):
+                await manager.store_artifact(
+                    artifact_id="gen1",
+                    content=_chunks(_payload(2 * PART_SIZE)),
+                    artifact_type="video",
+                    content_type="video/mp4",
+                )
+
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+        assert s3_client.list_objects_v2(Bucket=BUCKET).get("Contents", []) == []
+
+    @pytest.mark.asyncio
+    async def test_oversized_stream_aborts_upload(self, manager, s3_client):
+        manager.config.max_file_size = PART_SIZE + 10
+
+        with pytest.raises(ValidationException, match="exceeds limit"):
+            await manager.store_artifact(
+                artifact_id="gen1",
+                content=_chunks(_payload(3 * PART_SIZE)),
+                artifact_type="video",
+                content_type="video/mp4",
+            )
+
+        assert s3_client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+        assert s3_client.list_objects_v2(Bucket=BUCKET).get("Contents", []) == []
+
+
+class TestS3MultipartConcurrency:
+    @pytest.mark.asyncio
+    async def test_parts_in_flight_are_bounded(self):
+        provider = S3StorageProvider(
+            bucket=BUCKET,
+            aws_access_key_id="test-key",
+            aws_secret_access_key="test-secret",
+            multipart_part_size=PART_SIZE,
+            multipart_concurrency=3,
+        )
+        in_flight = 0
+        peak = 0
+
+        async def upload_part(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"ETag": f'"etag-{kwargs["PartNumber"]}"'}
+
+        with patch.object(provider, "_get_session") as mock_session:
+            mock_client = AsyncMock()
+            mock_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+            mock_client.upload_part.side_effect = upload_part
+            mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+            await provider.upload("test/video.mp4", _payload(10 * PART_SIZE), "video/mp4")
+
+        assert peak == 3
+        parts = mock_client.complete_multipart_upload.call_args[1]["MultipartUpload"]["Parts"]
+        assert [part["PartNumber"] for part in parts] == list(range(1, 11))
+
+    def test_part_size_below_s3_minimum_rejected(self):
+        with pytest.raises(ValueError, match="multipart_part_size"):
+            S3StorageProvider(bucket=BUCKET, multipart_part_size=1024)
@@ -16,10 +16,12 @@ def test_submit_generation_smoke(monkeypatch):
     from boards.jobs import repository as jobs_repo
     from boards.workers import actors
 
-    def fake_send(gen_id: str):
-        sent["id"] = gen_id
+    def fake_enqueue(message):
+        sent["id"] = message.args[0]
+        sent["queue_name"] = message.queue_name
+        return message
 
-    monkeypatch.setattr(actors.process_generation, "send", fake_send)
+    monkeypatch.setattr(actors.broker, "enqueue", fake_enqueue)
 
     # Bypass DB FKs by faking create_generation
     async def fake_create_generation(db, **kwargs):
@@ -48,3 +50,144 @@ def test_submit_generation_smoke(monkeypatch):
     data = resp.json()
     assert "generation_id" in data
     assert sent.get("id") == data["generation_id"]
+    # flux-pro is not registered here, so the job goes to the default queue
+    assert sent.get("queue_name") == "boards-jobs"
+
+
+def _batch_client(monkeypatch, boards):
+    """Client whose session finds ``boards`` and whose user owns the first one."""
+    from unittest.mock import AsyncMock, MagicMock
+    from uuid import UUID
+
+    from boards.api.auth import AuthenticatedUser, get_current_user
+    from boards.database.connection import get_db_session
+
+    user = AuthenticatedUser(
+        user_id=UUID("00000000-0000-0000-0000-000000000003"),
+        tenant_id=UUID("00000000-0000-0000-0000-000000000001"),
+    )
+    session = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = boards
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+
+    async def db_session():
+        yield session
+
+    app.dependency_overrides[get_db_session] = db_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    monkeypatch.setattr(
+        "boards.api.endpoints.jobs.generator_registry.list_names", lambda: ["flux-pro"]
+    )
+    return TestClient(app), user, session
+
+
+def _board(board_id: str, owner_id: str):
+    from uuid import UUID
+
+    return SimpleNamespace(id=UUID(board_id), owner_id=UUID(owner_id), board_members=[])
+
+
+def test_submit_generation_batch(monkeypatch):
+    from uuid import UUID
+
+    from boards.jobs import repository as jobs_repo
+
+    board_id = "00000000-0000-0000-0000-000000000002"
+    client, user, session = _batch_client(
+        monkeypatch, [_board(board_id, "00000000-0000-0000-0000-000000000003")]
+    )
+    created = []
+
+    async def fake_create_generations(db, *, tenant_id, user_id, generations):
+        created.extend(generations)
+        return [
+            SimpleNamespace(
+                id=UUID(int=n + 100), generator_name=gen["generator_name"], tenant_id=tenant_id
+            )
+            for n, gen in enumerate(generations)
+        ]
+
+    enqueued = []
+
+    async def fake_enqueue_generations(jobs):
+        enqueued.extend(jobs)
+        return [SimpleNamespace(queue_name="boards-jobs") for _ in jobs]
+
+    monkeypatch.setattr(jobs_repo, "create_generations", fake_create_generations)
+    monkeypatch.setattr("boards.api.endpoints.jobs.enqueue_generations", fake_enqueue_generations)
+    item = {
+        "board_id": board_id,
+        "generator_name": "flux-pro",
+        "artifact_type": "image",
+        "input_params": {"prompt": "hello"},
+    }
+
+    try:
+        resp = client.post("/api/jobs/generations/batch", json={"generations": [item] * 3})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200, resp.text
+    generation_ids = resp.json()["generation_ids"]
+    assert generation_ids == [str(UUID(int=n + 100)) for n in range(3)]
+    assert len(created) == 3
+    session.commit.assert_awaited_once()
+    # One board lookup for the whole batch, and every job enqueued together
+    session.execute.assert_awaited_once()
+    assert [job.generation_id for job in enqueued] == generation_ids
+    assert all(job.tenant_id == user.tenant_id for job in enqueued)
+
+
+def test_submit_generation_batch_requires_edit_access_to_every_board(monkeypatch):
+    from boards.jobs import repository as jobs_repo
+
+    own_board = "00000000-0000-0000-0000-000000000002"
+    other_board = "00000000-0000-0000-0000-000000000004"
+    client, _, session = _batch_client(
+        monkeypatch,
+        [
+            _board(own_board, "00000000-0000-0000-0000-000000000003"),
+            _board(other_board, "00000000-0000-0000-0000-000000000009"),
+        ],
+    )
+    create_generations = []
+    monkeypatch.setattr(jobs_repo, "create_generations", create_generations.append)
+    items = [
+        {
+            "board_id": board_id,
+            "generator_name": "flux-pro",
+            "artifact_type": "image",
+            "input_params": {},
+        }
+        for board_id in (own_board, other_board)
+    ]
+
+    try:
+        resp = client.post("/api/jobs/generations/batch", json={"generations": items})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 403
+    assert create_generations == []
+    session.commit.assert_not_awaited()
+
+
+def test_submit_generation_batch_unknown_board(monkeypatch):
+    client, _, session = _batch_client(monkeypatch, [])
+    item = {
+        "board_id": "00000000-0000-0000-0000-000000000002",
+        "generator_name": "flux-pro",
+        "artifact_type": "image",
+        "input_params": {},
+    }
+
+    try:
+        resp = client.post("/api/jobs/generations/batch", json={"generations": [item]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 404
+    session.commit.assert_not_awaited()
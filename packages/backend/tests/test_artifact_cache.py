@@ -0,0 +1,137 @@
+"""Tests for the content-addressed input artifact cache."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from boards.generators.artifacts import ImageArtifact
+from boards.workers.artifact_cache import ArtifactCache
+from boards.workers.context import GeneratorExecutionContext
+from boards.workers.workspace import ScratchSpace
+
+
+def _artifact(generation_id: str = "gen-1", url: str = "https://example.com/a.png"):
+    return ImageArtifact(
+        generation_id=generation_id, storage_url=url, width=64, height=64, format="png"
+    )
+
+
+@pytest.fixture
+def space(tmp_path):
+    return ScratchSpace(tmp_path / "scratch", quota_bytes=1024 * 1024)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(tmp_path / "cache", max_bytes=1024)
+
+
+def _downloaded(workspace, content: bytes) -> str:
+    path = workspace.new_file(suffix=".png", prefix="boards_artifact_")
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestArtifactCache:
+    @pytest.mark.asyncio
+    async def test_miss_then_hit_links_into_workspace(self, cache, space):
+        artifact = _artifact()
+        first = space.workspace("job-1")
+
+        assert cache.get(artifact, first) is None
+        await cache.put(artifact, _downloaded(first, b"garment"))
+
+        second = space.workspace("job-2")
+        path = cache.get(artifact, second)
+
+        assert path is not None
+        assert os.path.dirname(path) == str(second.path)
+        with open(path, "rb") as f:
+            assert f.read() == b"garment"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_hit_survives_source_workspace_cleanup(self, cache, space):
+        artifact = _artifact()
+        first = space.workspace("job-1")
+        await cache.put(artifact, _downloaded(first, b"person"))
+        first.cleanup()
+
+        path = cache.get(artifact, space.workspace("job-2"))
+
+        assert path is not None and os.path.exists(path)
+
+    @pytest.mark.asyncio
+    async def test_identical_content_stored_once(self, cache, space):
+        workspace = space.workspace("job-1")
+        await cache.put(_artifact("gen-1"), _downloaded(workspace, b"same"))
+        await cache.put(
+            _artifact("gen-2", "https://example.com/b.png"), _downloaded(workspace, b"same")
+        )
+
+        blobs = [p for p in (cache.root / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_blob_evicted(self, cache, space):
+        workspace = space.workspace("job-1")
+        old, recent, new = _artifact("old"), _artifact("recent"), _artifact("new")
+        await cache.put(old, _downloaded(workspace, b"o" * 400))
+        await cache.put(recent, _downloaded(workspace, b"r" * 400))
+        # Age both entries, then use "recent" so "old" is the LRU victim
+        for blob in (cache.root / "blobs").rglob("*.png"):
+            os.utime(blob, (1, 1))
+        for index in (cache.root / "index").iterdir():
+            os.utime(index, (1, 1))
+        assert cache.get(recent, workspace) is not None
+
+        await cache.put(new, _downloaded(workspace, b"n" * 400))
+
+        assert cache.evictions == 1
+        assert cache.get(old, workspace) is None
+        assert cache.get(recent, workspace) is not None
+        assert cache.get(new, workspace) is not None
+
+
+class TestContextUsesCache:
+    @pytest.mark.asyncio
+    async def test_repeat_input_is_not_downloaded_again(self, cache, space):
+        artifact = _artifact()
+        downloads = 0
+
+        async def fake_download(artifact, workspace=None):
+            nonlocal downloads
+            downloads += 1
+            return _downloaded(workspace, b"garment")
+
+        def make_context():
+            return GeneratorExecutionContext(
+                uuid4(),
+                MagicMock(),
+                MagicMock(),
+                uuid4(),
+                uuid4(),
+                uuid4(),
+                "test-generator",
+                "image",
+                {},
+                scratch_space=space,
+                artifact_cache=cache,
+            )
+
+        with patch(
+            "boards.generators.resolution.download_artifact_to_temp", side_effect=fake_download
+        ):
+            for _ in range(3):
+                context = make_context()
+                path = await context.resolve_artifact(artifact)
+                with open(path, "rb") as f:
+                    assert f.read() == b"garment"
+                context.cleanup()
+
+        assert downloads == 1
+        assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,116 @@
+"""Tests for the worker that runs async jobs concurrently on one event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import dramatiq
+import pytest
+from dramatiq.brokers.stub import StubBroker
+from dramatiq.middleware import AsyncIO
+
+from boards.workers.executor import AsyncWorker
+
+
+@pytest.fixture
+def broker():
+    broker = StubBroker()
+    broker.add_middleware(AsyncIO())
+    broker.emit_after("process_boot")
+    yield broker
+    broker.emit_before("process_stop")
+    broker.close()
+
+
+@pytest.fixture
+def start_worker(broker):
+    workers: list[AsyncWorker] = []
+
+    def start(concurrency: int) -> AsyncWorker:
+        worker = AsyncWorker(broker, concurrency=concurrency, worker_timeout=50)
+        worker.start()
+        workers.append(worker)
+        return worker
+
+    yield start
+    for worker in workers:
+        worker.stop(timeout=5000)
+
+
+class TestAsyncWorker:
+    def test_jobs_run_concurrently_on_one_thread(self, broker, start_worker):
+        running = 0
+        peak = 0
+        threads: set[int] = set()
+
+        @dramatiq.actor(broker=broker, max_retries=0)
+        async def wait_on_provider(n: int) -> None:
+            nonlocal running, peak
+            threads.add(threading.get_ident())
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.2)
+            running -= 1
+
+        for n in range(40):
+            wait_on_provider.send(n)
+        start_worker(concurrency=25)
+        broker.join(wait_on_provider.queue_name, timeout=10_000)
+
+        # 40 jobs of 0.2s would take 8s one at a time
+        assert peak == 25
+        assert len(threads) == 1
+        assert broker.dead_letters == []
+
+    def test_failed_jobs_are_retried_then_dead_lettered(self, broker, start_worker):
+        attempts = 0
+
+        @dramatiq.actor(broker=broker, max_retries=1, min_backoff=1, max_backoff=1)
+        async def flaky() -> None:
+            nonlocal attempts
+            attempts += 1
+            raise RuntimeError("provider error")
+
+        flaky.send()
+        start_worker(concurrency=5)
+        broker.join(flaky.queue_name, timeout=10_000)
+
+        assert attempts == 2
+        assert len(broker.dead_letters) == 1
+
+    def test_time_limit_cancels_only_the_slow_job(self, broker, start_worker):
+        finished: list[str] = []
+
+        @dramatiq.actor(broker=broker, max_retries=0, time_limit=100)
+        async def job(name: str, seconds: float) -> None:
+            await asyncio.sleep(seconds)
+            finished.append(name)
+
+        job.send("slow", 5.0)
+        job.send("fast", 0.01)
+        start_worker(concurrency=5)
+        broker.join(job.queue_name, timeout=10_000)
+
+        assert finished == ["fast"]
+        [dead] = broker.dead_letters
+        assert dead.args == ("slow", 5.0)
+
+    def test_sync_actors_run_off_the_event_loop(self, broker, start_worker):
+        ran: list[int] = []
+
+        @dramatiq.actor(broker=broker, max_retries=0)
+        def legacy(n: int) -> None:
+            ran.append(n)
+
+        legacy.send(1)
+        start_worker(concurrency=5)
+        broker.join(legacy.queue_name, timeout=10_000)
+
+        assert ran == [1]
+
+    def test_requires_asyncio_middleware(self):
+        broker = StubBroker()
+
+        with pytest.raises(RuntimeError, match="AsyncIO middleware"):
+            AsyncWorker(broker, concurrency=5).start()
@@ -0,0 +1,230 @@
+"""Tests for weighted fair scheduling of generations across tenants."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+import pytest
+from dramatiq import Message
+from dramatiq.brokers.stub import StubBroker
+
+from boards.workers import actors
+from boards.workers import fair_queue as fair_queue_module
+from boards.workers.fair_queue import TenantFairQueue
+
+QUEUE = "boards-jobs-image"
+
+
+class FakeRedis:
+    """The list, set and string commands the fair queue uses, kept in memory."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[bytes]] = defaultdict(list)
+        self.sets: dict[str, set[str]] = defaultdict(set)
+        self.strings: dict[str, str] = {}
+
+    async def rpush(self, key, *values):
+        self.lists[key].extend(values)
+
+    async def lmove(self, source, destination, src="LEFT", dest="RIGHT"):
+        if not self.lists[source]:
+            return None
+        value = self.lists[source].pop(0)
+        self.lists[destination].append(value)
+        return value
+
+    async def lrange(self, key, start, end):
+        return list(self.lists[key])
+
+    async def llen(self, key):
+        return len(self.lists[key])
+
+    async def sadd(self, key, member):
+        self.sets[key].add(member)
+
+    async def srem(self, key, member):
+        self.sets[key].discard(member)
+
+    async def smembers(self, key):
+        return set(self.sets[key])
+
+    async def scard(self, key):
+        return len(self.sets[key])
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    async def delete(self, key):
+        self.strings.pop(key, None)
+        self.lists.pop(key, None)
+
+
+@pytest.fixture
+def broker():
+    broker = StubBroker()
+    broker.declare_queue(QUEUE)
+    yield broker
+    broker.close()
+
+
+@pytest.fixture
+def redis_client():
+    return FakeRedis()
+
+
+def _fair_queue(redis_client, broker, **kwargs) -> TenantFairQueue:
+    return TenantFairQueue(redis_client, broker, **kwargs)  # type: ignore[arg-type]
+
+
+async def _submit(fair_queue: TenantFairQueue, tenant_id: str, count: int) -> None:
+    for n in range(count):
+        message = Message(
+            queue_name=QUEUE,
+            actor_name="process_generation",
+            args=(f"{tenant_id}-{n}",),
+            kwargs={},
+            options={},
+        )
+        await fair_queue.push(tenant_id, message)
+
+
+def _dispatched(broker: StubBroker) -> list[str]:
+    queue = broker.queues[QUEUE]
+    generation_ids = []
+    while not queue.empty():
+        generation_ids.append(Message.decode(queue.get_nowait()).args[0])
+    return generation_ids
+
+
+class TestTenantFairQueue:
+    @pytest.mark.asyncio
+    async def test_small_tenant_is_not_stuck_behind_noisy_neighbor(self, redis_client, broker):
+        fair_queue = _fair_queue(redis_client, broker, max_backlog=6)
+        await _submit(fair_queue, "noisy", 500)
+        await _submit(fair_queue, "small", 3)
+
+        await fair_queue.dispatch()
+
+        assert _dispatched(broker) == [
+            "noisy-0",
+            "small-0",
+            "noisy-1",
+            "small-1",
+            "noisy-2",
+            "small-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_dispatch_share_follows_weights(self, redis_client, broker):
+        fair_queue = _fair_queue(
+            redis_client, broker, weights={"paid": 3.0, "trial": 0.5}, max_backlog=18
+        )
+        await _submit(fair_queue, "free", 40)
+        await _submit(fair_queue, "paid", 40)
+        await _submit(fair_queue, "trial", 40)
+
+        await fair_queue.dispatch()
+
+        tenants = [generation_id.split("-")[0] for generation_id in _dispatched(broker)]
+        # Four rounds of 1 + 3 + 0.5 messages
+        assert tenants.count("free") == 4
+        assert tenants.count("paid") == 12
+        assert tenants.count("trial") == 2
+
+    @pytest.mark.parametrize("weight", [0.0, -1.0, float("nan")])
+    def test_rejects_weights_that_never_serve_a_tenant(self, redis_client, broker, weight):
+        with pytest.raises(ValueError, match="paused"):
+            _fair_queue(redis_client, broker, weights={"paused": weight})
+
+    @pytest.mark.asyncio
+    async def test_keeps_job_queue_backlog_short(self, redis_client, broker):
+        fair_queue = _fair_queue(redis_client, broker, max_backlog=20)
+        # Messages the job queue already holds
+        redis_client.lists[f"dramatiq:{QUEUE}"] = [b"waiting"] * 18
+        await _submit(fair_queue, "tenant", 10)
+
+        assert await fair_queue.dispatch() == 2
+
+        redis_client.lists[f"dramatiq:{QUEUE}"] = []
+        assert await fair_queue.dispatch() == 8
+
+    @pytest.mark.asyncio
+    async def test_turn_continues_on_next_dispatch(self, redis_client, broker):
+        fair_queue = _fair_queue(redis_client, broker, weights={"big": 4.0}, max_backlog=3)
+        await _submit(fair_queue, "big", 10)
+        await _submit(fair_queue, "other", 10)
+
+        await fair_queue.dispatch()
+        first = _dispatched(broker)
+        await fair_queue.dispatch()
+        second = _dispatched(broker)
+
+        assert first == ["big-0", "big-1", "big-2"]
+        # big finishes its turn of four before other's turn
+        assert second == ["big-3", "other-0", "big-4"]
+
+    @pytest.mark.asyncio
+    async def test_drained_tenants_leave_the_round(self, redis_client, broker):
+        fair_queue = _fair_queue(redis_client, broker)
+        await _submit(fair_queue, "tenant", 2)
+
+        assert await fair_queue.dispatch() == 2
+        assert redis_client.sets["boards:fairqueue:queues"] == set()
+        assert redis_client.sets[f"boards:fairqueue:{QUEUE}:tenants"] == set()
+
+        await _submit(fair_queue, "tenant", 1)
+        assert await fair_queue.dispatch() == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_enqueue_keeps_messages_for_next_dispatch(
+        self, redis_client, broker, monkeypatch
+    ):
+        fair_queue = _fair_queue(redis_client, broker)
+        await _submit(fair_queue, "tenant", 2)
+        enqueue_many = fair_queue_module.enqueue_many
+
+        def broker_down(broker, messages):
+            raise ConnectionError("broker unavailable")
+
+        monkeypatch.setattr(fair_queue_module, "enqueue_many", broker_down)
+        with pytest.raises(ConnectionError):
+            await fair_queue.dispatch()
+        assert _dispatched(broker) == []
+
+        monkeypatch.setattr(fair_queue_module, "enqueue_many", enqueue_many)
+        assert await fair_queue.dispatch() == 2
+        assert _dispatched(broker) == ["tenant-0", "tenant-1"]
+        assert redis_client.lists[f"boards:fairqueue:{QUEUE}:dispatching"] == []
+        assert redis_client.sets["boards:fairqueue:queues"] == set()
+
+    @pytest.mark.asyncio
+    async def test_skips_dispatch_while_another_dispatcher_runs(self, redis_client, broker):
+        fair_queue = _fair_queue(redis_client, broker, lock_timeout=0.05)
+        await _submit(fair_queue, "tenant", 2)
+        redis_client.strings["boards:fairqueue:lock"] = "other-dispatcher"
+
+        assert await fair_queue.dispatch() == 0
+
+
+class TestEnqueueGeneration:
+    @pytest.mark.asyncio
+    async def test_generations_wait_in_their_tenant_queue(self, redis_client, broker, monkeypatch):
+        monkeypatch.setattr(actors.settings, "fair_queue_enabled", True)
+        monkeypatch.setattr(actors.settings, "fair_queue_max_backlog", 1)
+        monkeypatch.setattr(actors, "get_redis_client", lambda: redis_client)
+        monkeypatch.setattr(actors, "broker", broker)
+        monkeypatch.setattr(actors, "queue_for_generator", lambda name: QUEUE)
+
+        await actors.enqueue_generation("gen-1", "flux-2", "tenant-1")
+        # gen-1 now waits in the job queue, which has room for one message
+        redis_client.lists[f"dramatiq:{QUEUE}"] = [b"gen-1"]
+        await actors.enqueue_generation("gen-2", "flux-2", "tenant-1")
+
+        assert _dispatched(broker) == ["gen-1"]
+        assert len(redis_client.lists[f"boards:fairqueue:{QUEUE}:tenant:tenant-1"]) == 1
@@ -1,6 +1,8 @@
 import pytest
 
+from boards.generators import rate_limit
 from boards.generators.loader import load_generators_from_config
+from boards.generators.rate_limit import ProviderLimit
 from boards.generators.registry import registry
 
 
@@ -126,3 +128,52 @@ generators:
 
     load_generators_from_config(str(cfg))
     assert "class-gen" in registry
+
+
+def test_rate_limits_and_provider_override(tmp_path, monkeypatch):
+    _reset_registry()
+    monkeypatch.setattr(rate_limit, "_limits", {})
+    monkeypatch.setattr(rate_limit, "_limiter", None)
+    cfg = tmp_path / "gens.yaml"
+    cfg.write_text(
+        """
+generators:
+  - class: "boards.generators.testmods.class_gen:ClassGen"
+    provider: "fal"
+    queue_class: "slow"
+rate_limits:
+  fal:
+    requests_per_second: 10
+    burst: 20
+    concurrency: 40
+        """,
+        encoding="utf-8",
+    )
+
+    load_generators_from_config(str(cfg))
+
+    gen = registry.get("class-gen")
+    assert gen is not None
+    assert gen.provider == "fal"
+    assert gen.queue_class == "slow"
+    assert rate_limit._limits == {
+        "fal": ProviderLimit(requests_per_second=10, burst=20, concurrency=40)
+    }
+
+
+def test_strict_mode_fails_on_invalid_rate_limit(tmp_path):
+    _reset_registry()
+    cfg = tmp_path / "gens.yaml"
+    cfg.write_text(
+        """
+generators:
+  - class: "boards.generators.testmods.class_gen:ClassGen"
+rate_limits:
+  fal:
+    concurrency: -1
+        """,
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="fal"):
+        load_generators_from_config(str(cfg))
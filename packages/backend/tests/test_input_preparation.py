@@ -0,0 +1,164 @@
+"""Tests for preparing image inputs to a generator's input profile."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.base import InputProfile
+from boards.workers.artifact_cache import ArtifactCache
+from boards.workers.context import GeneratorExecutionContext
+from boards.workers.input_preparation import InputPreparer, prepare_image
+from boards.workers.workspace import ScratchSpace
+
+
+def _gradient(size: tuple[int, int], mode: str = "RGB") -> Image.Image:
+    image = Image.linear_gradient("L").resize(size).convert(mode)
+    if mode == "RGBA":
+        image.putalpha(Image.linear_gradient("L").resize(size))
+    return image
+
+
+def _artifact(generation_id: str = "gen-1") -> ImageArtifact:
+    return ImageArtifact(
+        generation_id=generation_id,
+        storage_url=f"https://example.com/{generation_id}.png",
+        width=2048,
+        height=1536,
+        format="png",
+    )
+
+
+@pytest.fixture
+def space(tmp_path):
+    return ScratchSpace(tmp_path / "scratch", quota_bytes=100 * 1024 * 1024)
+
+
+@pytest.fixture
+def preparer():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield InputPreparer(executor)
+
+
+class TestPrepareImage:
+    def test_large_png_downsized_and_reencoded(self, tmp_path):
+        source = tmp_path / "big.png"
+        _gradient((2048, 1536)).save(source)
+
+        result = prepare_image(str(source), str(tmp_path / "out"), InputProfile(1024))
+
+        assert result.endswith(".webp")
+        with Image.open(result) as prepared:
+            assert prepared.size == (1024, 768)
+        assert os.path.getsize(result) < os.path.getsize(source)
+
+    def test_fitting_jpeg_passed_through(self, tmp_path):
+        source = tmp_path / "small.jpg"
+        _gradient((800, 600)).save(source, "JPEG")
+
+        result = prepare_image(str(source), str(tmp_path / "out"), InputProfile(1024))
+
+        assert result == str(source)
+
+    def test_alpha_kept_in_accepted_format(self, tmp_path):
+        source = tmp_path / "garment.png"
+        _gradient((2048, 2048), "RGBA").save(source)
+        profile = InputProfile(1024, formats=("jpeg", "png"))
+
+        result = prepare_image(str(source), str(tmp_path / "out"), profile)
+
+        with Image.open(result) as prepared:
+            assert prepared.format == "PNG"
+            assert prepared.mode == "RGBA"
+            assert prepared.size == (1024, 1024)
+
+    @pytest.mark.asyncio
+    async def test_unreadable_input_falls_back_to_original(self, tmp_path, space, preparer):
+        source = tmp_path / "broken.png"
+        source.write_bytes(b"not an image")
+
+        result = await preparer.prepare(str(source), space.workspace("job-1"), InputProfile(1024))
+
+        assert result == str(source)
+
+
+class TestContextPreparesInputs:
+    @pytest.fixture
+    def downloads(self):
+        """Serve artifact downloads as 2048x1536 PNGs, counting them."""
+        downloads = SimpleNamespace(count=0)
+
+        async def fake_download(artifact, workspace=None):
+            downloads.count += 1
+            assert workspace is not None
+            path = workspace.new_file(suffix=".png", prefix="boards_artifact_")
+            _gradient((2048, 1536)).save(path)
+            return str(path)
+
+        with patch(
+            "boards.generators.resolution.download_artifact_to_temp", side_effect=fake_download
+        ):
+            yield downloads
+
+    @pytest.fixture
+    def make_context(self, tmp_path, space, preparer):
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=100 * 1024 * 1024)
+
+        def make_context(profile):
+            return GeneratorExecutionContext(
+                uuid4(),
+                MagicMock(),
+                MagicMock(),
+                uuid4(),
+                uuid4(),
+                uuid4(),
+                "test-generator",
+                "image",
+                {},
+                scratch_space=space,
+                artifact_cache=cache,
+                input_profile=profile,
+                input_preparer=preparer,
+            )
+
+        return make_context
+
+    @pytest.mark.asyncio
+    async def test_prepared_variant_cached_per_profile(self, downloads, make_context):
+        artifact = _artifact()
+        for _ in range(2):
+            context = make_context(InputProfile(1024))
+            with Image.open(await context.resolve_artifact(artifact)) as prepared:
+                assert prepared.size == (1024, 768)
+            context.cleanup()
+
+        original = make_context(None)
+        with Image.open(await original.resolve_artifact(artifact)) as image:
+            assert image.size == (2048, 1536)
+        original.cleanup()
+
+        assert downloads.count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_original_prepared_for_profile(self, downloads, make_context):
+        artifact = _artifact()
+        original = make_context(None)
+        with Image.open(await original.resolve_artifact(artifact)) as image:
+            assert image.size == (2048, 1536)
+        original.cleanup()
+
+        for _ in range(2):
+            context = make_context(InputProfile(1024))
+            with Image.open(await context.resolve_artifact(artifact)) as prepared:
+                assert prepared.size == (1024, 768)
+                assert prepared.format == "WEBP"
+            context.cleanup()
+
+        assert downloads.count == 1
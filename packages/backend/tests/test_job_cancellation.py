@@ -0,0 +1,264 @@
+"""Tests for propagating cancellation to the worker running a generation."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from boards.generators.base import BaseGenerator, GeneratorResult
+from boards.jobs import repository as jobs_repo
+from boards.jobs.cancellation import (
+    CancellationWatcher,
+    cancel_channel,
+    cancelled_key,
+    request_cancellation,
+)
+from boards.workers import actors
+
+
+class FakePubSub:
+    async def psubscribe(self, pattern):
+        self.pattern = pattern
+
+    async def listen(self):
+        await asyncio.Event().wait()
+        yield {}
+
+    async def close(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, keys: set[str] | None = None) -> None:
+        self.keys = keys or set()
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    def pubsub(self):
+        return FakePubSub()
+
+    async def close(self):
+        pass
+
+
+class FakeInput(BaseModel):
+    prompt: str
+
+
+class SlowGenerator(BaseGenerator):
+    name = "slow"
+    artifact_type = "video"
+    description = "Waits for its provider until cancelled"
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.cancelled_jobs: list[str] = []
+
+    def get_input_schema(self) -> type[FakeInput]:
+        return FakeInput
+
+    async def generate(self, inputs, context) -> GeneratorResult:
+        self.started.set()
+        await asyncio.sleep(3600)
+        raise AssertionError("generation was not cancelled")
+
+    async def cancel(self, external_id: str) -> None:
+        self.cancelled_jobs.append(external_id)
+
+    async def estimate_cost(self, inputs) -> float:
+        return 0.0
+
+
+@pytest.fixture
+async def watcher():
+    watcher = CancellationWatcher(redis_client=FakeRedis())  # type: ignore[arg-type]
+    yield watcher
+    await watcher.close()
+
+
+class TestCancellationWatcher:
+    @pytest.mark.asyncio
+    async def test_cancel_stops_only_the_watched_job(self, watcher):
+        async def run(job_id: str) -> bool:
+            async with watcher.watch(job_id, asyncio.current_task()) as watched:
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    return watched.requested
+            return False
+
+        cancelled = asyncio.create_task(run("job-1"))
+        other = asyncio.create_task(run("job-2"))
+        await asyncio.sleep(0)
+
+        watcher.cancel("job-1")
+
+        assert await cancelled is True
+        assert not other.done()
+        other.cancel()
+
+    @pytest.mark.asyncio
+    async def test_job_cancelled_before_it_started(self):
+        redis_client = FakeRedis({cancelled_key("job-1")})
+        watcher = CancellationWatcher(redis_client=redis_client)  # type: ignore[arg-type]
+
+        with pytest.raises(asyncio.CancelledError):
+            async with watcher.watch("job-1", asyncio.current_task()) as watched:  # type: ignore[arg-type]
+                assert watched.requested
+                await asyncio.sleep(1)
+        asyncio.current_task().uncancel()  # type: ignore[union-attr]
+        await watcher.close()
+
+    @pytest.mark.asyncio
+    async def test_request_sets_key_and_publishes(self):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+
+        await request_cancellation(redis_client, "job-1", ttl=3600)
+
+        pipe.set.assert_called_once_with(cancelled_key("job-1"), "1", ex=3600)
+        pipe.publish.assert_called_once_with(cancel_channel("job-1"), "cancel")
+        pipe.execute.assert_awaited_once()
+
+
+class TestWorkerCancellation:
+    @pytest.mark.asyncio
+    async def test_cancelled_generation_stops_and_cancels_provider_job(self, monkeypatch, watcher):
+        generation_id = str(uuid4())
+        generator = SlowGenerator()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield MagicMock()
+
+        publisher = MagicMock()
+        publisher.publish_progress = AsyncMock()
+        publisher.publish_only = AsyncMock()
+        context = MagicMock()
+        context.generator_name = "slow"
+        prepared = actors._PreparedJob(generator, FakeInput(prompt="x"), context)
+        monkeypatch.setattr(actors, "get_cancellation_watcher", lambda: watcher)
+        monkeypatch.setattr(actors, "get_async_session", fake_session)
+        monkeypatch.setattr(actors, "ProgressPublisher", lambda settings: publisher)
+        monkeypatch.setattr(actors, "_prepare_job", AsyncMock(return_value=prepared))
+        monkeypatch.setattr(actors.generator_registry, "get", lambda name: generator)
+        monkeypatch.setattr(
+            actors.jobs_repo,
+            "get_generation",
+            AsyncMock(
+                return_value=SimpleNamespace(external_job_id="provider-1", generator_name="slow")
+            ),
+        )
+        monkeypatch.setattr(actors.jobs_repo, "finalize_success", AsyncMock())
+
+        job = asyncio.create_task(actors.process_generation.fn.__wrapped__(generation_id))
+        await asyncio.wait_for(generator.started.wait(), 1)
+        watcher.cancel(generation_id)
+        await asyncio.wait_for(job, 1)
+
+        assert generator.cancelled_jobs == ["provider-1"]
+        actors.jobs_repo.finalize_success.assert_not_awaited()
+        assert publisher.publish_only.await_args.args[1].status == "cancelled"
+        assert publisher.publish_progress.await_args.args[1].status == "processing"
+        context.cleanup.assert_called_once()
+
+
+class TestCancelledStatusIsFinal:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda session: jobs_repo.update_progress(
+                session, uuid4(), status="processing", progress=50.0
+            ),
+            lambda session: jobs_repo.finalize_success(session, uuid4(), storage_url="s3://x"),
+        ],
+    )
+    async def test_late_worker_writes_skip_cancelled_jobs(self, write):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await write(session)
+
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "boards.generations.status != %(status_1)s" in sql
+        assert stmt.compile().params["status_1"] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_start_job_reports_skipped_transition(self):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        assert await jobs_repo.start_job(session, uuid4()) is False
+
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "boards.generations.status IN" in sql
+        assert "RETURNING boards.generations.id" in sql
+
+
+class TestCancelledBeforeStart:
+    @pytest.fixture
+    def queued(self, monkeypatch):
+        generator = SlowGenerator()
+        job = SimpleNamespace(
+            id=uuid4(),
+            tenant_id=uuid4(),
+            board_id=uuid4(),
+            user_id=uuid4(),
+            generator_name="slow",
+            artifact_type="video",
+            input_params={"prompt": "x"},
+            external_job_id=None,
+            pipeline=None,
+            status="pending",
+        )
+
+        @asynccontextmanager
+        async def fake_session():
+            yield MagicMock()
+
+        publisher = MagicMock()
+        publisher.publish_progress = AsyncMock()
+        publisher.publish_only = AsyncMock()
+        monkeypatch.setattr(actors, "get_async_session", fake_session)
+        monkeypatch.setattr(actors, "ProgressPublisher", lambda settings: publisher)
+        monkeypatch.setattr(actors, "_watch_cancellation", lambda generation_id: nullcontext())
+        monkeypatch.setattr(actors.jobs_repo, "load_job", AsyncMock(return_value=job))
+        monkeypatch.setattr(actors.jobs_repo, "start_job", AsyncMock(return_value=True))
+        monkeypatch.setattr(actors.generator_registry, "get", lambda name: generator)
+        return SimpleNamespace(job=job, generator=generator, publisher=publisher)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_generation_never_reaches_provider(self, queued):
+        queued.job.status = "cancelled"
+
+        await actors.process_generation.fn.__wrapped__(str(queued.job.id))
+
+        assert not queued.generator.started.is_set()
+        actors.jobs_repo.start_job.assert_not_awaited()
+        queued.publisher.publish_only.assert_not_awaited()
+        queued.publisher.publish_progress.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_inputs_resolved(self, queued):
+        actors.jobs_repo.start_job.return_value = False
+
+        await actors.process_generation.fn.__wrapped__(str(queued.job.id))
+
+        assert not queued.generator.started.is_set()
+        actors.jobs_repo.start_job.assert_awaited_once()
+        queued.publisher.publish_progress.assert_not_awaited()
@@ -0,0 +1,590 @@
+"""Tests for suspending generations while the provider works and resuming them."""
+
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager, nullcontext
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.base import ExternalJobStatus, GeneratorResult, ResumableGenerator
+from boards.generators.implementations.kie.image.nano_banana_edit import (
+    KieNanoBananaEditGenerator,
+    NanoBananaEditInput,
+)
+from boards.generators.implementations.kie.video.veo3 import KieVeo3Generator
+from boards.generators.rate_limit import ProviderBusyError, ProviderLimit, ProviderLimiter
+from boards.jobs import repository as jobs_repo
+from boards.workers import actors
+
+
+class FakeInput(BaseModel):
+    prompt: str
+
+
+class FakeResumableGenerator(ResumableGenerator):
+    name = "fake-resumable"
+    artifact_type = "image"
+    description = "Fake resumable generator"
+
+    def __init__(self, status: ExternalJobStatus | None = None) -> None:
+        self.status = status or ExternalJobStatus(state="completed")
+        self.submit_calls = 0
+        self.finalize_calls: list[str] = []
+
+    def get_input_schema(self) -> type[FakeInput]:
+        return FakeInput
+
+    async def generate(self, inputs, context) -> GeneratorResult:
+        raise AssertionError("generate() must not run in continuation mode")
+
+    async def submit(self, inputs, context) -> str:
+        self.submit_calls += 1
+        return "provider-job-1"
+
+    async def check_status(self, external_id: str) -> ExternalJobStatus:
+        return self.status
+
+    async def finalize(self, external_id, inputs, context: Any) -> GeneratorResult:
+        self.finalize_calls.append(external_id)
+        return GeneratorResult(
+            outputs=[
+                ImageArtifact(
+                    generation_id=context.generation_id,
+                    storage_url="https://storage.example.com/out.png",
+                    format="png",
+                    width=512,
+                    height=512,
+                )
+            ]
+        )
+
+    async def estimate_cost(self, inputs) -> float:
+        return 0.0
+
+
+@pytest.fixture
+def generation_id() -> str:
+    return str(uuid4())
+
+
+@pytest.fixture
+def job(monkeypatch, generation_id):
+    """Patch the actors' DB, publisher and scheduling dependencies."""
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    publisher = MagicMock()
+    publisher.publish_progress = AsyncMock()
+    publisher.publish_only = AsyncMock()
+    context = MagicMock()
+    context.generation_id = generation_id
+    context.generator_name = "fake-resumable"
+    context._batch_id = None
+    context._batch_generations = []
+    context.pipeline_id = None
+    ensure_poller = AsyncMock()
+
+    monkeypatch.setattr(actors.settings, "job_continuation_enabled", True)
+    monkeypatch.setattr(actors, "get_async_session", fake_session)
+    monkeypatch.setattr(actors, "ProgressPublisher", lambda settings: publisher)
+    monkeypatch.setattr(actors, "_ensure_poller", ensure_poller)
+    monkeypatch.setattr(actors, "_watch_cancellation", lambda generation_id: nullcontext())
+    for name in (
+        "suspend_generation",
+        "claim_continuation",
+        "release_continuation",
+        "finalize_success",
+    ):
+        monkeypatch.setattr(actors.jobs_repo, name, AsyncMock())
+
+    def prepare_with(generator, external_job_id=None):
+        prepared = actors._PreparedJob(generator, FakeInput(prompt="x"), context, external_job_id)
+        monkeypatch.setattr(actors, "_prepare_job", AsyncMock(return_value=prepared))
+        monkeypatch.setattr(actors.generator_registry, "get", lambda name: generator)
+
+    return SimpleNamespace(
+        publisher=publisher,
+        context=context,
+        ensure_poller=ensure_poller,
+        prepare_with=prepare_with,
+    )
+
+
+def _claim(suspended_at: datetime | None = None, checks: int = 0) -> SimpleNamespace:
+    suspended_at = suspended_at or datetime.now(UTC)
+    return SimpleNamespace(
+        continuation={"suspended_at": suspended_at.isoformat(), "checks": checks},
+        external_job_id="provider-job-1",
+        generator_name="fake-resumable",
+    )
+
+
+class TestProcessGenerationContinuation:
+    @pytest.mark.asyncio
+    async def test_resumable_generator_is_suspended_after_submit(self, job, generation_id):
+        generator = FakeResumableGenerator()
+        job.prepare_with(generator)
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.submit_calls == 1
+        actors.jobs_repo.suspend_generation.assert_awaited_once()
+        suspend = actors.jobs_repo.suspend_generation.await_args.kwargs
+        assert suspend["external_job_id"] == "provider-job-1"
+        assert suspend["next_check_at"] > datetime.now(UTC)
+        job.ensure_poller.assert_awaited_once()
+        actors.jobs_repo.finalize_success.assert_not_awaited()
+        job.context.cleanup.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_mode_runs_generate(self, job, generation_id, monkeypatch):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        generator = FakeResumableGenerator()
+        generator.generate = (  # type: ignore[method-assign]
+            lambda inputs, context: generator.finalize("inline", inputs, context)
+        )
+        job.prepare_with(generator)
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.submit_calls == 0
+        actors.jobs_repo.suspend_generation.assert_not_awaited()
+        actors.jobs_repo.finalize_success.assert_awaited_once()
+
+
+class TestRetryReattachesToProviderJob:
+    @pytest.mark.asyncio
+    async def test_retry_stores_outputs_of_earlier_provider_job(
+        self, job, generation_id, monkeypatch
+    ):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        generator = FakeResumableGenerator()
+        generator.resume = (  # type: ignore[method-assign]
+            lambda external_id, inputs, context: generator.finalize(external_id, inputs, context)
+        )
+        job.prepare_with(generator, external_job_id="provider-job-0")
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.finalize_calls == ["provider-job-0"]
+        assert generator.submit_calls == 0
+        actors.jobs_repo.finalize_success.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_generator_without_resume_runs_generate(self, job, generation_id, monkeypatch):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        generator = FakeResumableGenerator()
+        generator.generate = (  # type: ignore[method-assign]
+            lambda inputs, context: generator.finalize("new-job", inputs, context)
+        )
+        job.prepare_with(generator, external_job_id="provider-job-0")
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.finalize_calls == ["new-job"]
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_retried_on_same_provider_job(
+        self, job, generation_id, monkeypatch
+    ):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        generator = FakeResumableGenerator()
+        finalize = generator.finalize
+        storage_errors = [OSError("storage unavailable")]
+
+        async def flaky_finalize(external_id, inputs, context):
+            if storage_errors:
+                raise storage_errors.pop()
+            return await finalize(external_id, inputs, context)
+
+        async def generate(inputs, context):
+            return await generator.finalize(
+                await generator.submit(inputs, context), inputs, context
+            )
+
+        generator.finalize = flaky_finalize  # type: ignore[method-assign]
+        generator.generate = generate  # type: ignore[method-assign]
+        generator.resume = generator.finalize  # type: ignore[method-assign]
+        job.prepare_with(generator)
+
+        # The error reaches Dramatiq, which retries the message
+        with pytest.raises(OSError, match="storage unavailable"):
+            await actors.process_generation.fn.__wrapped__(generation_id)
+        statuses = [call.args[1].status for call in job.publisher.publish_progress.await_args_list]
+        assert "failed" not in statuses
+
+        # The first attempt recorded its provider job on the generation
+        job.prepare_with(generator, external_job_id="provider-job-1")
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.submit_calls == 1
+        assert generator.finalize_calls == ["provider-job-1"]
+        actors.jobs_repo.finalize_success.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_stops_its_batch_generations(
+        self, job, generation_id, monkeypatch
+    ):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        stop_generations = AsyncMock()
+        monkeypatch.setattr(actors.jobs_repo, "stop_generations", stop_generations)
+        generator = FakeResumableGenerator()
+
+        async def generate(inputs, context):
+            # The attempt stored its first outputs before storage failed
+            context._batch_id = "batch-1"
+            context._batch_generations = ["batch-gen-1", "batch-gen-2"]
+            raise OSError("storage unavailable")
+
+        generator.generate = generate  # type: ignore[method-assign]
+        job.prepare_with(generator)
+
+        with pytest.raises(OSError):
+            await actors.process_generation.fn.__wrapped__(generation_id)
+
+        # The retry creates batch generations of its own
+        stop_generations.assert_awaited_once_with(
+            ANY,
+            ["batch-gen-1", "batch-gen-2"],
+            status="failed",
+            error_message="storage unavailable",
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_job_fails_without_retry(self, job, generation_id, monkeypatch):
+        monkeypatch.setattr(
+            actors,
+            "_prepare_job",
+            AsyncMock(side_effect=actors.InvalidJobError("Invalid input parameters: prompt")),
+        )
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        failed = job.publisher.publish_progress.await_args.args[1]
+        assert failed.status == "failed"
+        assert failed.message == "Invalid input parameters: prompt"
+
+    @pytest.mark.asyncio
+    async def test_generation_failed_once_retries_run_out(self, job, generation_id):
+        message = actors.process_generation.message(generation_id).asdict()
+        message["options"]["traceback"] = (
+            "Traceback (most recent call last):\n  ...\nOSError: storage unavailable\n"
+        )
+
+        await actors.fail_generation.fn.__wrapped__(message, {"retries": 3, "max_retries": 3})
+
+        failed = job.publisher.publish_progress.await_args.args[1]
+        assert failed.job_id == generation_id
+        assert failed.status == "failed"
+        assert failed.message == "OSError: storage unavailable"
+
+    @pytest.mark.asyncio
+    async def test_continuation_mode_waits_on_earlier_provider_job(self, job, generation_id):
+        generator = FakeResumableGenerator()
+        job.prepare_with(generator, external_job_id="provider-job-0")
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert generator.submit_calls == 0
+        suspend = actors.jobs_repo.suspend_generation.await_args.kwargs
+        assert suspend["external_job_id"] == "provider-job-0"
+
+
+class TestResumeGeneration:
+    @pytest.mark.asyncio
+    async def test_unclaimed_job_is_skipped(self, job, generation_id):
+        actors.jobs_repo.claim_continuation.return_value = None
+        generator = FakeResumableGenerator()
+        job.prepare_with(generator)
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        assert generator.finalize_calls == []
+        actors.jobs_repo.release_continuation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pending_job_is_released_to_the_poller(self, job, generation_id):
+        actors.jobs_repo.claim_continuation.return_value = _claim(checks=2)
+        generator = FakeResumableGenerator(ExternalJobStatus(state="pending", progress=0.5))
+        job.prepare_with(generator)
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        continuation = actors.jobs_repo.release_continuation.await_args.args[2]
+        assert continuation["checks"] == 3
+        assert datetime.fromisoformat(continuation["next_check_at"]) > datetime.now(UTC)
+        assert job.publisher.publish_progress.await_args.args[1].progress == 0.5
+        assert generator.finalize_calls == []
+        actors._prepare_job.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_completed_job_is_finalized(self, job, generation_id):
+        actors.jobs_repo.claim_continuation.return_value = _claim()
+        generator = FakeResumableGenerator()
+        job.prepare_with(generator)
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        assert generator.finalize_calls == ["provider-job-1"]
+        actors.jobs_repo.finalize_success.assert_awaited_once()
+        assert job.publisher.publish_only.await_args.args[1].status == "completed"
+        assert actors._prepare_job.await_args.kwargs["record_lineage"] is False
+        job.context.cleanup.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_completed_hint_skips_status_check(self, job, generation_id):
+        actors.jobs_repo.claim_continuation.return_value = _claim()
+        generator = FakeResumableGenerator()
+        generator.check_status = AsyncMock()  # type: ignore[method-assign]
+        job.prepare_with(generator)
+
+        await actors.resume_generation.fn.__wrapped__(generation_id, True)
+
+        generator.check_status.assert_not_awaited()
+        assert generator.finalize_calls == ["provider-job-1"]
+
+    @pytest.mark.asyncio
+    async def test_failed_provider_job_fails_generation(self, job, generation_id):
+        actors.jobs_repo.claim_continuation.return_value = _claim()
+        generator = FakeResumableGenerator(ExternalJobStatus(state="failed", error="NSFW"))
+        job.prepare_with(generator)
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        update = job.publisher.publish_progress.await_args.args[1]
+        assert update.status == "failed"
+        assert update.message == "Generation failed: NSFW"
+        actors.jobs_repo.finalize_success.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_job_past_timeout_fails(self, job, generation_id):
+        suspended_at = datetime.now(UTC) - timedelta(seconds=actors.settings.job_timeout + 1)
+        actors.jobs_repo.claim_continuation.return_value = _claim(suspended_at)
+        job.prepare_with(FakeResumableGenerator(ExternalJobStatus(state="pending")))
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        assert job.publisher.publish_progress.await_args.args[1].status == "failed"
+        actors.jobs_repo.release_continuation.assert_not_awaited()
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Limit the fake generator's provider; returns the limiter's Redis calls."""
+    redis_client = MagicMock()
+    redis_client.eval = AsyncMock(return_value=0)
+    redis_client.zrem = AsyncMock()
+    limiter = ProviderLimiter(redis_client, {"fake": ProviderLimit(concurrency=2)})
+    monkeypatch.setattr(actors, "get_provider_limiter", lambda: limiter)
+    monkeypatch.setattr(FakeResumableGenerator, "provider", "fake")
+    return redis_client
+
+
+class TestProviderSlots:
+    @pytest.mark.asyncio
+    async def test_suspended_job_keeps_its_slot(self, job, generation_id, limited):
+        job.prepare_with(FakeResumableGenerator())
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        lease_ttl = limited.eval.await_args.args[-1]
+        expected = actors.settings.job_timeout + actors.settings.job_continuation_claim_timeout
+        assert lease_ttl == expected * 1000
+        suspend = actors.jobs_repo.suspend_generation.await_args.kwargs
+        assert suspend["rate_limit_scope"] == "ratelimit:fake"
+        limited.zrem.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_finished_job_frees_its_slot(self, job, generation_id, limited):
+        claim = _claim()
+        claim.continuation["rate_limit_scope"] = "ratelimit:fake"
+        actors.jobs_repo.claim_continuation.return_value = claim
+        job.prepare_with(FakeResumableGenerator())
+
+        await actors.resume_generation.fn.__wrapped__(generation_id)
+
+        limited.zrem.assert_awaited_once_with("ratelimit:fake:leases", generation_id)
+
+    @pytest.mark.asyncio
+    async def test_inline_job_holds_slot_while_generating(
+        self, job, generation_id, limited, monkeypatch
+    ):
+        monkeypatch.setattr(actors.settings, "job_continuation_enabled", False)
+        generator = FakeResumableGenerator()
+        held_during_generate: list[bool] = []
+
+        async def generate(inputs, context):
+            held_during_generate.append(not limited.zrem.await_count)
+            return await generator.finalize("inline", inputs, context)
+
+        generator.generate = generate  # type: ignore[method-assign]
+        job.prepare_with(generator)
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        assert held_during_generate == [True]
+        limited.zrem.assert_awaited_once_with("ratelimit:fake:leases", generation_id)
+
+    @pytest.mark.asyncio
+    async def test_busy_provider_requeues_instead_of_failing(
+        self, job, generation_id, limited, monkeypatch
+    ):
+        monkeypatch.setattr(
+            ProviderLimiter, "acquire", AsyncMock(side_effect=ProviderBusyError("busy"))
+        )
+        enqueue = AsyncMock()
+        monkeypatch.setattr(actors, "enqueue_generation", enqueue)
+        job.prepare_with(FakeResumableGenerator())
+
+        await actors.process_generation.fn.__wrapped__(generation_id)
+
+        enqueue.assert_awaited_once_with(
+            generation_id, job.context.generator_name, job.context.tenant_id
+        )
+        actors.jobs_repo.suspend_generation.assert_not_awaited()
+        statuses = [call.args[1].status for call in job.publisher.publish_progress.await_args_list]
+        assert "failed" not in statuses
+
+
+class TestContinuationRepository:
+    @pytest.mark.asyncio
+    async def test_claim_is_a_single_conditional_update(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await jobs_repo.claim_continuation(session, uuid4(), claim_timeout=600)
+
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE boards.generations SET continuation=")
+        assert "boards.generations.continuation IS NOT NULL" in sql
+        assert "->>" in sql
+        assert "RETURNING boards.generations.continuation" in sql
+
+
+def _kie_response(data: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"code": 200, "msg": "success", "data": data}
+    return response
+
+
+class TestKieResumableHooks:
+    @pytest.mark.asyncio
+    async def test_dedicated_status_mapping(self):
+        generator = KieVeo3Generator()
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(return_value=_kie_response({"successFlag": 0}))
+            assert (await generator.check_status("task")).state == "pending"
+
+            client.get = AsyncMock(
+                return_value=_kie_response({"successFlag": 2, "errorMsg": "bad prompt"})
+            )
+            status = await generator.check_status("task")
+
+        assert status.state == "failed"
+        assert status.error == "bad prompt"
+
+    @pytest.mark.asyncio
+    async def test_market_finalize_stores_outputs_of_completed_task(self):
+        generator = KieNanoBananaEditGenerator()
+        inputs = NanoBananaEditInput(
+            prompt="edit",
+            image_sources=[
+                ImageArtifact(
+                    generation_id="in",
+                    storage_url="https://example.com/in.png",
+                    format="png",
+                    width=512,
+                    height=512,
+                )
+            ],
+        )
+        context = MagicMock()
+        artifact = ImageArtifact(
+            generation_id="out",
+            storage_url="https://storage.example.com/out.png",
+            format="png",
+            width=1024,
+            height=1024,
+        )
+        context.store_image_result = AsyncMock(return_value=artifact)
+        task = {"state": "success", "resultJson": '{"resultUrls": ["https://kie.ai/out.png"]}'}
+
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(return_value=_kie_response(task))
+            result = await generator.finalize("task", inputs, context)
+
+        assert result.outputs == [artifact]
+        assert context.store_image_result.await_args.kwargs["storage_url"] == (
+            "https://kie.ai/out.png"
+        )
+
+    @pytest.mark.asyncio
+    async def test_resume_polls_existing_task_without_resubmitting(self):
+        generator = KieVeo3Generator()
+        context = MagicMock()
+        context.publish_progress = AsyncMock()
+        result = GeneratorResult(outputs=[])
+        generator._store_outputs = AsyncMock(return_value=result)  # type: ignore[method-assign]
+        generator.submit = AsyncMock()  # type: ignore[method-assign]
+
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(
+                side_effect=[
+                    _kie_response({"successFlag": 0}),
+                    _kie_response({"successFlag": 0}),
+                    _kie_response({"successFlag": 1}),
+                ]
+            )
+            assert await generator.resume("task", MagicMock(), context) is result
+
+        generator.submit.assert_not_awaited()
+        assert generator._store_outputs.await_args_list[0].args[0] == {"successFlag": 1}
+
+    @pytest.mark.asyncio
+    async def test_resume_gives_up_on_failed_task(self):
+        generator = KieVeo3Generator()
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(return_value=_kie_response({"successFlag": 2}))
+            assert await generator.resume("task", MagicMock(), MagicMock()) is None
+
+    @pytest.mark.asyncio
+    async def test_finalize_refuses_unfinished_task(self):
+        generator = KieVeo3Generator()
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(return_value=_kie_response({"successFlag": 0}))
+            with pytest.raises(ValueError, match="has not completed yet"):
+                await generator.finalize("task", MagicMock(), MagicMock())
@@ -0,0 +1,172 @@
+"""Tests for the database round trips of a generation job."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, nullcontext
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.base import BaseGenerator, GeneratorResult
+from boards.progress import publisher as publisher_module
+from boards.progress.models import ProgressUpdate
+from boards.workers import actors
+
+
+class PromptInput(BaseModel):
+    prompt: str
+
+
+class EditInput(PromptInput):
+    image: ImageArtifact
+
+
+class FakeImageGenerator(BaseGenerator):
+    name = "fake-image"
+    artifact_type = "image"
+    description = "Generates or edits an image"
+
+    def __init__(self, input_schema: type[BaseModel] = PromptInput) -> None:
+        self.input_schema = input_schema
+
+    def get_input_schema(self) -> type[BaseModel]:
+        return self.input_schema
+
+    async def generate(self, inputs, context: Any) -> GeneratorResult:
+        await context.publish_progress(
+            ProgressUpdate(
+                job_id=context.generation_id,
+                status="processing",
+                progress=0.5,
+                phase="processing",
+            )
+        )
+        return GeneratorResult(
+            outputs=[
+                ImageArtifact(
+                    generation_id=context.generation_id,
+                    storage_url="s3://edited.png",
+                    format="png",
+                    width=None,
+                    height=None,
+                )
+            ]
+        )
+
+    async def estimate_cost(self, inputs) -> float:
+        return 0.0
+
+
+class RecordingSession:
+    """Records the statements a job sends; answers with canned rows."""
+
+    def __init__(self, job, source) -> None:
+        self.job = job
+        self.source = source
+        self.statements: list[str] = []
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.statements.append(sql.split()[0])
+        result = MagicMock()
+        result.one.return_value = self.job
+        result.__iter__.return_value = iter([self.source])
+        return result
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    tenant_id = uuid4()
+    source_id = uuid4()
+    job = SimpleNamespace(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        board_id=uuid4(),
+        user_id=uuid4(),
+        generator_name="fake-image",
+        artifact_type="image",
+        input_params={"prompt": "make it blue"},
+        external_job_id=None,
+        pipeline=None,
+        status="pending",
+    )
+    source = SimpleNamespace(
+        id=source_id,
+        tenant_id=tenant_id,
+        status="completed",
+        artifact_type="image",
+        storage_url="s3://source.png",
+        output_metadata={"format": "png"},
+    )
+    session = RecordingSession(job, source)
+    sessions_opened = []
+
+    @asynccontextmanager
+    async def fake_session():
+        sessions_opened.append(session)
+        yield session
+
+    redis_client = MagicMock()
+    redis_client.publish = AsyncMock()
+    redis_client.eval = AsyncMock(return_value=1)
+    monkeypatch.setattr(actors.settings, "progress_flush_interval_ms", 250)
+    monkeypatch.setattr(actors, "get_async_session", fake_session)
+    monkeypatch.setattr(publisher_module, "get_async_session", fake_session)
+    monkeypatch.setattr(publisher_module, "get_redis_client", lambda: redis_client)
+    monkeypatch.setattr(actors, "create_storage_manager", MagicMock)
+    monkeypatch.setattr(actors, "_watch_cancellation", lambda generation_id: nullcontext())
+    generator = SimpleNamespace(current=FakeImageGenerator())
+    monkeypatch.setattr(actors.generator_registry, "get", lambda name: generator.current)
+    return SimpleNamespace(
+        generator=generator,
+        job=job,
+        source=source,
+        session=session,
+        sessions_opened=sessions_opened,
+        redis=redis_client,
+    )
+
+
+def _published_statuses(redis_client) -> list[str]:
+    return [
+        ProgressUpdate.model_validate_json(call.args[1]).status
+        for call in redis_client.publish.await_args_list
+    ]
+
+
+class TestJobRoundTrips:
+    @pytest.mark.asyncio
+    async def test_job_runs_with_three_statements(self, recorded):
+        await actors.process_generation.fn.__wrapped__(str(recorded.job.id))
+
+        # Load the job, mark it processing, complete it; progress ticks in between
+        # wait in the write buffer and are dropped by the terminal write
+        assert recorded.session.statements == ["SELECT", "UPDATE", "UPDATE"]
+        assert len(recorded.sessions_opened) == 2
+        statuses = _published_statuses(recorded.redis)
+        assert statuses[0] == "processing"
+        assert statuses[-1] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_lineage_is_written_with_the_processing_status(self, recorded, monkeypatch):
+        recorded.generator.current = FakeImageGenerator(EditInput)
+        recorded.job.input_params["image"] = str(recorded.source.id)
+        start_job = AsyncMock()
+        monkeypatch.setattr(actors.jobs_repo, "start_job", start_job)
+
+        await actors.process_generation.fn.__wrapped__(str(recorded.job.id))
+
+        # Input artifacts are resolved with one more query, in the same session
+        assert recorded.session.statements == ["SELECT", "SELECT", "UPDATE"]
+        assert len(recorded.sessions_opened) == 2
+        start_job.assert_awaited_once()
+        lineage = start_job.call_args_list[0].kwargs["input_artifacts"]
+        assert [item["generation_id"] for item in lineage] == [str(recorded.source.id)]
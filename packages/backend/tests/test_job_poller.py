@@ -0,0 +1,288 @@
+"""Tests for the central poller of suspended generations' provider jobs."""
+
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from boards.config import Settings
+from boards.generators.base import ExternalJobStatus, ResumableGenerator
+from boards.generators.implementations.kie.video.veo3 import KieVeo3Generator
+from boards.jobs import repository as jobs_repo
+from boards.workers import poller as poller_module
+from boards.workers.poller import (
+    ExternalJobPoller,
+    claim_poller_turn,
+    next_check_delay,
+)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def pexpire(self, key, ttl):
+        return key in self.data
+
+
+def _job(generator_name="fake-resumable", checks=0, suspended_at=None, external_job_id="ext"):
+    suspended_at = suspended_at or datetime.now(UTC)
+    return SimpleNamespace(
+        id=uuid4(),
+        continuation={
+            "suspended_at": suspended_at.isoformat(),
+            "checks": checks,
+            "claimed_at": datetime.now(UTC).isoformat(),
+        },
+        external_job_id=external_job_id,
+        generator_name=generator_name,
+    )
+
+
+class BatchGenerator(ResumableGenerator):
+    name = "fake-resumable"
+    artifact_type = "image"
+    description = "Fake resumable generator"
+
+    def __init__(self, statuses: dict[str, ExternalJobStatus | Exception]) -> None:
+        self.statuses = statuses
+        self.batches: list[list[str]] = []
+
+    def get_input_schema(self):
+        raise NotImplementedError
+
+    async def generate(self, inputs, context):
+        raise NotImplementedError
+
+    async def submit(self, inputs, context) -> str:
+        raise NotImplementedError
+
+    async def check_status(self, external_id: str) -> ExternalJobStatus:
+        status = self.statuses[external_id]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    async def check_statuses(self, external_ids):
+        self.batches.append(list(external_ids))
+        return await super().check_statuses(external_ids)
+
+    async def finalize(self, external_id, inputs, context):
+        raise NotImplementedError
+
+    async def estimate_cost(self, inputs) -> float:
+        return 0.0
+
+
+@pytest.fixture
+def config() -> Settings:
+    return Settings(
+        job_continuation_poll_interval=5.0,
+        job_continuation_poll_max_interval=60.0,
+        job_continuation_poll_backoff=2.0,
+        job_continuation_poll_jitter=0.0,
+    )
+
+
+@pytest.fixture
+def run(monkeypatch, config):
+    """Run the poller once over the given claimed jobs and generators."""
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    monkeypatch.setattr(poller_module, "get_async_session", fake_session)
+    release = AsyncMock()
+    monkeypatch.setattr(jobs_repo, "release_continuations", release)
+
+    async def run_once(jobs, generators):
+        monkeypatch.setattr(jobs_repo, "claim_due_continuations", AsyncMock(return_value=jobs))
+        monkeypatch.setattr(poller_module.generator_registry, "get", generators.get)
+        publisher = MagicMock()
+        publisher.publish_progress = AsyncMock()
+        resumed: list[tuple[str, bool]] = []
+        poller = ExternalJobPoller(config, publisher, lambda *args: resumed.append(args))
+        checked = await poller.run_once()
+        released = release.await_args.args[1] if release.await_args else {}
+        return SimpleNamespace(
+            checked=checked, released=released, resumed=resumed, publisher=publisher
+        )
+
+    return run_once
+
+
+class TestSchedule:
+    def test_delay_backs_off_up_to_the_cap(self, config):
+        delays = [next_check_delay(checks, config) for checks in range(6)]
+
+        assert delays == [5.0, 10.0, 20.0, 40.0, 60.0, 60.0]
+
+    def test_jitter_spreads_checks(self, config):
+        config.job_continuation_poll_jitter = 0.2
+
+        delays = {next_check_delay(1, config) for _ in range(50)}
+
+        assert len(delays) > 1
+        assert all(8.0 <= delay <= 12.0 for delay in delays)
+
+
+class TestExternalJobPoller:
+    @pytest.mark.asyncio
+    async def test_nothing_due(self, run):
+        result = await run([], {})
+
+        assert result.checked == 0
+        assert result.resumed == []
+
+    @pytest.mark.asyncio
+    async def test_jobs_are_checked_in_one_batch_per_generator(self, run):
+        pending, done, failed = _job(checks=2), _job(), _job()
+        pending.external_job_id, done.external_job_id, failed.external_job_id = "a", "b", "c"
+        generator = BatchGenerator(
+            {
+                "a": ExternalJobStatus(state="pending", progress=0.4),
+                "b": ExternalJobStatus(state="completed"),
+                "c": ExternalJobStatus(state="failed", error="NSFW"),
+            }
+        )
+
+        result = await run([pending, done, failed], {"fake-resumable": generator})
+
+        assert generator.batches == [["a", "b", "c"]]
+        assert result.checked == 3
+        assert result.resumed == [(str(done.id), True), (str(failed.id), False)]
+        # Claims are dropped for every job in a single release
+        assert set(result.released) == {str(pending.id), str(done.id), str(failed.id)}
+        pending_state = result.released[str(pending.id)]
+        assert pending_state["checks"] == 3
+        next_check = datetime.fromisoformat(pending_state["next_check_at"])
+        assert timedelta(seconds=39) < next_check - datetime.now(UTC) <= timedelta(seconds=40)
+        update = result.publisher.publish_progress.await_args.args[1]
+        assert update.progress == 0.4
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_are_retried_if_resume_is_lost(self, run, config):
+        job = _job()
+        generator = BatchGenerator({"ext": ExternalJobStatus(state="completed")})
+
+        result = await run([job], {"fake-resumable": generator})
+
+        next_check = datetime.fromisoformat(result.released[str(job.id)]["next_check_at"])
+        assert next_check - datetime.now(UTC) > timedelta(
+            seconds=config.job_continuation_claim_timeout - 5
+        )
+
+    @pytest.mark.asyncio
+    async def test_status_errors_count_as_pending(self, run):
+        job = _job()
+        generator = BatchGenerator({"ext": RuntimeError("503 from provider")})
+
+        result = await run([job], {"fake-resumable": generator})
+
+        assert result.resumed == []
+        assert result.released[str(job.id)]["checks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_jobs_past_timeout_are_handed_to_resume(self, run, config):
+        job = _job(suspended_at=datetime.now(UTC) - timedelta(seconds=config.job_timeout + 1))
+        generator = BatchGenerator({"ext": ExternalJobStatus(state="pending")})
+
+        result = await run([job], {"fake-resumable": generator})
+
+        assert result.resumed == [(str(job.id), False)]
+
+    @pytest.mark.asyncio
+    async def test_unknown_generator_is_handed_to_resume(self, run):
+        job = _job(generator_name="removed")
+
+        result = await run([job], {})
+
+        assert result.resumed == [(str(job.id), False)]
+
+
+class TestPollerOwnership:
+    @pytest.mark.asyncio
+    async def test_only_the_owning_chain_runs(self):
+        redis_client = FakeRedis()
+
+        assert await claim_poller_turn(redis_client, "chain-1", ttl=10)  # type: ignore[arg-type]
+        assert await claim_poller_turn(redis_client, "chain-1", ttl=10)  # type: ignore[arg-type]
+        assert not await claim_poller_turn(redis_client, "chain-2", ttl=10)  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_chain_takes_over_after_owner_expires(self):
+        redis_client = FakeRedis()
+        await claim_poller_turn(redis_client, "chain-1", ttl=10)  # type: ignore[arg-type]
+        redis_client.data.clear()
+
+        assert await claim_poller_turn(redis_client, "chain-2", ttl=10)  # type: ignore[arg-type]
+
+
+class TestPollerRepository:
+    @pytest.mark.asyncio
+    async def test_due_jobs_are_claimed_in_one_update(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await jobs_repo.claim_due_continuations(session, claim_timeout=600, limit=200)
+
+        session.execute.assert_awaited_once()
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE boards.generations SET continuation=")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "->>" in sql
+        assert "RETURNING boards.generations.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_claims_are_released_in_one_update(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        first, second = str(uuid4()), str(uuid4())
+
+        await jobs_repo.release_continuations(
+            session, {first: {"checks": 1, "claimed_at": "x"}, second: {"checks": 4}}
+        )
+
+        session.execute.assert_awaited_once()
+        stmt = session.execute.await_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        assert str(compiled).startswith("UPDATE boards.generations SET continuation=released.")
+        assert "claimed_at" not in str(compiled.params)
+
+
+class TestKieBatchStatus:
+    @pytest.mark.asyncio
+    async def test_tasks_share_one_connection_pool(self):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"code": 200, "msg": "ok", "data": {"successFlag": 1}}
+
+        with (
+            patch.dict(os.environ, {"KIE_API_KEY": "fake-key"}),
+            patch("httpx.AsyncClient") as client_class,
+        ):
+            client = client_class.return_value.__aenter__.return_value
+            client.get = AsyncMock(return_value=response)
+            statuses = await KieVeo3Generator().check_statuses(["t1", "t2", "t3"])
+
+        client_class.assert_called_once()
+        assert client.get.await_count == 3
+        assert [s.state for s in statuses if isinstance(s, ExternalJobStatus)] == ["completed"] * 3
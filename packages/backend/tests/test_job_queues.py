@@ -0,0 +1,205 @@
+"""Tests for routing generations to the queue of their duration class."""
+
+from __future__ import annotations
+
+import click
+import pytest
+from dramatiq import Message
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.brokers.stub import StubBroker
+from dramatiq.common import q_name
+from dramatiq.middleware import AsyncIO
+
+from boards.generators.registry import registry
+from boards.generators.testmods.class_gen import ClassGen
+from boards.workers import actors, queues
+from boards.workers.cli import parse_queue_concurrency, parse_queues
+from boards.workers.executor import AsyncWorker
+
+
+class SlowClassGen(ClassGen):
+    name = "slow-class-gen"
+    queue_class = "slow"
+
+
+@pytest.fixture
+def generators():
+    registry.clear()
+    registry.register(ClassGen())
+    registry.register(SlowClassGen())
+    yield
+    registry.clear()
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    messages = []
+
+    def enqueue(message):
+        messages.append(message)
+        return message
+
+    monkeypatch.setattr(actors.broker, "enqueue", enqueue)
+    return messages
+
+
+class TestQueueRouting:
+    def test_generators_run_on_their_class_queue(self, generators):
+        # ClassGen makes text and has no queue_class of its own
+        assert queues.queue_for_generator("class-gen") == "boards-jobs-text"
+        assert queues.queue_for_generator("slow-class-gen") == "boards-jobs-slow"
+        assert queues.queue_for_generator("unknown-gen") == "boards-jobs"
+
+    def test_routing_can_be_disabled(self, generators, monkeypatch):
+        monkeypatch.setattr(queues.settings, "job_queue_routing_enabled", False)
+
+        assert queues.queue_for_generator("slow-class-gen") == "boards-jobs"
+
+    def test_declares_artifact_type_and_generator_queues(self, generators):
+        broker = StubBroker()
+
+        queues.declare_generation_queues(broker)
+
+        assert {q_name(queue) for queue in broker.get_declared_queues()} == {
+            "boards-jobs-audio",
+            "boards-jobs-image",
+            "boards-jobs-lora",
+            "boards-jobs-slow",
+            "boards-jobs-text",
+            "boards-jobs-video",
+        }
+
+    @pytest.mark.asyncio
+    async def test_enqueue_generation_routes_process_generation(self, generators, enqueued):
+        message = await actors.enqueue_generation("gen-1", "slow-class-gen")
+
+        assert enqueued == [message]
+        assert message.actor_name == "process_generation"
+        assert message.args == ("gen-1",)
+        assert message.queue_name == "boards-jobs-slow"
+
+    @pytest.mark.asyncio
+    async def test_enqueue_generation_without_generator_uses_default_queue(self, enqueued):
+        message = await actors.enqueue_generation("gen-1", None)
+
+        assert message.queue_name == "boards-jobs"
+
+
+class FakePipeline:
+    def __init__(self) -> None:
+        self.commands: list[list] = []
+        self.executions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self):
+        self.executions += 1
+
+
+class FakeScript:
+    def __call__(self, keys=None, args=None, client=None):
+        if client is None:
+            return 8000  # Lua stack size, asked once per process
+        client.commands.append(args)
+
+
+class FakeRedisClient:
+    def __init__(self) -> None:
+        self.pipelines: list[FakePipeline] = []
+
+    def register_script(self, script):
+        return FakeScript()
+
+    def pipeline(self, transaction=True):
+        self.pipelines.append(FakePipeline())
+        return self.pipelines[-1]
+
+
+class TestEnqueueMany:
+    def test_redis_broker_enqueues_in_one_pipeline(self):
+        client = FakeRedisClient()
+        broker = RedisBroker(client=client)
+        messages = [
+            Message(
+                queue_name="boards-jobs-image",
+                actor_name="process_generation",
+                args=(f"gen-{n}",),
+                kwargs={},
+                options={},
+            )
+            for n in range(1000)
+        ]
+
+        enqueued = queues.enqueue_many(broker, messages)
+
+        [pipeline] = client.pipelines
+        assert pipeline.executions == 1
+        assert len(pipeline.commands) == 1000
+        command, _, queue_name, *_, redis_message_id, data = pipeline.commands[0]
+        assert (command, queue_name) == ("enqueue", "boards-jobs-image")
+        assert redis_message_id == enqueued[0].options["redis_message_id"]
+        assert Message.decode(data).args == ("gen-0",)
+
+    def test_other_brokers_enqueue_one_by_one(self):
+        broker = StubBroker()
+        broker.declare_queue("boards-jobs")
+        message = Message(
+            queue_name="boards-jobs",
+            actor_name="process_generation",
+            args=("gen-1",),
+            kwargs={},
+            options={},
+        )
+
+        queues.enqueue_many(broker, [message])
+
+        assert broker.queues["boards-jobs"].qsize() == 1
+
+
+class TestQueueConcurrency:
+    def test_parse_classes_and_queue_names(self):
+        assert parse_queue_concurrency("video=4, boards-jobs=10") == {
+            "boards-jobs-video": 4,
+            "boards-jobs": 10,
+        }
+        assert parse_queue_concurrency(None) == {}
+
+    @pytest.mark.parametrize("value", ["video", "video=0", "=3", "video=many"])
+    def test_parse_rejects_invalid_limits(self, value):
+        with pytest.raises(click.BadParameter):
+            parse_queue_concurrency(value)
+
+    def test_parse_queues_resolves_classes_and_keeps_control_queue(self):
+        assert parse_queues("video, lora") == [
+            "boards-jobs-video",
+            "boards-jobs-lora",
+            "boards-jobs",
+        ]
+        assert parse_queues("boards-jobs, image") == ["boards-jobs", "boards-jobs-image"]
+        assert parse_queues(None) == []
+
+    def test_capped_queues_prefetch_only_their_limit(self):
+        broker = StubBroker()
+        broker.add_middleware(AsyncIO())
+        broker.emit_after("process_boot")
+        broker.declare_queue("boards-jobs-image")
+        broker.declare_queue("boards-jobs-video")
+        worker = AsyncWorker(
+            broker,
+            concurrency=50,
+            queue_concurrency={"boards-jobs-video": 4},
+            worker_timeout=50,
+        )
+        worker.start()
+        try:
+            # A consumer has at most its prefetch of unacked messages in flight
+            assert worker.consumers["boards-jobs-video"].prefetch == 4
+            assert worker.consumers["boards-jobs-image"].prefetch == 100
+        finally:
+            worker.stop(timeout=5000)
+            broker.emit_before("process_stop")
+            broker.close()
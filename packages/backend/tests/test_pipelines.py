@@ -0,0 +1,252 @@
+"""Tests for server-side generation pipelines."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from boards.generators.artifacts import ImageArtifact, VideoArtifact
+from boards.generators.base import BaseGenerator, GeneratorResult
+from boards.jobs.pipelines import PipelineStep, plan_pipeline
+from boards.workers import actors
+
+
+class PromptInput(BaseModel):
+    prompt: str
+
+
+class TryOnInput(BaseModel):
+    human_image_url: ImageArtifact
+    garment_image_url: ImageArtifact
+
+
+class UpscaleInput(BaseModel):
+    image_url: ImageArtifact
+
+
+class VideoToImageInput(BaseModel):
+    image_url: VideoArtifact
+
+
+class FakeGenerator(BaseGenerator):
+    description = "Fake generator"
+
+    def __init__(self, name: str, artifact_type: str, input_schema: type[BaseModel]) -> None:
+        self.name = name
+        self.artifact_type = artifact_type
+        self.input_schema = input_schema
+
+    def get_input_schema(self) -> type[BaseModel]:
+        return self.input_schema
+
+    async def generate(self, inputs, context: Any) -> GeneratorResult:
+        raise NotImplementedError
+
+    async def estimate_cost(self, inputs) -> float:
+        return 0.0
+
+
+GENERATORS = {
+    generator.name: generator
+    for generator in (
+        FakeGenerator("text-to-image", "image", PromptInput),
+        FakeGenerator("try-on", "image", TryOnInput),
+        FakeGenerator("upscale", "image", UpscaleInput),
+        FakeGenerator("image-to-video", "video", UpscaleInput),
+        FakeGenerator("video-frame", "image", VideoToImageInput),
+    )
+}
+
+
+def _plan(*steps: tuple[str, str, dict[str, Any]]):
+    return plan_pipeline([PipelineStep(*step) for step in steps], GENERATORS.get)
+
+
+class TestPlanPipeline:
+    def test_references_become_upstream_generation_ids(self):
+        garment_id = str(uuid4())
+        planned = _plan(
+            ("animate", "image-to-video", {"image_url": {"$step": "try-on"}}),
+            (
+                "try-on",
+                "try-on",
+                {"human_image_url": {"$step": "person"}, "garment_image_url": garment_id},
+            ),
+            ("person", "text-to-image", {"prompt": "a model"}),
+        )
+
+        assert [step.step_id for step in planned] == ["person", "try-on", "animate"]
+        person, try_on, animate = planned
+        assert person.waiting_on == []
+        assert try_on.waiting_on == [str(person.generation_id)]
+        assert try_on.input_params == {
+            "human_image_url": str(person.generation_id),
+            "garment_image_url": garment_id,
+        }
+        assert animate.artifact_type == "video"
+        assert animate.pipeline_record("p1") == {
+            "pipeline_id": "p1",
+            "step": "animate",
+            "waiting_on": [str(try_on.generation_id)],
+        }
+
+    def test_rejects_cycles(self):
+        with pytest.raises(ValueError, match="cycle: a, b"):
+            _plan(
+                ("a", "upscale", {"image_url": {"$step": "b"}}),
+                ("b", "upscale", {"image_url": {"$step": "a"}}),
+                ("c", "text-to-image", {"prompt": "unrelated"}),
+            )
+
+    @pytest.mark.parametrize(
+        ("steps", "error"),
+        [
+            (
+                [("a", "text-to-image", {}), ("a", "text-to-image", {})],
+                "Duplicate pipeline step: a",
+            ),
+            ([("a", "no-such-generator", {})], "Unknown generator: no-such-generator"),
+            ([("a", "upscale", {"image_url": {"$step": "b"}})], "refers to unknown step b"),
+            (
+                [("a", "text-to-image", {}), ("b", "text-to-image", {"prompt": {"$step": "a"}})],
+                "prompt is not an artifact field",
+            ),
+            (
+                [("a", "text-to-image", {}), ("b", "video-frame", {"image_url": {"$step": "a"}})],
+                "needs a video, but step a produces a image",
+            ),
+        ],
+    )
+    def test_rejects_invalid_pipelines(self, steps, error):
+        with pytest.raises(ValueError, match=error):
+            _plan(*steps)
+
+
+@pytest.fixture
+def pipeline_session(monkeypatch):
+    session = MagicMock()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield session
+
+    enqueue = AsyncMock(return_value=[])
+    monkeypatch.setattr(actors, "get_async_session", fake_session)
+    monkeypatch.setattr(actors, "enqueue_generations", enqueue)
+    return SimpleNamespace(session=session, enqueue=enqueue)
+
+
+class TestPipelineProgress:
+    @pytest.mark.asyncio
+    async def test_completed_step_enqueues_steps_waiting_only_on_it(
+        self, pipeline_session, monkeypatch
+    ):
+        tenant_id = uuid4()
+        ready, waiting, cancelled = uuid4(), uuid4(), uuid4()
+        release = AsyncMock(
+            return_value=[
+                SimpleNamespace(
+                    id=ready,
+                    tenant_id=tenant_id,
+                    generator_name="upscale",
+                    status="pending",
+                    waiting_on=[],
+                ),
+                SimpleNamespace(
+                    id=waiting,
+                    tenant_id=tenant_id,
+                    generator_name="try-on",
+                    status="pending",
+                    waiting_on=[str(uuid4())],
+                ),
+                SimpleNamespace(
+                    id=cancelled,
+                    tenant_id=tenant_id,
+                    generator_name="upscale",
+                    status="cancelled",
+                    waiting_on=[],
+                ),
+            ]
+        )
+        monkeypatch.setattr(actors.jobs_repo, "release_pipeline_dependents", release)
+
+        await actors._advance_pipeline("gen-a")
+
+        release.assert_awaited_once_with(pipeline_session.session, "gen-a")
+        pipeline_session.enqueue.assert_awaited_once_with(
+            [actors.GenerationJob(str(ready), "upscale", tenant_id)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_completion_published_when_advancing_fails(self, pipeline_session, monkeypatch):
+        generation_id = str(uuid4())
+        monkeypatch.setattr(actors.jobs_repo, "finalize_success", AsyncMock())
+        monkeypatch.setattr(
+            actors.jobs_repo,
+            "release_pipeline_dependents",
+            AsyncMock(side_effect=RuntimeError("connection reset")),
+        )
+        context = SimpleNamespace(_batch_id=None, pipeline_id=str(uuid4()))
+        output = GeneratorResult(
+            outputs=[
+                ImageArtifact(
+                    generation_id=generation_id,
+                    storage_url="https://storage.example/out.png",
+                    width=512,
+                    height=512,
+                    format="png",
+                )
+            ]
+        )
+        publisher = MagicMock()
+        publisher.publish_only = AsyncMock()
+
+        # A retry would skip the completed generation, so nothing may raise here
+        await actors._finalize_job(generation_id, output, context, publisher)  # type: ignore[arg-type]
+
+        published = publisher.publish_only.await_args_list[-1].args[1]
+        assert published.status == "completed"
+        pipeline_session.enqueue.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_step_fails_downstream_steps(self, pipeline_session, monkeypatch):
+        downstream = [uuid4(), uuid4()]
+        fail_dependents = AsyncMock(return_value=downstream)
+        monkeypatch.setattr(actors.jobs_repo, "fail_pipeline_dependents", fail_dependents)
+        publisher = MagicMock()
+        publisher.publish_progress = AsyncMock()
+        publisher.publish_only = AsyncMock()
+
+        await actors._fail_job("gen-a", publisher, RuntimeError("provider error"))
+
+        fail_dependents.assert_awaited_once()
+        assert fail_dependents.call_args_list[0].kwargs["status"] == "failed"
+        published = [call.args[1] for call in publisher.publish_only.await_args_list]
+        assert [update.job_id for update in published] == [str(step) for step in downstream]
+        assert all(update.status == "failed" for update in published)
+        pipeline_session.enqueue.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_outputs_on_fal_cdn_are_handed_to_later_fal_jobs(monkeypatch):
+    from boards.generators.implementations.fal import utils as fal_utils
+    from boards.workers.context import GeneratorExecutionContext
+
+    cache = MagicMock()
+    cache.set_many = AsyncMock()
+    monkeypatch.setattr(fal_utils, "get_fal_upload_cache", lambda: cache)
+    context = GeneratorExecutionContext.__new__(GeneratorExecutionContext)
+    artifact = ImageArtifact(
+        generation_id="gen-a", storage_url="s3://a.png", format="png", width=1, height=1
+    )
+
+    await context._share_provider_url(artifact, "https://v3.fal.media/files/a.png")
+    await context._share_provider_url(artifact, "https://replicate.delivery/a.png")
+
+    cache.set_many.assert_awaited_once_with([(artifact, "https://v3.fal.media/files/a.png")])
@@ -0,0 +1,113 @@
+"""Tests for the multiplexed progress hub used by SSE streams."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from boards.config import Settings
+from boards.progress.hub import PROGRESS_CHANNEL_PATTERN, ProgressHub, ProgressSubscription
+
+
+class FakePubSub:
+    """Minimal stand-in for redis.asyncio PubSub fed from an asyncio.Queue."""
+
+    def __init__(self, messages: asyncio.Queue) -> None:
+        self.messages = messages
+        self.patterns: list[str] = []
+        self.close = AsyncMock()
+
+    async def psubscribe(self, pattern: str) -> None:
+        self.patterns.append(pattern)
+
+    async def listen(self):
+        while True:
+            message = await self.messages.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+
+def _pmessage(job_id: str, data: str) -> dict:
+    return {
+        "type": "pmessage",
+        "pattern": PROGRESS_CHANNEL_PATTERN,
+        "channel": f"job:{job_id}:progress",
+        "data": data,
+    }
+
+
+@pytest.fixture
+def messages():
+    return asyncio.Queue()
+
+
+@pytest.fixture
+def redis_client(messages):
+    client = MagicMock()
+    client.pubsub.side_effect = lambda: FakePubSub(messages)
+    client.close = AsyncMock()
+    return client
+
+
+@pytest.fixture
+async def hub(redis_client):
+    hub = ProgressHub(Settings(sse_client_queue_size=3), redis_client=redis_client)
+    yield hub
+    await hub.close()
+
+
+class TestProgressHub:
+    @pytest.mark.asyncio
+    async def test_many_clients_share_one_subscription(self, hub, redis_client, messages):
+        async with (
+            hub.subscribe("job-a") as first,
+            hub.subscribe("job-a") as second,
+            hub.subscribe("job-b") as other,
+        ):
+            messages.put_nowait(_pmessage("job-a", "a1"))
+            messages.put_nowait(_pmessage("job-b", "b1"))
+
+            assert await asyncio.wait_for(first.get(), 1) == "a1"
+            assert await asyncio.wait_for(second.get(), 1) == "a1"
+            assert await asyncio.wait_for(other.get(), 1) == "b1"
+            assert first.qsize() == 0
+
+        assert redis_client.pubsub.call_count == 1
+        assert hub.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_channels_are_ignored(self, hub, messages):
+        async with hub.subscribe("job-a") as subscription:
+            messages.put_nowait(_pmessage("job-z", "ignored"))
+            messages.put_nowait(_pmessage("job-a", "a1"))
+
+            assert await asyncio.wait_for(subscription.get(), 1) == "a1"
+
+    @pytest.mark.asyncio
+    async def test_listener_reconnects_after_connection_error(
+        self, hub, redis_client, messages, monkeypatch
+    ):
+        monkeypatch.setattr("boards.progress.hub.asyncio.sleep", AsyncMock())
+        async with hub.subscribe("job-a") as subscription:
+            messages.put_nowait(ConnectionError("connection lost"))
+            messages.put_nowait(_pmessage("job-a", "after-reconnect"))
+
+            assert await asyncio.wait_for(subscription.get(), 1) == "after-reconnect"
+
+        assert redis_client.pubsub.call_count == 2
+
+
+class TestProgressSubscription:
+    def test_full_queue_drops_oldest(self):
+        subscription = ProgressSubscription("job-a", maxsize=2)
+
+        for data in ("1", "2", "3", "4"):
+            subscription.put(data)
+
+        assert subscription.dropped == 2
+        assert subscription.qsize() == 2
+        assert subscription._queue.get_nowait() == "3"
+        assert subscription._queue.get_nowait() == "4"
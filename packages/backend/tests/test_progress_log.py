@@ -0,0 +1,38 @@
+"""Tests for the Redis Streams progress log reader."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from boards.config import Settings
+from boards.progress.log import ProgressLog
+
+
+class TestProgressLog:
+    @pytest.mark.asyncio
+    async def test_read_returns_entries_after_offset(self):
+        client = MagicMock()
+        client.xread = AsyncMock(
+            return_value=[
+                [
+                    "job:abc:events",
+                    [("1-0", {"data": '{"a": 1}'}), ("2-0", {"data": '{"a": 2}'})],
+                ]
+            ]
+        )
+        log = ProgressLog(Settings(), redis_client=client)
+
+        entries = await log.read("abc", after="0-5", count=10)
+
+        assert entries == [("1-0", '{"a": 1}'), ("2-0", '{"a": 2}')]
+        client.xread.assert_awaited_once_with({"job:abc:events": "0-5"}, count=10)
+
+    @pytest.mark.asyncio
+    async def test_read_missing_stream_is_empty(self):
+        client = MagicMock()
+        client.xread = AsyncMock(return_value=[])
+        log = ProgressLog(Settings(), redis_client=client)
+
+        assert await log.read("abc") == []
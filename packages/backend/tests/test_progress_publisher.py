@@ -0,0 +1,279 @@
+"""Tests for ProgressPublisher write-behind coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from boards.config import Settings
+from boards.jobs import repository as jobs_repo
+from boards.progress import publisher as publisher_module
+from boards.progress.models import ProgressUpdate
+from boards.progress.publisher import ProgressPublisher, ProgressWriteBuffer
+
+
+def _update(job_id: str, status: str, progress: float) -> ProgressUpdate:
+    return ProgressUpdate(job_id=job_id, status=status, progress=progress, phase="processing")
+
+
+def _buffer(publisher: ProgressPublisher) -> ProgressWriteBuffer:
+    assert publisher._buffer is not None
+    return publisher._buffer
+
+
+@pytest.fixture
+def db_calls(monkeypatch):
+    """Record repository writes instead of hitting the database."""
+    calls: dict[str, list] = {"single": [], "batch": []}
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    async def fake_update_progress(session, generation_id, **kwargs):
+        calls["single"].append(
+            (generation_id, kwargs["status"], kwargs["progress"], kwargs["sequence"])
+        )
+
+    async def fake_update_progress_batch(session, updates):
+        calls["batch"].append(list(updates))
+
+    monkeypatch.setattr(publisher_module, "get_async_session", fake_session)
+    monkeypatch.setattr(jobs_repo, "update_progress", fake_update_progress)
+    monkeypatch.setattr(jobs_repo, "update_progress_batch", fake_update_progress_batch)
+    return calls
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    sequences: Counter[str] = Counter()
+
+    async def next_sequence(script, numkeys, key, ttl):
+        sequences[key] += 1
+        return sequences[key]
+
+    mock_redis = MagicMock()
+    mock_redis.publish = AsyncMock()
+    mock_redis.eval = AsyncMock(side_effect=next_sequence)
+    monkeypatch.setattr(publisher_module, "get_redis_client", lambda: mock_redis)
+    monkeypatch.setattr(
+        publisher_module, "_write_buffers", publisher_module.weakref.WeakKeyDictionary()
+    )
+    return mock_redis
+
+
+class TestProgressWriteCoalescing:
+    @pytest.mark.asyncio
+    async def test_progress_ticks_are_coalesced_into_one_batch(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10_000))
+        job_a, job_b = str(uuid4()), str(uuid4())
+
+        await publisher.publish_progress(job_a, _update(job_a, "processing", 0.0))
+        await publisher.publish_progress(job_b, _update(job_b, "processing", 0.0))
+        for progress in (0.1, 0.2, 0.3):
+            await publisher.publish_progress(job_a, _update(job_a, "processing", progress))
+            await publisher.publish_progress(job_b, _update(job_b, "processing", progress / 2))
+
+        # Status changes are written synchronously, ticks are only buffered
+        assert [call[0] for call in db_calls["single"]] == [job_a, job_b]
+        assert db_calls["batch"] == []
+        # Every update still goes out on Redis immediately
+        assert redis.publish.await_count == 8
+
+        await _buffer(publisher).flush()
+
+        assert len(db_calls["batch"]) == 1
+        assert sorted(db_calls["batch"][0]) == sorted(
+            [
+                (job_a, "processing", pytest.approx(30.0), 4),
+                (job_b, "processing", pytest.approx(15.0), 4),
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_buffer_flushes_after_interval(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10))
+        job_id = str(uuid4())
+
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.4))
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.5))
+        await asyncio.sleep(0.05)
+
+        assert db_calls["batch"] == [[(job_id, "processing", pytest.approx(50.0), 3)]]
+
+    @pytest.mark.asyncio
+    async def test_terminal_status_written_synchronously_and_drops_pending(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10_000))
+        job_id = str(uuid4())
+
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.6))
+        await publisher.publish_progress(job_id, _update(job_id, "failed", 0.0))
+
+        assert [call[1] for call in db_calls["single"]] == ["processing", "failed"]
+        assert _buffer(publisher).pending == 0
+
+        await _buffer(publisher).flush()
+        assert db_calls["batch"] == []
+
+    @pytest.mark.asyncio
+    async def test_publish_only_terminal_drops_pending(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10_000))
+        job_id = str(uuid4())
+
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.9))
+        await publisher.publish_only(job_id, _update(job_id, "completed", 1.0))
+
+        assert _buffer(publisher).pending == 0
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_are_forgotten(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10_000))
+        job_a, job_b = str(uuid4()), str(uuid4())
+
+        for job_id in (job_a, job_b):
+            await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+        await publisher.publish_progress(job_a, _update(job_a, "completed", 1.0))
+        await publisher.publish_only(job_b, _update(job_b, "cancelled", 0.0))
+
+        assert publisher._persisted_status == {}
+
+    def test_each_event_loop_flushes_its_own_writes(self, db_calls, redis):
+        """Worker threads each run an event loop; none of their writes may be lost."""
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=20))
+        job_ids = [str(uuid4()) for _ in range(4)]
+        start = threading.Barrier(len(job_ids))
+
+        def run_job(job_id: str) -> None:
+            async def main() -> None:
+                await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+                start.wait()
+                await publisher.publish_progress(job_id, _update(job_id, "processing", 0.5))
+                await asyncio.sleep(0.1)
+
+            asyncio.run(main())
+
+        threads = [threading.Thread(target=run_job, args=(job_id,)) for job_id in job_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        flushed = sorted(update for batch in db_calls["batch"] for update in batch)
+        assert flushed == sorted((job_id, "processing", 50.0, 2) for job_id in job_ids)
+
+    @pytest.mark.asyncio
+    async def test_updates_numbered_per_job(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=0))
+        job_a, job_b = str(uuid4()), str(uuid4())
+
+        await publisher.publish_progress(job_a, _update(job_a, "processing", 0.0))
+        await publisher.publish_progress(job_b, _update(job_b, "processing", 0.0))
+        await publisher.publish_progress(job_a, _update(job_a, "processing", 0.5))
+        await publisher.publish_only(job_a, _update(job_a, "completed", 1.0))
+
+        published = [
+            (call.args[0], ProgressUpdate.model_validate_json(call.args[1]).sequence)
+            for call in redis.publish.await_args_list
+        ]
+        assert published == [
+            (f"job:{job_a}:progress", 1),
+            (f"job:{job_b}:progress", 1),
+            (f"job:{job_a}:progress", 2),
+            (f"job:{job_a}:progress", 3),
+        ]
+        # The database row records which update it was written from
+        assert [call[3] for call in db_calls["single"]] == [1, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_writes_every_update(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=0))
+        job_id = str(uuid4())
+
+        for progress in (0.0, 0.1, 0.2):
+            await publisher.publish_progress(job_id, _update(job_id, "processing", progress))
+
+        assert len(db_calls["single"]) == 3
+        assert db_calls["batch"] == []
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_is_logged_not_raised(self, db_calls, redis, monkeypatch):
+        publisher = ProgressPublisher(Settings(progress_flush_interval_ms=10_000))
+        job_id = str(uuid4())
+        monkeypatch.setattr(
+            jobs_repo, "update_progress_batch", AsyncMock(side_effect=RuntimeError("db down"))
+        )
+
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.0))
+        await publisher.publish_progress(job_id, _update(job_id, "processing", 0.5))
+        await _buffer(publisher).flush()
+
+        assert _buffer(publisher).pending == 0
+
+
+class TestUpdateProgressBatch:
+    @pytest.mark.asyncio
+    async def test_single_statement_skips_terminal_rows(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        updates = [(str(uuid4()), "processing", 30.0, 3), (str(uuid4()), "processing", 45.5, 7)]
+
+        await jobs_repo.update_progress_batch(session, updates)
+
+        session.execute.assert_awaited_once()
+        stmt = session.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE boards.generations SET")
+        assert "FROM (VALUES" in sql
+        assert "boards.generations.status NOT IN" in sql
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_noop(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await jobs_repo.update_progress_batch(session, [])
+
+        session.execute.assert_not_awaited()
+
+
+class TestProgressStreamLog:
+    @pytest.mark.asyncio
+    async def test_stream_log_written_in_same_pipeline_as_publish(self, db_calls, redis):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis.pipeline.return_value = pipe
+        publisher = ProgressPublisher(
+            Settings(progress_stream_enabled=True, progress_stream_maxlen=50)
+        )
+        job_id = str(uuid4())
+
+        await publisher.publish_only(job_id, _update(job_id, "completed", 1.0))
+
+        redis.pipeline.assert_called_once_with(transaction=True)
+        pipe.xadd.assert_called_once()
+        assert pipe.xadd.call_args.args[0] == f"job:{job_id}:events"
+        assert pipe.xadd.call_args.kwargs["maxlen"] == 50
+        pipe.publish.assert_called_once()
+        assert pipe.publish.call_args.args[0] == f"job:{job_id}:progress"
+        pipe.execute.assert_awaited_once()
+        redis.publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stream_log_disabled_by_default(self, db_calls, redis):
+        publisher = ProgressPublisher(Settings())
+        job_id = str(uuid4())
+
+        await publisher.publish_only(job_id, _update(job_id, "completed", 1.0))
+
+        redis.pipeline.assert_not_called()
+        redis.publish.assert_awaited_once()
@@ -0,0 +1,235 @@
+"""Tests for the SSE generation progress stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from boards.api.auth import AuthenticatedUser
+from boards.api.endpoints import sse
+from boards.progress.hub import ProgressSubscription
+from boards.progress.models import ProgressUpdate
+
+UPDATED_AT = datetime(2025, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+class FakeHub:
+    def __init__(self) -> None:
+        self.subscription: ProgressSubscription | None = None
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str):
+        self.subscription = ProgressSubscription(job_id, maxsize=10)
+        yield self.subscription
+
+
+@pytest.fixture
+def generation():
+    return SimpleNamespace(
+        id=uuid4(),
+        user_id=uuid4(),
+        tenant_id=uuid4(),
+        status="processing",
+        progress=Decimal("40.00"),
+        artifact_type="image",
+        storage_url=None,
+        error_message=None,
+        updated_at=UPDATED_AT,
+        progress_sequence=4,
+    )
+
+
+@pytest.fixture
+def hub(monkeypatch, generation):
+    fake_hub = FakeHub()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    monkeypatch.setattr(sse, "get_progress_hub", lambda: fake_hub)
+    monkeypatch.setattr(sse, "get_async_session", fake_session)
+    monkeypatch.setattr(sse.jobs_repo, "get_generation", AsyncMock(return_value=generation))
+    return fake_hub
+
+
+async def _open_stream(generation, headers: dict[str, str] | None = None):
+    request = MagicMock()
+    request.url = "http://test/api/sse"
+    request.headers = headers or {}
+    request.is_disconnected = AsyncMock(return_value=False)
+    user = AuthenticatedUser(user_id=generation.user_id, tenant_id=generation.tenant_id)
+    response = await sse.generation_progress_stream(
+        str(generation.id), request, db=MagicMock(), current_user=user
+    )
+    return cast(AsyncGenerator[str, None], response.body_iterator)
+
+
+def _live_update(generation, progress: float, sequence: int, at: datetime = UPDATED_AT) -> str:
+    return ProgressUpdate(
+        job_id=str(generation.id),
+        status="processing",
+        progress=progress,
+        phase="processing",
+        timestamp=at,
+        sequence=sequence,
+    ).model_dump_json()
+
+
+def _parse_event(raw: str) -> tuple[str | None, dict]:
+    event_id = None
+    data = ""
+    for line in raw.strip().splitlines():
+        if line.startswith("id: "):
+            event_id = line[4:]
+        elif line.startswith("data: "):
+            data = line[6:]
+    return event_id, json.loads(data)
+
+
+class TestGenerationProgressStream:
+    @pytest.mark.asyncio
+    async def test_first_event_is_database_snapshot(self, hub, generation):
+        stream = await _open_stream(generation)
+
+        event_id, data = _parse_event(await anext(stream))
+
+        assert event_id == "4"
+        assert data["status"] == "processing"
+        assert data["progress"] == pytest.approx(0.4)
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_live_update_delivered_without_delay(self, hub, generation):
+        stream = await _open_stream(generation)
+        await anext(stream)
+
+        assert hub.subscription is not None
+        hub.subscription.put(_live_update(generation, 0.5, 5))
+        raw = await asyncio.wait_for(anext(stream), timeout=0.5)
+
+        event_id, data = _parse_event(raw)
+        assert event_id == "5"
+        assert data["progress"] == pytest.approx(0.5)
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_sent_when_idle(self, hub, generation, monkeypatch):
+        monkeypatch.setattr(sse._settings, "sse_keepalive_interval", 0.01)
+        stream = await _open_stream(generation)
+        await anext(stream)
+
+        assert await asyncio.wait_for(anext(stream), timeout=0.5) == ": keep-alive\n\n"
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_last_event_id_skips_already_seen_states(self, hub, generation):
+        stream = await _open_stream(generation, headers={"last-event-id": "6"})
+
+        # Snapshot is older than what the client has, so the stream waits for live data
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        assert hub.subscription is not None
+        hub.subscription.put(_live_update(generation, 0.6, 6))
+        hub.subscription.put(_live_update(generation, 0.7, 7))
+
+        event_id, data = _parse_event(await asyncio.wait_for(first, timeout=0.5))
+        assert data["progress"] == pytest.approx(0.7)
+        assert event_id == "7"
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_update_written_after_its_timestamp_not_dropped(self, hub, generation):
+        # A coalesced flush sets updated_at after later updates were already stamped
+        generation.updated_at = UPDATED_AT + timedelta(seconds=10)
+        stream = await _open_stream(generation)
+        await anext(stream)
+
+        assert hub.subscription is not None
+        hub.subscription.put(_live_update(generation, 0.5, 5, at=UPDATED_AT))
+        event_id, data = _parse_event(await asyncio.wait_for(anext(stream), timeout=0.5))
+
+        assert event_id == "5"
+        assert data["progress"] == pytest.approx(0.5)
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_terminal_snapshot_ends_stream(self, hub, generation):
+        generation.status = "completed"
+        generation.progress = Decimal("100.00")
+        generation.storage_url = "https://example.com/out.png"
+        # The client saw the last tick, but not the completion written by the worker
+        stream = await _open_stream(generation, headers={"last-event-id": "4"})
+
+        _, data = _parse_event(await anext(stream))
+
+        assert data["status"] == "completed"
+        assert data["artifacts"][0]["url"] == "https://example.com/out.png"
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+    @pytest.mark.asyncio
+    async def test_stale_last_event_id_gets_snapshot(self, hub, generation):
+        stream = await _open_stream(generation, headers={"last-event-id": "2"})
+
+        _, data = _parse_event(await anext(stream))
+
+        assert data["progress"] == pytest.approx(0.4)
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_log_replays_missed_events(self, hub, generation, monkeypatch):
+        entries = [
+            ("1-0", _live_update(generation, 0.1, 1)),
+            ("2-0", _live_update(generation, 0.2, 2)),
+            ("3-0", _live_update(generation, 0.3, 3)),
+        ]
+        log = MagicMock()
+        log.read = AsyncMock(return_value=entries)
+        monkeypatch.setattr(sse._settings, "progress_stream_enabled", True)
+        monkeypatch.setattr(sse, "ProgressLog", lambda settings: log)
+        stream = await _open_stream(generation, headers={"last-event-id": "1"})
+
+        replayed = [_parse_event(await anext(stream))[1]["progress"] for _ in range(2)]
+
+        assert replayed == [pytest.approx(0.2), pytest.approx(0.3)]
+        # The log replaces the database snapshot; only the access check read the DB
+        assert sse.jobs_repo.get_generation.await_count == 1
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_log_reconnect_after_completion_ends_stream(
+        self, hub, generation, monkeypatch
+    ):
+        completed = ProgressUpdate(
+            job_id=str(generation.id),
+            status="completed",
+            progress=1.0,
+            phase="finalizing",
+            timestamp=UPDATED_AT,
+            sequence=2,
+        ).model_dump_json()
+        log = MagicMock()
+        log.read = AsyncMock(
+            return_value=[("1-0", _live_update(generation, 0.5, 1)), ("2-0", completed)]
+        )
+        monkeypatch.setattr(sse._settings, "progress_stream_enabled", True)
+        monkeypatch.setattr(sse, "ProgressLog", lambda settings: log)
+        # The client already received the completion before it reconnected
+        stream = await _open_stream(generation, headers={"last-event-id": "2"})
+
+        event_id, data = _parse_event(await anext(stream))
+
+        assert (event_id, data["status"]) == ("2", "completed")
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
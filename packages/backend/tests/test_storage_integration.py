@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import nullcontext
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -9,7 +11,7 @@ from uuid import uuid4
 
 import pytest
 
-from boards.generators.artifacts import ImageArtifact
+from boards.generators.artifacts import DigitalArtifact, ImageArtifact
 from boards.generators.resolution import (
     download_from_url,
     store_image_result,
@@ -128,6 +130,81 @@ async def test_store_image_result_integration(tmp_path: Path):
         assert "storage" in artifact.storage_url or artifact.storage_url.startswith("file://")
 
 
+@pytest.mark.asyncio
+async def test_store_video_result_streams_into_storage(tmp_path: Path):
+    """Test that provider output is piped chunk by chunk into storage."""
+    from boards.generators.resolution import store_video_result
+    from boards.storage.base import ValidationException
+    from boards.storage.implementations.local import LocalStorageProvider
+
+    storage_manager = create_development_storage()
+    local_provider = storage_manager.providers["local"]
+    assert isinstance(local_provider, LocalStorageProvider)
+    local_provider.base_path = tmp_path / "storage"
+    local_provider.base_path.mkdir(parents=True, exist_ok=True)
+
+    chunks = [b"a" * 1000, b"b" * 1000, b"c" * 500]
+
+    mock_response = AsyncMock()
+    mock_response.raise_for_status = MagicMock()
+
+    async def mock_aiter_bytes(chunk_size=8192):
+        for chunk in chunks:
+            yield chunk
+
+    mock_response.aiter_bytes = mock_aiter_bytes
+    mock_stream_context = MagicMock()
+    mock_stream_context.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_stream_context.__aexit__ = AsyncMock(return_value=None)
+
+    with (
+        patch("httpx.AsyncClient") as mock_client,
+        patch.object(
+            storage_manager, "store_artifact", wraps=storage_manager.store_artifact
+        ) as store_spy,
+    ):
+        mock_client.return_value.__aenter__.return_value.stream = MagicMock(
+            return_value=mock_stream_context
+        )
+
+        artifact = await store_video_result(
+            storage_manager=storage_manager,
+            generation_id=str(uuid4()),
+            tenant_id=str(uuid4()),
+            board_id=str(uuid4()),
+            storage_url="https://fal.media/files/video.mp4",
+            format="mp4",
+        )
+
+        # Content is handed to storage as a stream, not as buffered bytes
+        assert not isinstance(store_spy.call_args.kwargs["content"], bytes)
+
+    stored_files = list((tmp_path / "storage").rglob("original"))
+    assert len(stored_files) == 1
+    assert stored_files[0].read_bytes() == b"".join(chunks)
+    assert artifact.storage_url.endswith("/original")
+
+    # Streams larger than max_file_size are rejected and leave nothing behind
+    storage_manager.config.max_file_size = 1500
+    mock_stream_context.__aenter__ = AsyncMock(return_value=mock_response)
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_client.return_value.__aenter__.return_value.stream = MagicMock(
+            return_value=mock_stream_context
+        )
+        with pytest.raises(ValidationException, match="exceeds limit"):
+            await store_video_result(
+                storage_manager=storage_manager,
+                generation_id=str(uuid4()),
+                tenant_id=str(uuid4()),
+                board_id=str(uuid4()),
+                storage_url="https://fal.media/files/video.mp4",
+                format="mp4",
+            )
+
+    stored_files = list((tmp_path / "storage").rglob("original"))
+    assert len(stored_files) == 1
+
+
 @pytest.mark.asyncio
 async def test_execution_context_store_methods(tmp_path: Path):
     """Test execution context storage methods."""
@@ -151,7 +228,7 @@ async def test_execution_context_store_methods(tmp_path: Path):
     async def fake_publish(job_id, update):
         pass
 
-    async def fake_persist(job_id, update):
+    async def fake_persist(job_id, update, sequence=None):
         pass
 
     publisher.publish_progress = fake_publish  # type: ignore
@@ -206,6 +283,7 @@ async def test_worker_integration_with_storage(monkeypatch, tmp_path: Path):
     # We need to mock at the RedisPoolManager level since it's a singleton
     mock_redis = MagicMock()
     mock_redis.publish = AsyncMock()
+    mock_redis.eval = AsyncMock(return_value=1)
 
     from boards import redis_pool
 
@@ -240,7 +318,7 @@ async def test_worker_integration_with_storage(monkeypatch, tmp_path: Path):
     # Track storage operations
     stored_url = None
 
-    async def fake_get_generation(session, generation_id):
+    async def fake_load_job(session, generation_id):
         return SimpleNamespace(
             id=generation_id,
             generator_name="replicate-flux-pro",
@@ -253,6 +331,9 @@ async def test_worker_integration_with_storage(monkeypatch, tmp_path: Path):
             board_id=uuid4(),
             user_id=uuid4(),
             artifact_type="image",
+            external_job_id=None,
+            pipeline=None,
+            status="pending",
         )
 
     async def fake_finalize_success(session, generation_id, **kwargs):
@@ -260,12 +341,16 @@ async def test_worker_integration_with_storage(monkeypatch, tmp_path: Path):
         stored_url = kwargs.get("storage_url")
         return None
 
-    async def fake_persist(self, job_id, update):
+    async def fake_persist(self, job_id, update, sequence=None):
         return None
 
-    monkeypatch.setattr(jobs_repo, "get_generation", fake_get_generation)
+    monkeypatch.setattr(jobs_repo, "load_job", fake_load_job)
+    monkeypatch.setattr(jobs_repo, "start_job", AsyncMock())
     monkeypatch.setattr(jobs_repo, "finalize_success", fake_finalize_success)
     monkeypatch.setattr(ProgressPublisher, "_persist_update", fake_persist, raising=False)
+    monkeypatch.setattr(
+        "boards.workers.actors._watch_cancellation", lambda generation_id: nullcontext()
+    )
 
     # Mock storage manager creation to use tmp_path
     from boards.storage import factory
@@ -336,7 +421,7 @@ async def test_batch_generation_context(tmp_path: Path):
     async def fake_publish(_job_id, _update):
         pass
 
-    async def fake_persist(_job_id, _update):
+    async def fake_persist(_job_id, _update, _sequence=None):
         pass
 
     publisher.publish_progress = fake_publish  # type: ignore
@@ -437,3 +522,109 @@ async def test_batch_generation_context(tmp_path: Path):
                 # Verify batch_id is consistent
                 assert context._batch_id is not None
                 assert len(context._batch_generations) == 2
+
+
+@pytest.mark.asyncio
+async def test_store_many_stores_outputs_concurrently(monkeypatch):
+    """store_many creates the batch records with one INSERT and stores outputs in parallel."""
+    from boards.generators.base import ImageOutput
+    from boards.jobs import repository as jobs_repo
+    from boards.workers import context as context_module
+
+    generation_id = uuid4()
+    context = GeneratorExecutionContext(
+        generation_id=generation_id,
+        publisher=MagicMock(),
+        storage_manager=MagicMock(),
+        tenant_id=uuid4(),
+        board_id=uuid4(),
+        user_id=uuid4(),
+        generator_name="test-generator",
+        artifact_type="image",
+        input_params={"num_images": 4},
+    )
+
+    create_batch_generations = AsyncMock(return_value=["batch-1", "batch-2", "batch-3"])
+    running = 0
+    peak = 0
+
+    async def fake_store_image_result(*, generation_id, storage_url, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ImageArtifact(
+            generation_id=generation_id,
+            storage_url=f"stored:{storage_url}",
+            format="png",
+            width=None,
+            height=None,
+        )
+
+    monkeypatch.setattr(context_module.settings, "output_store_concurrency", 3)
+    monkeypatch.setattr(jobs_repo, "create_batch_generations", create_batch_generations)
+    monkeypatch.setattr(context_module.resolution, "store_image_result", fake_store_image_result)
+    with patch("boards.workers.context.get_async_session") as mock_session:
+        mock_session.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+        mock_session.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        artifacts = await context.store_many(
+            [
+                ImageOutput(storage_url=f"https://example.com/{n}.png", format="png")
+                for n in range(4)
+            ]
+        )
+
+    assert [artifact.generation_id for artifact in artifacts] == [
+        str(generation_id),
+        "batch-1",
+        "batch-2",
+        "batch-3",
+    ]
+    assert artifacts[2].storage_url == "stored:https://example.com/2.png"
+    create_batch_generations.assert_awaited_once()
+    assert create_batch_generations.call_args_list[0].kwargs["batch_indexes"] == [1, 2, 3]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_finalize_batch_in_one_statement(monkeypatch):
+    """The primary and batch generations of a job are finalized with one UPDATE."""
+    from contextlib import asynccontextmanager
+
+    from boards.generators.base import GeneratorResult
+    from boards.workers import actors
+
+    @asynccontextmanager
+    async def fake_session():
+        yield MagicMock()
+
+    finalize_success_batch = AsyncMock()
+    monkeypatch.setattr(actors, "get_async_session", fake_session)
+    monkeypatch.setattr(actors.jobs_repo, "finalize_success", AsyncMock())
+    monkeypatch.setattr(actors.jobs_repo, "finalize_success_batch", finalize_success_batch)
+    publisher = MagicMock()
+    publisher.publish_only = AsyncMock()
+    context = SimpleNamespace(
+        _batch_id="batch", _batch_generations=["gen-b", "gen-c"], pipeline_id=None
+    )
+    artifacts: list[DigitalArtifact] = [
+        ImageArtifact(
+            generation_id=gen_id, storage_url=f"s3://{gen_id}", format="png", width=1, height=1
+        )
+        for gen_id in ("gen-a", "gen-b", "gen-c")
+    ]
+    output = GeneratorResult(outputs=artifacts)
+
+    await actors._finalize_job("gen-a", output, context, publisher)  # type: ignore[arg-type]
+
+    actors.jobs_repo.finalize_success.assert_not_awaited()
+    [results] = finalize_success_batch.call_args_list[0].args[1:]
+    assert [(gen_id, url) for gen_id, url, _ in results] == [
+        ("gen-a", "s3://gen-a"),
+        ("gen-b", "s3://gen-b"),
+        ("gen-c", "s3://gen-c"),
+    ]
+    assert [metadata["batch_index"] for _, _, metadata in results] == [0, 1, 2]
+    assert {metadata["batch_size"] for _, _, metadata in results} == {3}
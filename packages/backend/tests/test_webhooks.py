@@ -0,0 +1,266 @@
+"""Tests for provider completion webhooks."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from fastapi.testclient import TestClient
+
+from boards.api.app import app
+from boards.api.endpoints import webhooks as webhook_endpoints
+from boards.jobs import repository as jobs_repo
+from boards.jobs import webhooks
+from boards.jobs.webhooks import FalWebhookVerifier, WebhookVerificationError
+
+REPLICATE_SECRET = "whsec_" + base64.b64encode(b"replicate-test-signing-key").decode()
+KIE_SECRET = "kie-test-secret"
+
+# Callback bodies as delivered by the providers (trimmed)
+REPLICATE_PAYLOAD = {
+    "id": "ufawqhfynnddngldkgtslldrkq",
+    "model": "cjwbw/wav2lip",
+    "status": "succeeded",
+    "output": "https://replicate.delivery/pbxt/output.mp4",
+    "error": None,
+    "metrics": {"predict_time": 42.1},
+}
+FAL_PAYLOAD = {
+    "request_id": "764cabcf-b745-4b3e-ae38-1200304cf45b",
+    "gateway_request_id": "764cabcf-b745-4b3e-ae38-1200304cf45b",
+    "status": "OK",
+    "payload": {"video": {"url": "https://v3.fal.media/files/output.mp4"}},
+}
+KIE_PAYLOAD = {
+    "code": 200,
+    "msg": "Veo3 video generated successfully.",
+    "data": {
+        "taskId": "ee603959-debb-48d1-98c4-a6d1c717eba6",
+        "info": {"resultUrls": ["https://tempfile.aiquickdraw.com/output.mp4"]},
+    },
+}
+
+
+def _sign_replicate(body: bytes, timestamp: int | None = None) -> dict[str, str]:
+    webhook_id = "msg_2nA4sVe3J1kAy2nFB7Q1o8Ti2Bc"
+    timestamp = timestamp or int(time.time())
+    key = base64.b64decode(REPLICATE_SECRET.removeprefix("whsec_"))
+    digest = hmac.new(key, f"{webhook_id}.{timestamp}.".encode() + body, hashlib.sha256)
+    return {
+        "webhook-id": webhook_id,
+        "webhook-timestamp": str(timestamp),
+        "webhook-signature": f"v1,{base64.b64encode(digest.digest()).decode()}",
+        "content-type": "application/json",
+    }
+
+
+class LocalFalSigner:
+    """Stands in for fal's signing service with a locally generated key."""
+
+    def __init__(self) -> None:
+        self.private_key = Ed25519PrivateKey.generate()
+        public = self.private_key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+        self.jwks = {
+            "keys": [
+                {
+                    "kty": "OKP",
+                    "crv": "Ed25519",
+                    "x": base64.urlsafe_b64encode(public).rstrip(b"=").decode(),
+                }
+            ]
+        }
+
+    def headers(self, body: bytes, request_id: str) -> dict[str, str]:
+        timestamp = str(int(time.time()))
+        user_id = "github|boards-test"
+        message = "\n".join([request_id, user_id, timestamp, hashlib.sha256(body).hexdigest()])
+        return {
+            "x-fal-webhook-request-id": request_id,
+            "x-fal-webhook-user-id": user_id,
+            "x-fal-webhook-timestamp": timestamp,
+            "x-fal-webhook-signature": self.private_key.sign(message.encode()).hex(),
+            "content-type": "application/json",
+        }
+
+
+@pytest.fixture
+def fal_signer(monkeypatch):
+    signer = LocalFalSigner()
+    verifier = FalWebhookVerifier("https://fal.test/jwks.json")
+    verifier._fetch_jwks = AsyncMock(return_value=signer.jwks)  # type: ignore[method-assign]
+    monkeypatch.setattr(webhook_endpoints, "get_fal_webhook_verifier", lambda: verifier)
+    return signer
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    """Generations by external job id, and the resume messages sent."""
+    by_external_id: dict[str, SimpleNamespace] = {}
+    sent: list[str] = []
+
+    async def fake_lookup(db, external_job_id):
+        return by_external_id.get(external_job_id)
+
+    monkeypatch.setattr(jobs_repo, "get_generation_by_external_job_id", fake_lookup)
+    monkeypatch.setattr(webhook_endpoints.resume_generation, "send", sent.append)
+    monkeypatch.setattr(webhook_endpoints._settings, "replicate_webhook_secret", REPLICATE_SECRET)
+    monkeypatch.setattr(webhook_endpoints._settings, "webhook_secret", KIE_SECRET)
+
+    def add(external_job_id: str, status: str = "processing") -> str:
+        generation_id = uuid4()
+        by_external_id[external_job_id] = SimpleNamespace(id=generation_id, status=status)
+        return str(generation_id)
+
+    return SimpleNamespace(add=add, sent=sent)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestReplicateWebhook:
+    def test_signed_callback_resumes_generation(self, client, generations):
+        generation_id = generations.add(REPLICATE_PAYLOAD["id"])
+        body = json.dumps(REPLICATE_PAYLOAD).encode()
+
+        resp = client.post("/api/webhooks/replicate", content=body, headers=_sign_replicate(body))
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == {"status": "accepted"}
+        assert generations.sent == [generation_id]
+
+    def test_tampered_body_is_rejected(self, client, generations):
+        generations.add(REPLICATE_PAYLOAD["id"])
+        body = json.dumps(REPLICATE_PAYLOAD).encode()
+        headers = _sign_replicate(body)
+
+        resp = client.post(
+            "/api/webhooks/replicate",
+            content=body.replace(b"succeeded", b"failed"),
+            headers=headers,
+        )
+
+        assert resp.status_code == 401
+        assert generations.sent == []
+
+    def test_stale_timestamp_is_rejected(self, client, generations):
+        body = json.dumps(REPLICATE_PAYLOAD).encode()
+        headers = _sign_replicate(body, timestamp=int(time.time()) - 3600)
+
+        resp = client.post("/api/webhooks/replicate", content=body, headers=headers)
+
+        assert resp.status_code == 401
+
+    def test_redelivery_after_completion_is_acknowledged(self, client, generations):
+        generations.add(REPLICATE_PAYLOAD["id"], status="completed")
+        body = json.dumps(REPLICATE_PAYLOAD).encode()
+
+        resp = client.post("/api/webhooks/replicate", content=body, headers=_sign_replicate(body))
+
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "already_finalized"}
+        assert generations.sent == []
+
+
+class TestFalWebhook:
+    def test_signed_callback_resumes_generation(self, client, generations, fal_signer):
+        generation_id = generations.add(FAL_PAYLOAD["request_id"])
+        body = json.dumps(FAL_PAYLOAD).encode()
+
+        resp = client.post(
+            "/api/webhooks/fal",
+            content=body,
+            headers=fal_signer.headers(body, FAL_PAYLOAD["request_id"]),
+        )
+
+        assert resp.status_code == 200, resp.text
+        assert generations.sent == [generation_id]
+
+    def test_signature_from_other_key_is_rejected(self, client, generations, fal_signer):
+        generations.add(FAL_PAYLOAD["request_id"])
+        body = json.dumps(FAL_PAYLOAD).encode()
+        headers = LocalFalSigner().headers(body, FAL_PAYLOAD["request_id"])
+
+        resp = client.post("/api/webhooks/fal", content=body, headers=headers)
+
+        assert resp.status_code == 401
+        assert generations.sent == []
+
+    def test_unknown_job_is_ignored(self, client, generations, fal_signer):
+        body = json.dumps(FAL_PAYLOAD).encode()
+
+        resp = client.post(
+            "/api/webhooks/fal",
+            content=body,
+            headers=fal_signer.headers(body, FAL_PAYLOAD["request_id"]),
+        )
+
+        assert resp.json() == {"status": "ignored"}
+
+    @pytest.mark.asyncio
+    async def test_public_keys_are_cached(self, fal_signer):
+        verifier = FalWebhookVerifier("https://fal.test/jwks.json")
+        verifier._fetch_jwks = AsyncMock(return_value=fal_signer.jwks)  # type: ignore[method-assign]
+        body = json.dumps(FAL_PAYLOAD).encode()
+
+        for _ in range(3):
+            await verifier.verify(fal_signer.headers(body, "req"), body)
+
+        verifier._fetch_jwks.assert_awaited_once()
+
+
+class TestKieWebhook:
+    def test_callback_with_token_resumes_generation(self, client, generations, monkeypatch):
+        generation_id = generations.add(KIE_PAYLOAD["data"]["taskId"])
+        config = SimpleNamespace(webhook_base_url="https://boards.test/", webhook_secret=KIE_SECRET)
+        url = webhooks.webhook_url("kie", config)  # type: ignore[arg-type]
+        assert url is not None
+        assert url.startswith("https://boards.test/api/webhooks/kie?token=")
+
+        resp = client.post(url.removeprefix("https://boards.test"), json=KIE_PAYLOAD)
+
+        assert resp.status_code == 200, resp.text
+        assert generations.sent == [generation_id]
+
+    def test_missing_token_is_rejected(self, client, generations):
+        generations.add(KIE_PAYLOAD["data"]["taskId"])
+
+        resp = client.post("/api/webhooks/kie", json=KIE_PAYLOAD)
+
+        assert resp.status_code == 401
+        assert generations.sent == []
+
+    def test_kie_submit_registers_callback_url(self, monkeypatch):
+        from boards.generators.implementations.kie.video.veo3 import KieVeo3Generator
+
+        monkeypatch.setattr(
+            "boards.generators.implementations.kie.base.webhook_url",
+            lambda provider: f"https://boards.test/api/webhooks/{provider}?token=t",
+        )
+        body: dict = {}
+        KieVeo3Generator()._add_callback_url(body)
+
+        assert body == {"callBackUrl": "https://boards.test/api/webhooks/kie?token=t"}
+
+
+class TestReplicateSignature:
+    def test_any_listed_signature_may_match(self):
+        body = b"{}"
+        headers = _sign_replicate(body)
+        headers["webhook-signature"] = "v1,bm90LXRoZS1zaWduYXR1cmU= " + headers["webhook-signature"]
+
+        webhooks.verify_replicate_signature(headers, body, REPLICATE_SECRET)
+
+    def test_missing_headers(self):
+        with pytest.raises(WebhookVerificationError, match="Missing"):
+            webhooks.verify_replicate_signature(MagicMock(get=lambda key: None), b"{}", "whsec_")
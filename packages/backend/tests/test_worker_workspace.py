@@ -0,0 +1,177 @@
+"""Tests for per-job scratch workspaces."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from boards.generators.artifacts import ImageArtifact
+from boards.generators.resolution import resolve_artifact
+from boards.workers.artifact_cache import ArtifactCache
+from boards.workers.context import GeneratorExecutionContext
+from boards.workers.workspace import ScratchQuotaExceeded, ScratchSpace
+
+
+def _mock_download(content: bytes):
+    """Patch httpx.AsyncClient so a streamed GET returns the given content."""
+    patcher = patch("httpx.AsyncClient")
+    mock_client_class = patcher.start()
+    mock_client = AsyncMock()
+    mock_client_class.return_value.__aenter__.return_value = mock_client
+
+    mock_response = AsyncMock()
+    mock_response.raise_for_status = MagicMock()
+
+    async def mock_aiter_bytes(chunk_size=8192):
+        yield content
+
+    mock_response.aiter_bytes = mock_aiter_bytes
+    mock_stream_context = MagicMock()
+    mock_stream_context.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_stream_context.__aexit__ = AsyncMock(return_value=None)
+    mock_client.stream = MagicMock(return_value=mock_stream_context)
+    return patcher
+
+
+def _artifact() -> ImageArtifact:
+    return ImageArtifact(
+        generation_id="input",
+        storage_url="https://example.com/image.png",
+        width=512,
+        height=512,
+        format="png",
+    )
+
+
+@pytest.fixture
+def space(tmp_path):
+    return ScratchSpace(
+        tmp_path / "scratch", quota_bytes=1024, wait_timeout=1.0, poll_interval=0.01
+    )
+
+
+def _context(space: ScratchSpace, cache: ArtifactCache) -> GeneratorExecutionContext:
+    return GeneratorExecutionContext(
+        uuid4(),
+        MagicMock(),
+        MagicMock(),
+        uuid4(),
+        uuid4(),
+        uuid4(),
+        "test-generator",
+        "image",
+        {},
+        scratch_space=space,
+        artifact_cache=cache,
+    )
+
+
+class TestJobWorkspace:
+    @pytest.mark.asyncio
+    async def test_resolved_artifacts_live_in_job_directory(self, space, tmp_path):
+        context = _context(space, ArtifactCache(tmp_path / "cache", max_bytes=1024))
+        patcher = _mock_download(b"image bytes")
+        try:
+            path = await context.resolve_artifact(_artifact())
+        finally:
+            patcher.stop()
+
+        assert os.path.dirname(path) == str(context.workspace.path)
+        assert path.endswith(".png")
+        assert space.used_bytes == len(b"image bytes")
+
+        context.cleanup()
+
+        assert not context.workspace.path.exists()
+        assert space.used_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_download_waits_for_space_released_by_other_job(self, space):
+        busy = space.workspace("busy-job")
+        busy.new_file().write_bytes(b"x" * 1024)
+        busy.add_bytes(1024)
+        workspace = space.workspace("waiting-job")
+
+        async def release_later():
+            await asyncio.sleep(0.05)
+            busy.cleanup()
+
+        patcher = _mock_download(b"image bytes")
+        try:
+            release = asyncio.create_task(release_later())
+            path = await resolve_artifact(_artifact(), workspace=workspace)
+            await release
+        finally:
+            patcher.stop()
+
+        assert os.path.exists(path)
+        assert space.used_bytes == len(b"image bytes")
+
+    @pytest.mark.asyncio
+    async def test_download_fails_when_space_never_frees(self, space):
+        space.wait_timeout = 0.05
+        busy = space.workspace("busy-job")
+        busy.add_bytes(2048)
+
+        with pytest.raises(ScratchQuotaExceeded):
+            await resolve_artifact(_artifact(), workspace=space.workspace("waiting-job"))
+
+    @pytest.mark.asyncio
+    async def test_job_larger_than_quota_never_waits_on_itself(self, space):
+        space.wait_timeout = 0.05
+        workspace = space.workspace("big-job")
+        patcher = _mock_download(b"x" * 1000)
+        try:
+            paths = [await resolve_artifact(_artifact(), workspace=workspace) for _ in range(3)]
+        finally:
+            patcher.stop()
+
+        assert all(os.path.exists(path) for path in paths)
+        assert space.used_bytes == 3000
+
+    @pytest.mark.asyncio
+    async def test_jobs_holding_space_do_not_block_each_other(self, space):
+        space.wait_timeout = 0.05
+        first, second = space.workspace("job-1"), space.workspace("job-2")
+        patcher = _mock_download(b"x" * 600)
+        try:
+            # Each job's first input fits; together they use up the quota
+            await resolve_artifact(_artifact(), workspace=first)
+            await resolve_artifact(_artifact(), workspace=second)
+            await asyncio.gather(
+                resolve_artifact(_artifact(), workspace=first),
+                resolve_artifact(_artifact(), workspace=second),
+            )
+            # A job that holds nothing still waits for the others to finish
+            with pytest.raises(ScratchQuotaExceeded):
+                await resolve_artifact(_artifact(), workspace=space.workspace("job-3"))
+        finally:
+            patcher.stop()
+
+        assert space.used_bytes == 4 * 600
+
+
+class TestScratchSweep:
+    def test_sweep_removes_directories_of_dead_processes(self, space):
+        space.root.mkdir(parents=True)
+        stale = space.root / "job-999999999-abc"
+        own_stale = space.root / f"job-{os.getpid()}-def"
+        live = space.root / f"job-{os.getppid()}-ghi"
+        unrelated = space.root / "keep-me"
+        for directory in (stale, own_stale, live, unrelated):
+            directory.mkdir()
+
+        removed = space.sweep()
+
+        assert removed == 2
+        assert not stale.exists()
+        assert not own_stale.exists()
+        assert live.exists()
+        assert unrelated.exists()
+
+    def test_sweep_without_root_is_noop(self, space):
+        assert space.sweep() == 0